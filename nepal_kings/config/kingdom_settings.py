@@ -532,6 +532,10 @@ HEX_MAP_ZOOM_MIN    = 0.04   # permits a complete 96x50 fit in portrait
 HEX_MAP_ZOOM_MAX    = 4.0
 HEX_MAP_ZOOM_FACTOR = 1.35  # proportional per wheel/button notch
 HEX_MAP_DRAG_THRESHOLD = 5                 # px before drag starts
+# Pre-rendered map chunks used while the camera pans or zooms.
+HEX_MAP_PYRAMID_ENABLED   = True
+HEX_MAP_PYRAMID_CHUNK_PX  = 256
+HEX_MAP_PYRAMID_BUDGET_MB = 24 if _IS_MOBILE else 48
 # Progressive disclosure thresholds for per-tile overlays.
 HEX_MAP_LAND_INFO_MIN_ZOOM       = 1.5    # icons (stat strip, tier ribbon)
 HEX_MAP_LAND_NUMBERS_MIN_ZOOM    = 2.0    # numeric labels appear here and above
@@ -4,6 +4,7 @@
 
 import pygame
 from config import settings
+from utils import assets
 from game.components.battle_moves.battle_move import BattleMoveFamily, BattleMove
 from game.components.battle_moves.battle_move_configs import ALL_BATTLE_MOVE_CONFIGS
 
@@ -15,7 +16,7 @@ _NUMBER_RANKS = {'7', '8', '9', '10'}
 class BattleMoveManager:
     """Loads battle move families from config, provides helpers to match cards."""
 
-    # Class-level image cache
+    # Placeholders for images that failed to load; the rest live in utils.assets.
     _image_cache = {}
 
     def __init__(self):
@@ -52,21 +53,16 @@ class BattleMoveManager:
     _MAX_IMG_DIM = 512
 
     def _load_image(self, path):
-        if path not in BattleMoveManager._image_cache:
-            try:
-                img = pygame.image.load(path).convert_alpha()
-                w, h = img.get_size()
-                if w > self._MAX_IMG_DIM or h > self._MAX_IMG_DIM:
-                    ratio = min(self._MAX_IMG_DIM / w, self._MAX_IMG_DIM / h)
-                    img = pygame.transform.smoothscale(
-                        img, (int(w * ratio), int(h * ratio)))
-                BattleMoveManager._image_cache[path] = img
-            except Exception as e:
-                print(f"[BattleMoveManager] Failed to load image: {path} — {e}")
-                surf = pygame.Surface((64, 64), pygame.SRCALPHA)
-                surf.fill((100, 100, 100, 128))
-                BattleMoveManager._image_cache[path] = surf
-        return BattleMoveManager._image_cache[path]
+        if path in BattleMoveManager._image_cache:
+            return BattleMoveManager._image_cache[path]
+        try:
+            return assets.get(path, max_dim=self._MAX_IMG_DIM)
+        except Exception as e:
+            print(f"[BattleMoveManager] Failed to load image: {path} — {e}")
+            surf = pygame.Surface((64, 64), pygame.SRCALPHA)
+            surf.fill((100, 100, 100, 128))
+            BattleMoveManager._image_cache[path] = surf
+            return surf
 
     # ----------------------------------------------------------- card matching
     def get_available_moves(self, hand_cards, already_bought_card_ids=None):
@@ -7,6 +7,7 @@ import math
 import pygame
 from config import settings
 from game.components.cards.card_img import CardImg
+from utils import assets
 
 _SW, _SH = settings.SCREEN_WIDTH, settings.SCREEN_HEIGHT
 # True on mobile web, where the canvas is CSS-downscaled and text/buttons sized
@@ -34,26 +35,10 @@ _CLOSE_W = int((0.20 if _IS_MOBILE else 0.12) * _SW)
 _CLOSE_H = max(int(0.05 * _SH), getattr(settings, 'TOUCH_TARGET_MIN', 0))
 _NAV_W = int((0.15 if _IS_MOBILE else 0.095) * _SW)
 
-_RAW_IMAGE_CACHE = {}
-_SCALED_IMAGE_CACHE = {}
 _CARD_FRONT_CACHE = {}
 _TIER_GLOW_CACHE = {}
 
 
-def _load_raw_image(path):
-    if path not in _RAW_IMAGE_CACHE:
-        _RAW_IMAGE_CACHE[path] = pygame.image.load(path).convert_alpha()
-    return _RAW_IMAGE_CACHE[path]
-
-
-def _load_scaled_image(path, size):
-    key = (path, size)
-    if key not in _SCALED_IMAGE_CACHE:
-        _SCALED_IMAGE_CACHE[key] = pygame.transform.smoothscale(
-            _load_raw_image(path), size)
-    return _SCALED_IMAGE_CACHE[key]
-
-
 def _card_front_image(window, suit, rank, size):
     key = (suit, rank, size)
     if key not in _CARD_FRONT_CACHE:
@@ -150,9 +135,9 @@ class BoosterRevealOverlay:
         self._back_imgs_big = []
         back_path = settings.CARD_IMG_PATH + 'back.png'
         for i in range(max(1, len(self._cards))):
-            self._back_imgs.append(_load_scaled_image(
+            self._back_imgs.append(assets.get_scaled(
                 back_path, (self._card_w, self._card_h)))
-            self._back_imgs_big.append(_load_scaled_image(
+            self._back_imgs_big.append(assets.get_scaled(
                 back_path, (int(self._card_w * self._hover_scale),
                             int(self._card_h * self._hover_scale))))
 
@@ -169,7 +154,7 @@ class BoosterRevealOverlay:
 
         # Glow images use the booster tier even before the card face is shown.
         glow_path = 'img/glow/rect/'
-        self._glow_base = _load_scaled_image(
+        self._glow_base = assets.get_scaled(
             glow_path + 'white.png', (self._glow_w, self._glow_h))
         glow_tiers = set(settings.COLLECTION_TIER_LABELS)
         glow_tiers.update(settings.COLLECTION_TIER_GLOW_TINTS)
@@ -3,11 +3,9 @@
 import pygame
 from pygame.locals import *
 from config import settings
+from utils import assets
 
 class CardImg():
-    # Class-level cache for card images (loaded once for all instances)
-    _card_image_cache = {}
-    
     def __init__(self, window, suit, rank, width=None, height=None):
         self.window = window
         self.suit = suit
@@ -16,27 +14,19 @@ class CardImg():
         self.front_img_path = f"{settings.CARD_IMG_PATH}{settings.SUIT_TO_IMG_PATH[self.suit]}{settings.RANK_TO_IMG_PATH[self.rank]}.png"
         self.back_img_path = f"{settings.CARD_IMG_PATH}back.png"
 
-        # Load from cache or disk
-        if self.front_img_path not in self._card_image_cache:
-            self._card_image_cache[self.front_img_path] = pygame.image.load(self.front_img_path)
-        if self.back_img_path not in self._card_image_cache:
-            self._card_image_cache[self.back_img_path] = pygame.image.load(self.back_img_path)
-        
-        self.front_img = self._card_image_cache[self.front_img_path]
-        self.back_img = self._card_image_cache[self.back_img_path]
-
         # The unscaled source art. front_img is downscaled below to the caller's
         # cell size; consumers that render the card larger (e.g. detail dialogs)
         # should scale from this instead to avoid upscaling a thumbnail.
-        self.front_img_source = self.front_img
+        self.front_img_source = assets.get(self.front_img_path)
 
         if width == None:
             width = settings.CARD_WIDTH
         if height == None:
             height = settings.CARD_HEIGHT
 
-        self.front_img = pygame.transform.smoothscale(self.front_img, (width, height))
-        self.back_img = pygame.transform.smoothscale(self.back_img, (width, height))
+        # Decoded and scaled surfaces are shared through the asset cache.
+        self.front_img = assets.get_scaled(self.front_img_path, (width, height))
+        self.back_img = assets.get_scaled(self.back_img_path, (width, height))
 
         self.black_overlay = pygame.Surface((width, height), pygame.SRCALPHA)
         self.black_overlay.fill((0, 0, 0, settings.ALPHA_OVERLAY)) # RGBA
@@ -44,11 +34,8 @@ class CardImg():
         self.missing_overlay = pygame.Surface((width, height), pygame.SRCALPHA)
         self.missing_overlay.fill((0, 0, 0, settings.ALPHA_MISSING_OVERLAY)) # RGBA
 
-        # Load red cross from cache or disk
-        if 'red_cross' not in self._card_image_cache:
-            self._card_image_cache['red_cross'] = pygame.image.load(settings.RED_CROSS_IMG_PATH)
-        red_cross_base = self._card_image_cache['red_cross']
-        self.red_cross = pygame.transform.smoothscale(red_cross_base, (settings.RED_CROSS_WIDTH, settings.RED_CROSS_HEIGHT))
+        self.red_cross = assets.get_scaled(
+            settings.RED_CROSS_IMG_PATH, (settings.RED_CROSS_WIDTH, settings.RED_CROSS_HEIGHT))
 
     def draw_front(self, x, y):
         self.window.blit(self.front_img, (x, y))
@@ -76,11 +63,8 @@ class CardImg():
         # Battle move icon in top-left (drawn UNDER the overlay)
         if not hasattr(self, '_battle_move_sword'):
             icon_size = int(self.front_img.get_width() * 0.35)
-            if 'battle_sword' not in self._card_image_cache:
-                self._card_image_cache['battle_sword'] = pygame.image.load(
-                    'img/figures/state_icons/charge_opponent.png').convert_alpha()
-            self._battle_move_sword = pygame.transform.smoothscale(
-                self._card_image_cache['battle_sword'], (icon_size, icon_size))
+            self._battle_move_sword = assets.get_scaled(
+                'img/figures/state_icons/charge_opponent.png', (icon_size, icon_size))
         self.window.blit(self._battle_move_sword, (x + 3, y + 3))
 
         # Overlay on top of everything
@@ -96,6 +80,5 @@ class CardImg():
 
     def draw_icon(self, x, y, width, height):
         """Draw card at specified position and size (for use in dialogue boxes)."""
-        # Scale the front image to the requested size
-        scaled_img = pygame.transform.smoothscale(self.front_img, (int(width), int(height)))
+        scaled_img = assets.get_scaled(self.front_img_path, (int(width), int(height)))
         self.window.blit(scaled_img, (x, y))
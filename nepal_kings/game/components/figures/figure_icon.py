@@ -8,6 +8,7 @@ import pygame
 
 from game.components.cards.card_img import CardImg
 from config import settings
+from utils import assets
 from game.core.input_state import get_pressed as _get_pressed
 from game.components.picker_ui import draw_caption_cell
 
@@ -19,23 +20,49 @@ _CLONE_AURA_RING_RADIUS_SCALE = 0.49
 class FigureIcon:
     # Class-level cache for base glow images (loaded once for all instances)
     _glow_cache = {}
-    _suit_icon_cache = {}  # Cache for suit icons
-    _skill_icon_cache = {}  # Cache for skill icons
-    _broken_icon_cache = {}  # Cache for broken state icon
-    _advance_icon_cache = {}  # Cache for advance state icons
+    # Scaled/composited glow surfaces keyed by (kind, source, size).  Shared
+    # by every icon of that size, so nothing may draw onto them.
+    _glow_surface_cache = {}
     
     @classmethod
     def _load_base_glow_images(cls):
         """Load base glow images once and cache them at class level."""
         if not cls._glow_cache:
             cls._glow_cache = {
-                'black': pygame.image.load(settings.GAME_BUTTON_GLOW_RECT_IMG_PATH + 'black.png').convert_alpha(),
-                'white': pygame.image.load(settings.GAME_BUTTON_GLOW_RECT_IMG_PATH + 'white.png').convert_alpha(),
-                'yellow': pygame.image.load(settings.GAME_BUTTON_GLOW_RECT_IMG_PATH + 'yellow.png').convert_alpha(),
-                'orange': pygame.image.load(settings.GAME_BUTTON_GLOW_RECT_IMG_PATH + 'orange.png').convert_alpha(),
-                'blue': pygame.image.load(settings.GAME_BUTTON_GLOW_RECT_IMG_PATH + 'blue.png').convert_alpha(),
+                'black': assets.get(settings.GAME_BUTTON_GLOW_RECT_IMG_PATH + 'black.png'),
+                'white': assets.get(settings.GAME_BUTTON_GLOW_RECT_IMG_PATH + 'white.png'),
+                'yellow': assets.get(settings.GAME_BUTTON_GLOW_RECT_IMG_PATH + 'yellow.png'),
+                'orange': assets.get(settings.GAME_BUTTON_GLOW_RECT_IMG_PATH + 'orange.png'),
+                'blue': assets.get(settings.GAME_BUTTON_GLOW_RECT_IMG_PATH + 'blue.png'),
             }
         return cls._glow_cache
+
+    @classmethod
+    def _shared_glow(cls, kind, size, source=None):
+        """
+        Return the shared ``kind`` glow scaled to ``size`` x ``size``.
+
+        ``kind`` is a base glow colour, or ``'active'``/``'active_dark'`` for
+        ``source`` (a family glow image) and its darkened variant.  The
+        surface is built on first use and reused by every later icon.
+        """
+        key = (kind, source, size)
+        surface = cls._glow_surface_cache.get(key)
+        if surface is not None:
+            return surface
+        base = cls._load_base_glow_images()
+        if kind == 'active':
+            surface = pygame.transform.smoothscale(source, (size, size))
+        elif kind == 'active_dark':
+            # Colored glow darkened by a semi-transparent black overlay.
+            overlay = pygame.transform.smoothscale(base['black'], (size, size))
+            overlay.set_alpha(160)
+            surface = cls._shared_glow('active', size, source).copy()
+            surface.blit(overlay, (0, 0))
+        else:
+            surface = pygame.transform.smoothscale(base[kind], (size, size))
+        cls._glow_surface_cache[key] = surface
+        return surface
     """
     A class representing an on-screen figure icon with optional animation,
     highlighting, and interactive behavior.
@@ -225,69 +252,28 @@ class FigureIcon:
         Load and scale all the necessary glow effects.
         Creates both bright and dark versions of colored glows.
         """
-        # Load base images from class-level cache (loaded once for all instances)
-        cache = self._load_base_glow_images()
-        glow_black_img = cache['black']
-        glow_white_img = cache['white']
-        
         # Use provided glow_img or default to yellow
-        glow_active = self.glow_img if self.glow_img else cache['yellow']
-        
-        # Scale colored glows (bright version)
-        self.glow_yellow = pygame.transform.smoothscale(
-            glow_active,
-            (settings.FIGURE_ICON_GLOW_WIDTH, settings.FIGURE_ICON_GLOW_WIDTH)
-        )
-        self.glow_yellow_big = pygame.transform.smoothscale(
-            glow_active,
-            (settings.FIGURE_ICON_GLOW_BIG_WIDTH, settings.FIGURE_ICON_GLOW_BIG_WIDTH)
-        )
-        
-        # Create dark version by preparing semi-transparent black overlay
-        glow_black_overlay = pygame.transform.smoothscale(
-            glow_black_img,
-            (settings.FIGURE_ICON_GLOW_WIDTH, settings.FIGURE_ICON_GLOW_WIDTH)
-        )
-        glow_black_overlay.set_alpha(160)  # Semi-transparent for layering
-        
-        glow_black_overlay_big = pygame.transform.smoothscale(
-            glow_black_img,
-            (settings.FIGURE_ICON_GLOW_BIG_WIDTH, settings.FIGURE_ICON_GLOW_BIG_WIDTH)
-        )
-        glow_black_overlay_big.set_alpha(160)
-        
-        # Create dark colored glows by compositing colored glow with black overlay
-        self.glow_yellow_dark = self.glow_yellow.copy()
-        self.glow_yellow_dark.blit(glow_black_overlay, (0, 0))
-        
-        self.glow_yellow_dark_big = self.glow_yellow_big.copy()
-        self.glow_yellow_dark_big.blit(glow_black_overlay_big, (0, 0))
-        
-        # Standard black glow (opaque)
-        self.glow_black = pygame.transform.smoothscale(
-            glow_black_img,
-            (settings.FIGURE_ICON_GLOW_WIDTH, settings.FIGURE_ICON_GLOW_WIDTH)
-        )
-        
-        # White glows
-        self.glow_white = pygame.transform.smoothscale(
-            glow_white_img,
-            (settings.FIGURE_ICON_GLOW_WIDTH, settings.FIGURE_ICON_GLOW_WIDTH)
-        )
-        self.glow_white_big = pygame.transform.smoothscale(
-            glow_white_img,
-            (settings.FIGURE_ICON_GLOW_BIG_WIDTH, settings.FIGURE_ICON_GLOW_BIG_WIDTH)
-        )
-        
-        # Keep orange glows for compatibility (deprecated - use dark colored glows instead)
-        self.glow_orange = pygame.transform.smoothscale(
-            cache['orange'],
-            (settings.FIGURE_ICON_GLOW_WIDTH, settings.FIGURE_ICON_GLOW_WIDTH)
-        )
-        self.glow_orange_big = pygame.transform.smoothscale(
-            cache['orange'],
-            (settings.FIGURE_ICON_GLOW_BIG_WIDTH, settings.FIGURE_ICON_GLOW_BIG_WIDTH)
-        )
+        glow_active = self.glow_img if self.glow_img else self._load_base_glow_images()['yellow']
+        self._assign_glows(glow_active, settings.FIGURE_ICON_GLOW_WIDTH,
+                           settings.FIGURE_ICON_GLOW_BIG_WIDTH)
+
+    def _assign_glows(self, glow_active, size: int, big_size: int) -> None:
+        """
+        Point the glow attributes at the shared surfaces for both sizes.
+
+        Dark colored glows are the bright ones composited with a
+        semi-transparent black overlay; orange is kept for compatibility.
+        """
+        glow = self._shared_glow
+        self.glow_yellow = glow('active', size, glow_active)
+        self.glow_yellow_big = glow('active', big_size, glow_active)
+        self.glow_yellow_dark = glow('active_dark', size, glow_active)
+        self.glow_yellow_dark_big = glow('active_dark', big_size, glow_active)
+        self.glow_black = glow('black', size)
+        self.glow_white = glow('white', size)
+        self.glow_white_big = glow('white', big_size)
+        self.glow_orange = glow('orange', size)
+        self.glow_orange_big = glow('orange', big_size)
 
     def set_position(
         self,
@@ -622,6 +608,9 @@ class FieldFigureIcon(FigureIcon):
     with associated cards displayed relative to the figure's position.
     """
 
+    # Radial skill glows keyed by icon size, shared by every field icon.
+    _skill_glow_cache = {}
+
     def __init__(
         self,
         window: pygame.Surface,
@@ -722,11 +711,10 @@ class FieldFigureIcon(FigureIcon):
         if not is_visible and hasattr(figure, 'cards') and figure.cards:
             try:
                 back_path = f"{settings.CARD_IMG_PATH}back.png"
-                back_img = pygame.image.load(back_path).convert_alpha()
                 cb_size = int(settings.FIELD_FIGURE_CARD_HEIGHT * 0.8)
-                self._card_back_normal = pygame.transform.smoothscale(back_img, (cb_size, cb_size))
+                self._card_back_normal = assets.get_scaled(back_path, (cb_size, cb_size))
                 cb_big = int(cb_size * self.icon_scale_factor)
-                self._card_back_big = pygame.transform.smoothscale(back_img, (cb_big, cb_big))
+                self._card_back_big = assets.get_scaled(back_path, (cb_big, cb_big))
             except Exception:
                 pass
         
@@ -819,69 +807,9 @@ class FieldFigureIcon(FigureIcon):
                                       * getattr(self, 'render_scale', 1.0)))
         big_glow_size = int(settings.FIGURE_ICON_GLOW_BIG_WIDTH * glow_scale)
         
-        # Load base images from class-level cache (shared with parent class)
-        cache = self._load_base_glow_images()
-        glow_black_img = cache['black']
-        glow_white_img = cache['white']
-        
         # Use provided glow_img or default to yellow
-        glow_active = self.glow_img if self.glow_img else cache['yellow']
-        
-        # Scale colored glows (bright version)
-        self.glow_yellow = pygame.transform.smoothscale(
-            glow_active,
-            (normal_glow_size, normal_glow_size)
-        )
-        self.glow_yellow_big = pygame.transform.smoothscale(
-            glow_active,
-            (big_glow_size, big_glow_size)
-        )
-        
-        # Create dark version by preparing semi-transparent black overlay
-        glow_black_overlay = pygame.transform.smoothscale(
-            glow_black_img,
-            (normal_glow_size, normal_glow_size)
-        )
-        glow_black_overlay.set_alpha(160)  # Semi-transparent for layering
-        
-        glow_black_overlay_big = pygame.transform.smoothscale(
-            glow_black_img,
-            (big_glow_size, big_glow_size)
-        )
-        glow_black_overlay_big.set_alpha(160)
-        
-        # Create dark colored glows by compositing colored glow with black overlay
-        self.glow_yellow_dark = self.glow_yellow.copy()
-        self.glow_yellow_dark.blit(glow_black_overlay, (0, 0))
-        
-        self.glow_yellow_dark_big = self.glow_yellow_big.copy()
-        self.glow_yellow_dark_big.blit(glow_black_overlay_big, (0, 0))
-        
-        # Standard black glow (opaque)
-        self.glow_black = pygame.transform.smoothscale(
-            glow_black_img,
-            (normal_glow_size, normal_glow_size)
-        )
-        
-        # White glows for hidden figures
-        self.glow_white = pygame.transform.smoothscale(
-            glow_white_img,
-            (normal_glow_size, normal_glow_size)
-        )
-        self.glow_white_big = pygame.transform.smoothscale(
-            glow_white_img,
-            (big_glow_size, big_glow_size)
-        )
-        
-        # Keep orange glows for compatibility
-        self.glow_orange = pygame.transform.smoothscale(
-            cache['orange'],
-            (normal_glow_size, normal_glow_size)
-        )
-        self.glow_orange_big = pygame.transform.smoothscale(
-            cache['orange'],
-            (big_glow_size, big_glow_size)
-        )
+        glow_active = self.glow_img if self.glow_img else self._load_base_glow_images()['yellow']
+        self._assign_glows(glow_active, normal_glow_size, big_glow_size)
 
         # Blue clone aura — permanently drawn behind Copy Figure clones so a
         # copied figure is always recognisable regardless of hover/select
@@ -889,10 +817,8 @@ class FieldFigureIcon(FigureIcon):
         # identifies the clone without crowding neighbouring figures.
         clone_size = int(normal_glow_size * _CLONE_AURA_GLOW_SCALE)
         clone_size_big = int(big_glow_size * _CLONE_AURA_GLOW_SCALE)
-        self.glow_clone = pygame.transform.smoothscale(
-            cache['blue'], (clone_size, clone_size))
-        self.glow_clone_big = pygame.transform.smoothscale(
-            cache['blue'], (clone_size_big, clone_size_big))
+        self.glow_clone = self._shared_glow('blue', clone_size)
+        self.glow_clone_big = self._shared_glow('blue', clone_size_big)
 
     def _is_clone_figure(self) -> bool:
         return bool(getattr(getattr(self, 'figure', None), 'is_clone', False))
@@ -2133,20 +2059,14 @@ class FieldFigureIcon(FigureIcon):
             }
             suit_file = suit_map.get(self.figure.suit.lower())
             if suit_file:
-                # Check cache first
-                cache_key = suit_file
-                if cache_key not in self._suit_icon_cache:
-                    suit_path = settings.SUIT_ICON_IMG_PATH + suit_file
-                    self._suit_icon_cache[cache_key] = pygame.image.load(suit_path).convert_alpha()
-                
-                suit_img = self._suit_icon_cache[cache_key]
+                suit_path = settings.SUIT_ICON_IMG_PATH + suit_file
                 # Scale to appropriate size for field view
                 base_size = int(settings.FIELD_FIGURE_CARD_HEIGHT * 0.8)
                 if is_big:
                     icon_size = int(base_size * self.icon_scale_factor)
                 else:
                     icon_size = base_size
-                return pygame.transform.smoothscale(suit_img, (icon_size, icon_size))
+                return assets.get_scaled(suit_path, (icon_size, icon_size))
         except Exception as e:
             print(f"[FIELD_ICON] Failed to load suit icon: {e}")
         return None
@@ -2164,23 +2084,19 @@ class FieldFigureIcon(FigureIcon):
         
         for skill_key, icon_path in SKILL_ICON_IMG_PATH_DICT.items():
             try:
-                # Check cache first
-                if skill_key not in self._skill_icon_cache:
-                    # Load original high-res icon once and cache it
-                    self._skill_icon_cache[skill_key] = pygame.image.load(icon_path).convert_alpha()
-                
-                icon = self._skill_icon_cache[skill_key]
-                # Create both sizes from the cached original
-                skill_icons_normal[skill_key] = pygame.transform.smoothscale(icon, (normal_size, normal_size))
-                skill_icons_big[skill_key] = pygame.transform.smoothscale(icon, (big_size, big_size))
+                skill_icons_normal[skill_key] = assets.get_scaled(icon_path, (normal_size, normal_size))
+                skill_icons_big[skill_key] = assets.get_scaled(icon_path, (big_size, big_size))
             except Exception as e:
                 print(f"[FIELD_ICON] Failed to load skill icon '{skill_key}': {e}")
         
         return skill_icons_normal, skill_icons_big
     
-    @staticmethod
-    def _create_skill_glow(size):
-        """Create a soft white radial glow surface for skill icons."""
+    @classmethod
+    def _create_skill_glow(cls, size):
+        """Return the shared soft white radial glow for skill icons of ``size``."""
+        glow_surface = cls._skill_glow_cache.get(size)
+        if glow_surface is not None:
+            return glow_surface
         glow_size = int(size * 1.5)
         glow_surface = pygame.Surface((glow_size, glow_size), pygame.SRCALPHA)
         center = glow_size // 2
@@ -2188,6 +2104,7 @@ class FieldFigureIcon(FigureIcon):
         for r in range(radius, 0, -1):
             alpha = int(120 * (1 - (r / radius) ** 1.5))
             pygame.draw.circle(glow_surface, (255, 255, 255, alpha), (center, center), r)
+        cls._skill_glow_cache[size] = glow_surface
         return glow_surface
     
     def _load_advantage_suit_icons(self):
@@ -2198,18 +2115,14 @@ class FieldFigureIcon(FigureIcon):
             return None, None
         suit_file = adv_suit.lower() + '.png'
         try:
-            cache_key = f'advantage_{suit_file}'
-            if cache_key not in self._suit_icon_cache:
-                suit_path = settings.SUIT_ICON_IMG_PATH + suit_file
-                self._suit_icon_cache[cache_key] = pygame.image.load(suit_path).convert_alpha()
-            suit_img = self._suit_icon_cache[cache_key]
+            suit_path = settings.SUIT_ICON_IMG_PATH + suit_file
             # Slightly smaller than skill icon for centered overlay
             base_size = int(settings.FIELD_FIGURE_CARD_HEIGHT * 0.8)
             normal_size = int(base_size * 0.85)
             big_size = int(normal_size * self.icon_scale_factor)
             return (
-                pygame.transform.smoothscale(suit_img, (normal_size, normal_size)),
-                pygame.transform.smoothscale(suit_img, (big_size, big_size)),
+                assets.get_scaled(suit_path, (normal_size, normal_size)),
+                assets.get_scaled(suit_path, (big_size, big_size)),
             )
         except Exception as e:
             print(f"[FIELD_ICON] Failed to load advantage suit icon '{suit_file}': {e}")
@@ -2227,17 +2140,13 @@ class FieldFigureIcon(FigureIcon):
             return None, None
         suit_file = own_suit.lower() + '.png'
         try:
-            cache_key = f'own_{suit_file}'
-            if cache_key not in self._suit_icon_cache:
-                suit_path = settings.SUIT_ICON_IMG_PATH + suit_file
-                self._suit_icon_cache[cache_key] = pygame.image.load(suit_path).convert_alpha()
-            suit_img = self._suit_icon_cache[cache_key]
+            suit_path = settings.SUIT_ICON_IMG_PATH + suit_file
             base_size = int(settings.FIELD_FIGURE_CARD_HEIGHT * 0.8)
             normal_size = int(base_size * 0.85)
             big_size = int(normal_size * self.icon_scale_factor)
             return (
-                pygame.transform.smoothscale(suit_img, (normal_size, normal_size)),
-                pygame.transform.smoothscale(suit_img, (big_size, big_size)),
+                assets.get_scaled(suit_path, (normal_size, normal_size)),
+                assets.get_scaled(suit_path, (big_size, big_size)),
             )
         except Exception as e:
             print(f"[FIELD_ICON] Failed to load own suit icon '{suit_file}': {e}")
@@ -2263,8 +2172,7 @@ class FieldFigureIcon(FigureIcon):
         try:
             # Spell icons are in img/spells/icons/
             icon_path = f'img/spells/icons/{icon_filename}'
-            icon = pygame.image.load(icon_path).convert_alpha()
-            return pygame.transform.smoothscale(icon, (icon_size, icon_size))
+            return assets.get_scaled(icon_path, (icon_size, icon_size))
         except Exception as e:
             print(f"[FIELD_ICON] Failed to load enchantment icon '{icon_filename}': {e}")
             return None
@@ -2272,20 +2180,14 @@ class FieldFigureIcon(FigureIcon):
     def _load_broken_icon(self, is_big=False):
         """Load the broken state icon for figures with resource deficits."""
         try:
-            # Check cache first
-            cache_key = 'broken.png'
-            if cache_key not in self._broken_icon_cache:
-                broken_path = 'img/figures/state_icons/broken.png'
-                self._broken_icon_cache[cache_key] = pygame.image.load(broken_path).convert_alpha()
-            
-            broken_img = self._broken_icon_cache[cache_key]
+            broken_path = 'img/figures/state_icons/broken.png'
             # Size to fit in top left corner of icon
             base_size = int(settings.FIELD_ICON_WIDTH * 0.25)
             if is_big:
                 icon_size = int(base_size * self.icon_scale_factor)
             else:
                 icon_size = base_size
-            return pygame.transform.smoothscale(broken_img, (icon_size, icon_size))
+            return assets.get_scaled(broken_path, (icon_size, icon_size))
         except Exception as e:
             print(f"[FIELD_ICON] Failed to load broken icon: {e}")
         return None
@@ -2294,18 +2196,14 @@ class FieldFigureIcon(FigureIcon):
         """Load the advance state icon overlay (charge.png for own, charge_opponent.png for opponent)."""
         try:
             filename = 'charge.png' if is_own else 'charge_opponent.png'
-            if filename not in self._advance_icon_cache:
-                icon_path = f'img/figures/state_icons/{filename}'
-                self._advance_icon_cache[filename] = pygame.image.load(icon_path).convert_alpha()
-            
-            advance_img = self._advance_icon_cache[filename]
+            icon_path = f'img/figures/state_icons/{filename}'
             # Size to fit in top corner of icon; larger on mobile
             base_size = int(settings.FIELD_ICON_WIDTH * settings.ADVANCE_ICON_SCALE)
             if is_big:
                 icon_size = int(base_size * self.icon_scale_factor)
             else:
                 icon_size = base_size
-            return pygame.transform.smoothscale(advance_img, (icon_size, icon_size))
+            return assets.get_scaled(icon_path, (icon_size, icon_size))
         except Exception as e:
             print(f"[FIELD_ICON] Failed to load advance icon: {e}")
         return None
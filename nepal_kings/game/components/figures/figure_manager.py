@@ -3,15 +3,13 @@
 import pygame
 from typing import List, Dict, Optional, Tuple
 from config import settings
+from utils import assets
 from game.components.figures.family_configs.family_config_list import FAMILY_CONFIG_LIST
 from game.components.figures.figure import Figure, FigureFamily
 from game.components.cards.card import Card
 
 
 class FigureManager:
-    # Class-level cache for loaded images (shared across all instances)
-    _image_cache = {}
-    
     def __init__(self):
         self.families: Dict[str, FigureFamily] = {}
         self.figures: List[Figure] = []
@@ -41,16 +39,8 @@ class FigureManager:
     _MAX_IMG_DIM = 512
 
     def load_image(self, path: str) -> pygame.Surface:
-        """Load an image with caching and runtime max-size safety cap."""
-        if path not in self._image_cache:
-            img = pygame.image.load(path).convert_alpha()
-            w, h = img.get_size()
-            if w > self._MAX_IMG_DIM or h > self._MAX_IMG_DIM:
-                ratio = min(self._MAX_IMG_DIM / w, self._MAX_IMG_DIM / h)
-                img = pygame.transform.smoothscale(
-                    img, (int(w * ratio), int(h * ratio)))
-            self._image_cache[path] = img
-        return self._image_cache[path]
+        """Load an image through the shared asset cache with the max-size cap."""
+        return assets.get(path, max_dim=self._MAX_IMG_DIM)
 
     def add_figure_family(self, family: FigureFamily) -> None:
         """Add a figure family to the manager and categorize it."""
@@ -0,0 +1,113 @@
+# Copyright (c) 2026 Marc Stieffenhofer. All rights reserved.
+# See LICENSE file in the project root for full license information.
+"""Grid lookups for the odd-q hex map.
+
+Tile centres sit on a fixed lattice (see ``HexMap``)::
+
+    cx = col * 1.5 * size
+    cy = row * sqrt(3) * size + (col % 2) * sqrt(3) / 2 * size
+
+so a world-space rectangle maps straight to a column range and, per
+column, a row range, and a world point has at most four candidate tiles.
+Culling and picking cost is proportional to the visible area rather than
+to the size of the map.  Pure arithmetic: no pygame, no display.
+"""
+
+import math
+
+_SQRT3 = math.sqrt(3)
+
+
+class HexGridIndex:
+    """Coordinate-keyed tiles with range and nearest-centre queries."""
+
+    def __init__(self, tiles, size):
+        self.size = float(size)
+        self._col_step = 1.5 * self.size
+        self._row_step = _SQRT3 * self.size
+        self._tiles = list(tiles)
+        self._by_coord = {}
+        self._order = {}
+        for seq, tile in enumerate(self._tiles):
+            self._by_coord[(tile.col, tile.row)] = tile
+            self._order[id(tile)] = seq
+        if self._tiles:
+            self.min_col = min(t.col for t in self._tiles)
+            self.max_col = max(t.col for t in self._tiles)
+            self.min_row = min(t.row for t in self._tiles)
+            self.max_row = max(t.row for t in self._tiles)
+            self._centre_bounds = (
+                min(t.cx for t in self._tiles), min(t.cy for t in self._tiles),
+                max(t.cx for t in self._tiles), max(t.cy for t in self._tiles))
+        else:
+            self.min_col = self.max_col = self.min_row = self.max_row = 0
+            self._centre_bounds = (0.0, 0.0, 0.0, 0.0)
+
+    def __len__(self):
+        return len(self._tiles)
+
+    def get(self, col, row):
+        return self._by_coord.get((col, row))
+
+    def _row_offset(self, col):
+        return (col % 2) * self._row_step / 2
+
+    def col_range(self, wx0, wx1):
+        """Inclusive columns whose centres can fall inside ``[wx0, wx1]``."""
+        first = max(self.min_col, math.floor(wx0 / self._col_step))
+        last = min(self.max_col, math.ceil(wx1 / self._col_step))
+        return first, last
+
+    def row_range(self, col, wy0, wy1):
+        """Inclusive rows of ``col`` whose centres can fall inside ``[wy0, wy1]``."""
+        offset = self._row_offset(col)
+        first = max(self.min_row, math.floor((wy0 - offset) / self._row_step))
+        last = min(self.max_row, math.ceil((wy1 - offset) / self._row_step))
+        return first, last
+
+    def tiles_in_rect(self, wx0, wy0, wx1, wy1):
+        """Tiles whose centres may lie in the world rect, in original order.
+
+        The ranges are rounded outwards, so callers still apply their own
+        exact bounds test; no tile inside the rect is ever missed.
+        """
+        min_x, min_y, max_x, max_y = self._centre_bounds
+        if wx0 <= min_x and wy0 <= min_y and wx1 >= max_x and wy1 >= max_y:
+            return list(self._tiles)
+        first_col, last_col = self.col_range(wx0, wx1)
+        found = []
+        by_coord = self._by_coord
+        for col in range(first_col, last_col + 1):
+            first_row, last_row = self.row_range(col, wy0, wy1)
+            for row in range(first_row, last_row + 1):
+                tile = by_coord.get((col, row))
+                if tile is not None:
+                    found.append(tile)
+        order = self._order
+        found.sort(key=lambda t: order[id(t)])
+        return found
+
+    def tile_at(self, wx, wy, max_dist=None):
+        """Nearest tile whose centre is closer than ``max_dist`` (default ``size``).
+
+        A centre within ``size`` of the point is less than 2/3 of a column
+        and 1/sqrt(3) of a row away, so two columns and two rows cover every
+        candidate.  Ties go to the earlier tile, as a linear scan would.
+        """
+        max_dist = self.size if max_dist is None else max_dist
+        base_col = math.floor(wx / self._col_step)
+        best = None
+        best_key = None
+        for col in (base_col, base_col + 1):
+            base_row = math.floor((wy - self._row_offset(col)) / self._row_step)
+            for row in (base_row, base_row + 1):
+                tile = self._by_coord.get((col, row))
+                if tile is None:
+                    continue
+                dist = math.hypot(wx - tile.cx, wy - tile.cy)
+                if dist >= max_dist:
+                    continue
+                key = (dist, self._order[id(tile)])
+                if best_key is None or key < best_key:
+                    best, best_key = tile, key
+        return best
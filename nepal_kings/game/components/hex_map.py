@@ -9,6 +9,8 @@ from collections import deque
 import pygame
 from config import settings
 from game.components import hex_cosmetics, badge_cosmetics, sigil_cosmetics
+from game.components.hex_grid_index import HexGridIndex
+from game.components.hex_map_pyramid import HexMapPyramid
 import logging
 
 logger = logging.getLogger('nk.components.hex_map')
@@ -109,6 +111,25 @@ def _tile_border_color(tile):
     )
 
 
+def _tile_geography_signature(tile):
+    """Tile data that shapes map-wide layers (suit clusters, landmarks, gold scale)."""
+    return (tile.suit_bonus_suit, tile.tier, tile.region, tile.gold_rate)
+
+
+def _tile_paint_signature(tile, starts_new_kingdom):
+    """Tile data the pre-rendered map chunks read for this land alone."""
+    style = tile.owner_style or {}
+    return (
+        tile.owner_user_id, tile.is_mine,
+        tuple(sorted((str(k), repr(v)) for k, v in style.items())),
+        tile.is_recommended_tutorial_land,
+        bool(tile.kingdom_shield_remaining)
+        or tile.kingdom_shield_reason == 'core_protection',
+        (tile.conquer_cooldown_remaining or 0) > 0,
+        starts_new_kingdom,
+    )
+
+
 def _star_points(cx, cy, outer_r, inner_r, points=5):
     """Return polygon points for a small vector star."""
     pts = []
@@ -528,6 +549,15 @@ class HexMap:
         self._terrain_landmarks_cache = None
         self._render_cache_key = None
         self._render_cache = None
+        # Offscreen chunks of the static tile layers, blitted instead of a
+        # full render while the camera pans or zooms (see hex_map_pyramid).
+        self._pyramid = HexMapPyramid(
+            getattr(settings, 'HEX_MAP_PYRAMID_CHUNK_PX', 256),
+            int(getattr(settings, 'HEX_MAP_PYRAMID_BUDGET_MB', 48)) * 1024 * 1024,
+        )
+        self._glow_pulse_override = None
+        self._last_view_key = None
+        self._view_motion_frames = 0
         # Crown leaderboards (set via set_leaderboards from KingdomScreen).
         # Crown leaderboards: group_key -> rank (1/2/3) for the largest
         # single connected kingdom; user_id -> rank for the greatest total
@@ -684,6 +714,17 @@ class HexMap:
             tile = HexTile(ld, cx, cy)
             self.tiles.append(tile)
             self._tile_by_coord[(tile.col, tile.row)] = tile
+        self._grid_index = HexGridIndex(self.tiles, s)
+        self._tile_by_land_id = {tile.land_id: tile for tile in self.tiles}
+        # Per-frame questions about the whole map, answered once per refresh.
+        self._has_mine_tiles = any(tile.is_mine for tile in self.tiles)
+        self._has_incomplete_defence = any(
+            tile.defence_incomplete for tile in self.tiles)
+        self._tutorial_tile = next(
+            (tile for tile in self.tiles
+             if getattr(tile, 'is_recommended_tutorial_land', False)),
+            None,
+        )
         self._update_world_bounds()
         self._precompute_conquest_outcomes()
         # Data changed — drop derived caches.
@@ -942,19 +983,16 @@ class HexMap:
     def tile_at_screen_pos(self, sx, sy):
         """Return the HexTile under screen position (sx, sy), or None."""
         wx, wy = self.screen_to_world(sx, sy)
-        best = None
-        best_dist = float('inf')
-        sz = self._size
-        # Quick radius check (hex inscribed circle radius = size * sqrt(3)/2)
-        max_r = sz
-        for tile in self.tiles:
-            dx = wx - tile.cx
-            dy = wy - tile.cy
-            dist = math.sqrt(dx * dx + dy * dy)
-            if dist < max_r and dist < best_dist:
-                best = tile
-                best_dist = dist
-        return best
+        # Nearest centre within one hex radius; only the up to four lattice
+        # neighbours of the point can qualify.
+        return self._grid_index.tile_at(wx, wy)
+
+    def _visible_candidates(self, margin_px):
+        """Tiles whose centres may lie within ``margin_px`` of the viewport."""
+        vp = self.viewport_rect
+        wx0, wy0 = self.screen_to_world(vp.left - margin_px, vp.top - margin_px)
+        wx1, wy1 = self.screen_to_world(vp.right + margin_px, vp.bottom + margin_px)
+        return self._grid_index.tiles_in_rect(wx0, wy0, wx1, wy1)
 
     # ── Event handling ──────────────────────────────────────────────
 
@@ -1070,6 +1108,8 @@ class HexMap:
         Quantized to ``HEX_MINE_GLOW_PULSE_STEPS`` so callers can rely on a
         small finite set of values per frame, enabling cheap caching.
         """
+        if self._glow_pulse_override is not None:
+            return self._glow_pulse_override
         period = max(1, int(getattr(settings, 'HEX_MINE_GLOW_PULSE_PERIOD_MS', 2400)))
         amp = float(getattr(settings, 'HEX_MINE_GLOW_PULSE_AMPLITUDE', 0.35))
         steps = max(2, int(getattr(settings, 'HEX_MINE_GLOW_PULSE_STEPS', 8)))
@@ -1103,6 +1143,7 @@ class HexMap:
         self._minimap_static_cache = None
         self._render_cache_key = None
         self._render_cache = None
+        self._pyramid.clear()
 
     def focus_region(self, region_key):
         """Fit an entire historic region within the active viewport."""
@@ -1434,12 +1475,10 @@ class HexMap:
                 ]
                 pygame.draw.polygon(self.window, (242, 205, 92), crown)
 
-    def render(self):
-        """Draw all visible hexes, labels, and minimap."""
-        sz = self._size * self.zoom
+    def _frame_cache_key(self):
+        """Everything the cached viewport frame depends on."""
         vp = self.viewport_rect
-
-        has_mine = any(tile.is_mine for tile in self.tiles)
+        has_mine = self._has_mine_tiles
         # At full-map scale the glow is sub-pixel; keeping it static avoids
         # rebuilding the entire 4,800-tile overview for an invisible pulse.
         pulse_step = (round(self._owner_glow_pulse(), 3)
@@ -1447,10 +1486,10 @@ class HexMap:
         warning_step = (
             pygame.time.get_ticks() // 250
             if (self.zoom >= settings.HEX_MAP_LAND_INFO_MIN_ZOOM
-                and any(tile.defence_incomplete for tile in self.tiles))
+                and self._has_incomplete_defence)
             else None
         )
-        cache_key = (
+        return (
             vp.x, vp.y, vp.w, vp.h,
             round(self.camera_x, 3), round(self.camera_y, 3),
             round(self.zoom, 5), self.map_mode,
@@ -1460,6 +1499,28 @@ class HexMap:
             tuple(getattr(self, 'minimap_origin', ()) or ()),
             pulse_step, warning_step,
         )
+
+    def frame_damage(self):
+        """What the next :meth:`render` changes, for the screen's pacer.
+
+        ``[]`` when it would blit the cached frame with nothing animated on
+        top, otherwise the viewport.
+        """
+        vp = self.viewport_rect
+        cached_frame = getattr(self, '_render_cache', None)
+        if (cached_frame is not None
+                and self._frame_cache_key() == getattr(self, '_render_cache_key', None)
+                and cached_frame.get_size() == vp.size
+                and not self._tutorial_marker_visible()):
+            return []
+        return [vp.copy()]
+
+    def render(self):
+        """Draw all visible hexes, labels, and minimap."""
+        sz = self._size * self.zoom
+        vp = self.viewport_rect
+        cache_key = self._frame_cache_key()
+        moving = self._camera_in_motion(cache_key[:7])
         cached_frame = getattr(self, '_render_cache', None)
         if (cached_frame is not None
                 and cache_key == getattr(self, '_render_cache_key', None)
@@ -1467,12 +1528,47 @@ class HexMap:
             self.window.blit(cached_frame, vp.topleft)
             self._draw_recommended_tutorial_marker()
             return
+        if moving and getattr(settings, 'HEX_MAP_PYRAMID_ENABLED', True):
+            self._render_from_pyramid(sz)
+            self._draw_recommended_tutorial_marker()
+            return
 
         old_clip = self.window.get_clip()
         self.window.set_clip(vp)
 
+        visible_hexes = self._collect_visible_hexes(sz)
+        self._draw_tile_layers(visible_hexes, sz)
+        if self.zoom >= settings.HEX_MAP_LAND_INFO_MIN_ZOOM:
+            for tile, _corners, scx, scy in visible_hexes:
+                self._draw_hex_details(tile, scx, scy, sz)
+        elif self.hovered_tile is not None:
+            for tile, _corners, scx, scy in visible_hexes:
+                if tile is self.hovered_tile:
+                    self._draw_hex_details(tile, scx, scy, sz)
+                    break
+
+        # Suit cluster icons (drawn before kingdom badges so the kingdom
+        # name pill always sits on top of the suit icon).
+        self._draw_suit_cluster_icons(sz)
+        self._draw_region_labels()
+        self._draw_kingdom_badges(sz)
+
+        self.window.set_clip(old_clip)
+
+        self._draw_minimap()
+        try:
+            self._render_cache = self.window.subsurface(vp).copy()
+            self._render_cache_key = cache_key
+        except (ValueError, pygame.error):
+            self._render_cache = None
+            self._render_cache_key = None
+        self._draw_recommended_tutorial_marker()
+
+    def _collect_visible_hexes(self, sz):
+        """``(tile, corners, scx, scy)`` for every hex near the viewport."""
+        vp = self.viewport_rect
         visible_hexes = []
-        for tile in self.tiles:
+        for tile in self._visible_candidates(sz * 2):
             scx, scy = self.world_to_screen(tile.cx, tile.cy)
 
             # Frustum culling
@@ -1483,7 +1579,10 @@ class HexMap:
 
             corners = _hex_corners(scx, scy, sz)
             visible_hexes.append((tile, corners, scx, scy))
+        return visible_hexes
 
+    def _draw_tile_layers(self, visible_hexes, sz):
+        """Fills, landmarks, region seams, borders and cluster outlines."""
         # Layered rendering fixes borders being overwritten by neighbouring
         # hex fills (most visible on lower/right edges with thick skins).
         for tile, corners, scx, scy in visible_hexes:
@@ -1502,31 +1601,107 @@ class HexMap:
                         getattr(tile, 'is_recommended_tutorial_land', False)):
                     self._draw_hex_border(tile, corners)
         self._draw_cluster_outlines(visible_hexes, sz)
+
+    # ── Motion frames from the chunk pyramid ──────────────────────
+
+    def _camera_in_motion(self, view_key):
+        """True while a pan or zoom is in progress.
+
+        A drag counts from its first moved frame; other camera changes (wheel,
+        pinch, arrow keys) only once they span two consecutive frames, so a
+        single zoom notch or a ``focus_land`` jump is still rendered in full.
+        """
+        moved = view_key != self._last_view_key
+        self._last_view_key = view_key
+        self._view_motion_frames = self._view_motion_frames + 1 if moved else 0
+        return moved and (self._did_drag or self._view_motion_frames >= 2)
+
+    def _render_pyramid_chunk(self, surface, zoom, world_x, world_y):
+        """Paint the static tile layers of one pyramid chunk onto ``surface``."""
+        saved = (self.window, self.viewport_rect, self.camera_x, self.camera_y,
+                 self.zoom, self.hovered_tile, self.selected_tile)
+        amp = float(getattr(settings, 'HEX_MINE_GLOW_PULSE_AMPLITUDE', 0.35))
+        self.window = surface
+        self.viewport_rect = surface.get_rect()
+        self.camera_x, self.camera_y, self.zoom = world_x, world_y, zoom
+        self.hovered_tile = self.selected_tile = None
+        # Chunks are painted at different times; a fixed mid-breath glow
+        # keeps neighbouring chunks from disagreeing.
+        self._glow_pulse_override = 1.0 - amp / 2
+        try:
+            sz = self._size * zoom
+            self._draw_tile_layers(self._collect_visible_hexes(sz), sz)
+        finally:
+            (self.window, self.viewport_rect, self.camera_x, self.camera_y,
+             self.zoom, self.hovered_tile, self.selected_tile) = saved
+            self._glow_pulse_override = None
+
+    def _render_from_pyramid(self, sz):
+        """Draw a motion frame: pre-rendered chunks plus per-frame overlays.
+
+        Hover highlights and the owner-glow pulse are left out; the frame
+        after the camera comes to rest is rendered in full (and cached) again.
+        """
+        vp = self.viewport_rect
+        old_clip = self.window.get_clip()
+        self.window.set_clip(vp)
+        self._pyramid.compose(self.window, vp, self.camera_x, self.camera_y,
+                              self.zoom, self._render_pyramid_chunk)
+        selected = self.selected_tile
+        if selected is not None:
+            scx, scy = self.world_to_screen(selected.cx, selected.cy)
+            self._draw_hex_border(selected, _hex_corners(scx, scy, sz))
         if self.zoom >= settings.HEX_MAP_LAND_INFO_MIN_ZOOM:
-            for tile, _corners, scx, scy in visible_hexes:
+            for tile, _corners, scx, scy in self._collect_visible_hexes(sz):
                 self._draw_hex_details(tile, scx, scy, sz)
-        elif self.hovered_tile is not None:
-            for tile, _corners, scx, scy in visible_hexes:
-                if tile is self.hovered_tile:
-                    self._draw_hex_details(tile, scx, scy, sz)
-                    break
-
-        # Suit cluster icons (drawn before kingdom badges so the kingdom
-        # name pill always sits on top of the suit icon).
         self._draw_suit_cluster_icons(sz)
         self._draw_region_labels()
         self._draw_kingdom_badges(sz)
-
         self.window.set_clip(old_clip)
-
         self._draw_minimap()
-        try:
-            self._render_cache = self.window.subsurface(vp).copy()
-            self._render_cache_key = cache_key
-        except (ValueError, pygame.error):
-            self._render_cache = None
-            self._render_cache_key = None
-        self._draw_recommended_tutorial_marker()
+
+    def _paint_signatures(self):
+        outcomes = getattr(self, '_conquest_outcomes', {})
+        return {
+            (tile.col, tile.row): (
+                _tile_geography_signature(tile),
+                _tile_paint_signature(
+                    tile, outcomes.get(tile.land_id) == 'new'),
+            )
+            for tile in self.tiles
+        }
+
+    def _invalidate_pyramid(self, old_signatures):
+        """Drop the pyramid chunks a data refresh actually changed."""
+        new_signatures = self._paint_signatures()
+        if old_signatures.keys() != new_signatures.keys():
+            self._pyramid.clear()
+            return
+        changed = []
+        for coord, (geography, paint) in new_signatures.items():
+            old_geography, old_paint = old_signatures[coord]
+            if geography != old_geography:
+                self._pyramid.clear()
+                return
+            if paint != old_paint:
+                changed.append(self._tile_by_coord[coord])
+        if len(changed) > 256:
+            self._pyramid.clear()
+            return
+        # A land's glow and its neighbours' strokes along the shared edges
+        # stay within half a hex of its outline.
+        reach = self._size * 1.5
+        self._pyramid.invalidate_world_rects(
+            [(t.cx - reach, t.cy - reach, t.cx + reach, t.cy + reach)
+             for t in changed],
+            pad_px=8,
+        )
+
+    def _tutorial_marker_visible(self):
+        tile = self._tutorial_tile
+        if tile is None:
+            return False
+        return self.viewport_rect.collidepoint(*self.world_to_screen(tile.cx, tile.cy))
 
     def _draw_recommended_tutorial_marker(self):
         """Draw a high-contrast tap halo over the marked onboarding land.
@@ -1536,16 +1711,10 @@ class HexMap:
         large as a mobile touch target and is drawn after the cached map frame
         so its gentle pulse remains animated without rebuilding every tile.
         """
-        tile = next(
-            (item for item in self.tiles
-             if getattr(item, 'is_recommended_tutorial_land', False)),
-            None,
-        )
-        if tile is None:
+        if not self._tutorial_marker_visible():
             return
+        tile = self._tutorial_tile
         cx, cy = self.world_to_screen(tile.cx, tile.cy)
-        if not self.viewport_rect.collidepoint(cx, cy):
-            return
         sz = self._size * self.zoom
         touch_radius = (getattr(settings, 'TOUCH_TARGET_MIN', 0) or 0) / 2
         pulse = (pygame.time.get_ticks() % 900) / 900.0
@@ -1578,7 +1747,10 @@ class HexMap:
 
     def set_map_mode(self, mode):
         """Switch the map scan mode ('terrain'/'ownership'/'gold'/'vulnerable')."""
-        self.map_mode = mode or 'terrain'
+        mode = mode or 'terrain'
+        if mode != self.map_mode:
+            self._pyramid.clear()
+        self.map_mode = mode
 
     def _ensure_gold_range(self):
         """Cache (min, max) gold rate across tiles for the gold heatmap."""
@@ -3072,17 +3244,16 @@ class HexMap:
         outside the map viewport, so callers (e.g. tutorial coaching) can fall
         back to a viewport-wide anchor when the land is panned off-screen.
         """
-        for tile in self.tiles:
-            if tile.land_id != land_id:
-                continue
-            cx, cy = self.world_to_screen(tile.cx, tile.cy)
-            if not self.viewport_rect.collidepoint(cx, cy):
-                return None
-            half_w = self._size * self.zoom
-            half_h = (math.sqrt(3) / 2) * self._size * self.zoom
-            return pygame.Rect(int(cx - half_w), int(cy - half_h),
-                               int(half_w * 2), int(half_h * 2))
-        return None
+        tile = self._tile_by_land_id.get(land_id)
+        if tile is None:
+            return None
+        cx, cy = self.world_to_screen(tile.cx, tile.cy)
+        if not self.viewport_rect.collidepoint(cx, cy):
+            return None
+        half_w = self._size * self.zoom
+        half_h = (math.sqrt(3) / 2) * self._size * self.zoom
+        return pygame.Rect(int(cx - half_w), int(cy - half_h),
+                           int(half_w * 2), int(half_h * 2))
 
     def focus_land(self, land_id, *, screen_offset_y=0):
         """Select and centre the map on a land id. Returns the tile if found.
@@ -3091,15 +3262,15 @@ class HexMap:
         viewport centre — used to keep a selected hex visible above the
         anchored land inspector sheet.
         """
-        for tile in self.tiles:
-            if tile.land_id == land_id:
-                self.selected_tile = tile
-                self.camera_x = tile.cx - self.viewport_rect.w / (2 * self.zoom)
-                self.camera_y = tile.cy - (
-                    self.viewport_rect.h / 2 - screen_offset_y) / self.zoom
-                self._clamp_camera()
-                return tile
-        return None
+        tile = self._tile_by_land_id.get(land_id)
+        if tile is None:
+            return None
+        self.selected_tile = tile
+        self.camera_x = tile.cx - self.viewport_rect.w / (2 * self.zoom)
+        self.camera_y = tile.cy - (
+            self.viewport_rect.h / 2 - screen_offset_y) / self.zoom
+        self._clamp_camera()
+        return tile
 
     def focus_lands(self, land_ids, *, fit=False, max_zoom=1.5, padding_px=None):
         """Centre the camera on a set of land IDs and optionally zoom to fit.
@@ -3114,7 +3285,9 @@ class HexMap:
         if not wanted:
             return None
 
-        targets = [tile for tile in self.tiles if tile.land_id in wanted]
+        targets = [self._tile_by_land_id[land_id]
+                   for land_id in sorted(wanted)
+                   if land_id in self._tile_by_land_id]
         if not targets:
             return None
 
@@ -3334,7 +3507,9 @@ class HexMap:
     def update_data(self, lands_data):
         """Refresh tile data (e.g. after ownership change) without resetting camera."""
         old_cam = (self.camera_x, self.camera_y, self.zoom)
+        old_signatures = self._paint_signatures()
         self._build_tiles(lands_data)
+        self._invalidate_pyramid(old_signatures)
         self.camera_x, self.camera_y, self.zoom = old_cam
         self.selected_tile = None
         self.hovered_tile = None
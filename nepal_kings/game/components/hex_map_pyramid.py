@@ -0,0 +1,171 @@
+# Copyright (c) 2026 Marc Stieffenhofer. All rights reserved.
+# See LICENSE file in the project root for full license information.
+"""Pre-rendered, zoom-levelled chunks of the static hex map layers.
+
+While the camera moves, ``HexMap`` paints its terrain, borders and cluster
+outlines from fixed-size offscreen chunks instead of redrawing every visible
+polygon.  Zoom is quantised to ``LEVELS_PER_OCTAVE`` levels per doubling; a
+chunk at level ``L`` covers ``chunk_px`` square pixels of the world drawn at
+``level_zoom(L)``, so panning only blits, and zooming between levels scales
+the stitched chunks by at most ``2 ** (1 / (2 * LEVELS_PER_OCTAVE))``.
+
+Chunks are kept in a byte-budgeted LRU.  ``invalidate_world_rects`` drops
+only the chunks overlapping changed lands; ``clear`` drops everything (map
+mode, regions or map shape changed).
+"""
+
+import math
+from collections import OrderedDict
+
+import pygame
+
+LEVELS_PER_OCTAVE = 4
+DEFAULT_CHUNK_PX = 256
+DEFAULT_BUDGET_BYTES = 48 * 1024 * 1024
+
+
+class HexMapPyramid:
+    """LRU of per-level map chunks plus the blit/scale compositor."""
+
+    def __init__(self, chunk_px=DEFAULT_CHUNK_PX, budget_bytes=DEFAULT_BUDGET_BYTES):
+        self.chunk_px = max(16, int(chunk_px))
+        self.budget_bytes = max(0, int(budget_bytes))
+        self._chunks = OrderedDict()
+        self._bytes = 0
+        self._canvas = None
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self._chunks)
+
+    @property
+    def bytes_used(self):
+        return self._bytes
+
+    @staticmethod
+    def level_for(zoom):
+        return int(round(math.log2(max(zoom, 1e-6)) * LEVELS_PER_OCTAVE))
+
+    @staticmethod
+    def level_zoom(level):
+        return 2.0 ** (level / LEVELS_PER_OCTAVE)
+
+    def chunk_world_rect(self, level, ix, iy):
+        """``(x0, y0, x1, y1)`` world bounds of one chunk."""
+        span = self.chunk_px / self.level_zoom(level)
+        return ix * span, iy * span, (ix + 1) * span, (iy + 1) * span
+
+    # ── Cache ───────────────────────────────────────────────────────
+
+    def chunk(self, level, ix, iy, render_chunk):
+        """Return the chunk surface, rendering it through ``render_chunk``.
+
+        ``render_chunk(surface, zoom, world_x, world_y)`` paints the world
+        region whose top-left is ``(world_x, world_y)`` at ``zoom`` onto a
+        transparent ``chunk_px`` square surface.
+        """
+        key = (level, ix, iy)
+        surf = self._chunks.get(key)
+        if surf is not None:
+            self._chunks.move_to_end(key)
+            self.hits += 1
+            return surf
+        self.misses += 1
+        surf = pygame.Surface((self.chunk_px, self.chunk_px), pygame.SRCALPHA)
+        zoom = self.level_zoom(level)
+        span = self.chunk_px / zoom
+        render_chunk(surf, zoom, ix * span, iy * span)
+        self._chunks[key] = surf
+        self._bytes += self._surface_bytes(surf)
+        while self._bytes > self.budget_bytes and len(self._chunks) > 1:
+            _key, old = self._chunks.popitem(last=False)
+            self._bytes -= self._surface_bytes(old)
+        return surf
+
+    @staticmethod
+    def _surface_bytes(surf):
+        return surf.get_width() * surf.get_height() * surf.get_bytesize()
+
+    def clear(self):
+        self._chunks.clear()
+        self._bytes = 0
+
+    def invalidate_world_rects(self, rects, pad_px=0):
+        """Drop every cached chunk overlapping one of the world ``rects``.
+
+        ``pad_px`` widens each chunk by that many of its own pixels, for
+        strokes whose minimum width is fixed in screen space.
+        """
+        if not rects or not self._chunks:
+            return 0
+        stale = []
+        for key in self._chunks:
+            x0, y0, x1, y1 = self.chunk_world_rect(*key)
+            pad = pad_px / self.level_zoom(key[0])
+            x0, y0, x1, y1 = x0 - pad, y0 - pad, x1 + pad, y1 + pad
+            for rx0, ry0, rx1, ry1 in rects:
+                if rx0 < x1 and rx1 > x0 and ry0 < y1 and ry1 > y0:
+                    stale.append(key)
+                    break
+        for key in stale:
+            self._bytes -= self._surface_bytes(self._chunks.pop(key))
+        return len(stale)
+
+    # ── Compositing ─────────────────────────────────────────────────
+
+    def compose(self, target, dest_rect, camera_x, camera_y, zoom, render_chunk):
+        """Paint the camera's view into ``dest_rect`` of ``target``.
+
+        At a level's exact zoom the chunks are blitted directly; in between
+        levels they are stitched onto a scratch canvas and the visible crop
+        is scaled once, so chunk seams never open up.
+        """
+        level = self.level_for(zoom)
+        level_zoom = self.level_zoom(level)
+        scale = zoom / level_zoom
+        c = self.chunk_px
+        # Viewport expressed in level pixels.
+        lx0 = camera_x * level_zoom
+        ly0 = camera_y * level_zoom
+        lw = dest_rect.w / scale
+        lh = dest_rect.h / scale
+        ix0, ix1 = math.floor(lx0 / c), math.floor((lx0 + lw) / c)
+        iy0, iy1 = math.floor(ly0 / c), math.floor((ly0 + lh) / c)
+
+        if abs(scale - 1.0) < 1e-6:
+            for iy in range(iy0, iy1 + 1):
+                for ix in range(ix0, ix1 + 1):
+                    surf = self.chunk(level, ix, iy, render_chunk)
+                    target.blit(surf, (dest_rect.x + round(ix * c - lx0),
+                                       dest_rect.y + round(iy * c - ly0)))
+            return
+
+        cw, ch = (ix1 - ix0 + 1) * c, (iy1 - iy0 + 1) * c
+        canvas = self._canvas
+        if canvas is None or canvas.get_width() < cw or canvas.get_height() < ch:
+            canvas = self._canvas = pygame.Surface(
+                (max(cw, canvas.get_width() if canvas else 0),
+                 max(ch, canvas.get_height() if canvas else 0)),
+                pygame.SRCALPHA)
+        canvas.fill((0, 0, 0, 0))
+        for iy in range(iy0, iy1 + 1):
+            for ix in range(ix0, ix1 + 1):
+                surf = self.chunk(level, ix, iy, render_chunk)
+                # Chunks never overlap on the cleared canvas: MAX copies the
+                # pixels verbatim instead of re-blending translucent edges.
+                canvas.blit(surf, ((ix - ix0) * c, (iy - iy0) * c),
+                            special_flags=pygame.BLEND_RGBA_MAX)
+        crop = pygame.Rect(
+            math.floor(lx0 - ix0 * c), math.floor(ly0 - iy0 * c),
+            math.ceil(lw) + 1, math.ceil(lh) + 1,
+        ).clip(pygame.Rect(0, 0, cw, ch))
+        if crop.w <= 0 or crop.h <= 0:
+            return
+        scaled = pygame.transform.scale(
+            canvas.subsurface(crop),
+            (max(1, round(crop.w * scale)), max(1, round(crop.h * scale))))
+        target.blit(scaled, (
+            dest_rect.x + round((ix0 * c + crop.x - lx0) * scale),
+            dest_rect.y + round((iy0 * c + crop.y - ly0) * scale),
+        ))
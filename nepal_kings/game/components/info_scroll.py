@@ -4,6 +4,7 @@ import pygame
 from typing import List, Dict, Any
 
 from config import settings
+from utils import assets
 
 
 class InfoScroll:
@@ -49,8 +50,7 @@ class InfoScroll:
 
     def _load_scaled_image(self, path, width, height):
         """Load and scale an image."""
-        image = pygame.image.load(path).convert_alpha()
-        return pygame.transform.smoothscale(image, (int(width), int(height)))
+        return assets.get_scaled(path, (int(width), int(height)))
 
     def _preload_icons(self):
         """Preload and preprocess icons from the data."""
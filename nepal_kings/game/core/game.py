@@ -8,6 +8,15 @@ from config import settings
 from game.components.cards.card import Card
 from utils.msg_service import fetch_log_entries, add_log_entry, fetch_chat_messages, send_chat_message
 from utils.figure_service import fetch_figures
+from utils.game_delta import (
+    append_new_rows,
+    apply_game_delta,
+    delta_poll_params,
+    is_delta_base,
+    log_chat_cursors,
+    max_row_id,
+    resolve_game_snapshot,
+)
 from game.components.figures.figure import Figure, FigureFamily
 from game.components.figures.skill_display_filters import filter_figure_for_display
 from typing import List, Dict
@@ -101,6 +110,8 @@ class Game:
         self.cached_figures_data = {}   # {player_id: [figure_dicts]} populated by background poller
         self._figures_data_version = 0  # Bumped when cached_figures_data changes
         self._game_data_version = 0     # Bumped when game dict (cards, state, etc.) changes
+        # Last complete server snapshot; delta polls are merged onto it.
+        self._server_game_dict = game_dict if is_delta_base(game_dict) else None
 
         self.player_id = None
         self.opponent_name = None
@@ -332,38 +343,65 @@ class Game:
     # ── Network fetch (thread-safe, no mutations) ──────────────
 
     @staticmethod
-    def fetch_server_data(game_id):
+    def fetch_server_data(game_id, base_game=None, cursors=None):
         """Fetch game state + logs + chats from the server.
 
         This method is safe to call from a background thread because it
         does not mutate any Game instance — it only returns raw dicts.
-        Returns ``None`` on failure.
+        One ``get_game_snapshot`` request carries everything; servers
+        without that endpoint get the per-resource fan-out instead.
+        With *base_game* (the last applied snapshot, see ``delta_base``) the
+        server is asked for a delta only, and *cursors* (see
+        ``poll_cursors``) limit logs and chats to entries the game lacks.
+        Returns ``None`` on failure or when unchanged.
         """
+        try:
+            resp = requests.get(
+                f'{settings.SERVER_URL}/games/get_game_snapshot',
+                params={**delta_poll_params(game_id, base_game), **(cursors or {})},
+                timeout=10,
+            )
+            if resp.status_code == 404:
+                return Game._fetch_server_data_fanout(game_id, base_game, cursors)
+            if resp.status_code != 200:
+                logger.error("Failed to fetch game snapshot")
+                return None
+            return resolve_game_snapshot(base_game, resp.json())
+        except Exception as e:
+            logger.error(f"BG fetch error: {e}")
+            return None
+
+    @staticmethod
+    def _fetch_server_data_fanout(game_id, base_game=None, cursors=None):
+        """Legacy ``fetch_server_data``: one request per resource."""
         try:
             resp = requests.get(
                 f'{settings.SERVER_URL}/games/get_game',
-                params={'game_id': game_id},
+                params=delta_poll_params(game_id, base_game),
                 timeout=10,
             )
             if resp.status_code != 200:
                 logger.error("Failed to fetch game")
                 return None
 
-            game_dict = resp.json().get('game')
+            game_dict = apply_game_delta(base_game, resp.json())
             if not game_dict:
-                logger.debug("Game data not found in response")
+                logger.debug("Game unchanged or not found in response")
                 return None
 
+            cursors = cursors or {}
             logs = []
             chats = []
             active_spells = []
             figures_by_player = {}
             try:
-                logs = fetch_log_entries(game_id)
+                logs = fetch_log_entries(
+                    game_id, after_id=cursors.get('logs_after_id'))
             except Exception as e:
                 logger.error(f"BG: Failed to fetch log entries: {e}")
             try:
-                chats = fetch_chat_messages(game_id)
+                chats = fetch_chat_messages(
+                    game_id, after_id=cursors.get('chats_after_id'))
             except Exception as e:
                 logger.error(f"BG: Failed to fetch chat messages: {e}")
             try:
@@ -386,6 +424,11 @@ class Game:
                 'chats': chats,
                 'active_spells': active_spells,
                 'figures': figures_by_player,
+                'appended': [
+                    key for key, cursor in (('logs', 'logs_after_id'),
+                                            ('chats', 'chats_after_id'))
+                    if cursor in cursors
+                ],
             }
         except Exception as e:
             logger.error(f"BG fetch error: {e}")
@@ -402,8 +445,15 @@ class Game:
             return
         game_dict = server_data['game']
         self._apply_game_dict(game_dict)
-        self.log_entries = server_data.get('logs', self.log_entries)
-        self.chat_messages = server_data.get('chats', self.chat_messages)
+        appended = server_data.get('appended') or ()
+        if 'logs' in server_data:
+            self.log_entries = (
+                append_new_rows(self.log_entries, server_data['logs'])
+                if 'logs' in appended else server_data['logs'])
+        if 'chats' in server_data:
+            self.chat_messages = (
+                append_new_rows(self.chat_messages, server_data['chats'])
+                if 'chats' in appended else server_data['chats'])
         self.cached_active_spells = server_data.get('active_spells', self.cached_active_spells)
         new_figures = server_data.get('figures', self.cached_figures_data)
         if new_figures != self.cached_figures_data:
@@ -412,10 +462,22 @@ class Game:
 
     def update(self):
         """Update game state from the server (blocking / legacy path)."""
-        data = self.fetch_server_data(self.game_id)
+        data = self.fetch_server_data(*self.poll_args())
         if data:
             self.apply_server_data(data)
 
+    def delta_base(self):
+        """Return the last complete server snapshot for delta polling."""
+        return getattr(self, '_server_game_dict', None)
+
+    def poll_cursors(self):
+        """Return the log/chat cursors for the entries this game holds."""
+        return log_chat_cursors(self.log_entries, self.chat_messages)
+
+    def poll_args(self):
+        """Return the ``fetch_server_data`` arguments for the next poll."""
+        return (self.game_id, self.delta_base(), self.poll_cursors())
+
     # ── Action lock helpers ────────────────────────────────────
 
     def lock_actions(self):
@@ -436,6 +498,13 @@ class Game:
                 logger.info(f"[ACTION_LOCK] Timeout after {elapsed}ms — force-unlocking")
                 self.unlock_actions()
 
+    def _remember_server_game_dict(self, game_dict):
+        """Keep *game_dict* as the delta base when it is a full snapshot."""
+        if is_delta_base(game_dict):
+            self._server_game_dict = game_dict
+        elif game_dict.get('id') != getattr(self, 'game_id', None):
+            self._server_game_dict = None
+
     def _clear_conquer_advance_dependent_flags(self):
         """Clear local latches that are only valid while an advance exists."""
         if getattr(self, 'mode', None) != 'conquer':
@@ -494,6 +563,7 @@ class Game:
     def _apply_game_dict(self, game_dict):
         """Apply a game dict to this instance (main-thread only)."""
         self._game_data_version += 1
+        self._remember_server_game_dict(game_dict)
         # Fresh server state arrived — unlock actions
         self.unlock_actions()
         self.game_id = game_dict['id']
@@ -1031,6 +1101,7 @@ class Game:
     def update_from_dict(self, game_dict):
         """Update game state directly from a dictionary (e.g., from spell service response)."""
         self._game_data_version += 1
+        self._remember_server_game_dict(game_dict)
         # Fresh server state arrived — unlock actions
         self.unlock_actions()
         # Update game data
@@ -1937,9 +2008,13 @@ class Game:
 
 
     def update_logs(self):
-        """Fetch and update log entries."""
+        """Fetch new log entries and append them."""
         try:
-            self.log_entries = fetch_log_entries(self.game_id)
+            after_id = max_row_id(self.log_entries)
+            new_entries = fetch_log_entries(self.game_id, after_id=after_id)
+            self.log_entries = (
+                new_entries if after_id is None
+                else append_new_rows(self.log_entries, new_entries))
         except Exception as e:
             logger.error(f"Failed to fetch log entries: {str(e)}")
 
@@ -1952,9 +2027,13 @@ class Game:
             logger.error(f"Failed to add log entry: {str(e)}")
 
     def update_chats(self):
-        """Fetch and update chat messages."""
+        """Fetch new chat messages and append them."""
         try:
-            self.chat_messages = fetch_chat_messages(self.game_id)
+            after_id = max_row_id(self.chat_messages)
+            new_messages = fetch_chat_messages(self.game_id, after_id=after_id)
+            self.chat_messages = (
+                new_messages if after_id is None
+                else append_new_rows(self.chat_messages, new_messages))
         except Exception as e:
             logger.error(f"Failed to fetch chat messages: {str(e)}")
 
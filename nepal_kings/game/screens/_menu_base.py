@@ -21,6 +21,7 @@ from utils import onboarding_service
 
 
 _MENU_COACH_STEP_UNSET = object()
+_FLOATER_MAX_STEP_MS = 100
 
 
 # ═══════════════════════════════════════════════════════════════════
@@ -484,7 +485,8 @@ class MenuScreenMixin:
         now = pygame.time.get_ticks()
         last_tick = getattr(self, '_gold_floaters_last_tick', now)
         self._gold_floaters_last_tick = now
-        layer.update(max(0, now - last_tick))
+        # Frames skipped while idle must not age a floater spawned this frame.
+        layer.update(min(_FLOATER_MAX_STEP_MS, max(0, now - last_tick)))
         layer.draw(self.window)
 
     def _spawn_onboarding_reward_floaters(self, reward, start_pos):
@@ -528,9 +530,28 @@ class MenuScreenMixin:
         now = pygame.time.get_ticks()
         last_tick = getattr(self, '_onboarding_reward_floaters_last_tick', now)
         self._onboarding_reward_floaters_last_tick = now
-        layer.update(max(0, now - last_tick))
+        layer.update(min(_FLOATER_MAX_STEP_MS, max(0, now - last_tick)))
         layer.draw(self.window)
 
+    def _menu_frame_settled(self):
+        """True when no menu overlay is animating or waiting on a timer.
+
+        Coach panels breathe with the clock and reward dialogues reveal over
+        time, so either keeps the frame live.
+        """
+        return not (
+            self.dialogue_box
+            or getattr(self, '_logout_dialogue', None)
+            or self._onboarding_guide_open
+            or self.state.message_lines
+            or len(self._gold_floaters)
+            or len(self._onboarding_reward_floaters)
+            or getattr(self, '_menu_coach_step', None)
+            or getattr(self, '_welcome_present_dialogue', None)
+            or getattr(self, '_starter_reveal_dialogue', None)
+            or getattr(self, '_tutorial_complete_dialogue', None)
+        )
+
     def _draw_booster_packs(self):
         """No-op — boosters are now drawn inside _draw_gold."""
         pass
@@ -1380,6 +1380,10 @@ class BuildFigureScreen(SubScreen):
             self.window.blit(txt, txt.get_rect(center=rect.center))
             self._collection_tutorial_button_rect = rect
 
+    def frame_damage(self):
+        # Nothing here animates: buttons and the preview change on input.
+        return None if self._overlay_open() else []
+
     def draw(self):
         """Draw the screen, including buttons and background."""
         super().draw()
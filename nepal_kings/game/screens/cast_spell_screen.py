@@ -840,6 +840,10 @@ class CastSpellScreen(SubScreen):
         
         return given_cards, missing_cards
 
+    def frame_damage(self):
+        # Nothing here animates: buttons and the preview change on input.
+        return None if self._overlay_open() else []
+
     def draw(self):
         """Draw the screen, including buttons and background."""
         super().draw()
@@ -9472,6 +9472,11 @@ class ConquerGameScreen(GameScreen):
         self.window.blit(badge, (bx, by))
         self.window.blit(label, (bx + 6, by + 2))
 
+    def frame_damage(self):
+        # Conquer battles run round timers and reveal sequences, and this
+        # screen skips the duel chrome ``GameScreen.frame_damage`` inspects.
+        return None
+
     def render(self):
         with perf_section('conquer.fill'):
             self.window.fill(settings.BACKGROUND_COLOR)
@@ -181,6 +181,10 @@ class GameMenuScreen(MenuScreenMixin, Screen):
             self._current_onboarding_guide_coach_step()
             or self._current_area_coach_step())
 
+    def frame_damage(self):
+        # Buttons change on input; badge poll results wake the loop.
+        return [] if self._menu_frame_settled() else None
+
 
     # ── badge helpers ────────────────────────────────────────────────
 
@@ -705,8 +705,10 @@ class GameScreen(Screen):
             self._consume_game_poll_result()
             if not self._game_poller.busy:
                 self._poller_data_version = self.state.game._game_data_version
+                poll_args = getattr(self.state.game, 'poll_args', None)
                 self._game_poller.poll(
-                    args=(self.state.game.game_id,))
+                    args=(poll_args() if callable(poll_args)
+                          else (self.state.game.game_id,)))
 
         if self._try_handle_finished_conquer_game():
             return
@@ -5317,10 +5319,10 @@ class GameScreen(Screen):
         
         return figure
 
-    def _draw_unread_chat_badge(self):
-        """Draw a red circle with unread message count on the log button."""
+    def _unread_chat_count(self):
+        """Opponent chat messages added since the log was last opened."""
         if not self.state.game or not self.state.game.chat_messages:
-            return
+            return 0
         # Only count opponent messages (not our own)
         current_player_id = self.state.game.player_id
         opponent_messages = [m for m in self.state.game.chat_messages if m.get('sender_id') != current_player_id]
@@ -5335,7 +5337,11 @@ class GameScreen(Screen):
                     break
                 if m.get('sender_id') != current_player_id:
                     seen_opponent += 1
-        unread = total_opponent - seen_opponent
+        return total_opponent - seen_opponent
+
+    def _draw_unread_chat_badge(self):
+        """Draw a red circle with unread message count on the log button."""
+        unread = self._unread_chat_count()
         if unread <= 0 or self.state.subscreen == 'log':
             return
         count_text = str(min(unread, 99))
@@ -6222,6 +6228,37 @@ class GameScreen(Screen):
             self.dialogue_box.draw()
         apply_screen_shake(self.window, self._fx.screen_shake_offset())
 
+    def frame_damage(self):
+        """Skip idle frames while the active subscreen reports none.
+
+        The chrome around the subscreen pulses its badges and turn prompts,
+        and coach marks and effects animate; any of them keeps full frames.
+        Otherwise the subscreen decides (see ``SubScreen.frame_damage``).
+        Game polls wake the loop when their result is consumed.
+        """
+        game = self.state.game
+        if (not game or self.dialogue_box or self.counter_spell_selector
+                or self._gameplay_input_overlay_open()
+                or self._fx.any_active()
+                or self._duel_coach_step
+                or self.waiting_for_counter_response
+                or game.infinite_hammer_active
+                or game.pending_forced_advance
+                or game.advancing_figure_id
+                or game.waiting_for_battle_decision
+                or game.pending_battle_ready
+                or self._field_unseen_count > 0
+                or self._battle_unseen_count > 0
+                or self._unread_chat_count() > 0
+                # Tab-switch veil and battle-unlock pulse start in render().
+                or self.state.subscreen != getattr(self, '_last_rendered_subscreen', None)
+                or pygame.time.get_ticks() - getattr(self, '_subscreen_switched_at', 0) < 160
+                or bool(getattr(self.battle_button, 'locked', True))
+                != self._battle_unlock_prev_locked):
+            return None
+        subscreen = self.subscreens.get(self.state.subscreen)
+        return subscreen.frame_damage() if subscreen else None
+
     def draw_msg(self):
         """Disable floating notifications on the game screen."""
         pass
@@ -3,6 +3,7 @@
 import pygame
 from pygame.locals import *
 from config import settings
+from utils import assets
 from game.screens.sub_screen import SubScreen
 
 
@@ -96,9 +97,7 @@ class GuideBookScreen(SubScreen):
         key = (path, size, size)
         if key not in self._image_cache:
             try:
-                img = pygame.image.load(path).convert_alpha()
-                img = pygame.transform.smoothscale(img, (size, size))
-                self._image_cache[key] = img
+                self._image_cache[key] = assets.get_scaled(path, (size, size))
             except Exception:
                 # Fallback: visible red-bordered placeholder
                 surf = pygame.Surface((size, size), pygame.SRCALPHA)
@@ -113,16 +112,14 @@ class GuideBookScreen(SubScreen):
         key = (path, max_width, max_height)
         if key not in self._image_cache:
             try:
-                img = pygame.image.load(path).convert_alpha()
-                w, h = img.get_size()
+                w, h = assets.get(path).get_size()
                 if max_width and w > max_width:
                     scale = max_width / w
                     w, h = int(w * scale), int(h * scale)
                 if max_height and h > max_height:
                     scale = max_height / h
                     w, h = int(w * scale), int(h * scale)
-                img = pygame.transform.smoothscale(img, (w, h))
-                self._image_cache[key] = img
+                self._image_cache[key] = assets.get_scaled(path, (w, h))
             except Exception:
                 surf = pygame.Surface((32, 32), pygame.SRCALPHA)
                 pygame.draw.rect(surf, (200, 60, 60, 180), surf.get_rect(), 2)
@@ -21,6 +21,7 @@ from config import settings
 from utils import http_compat as requests
 from utils import sound
 from utils.background_poller import BackgroundPoller
+from utils.kingdom_map_delta import KingdomMapSync
 import logging
 
 logger = logging.getLogger('nk.screens.kingdom')
@@ -407,8 +408,16 @@ class KingdomScreen(MenuScreenMixin, Screen):
         interactive (the result is applied once the poller returns).
         """
         if self._map_poller is None:
+            # Desktop threads keep static tiles and poll only map changes;
+            # the web async path still takes one full /kingdom/map XHR.
+            self._map_sync = KingdomMapSync(
+                settings.SERVER_URL,
+                requests.get,
+                timeout=(_MAP_CONNECT_TIMEOUT_SECONDS, _MAP_READ_TIMEOUT_SECONDS),
+                fallback=self._fetch_map_data,
+            )
             self._map_poller = BackgroundPoller(
-                self._fetch_map_data,
+                self._map_sync.fetch,
                 async_get_url=f'{settings.SERVER_URL}/kingdom/map',
                 async_transform=self._transform_map_async_response,
             )
@@ -2658,6 +2667,23 @@ class KingdomScreen(MenuScreenMixin, Screen):
 
     # ── Update / events ─────────────────────────────────────────────
 
+    def frame_damage(self):
+        """Only the hex map animates once input has settled.
+
+        Map and activity polls wake the loop when their result is consumed;
+        the map frame itself is cached by ``HexMap``, which reports whether
+        its owner glow, warning badges or tutorial marker moved.
+        """
+        if (not self._menu_frame_settled() or self._loading or self._error
+                or self._detail_box or self._thread or self._new_msg_picker
+                or len(self._floating_text) or self._fx.any_active()
+                or getattr(self, '_kingdom_overview_dialogue', None)
+                or getattr(self, '_kingdom_management_dialogue', None)):
+            return None
+        if self._hex_map is None:
+            return []
+        return self._hex_map.frame_damage()
+
     def update(self, events):
         super().update()
         self._update_icon_buttons()
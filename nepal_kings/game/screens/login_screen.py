@@ -977,6 +977,27 @@ class LoginScreen(Screen):
                 elif self.button_register.collide():
                     self.handle_register()
 
+    def frame_damage(self):
+        """Only the caret blinks once input has settled.
+
+        Web builds type into native inputs without pygame events, so a
+        field whose text or cursor moved still gets a full frame.
+        """
+        if (self.loading or self.dialogue_box or self._legal_doc is not None
+                or self.state.message_lines):
+            return None
+        fields = (self.field_username, self.field_pwd)
+        text = tuple((f.content, f.cursor_pos) for f in fields)
+        if text != getattr(self, '_paced_text', None):
+            self._paced_text = text
+            return None
+        caret_on = pygame.time.get_ticks() % 1000 < 500
+        caret = tuple(f.active and caret_on for f in fields)
+        previous = getattr(self, '_paced_caret', caret)
+        self._paced_caret = caret
+        return [f.rect for f, now, before in zip(fields, caret, previous)
+                if now != before]
+
     def update(self, events):
         super().update()
         # Native HTML inputs sit directly over the visible canvas fields. They
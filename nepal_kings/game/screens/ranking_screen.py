@@ -568,6 +568,11 @@ class RankingScreen(MenuScreenMixin, Screen):
             pygame.draw.rect(thumb_surf, clr, thumb_surf.get_rect(), border_radius=3)
             self.window.blit(thumb_surf, thumb.topleft)
 
+    def frame_damage(self):
+        # Everything on the table moves on input or on a poll result, and
+        # BackgroundPoller wakes the loop when a result is consumed.
+        return [] if self._menu_frame_settled() else None
+
     # ── Update ────────────────────────────────────────────────────
 
     def update(self, events):
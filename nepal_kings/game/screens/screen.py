@@ -153,6 +153,15 @@ class Screen:
 
         return False
 
+    def frame_damage(self):
+        """What the next frame changes, for ``utils.frame_pacer``.
+
+        ``None`` (the default) redraws and flips the whole window, ``[]``
+        skips the frame and a list of rects flips only those.  Only asked
+        once input has settled; override on screens that stop animating.
+        """
+        return None
+
     def render(self):
         """Render buttons, messages, and the dialogue box."""
         self.draw_msg()
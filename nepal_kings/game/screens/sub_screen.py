@@ -293,17 +293,21 @@ class SubScreen:
             scroll_height=scroll_height, scroll_rect=scroll_rect
         )
 
+    def _overlay_open(self):
+        """True while a dialogue or detail box covers this subscreen."""
+        return any(getattr(self, name, None) for name in (
+            'dialogue_box',
+            'figure_detail_box',
+            'battle_move_detail_box',
+            '_figure_detail_box',
+            '_move_detail_box'))
+
     def handle_events(self, events):
         """Handle events like mouse clicks and quit."""
         # Derived subscreens own the response semantics for their overlays,
         # but the shared scroll/close controls sit underneath them.  Do not
         # let the same pointer event reach those covered controls first.
-        if any(getattr(self, name, None) for name in (
-                'dialogue_box',
-                'figure_detail_box',
-                'battle_move_detail_box',
-                '_figure_detail_box',
-                '_move_detail_box')):
+        if self._overlay_open():
             return
         if self.scroll_text_list_shifter:
             self.scroll_text_list_shifter.handle_events(events)
@@ -360,6 +364,14 @@ class SubScreen:
         txt = self._close_font.render('\u00d7', True, txt_clr)
         self.window.blit(txt, txt.get_rect(center=r.center))
 
+    def frame_damage(self):
+        """What the next frame changes here, asked by ``GameScreen.frame_damage``.
+
+        ``None`` redraws the whole window.  Override on subscreens whose
+        ``draw()`` only changes on input or new game state.
+        """
+        return None
+
     def draw_on_top(self):
 
         if self.dialogue_box:
@@ -372,12 +384,7 @@ class SubScreen:
     def update(self, game):
         """Update control buttons and game/menu buttons."""
         self.game = game
-        if any(getattr(self, name, None) for name in (
-                'dialogue_box',
-                'figure_detail_box',
-                'battle_move_detail_box',
-                '_figure_detail_box',
-                '_move_detail_box')):
+        if self._overlay_open():
             return
         for button in self.buttons:
             button.update()
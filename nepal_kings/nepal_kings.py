@@ -5,6 +5,8 @@ import pygame
 import copy
 import sys as _sys
 from types import SimpleNamespace
+# Imported before the screens so --profile-startup counts their import cost.
+from utils.startup_profile import StartupProfiler
 #from pygame.locals import *
 from game.screens.login_screen import LoginScreen
 from game.screens.game_menu_screen import GameMenuScreen
@@ -24,6 +26,9 @@ from game.core.state import State
 from game.core.input_state import process_events as _process_input
 from config import settings
 from utils.perf_monitor import PerfMonitor
+from utils.frame_pacer import FramePacer, frame_kind, request_redraw
+from utils import screen_prefetch
+from utils import assets
 from utils import web_wheel as _web_wheel
 import os
 #import sys
@@ -35,6 +40,11 @@ class Client:
         self.clock = pygame.time.Clock()
         self.running = True
         self.perf = PerfMonitor()
+        self.pacer = FramePacer()
+        self.perf.add_counter_source('assets', assets.stats)
+        self.startup = StartupProfiler()
+        self.prefetch_enabled = screen_prefetch.prefetch_enabled()
+        self._screen_requested_ms = None
 
         self.state = State()
 
@@ -143,22 +153,21 @@ class Client:
         self._web_embed = _web_embed
         self._web_loader_ready_notified = _web_embed is None
 
+        self.screens = {}
+        self._screen_factories = {}
         if os.environ.get('NK_PERF_FIXTURE') == 'conquer_battle':
             self._init_perf_conquer_fixture(draw_progress)
             return
 
-        self.screens = {}
-        self._screen_factories = {}
         self._draw_loading_progress = draw_progress
-        lazy_screen_keys = set()
-        if _sys.platform == 'emscripten':
-            # The browser runtime is far slower at bulk image decode/scale work
-            # than desktop Python. Keep first paint/login light and build each
-            # app screen only when the player navigates there.
-            lazy_screen_keys.update(
-                key for key, *_rest in screen_steps
-                if key != 'login'
-            )
+        # Keep first paint light on every platform: only the login screen is
+        # built up front.  The others are built when the player navigates
+        # there, or earlier while the current screen is idle (see
+        # utils.screen_prefetch).
+        lazy_screen_keys = {
+            key for key, *_rest in screen_steps
+            if key != 'login'
+        }
 
         startup_steps = [
             step for step in screen_steps
@@ -173,6 +182,7 @@ class Client:
             frac_start = weight_done / total_weight
             frac_end = (weight_done + weight) / total_weight
             draw_progress(frac_start, label)
+            built_at = self.startup.now_ms()
 
             # For heavy screens, pass a sub-progress callback
             if weight > 1:
@@ -182,11 +192,14 @@ class Client:
                 self.screens[key] = cls(self.state, progress_callback=_sub_progress)
             else:
                 self.screens[key] = cls(self.state)
+            self.startup.screen_built(
+                key, self.startup.now_ms() - built_at, 'startup')
 
             weight_done += weight
             draw_progress(frac_end, label)
 
         draw_progress(1.0, 'Ready')
+        self.startup.boot_done()
 
     def _notify_web_loader_ready(self):
         if self._web_loader_ready_notified:
@@ -198,11 +211,25 @@ class Client:
             return
         self._web_loader_ready_notified = True
 
-    def _create_screen(self, key):
+    def _create_screen(self, key, *, prefetch=False):
+        """Build a lazily registered screen.
+
+        A navigation build shows the loading bar.  A ``prefetch`` build
+        draws nothing and restores any ``State`` attribute the constructor
+        overwrote, so the screen the player is looking at is undisturbed.
+        """
         spec = self._screen_factories.get(key)
         if not spec:
             return None
         label, cls, weight = spec
+        started = self.startup.now_ms()
+        if prefetch:
+            with screen_prefetch.preserved_state(self.state):
+                screen = cls(self.state)
+            self.screens[key] = screen
+            self.startup.screen_built(
+                key, self.startup.now_ms() - started, 'prefetch')
+            return screen
         draw_progress = getattr(self, '_draw_loading_progress', None)
         if draw_progress:
             draw_progress(0.0, label)
@@ -214,10 +241,33 @@ class Client:
         else:
             screen = cls(self.state)
         self.screens[key] = screen
+        self.startup.screen_built(
+            key, self.startup.now_ms() - started, 'navigate')
         if draw_progress:
             draw_progress(1.0, 'Ready')
         return screen
 
+    def _prefetch_next(self, current):
+        """Build one likely-next screen of ``current``; return its key or None."""
+        key = screen_prefetch.next_prefetch(
+            current, self.screens, self._screen_factories)
+        if key is None:
+            return None
+        self._create_screen(key, prefetch=True)
+        return key
+
+    def _prefetch_if_idle(self, current):
+        """Prefetch at most once per settled period of the current screen.
+
+        A build can take a few hundred milliseconds, so afterwards the loop
+        is woken like after input: the next frame is redrawn in full and
+        another prefetch waits until the screen has settled again.
+        """
+        if not self.prefetch_enabled or not self.pacer.settled():
+            return
+        if self._prefetch_next(current) is not None:
+            request_redraw()
+
     def _init_perf_conquer_fixture(self, draw_progress):
         draw_progress(0.05, 'Loading active conquer fixture ...')
         player_figures = []
@@ -414,18 +464,31 @@ class Client:
             pass
         if hasattr(scr, 'on_enter'):
             scr.on_enter()
+        self.pacer.reset()
+        requested_ms = self._screen_requested_ms
+        if requested_ms is None:
+            requested_ms = self.startup.now_ms()
+        self._screen_requested_ms = None
+        presented = False
         while self.state.screen == screen:
             if not self.perf.enabled:
                 events = self.get_events()
 
                 self.screens[screen].handle_events(events)
                 self.screens[screen].update(events)
-                self.screens[screen].render()
+                damage = self.pacer.plan(self.screens[screen], events)
+                if damage is None or damage:
+                    self.screens[screen].render()
 
                 self.state.update()
-                pygame.display.update()
+                self._update_display(damage)
                 self._notify_web_loader_ready()
-                self.clock.tick(60)
+                if not presented:
+                    presented = True
+                    self.startup.screen_presented(screen, requested_ms)
+                if self.state.screen == screen:
+                    self._prefetch_if_idle(screen)
+                self.clock.tick(self.pacer.fps())
                 await asyncio.sleep(0)
                 continue
 
@@ -436,17 +499,33 @@ class Client:
                 self.screens[screen].handle_events(events)
             with self.perf.section('update'):
                 self.screens[screen].update(events)
-            with self.perf.section('render'):
-                self.screens[screen].render()
+            damage = self.pacer.plan(self.screens[screen], events)
+            if damage is None or damage:
+                with self.perf.section('render'):
+                    self.screens[screen].render()
             with self.perf.section('state_update'):
                 self.state.update()
             with self.perf.section('display_update'):
-                pygame.display.update()
+                self._update_display(damage)
             self._notify_web_loader_ready()
-            self.perf.frame_end()
-            self.clock.tick(60)
+            self.perf.frame_end(frame_kind(damage))
+            if not presented:
+                presented = True
+                self.startup.screen_presented(screen, requested_ms)
+            if self.state.screen == screen:
+                with self.perf.section('prefetch'):
+                    self._prefetch_if_idle(screen)
+            self.clock.tick(self.pacer.fps())
             await asyncio.sleep(0)
 
+    @staticmethod
+    def _update_display(damage):
+        """Flip the window, only the damaged rects, or nothing at all."""
+        if damage is None:
+            pygame.display.update()
+        elif damage:
+            pygame.display.update(damage)
+
     def _perf_context(self, scr):
         if not self.perf.enabled:
             return None
@@ -472,6 +551,7 @@ class Client:
                 self._restart_game()
                 return
             elif self.state.screen in self.screens or self.state.screen in self._screen_factories:
+                self._screen_requested_ms = self.startup.now_ms()
                 if self.state.screen not in self.screens:
                     self._create_screen(self.state.screen)
                 await self.run_screen(self.state.screen)
@@ -0,0 +1,155 @@
+# Copyright (c) 2026 Marc Stieffenhofer. All rights reserved.
+# See LICENSE file in the project root for full license information.
+"""Shared image decode and scale cache for the client.
+
+Components used to decode the same PNGs in per-class dicts and
+``smoothscale`` them again for every instance.  This module decodes each
+path once and keeps scaled variants in a least-recently-used cache bounded
+by pixel bytes::
+
+    from utils import assets
+    icon = assets.get_scaled('img/figures/state_icons/charge_opponent.png', (24, 24))
+
+Returned surfaces are shared between callers: ``copy()`` one before
+drawing on it.  Hit, miss and byte counters are published through
+``PerfMonitor`` as the ``assets`` counter source.
+"""
+
+import time
+from collections import OrderedDict
+
+import pygame
+
+# Scaled variants are cheap to rebuild from the decoded source, so they are
+# the part that is evicted.  Decoded sources are kept for the session.
+SCALED_BUDGET_BYTES = 48 * 1024 * 1024
+
+
+def surface_bytes(surface):
+    return surface.get_width() * surface.get_height() * surface.get_bytesize()
+
+
+def _fit(size, max_dim):
+    w, h = size
+    if not max_dim or (w <= max_dim and h <= max_dim):
+        return size
+    ratio = min(max_dim / w, max_dim / h)
+    return max(1, int(w * ratio)), max(1, int(h * ratio))
+
+
+class AssetManager:
+    """Decoded sources plus a byte-budgeted LRU of scaled variants."""
+
+    def __init__(self, scaled_budget_bytes=SCALED_BUDGET_BYTES):
+        self.scaled_budget_bytes = int(scaled_budget_bytes)
+        self._sources = {}
+        self._scaled = OrderedDict()
+        self.clear()
+
+    def clear(self):
+        """Drop every cached surface and reset the counters."""
+        self._sources.clear()
+        self._scaled.clear()
+        self.source_bytes = 0
+        self.scaled_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.scaled_hits = 0
+        self.scaled_misses = 0
+        self.evictions = 0
+        self.decode_ms = 0.0
+        self.scale_ms = 0.0
+
+    def get(self, path, alpha=True, max_dim=None):
+        """Decoded surface for ``path``.
+
+        With a display mode set the surface is converted for fast blits
+        (``convert_alpha`` or, with ``alpha=False``, ``convert``).
+        ``max_dim`` caps the longer side at decode time; only the capped
+        surface is kept.  Load errors propagate to the caller.
+        """
+        key = (path, bool(alpha), max_dim)
+        surface = self._sources.get(key)
+        if surface is not None:
+            self.hits += 1
+            return surface
+        self.misses += 1
+        started = time.perf_counter()
+        surface = pygame.image.load(path)
+        if pygame.display.get_surface() is not None:
+            surface = surface.convert_alpha() if alpha else surface.convert()
+        capped = _fit(surface.get_size(), max_dim)
+        if capped != surface.get_size():
+            surface = pygame.transform.smoothscale(surface, capped)
+        self.decode_ms += (time.perf_counter() - started) * 1000.0
+        self._sources[key] = surface
+        self.source_bytes += surface_bytes(surface)
+        return surface
+
+    def get_scaled(self, path, size, alpha=True, smooth=True):
+        """``get(path)`` scaled to ``size``; ``smooth=False`` uses ``scale``."""
+        size = (max(1, int(size[0])), max(1, int(size[1])))
+        key = (path, size, bool(alpha), bool(smooth))
+        surface = self._scaled.get(key)
+        if surface is not None:
+            self._scaled.move_to_end(key)
+            self.scaled_hits += 1
+            return surface
+        self.scaled_misses += 1
+        source = self.get(path, alpha)
+        if source.get_size() == size:
+            return source
+        started = time.perf_counter()
+        scale = pygame.transform.smoothscale if smooth else pygame.transform.scale
+        surface = scale(source, size)
+        self.scale_ms += (time.perf_counter() - started) * 1000.0
+        self._scaled[key] = surface
+        self.scaled_bytes += surface_bytes(surface)
+        self._evict()
+        return surface
+
+    def _evict(self):
+        # The newest entry always survives, even when it alone is over budget.
+        while self.scaled_bytes > self.scaled_budget_bytes and len(self._scaled) > 1:
+            _key, surface = self._scaled.popitem(last=False)
+            self.scaled_bytes -= surface_bytes(surface)
+            self.evictions += 1
+
+    def stats(self):
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'scaled_hits': self.scaled_hits,
+            'scaled_misses': self.scaled_misses,
+            'evictions': self.evictions,
+            'sources': len(self._sources),
+            'source_bytes': self.source_bytes,
+            'scaled': len(self._scaled),
+            'scaled_bytes': self.scaled_bytes,
+            'scaled_budget_bytes': self.scaled_budget_bytes,
+            'decode_ms': round(self.decode_ms, 3),
+            'scale_ms': round(self.scale_ms, 3),
+        }
+
+
+_manager = AssetManager()
+
+
+def manager():
+    return _manager
+
+
+def get(path, alpha=True, max_dim=None):
+    return _manager.get(path, alpha=alpha, max_dim=max_dim)
+
+
+def get_scaled(path, size, alpha=True, smooth=True):
+    return _manager.get_scaled(path, size, alpha=alpha, smooth=smooth)
+
+
+def stats():
+    return _manager.stats()
+
+
+def clear():
+    _manager.clear()
@@ -19,6 +19,13 @@ import threading
 import logging
 import time as _time
 
+from utils.frame_pacer import request_redraw
+from utils.game_delta import (
+    apply_game_delta,
+    delta_poll_params,
+    resolve_game_snapshot,
+)
+
 logger = logging.getLogger('nk.utils.poller')
 
 
@@ -108,6 +115,8 @@ class BackgroundPoller:
     @property
     def result(self):
         """Return the latest result and clear the *has_result* flag."""
+        # The caller is about to apply new data: render it even when idle.
+        request_redraw()
         with self._lock:
             self._has_result = False
             return self._result
@@ -272,7 +281,7 @@ class BackgroundPoller:
                 self._busy = False
 
     def _start_async_poll(self, args, _kwargs):
-        """Fire all GET requests in parallel using async XHR."""
+        """Fire the combined game-snapshot request using async XHR."""
         from utils.http_compat import start_async_get
         from config import settings
 
@@ -282,12 +291,37 @@ class BackgroundPoller:
             self._run(args, _kwargs)
             return
 
-        base = settings.SERVER_URL
+        self._delta_base = args[1] if len(args) > 1 else None
+        self._poll_cursors = (args[2] if len(args) > 2 else None) or {}
         self._reset_async_check_timer()
         self._pending_rids = {
-            'game': start_async_get(f'{base}/games/get_game', {'game_id': game_id}),
-            'logs': start_async_get(f'{base}/msg/get_log_entries', {'game_id': game_id}),
-            'chats': start_async_get(f'{base}/msg/get_chat_messages', {'game_id': game_id}),
+            'snapshot': start_async_get(
+                f'{settings.SERVER_URL}/games/get_game_snapshot',
+                {**delta_poll_params(game_id, self._delta_base),
+                 **self._poll_cursors}),
+        }
+        self._pending_game_id = game_id
+        self._async_responses: dict = {}
+        self._phase = 0  # phase 0 = snapshot; 1/2 = legacy fan-out
+
+    def _start_async_fanout(self, game_id):
+        """Fire the per-resource GETs for servers without the snapshot."""
+        from utils.http_compat import start_async_get
+        from config import settings
+
+        base = settings.SERVER_URL
+        cursors = getattr(self, '_poll_cursors', None) or {}
+        log_params = {'game_id': game_id}
+        if 'logs_after_id' in cursors:
+            log_params['after_id'] = cursors['logs_after_id']
+        chat_params = {'game_id': game_id}
+        if 'chats_after_id' in cursors:
+            chat_params['after_id'] = cursors['chats_after_id']
+        self._pending_rids = {
+            'game': start_async_get(f'{base}/games/get_game',
+                                    delta_poll_params(game_id, self._delta_base)),
+            'logs': start_async_get(f'{base}/msg/get_log_entries', log_params),
+            'chats': start_async_get(f'{base}/msg/get_chat_messages', chat_params),
             'spells': start_async_get(f'{base}/spells/get_active_spells', {'game_id': game_id}),
         }
         self._pending_game_id = game_id
@@ -316,11 +350,18 @@ class BackgroundPoller:
             self._pending_rids = still_pending
             return
 
-        if self._phase == 1:
+        if self._phase == 0:
+            snapshot_resp = self._async_responses.get('snapshot')
+            if snapshot_resp is not None and snapshot_resp.status_code == 404:
+                self._start_async_fanout(self._pending_game_id)
+                return
+            self._pending_rids = None
+            self._finish_async()
+        elif self._phase == 1:
             # Phase 1 done — fire figure requests for each player
             game_resp = self._async_responses.get('game')
             if game_resp and game_resp.status_code == 200:
-                game_dict = game_resp.json().get('game')
+                game_dict = apply_game_delta(self._delta_base, game_resp.json())
                 if game_dict:
                     base = settings.SERVER_URL
                     fig_rids = {}
@@ -359,6 +400,9 @@ class BackgroundPoller:
         """Build the dict that ``Game.apply_server_data`` expects."""
         r = self._async_responses
 
+        if 'snapshot' in r:
+            return self._assemble_snapshot_data(r['snapshot'])
+
         game_resp = r.get('game')
         if not game_resp or game_resp.status_code != 200:
             return None
@@ -380,8 +424,11 @@ class BackgroundPoller:
             self._async_responses = {}
             return None
 
-        game_dict = game_resp.json().get('game')
+        # Unchanged delta polls resolve to None: nothing to apply.
+        game_dict = apply_game_delta(
+            getattr(self, '_delta_base', None), game_resp.json())
         if not game_dict:
+            self._async_responses = {}
             return None
         # Record the signature only once a usable result is being delivered;
         # a malformed/empty game payload must not suppress future deliveries.
@@ -407,6 +454,7 @@ class BackgroundPoller:
             else:
                 figures_by_player[pid] = []
 
+        cursors = getattr(self, '_poll_cursors', None) or {}
         self._async_responses = {}
         return {
             'game': game_dict,
@@ -414,4 +462,23 @@ class BackgroundPoller:
             'chats': chats,
             'active_spells': active_spells,
             'figures': figures_by_player,
+            'appended': [
+                key for key, cursor in (('logs', 'logs_after_id'),
+                                        ('chats', 'chats_after_id'))
+                if cursor in cursors
+            ],
         }
+
+    def _assemble_snapshot_data(self, snapshot_resp):
+        """Build ``apply_server_data`` input from a ``get_game_snapshot`` reply."""
+        self._async_responses = {}
+        if not snapshot_resp or snapshot_resp.status_code != 200:
+            return None
+        sig = getattr(snapshot_resp, 'text', None) or None
+        if sig is not None and sig == getattr(self, '_prev_response_sig', None):
+            return None
+        result = resolve_game_snapshot(
+            getattr(self, '_delta_base', None), snapshot_resp.json())
+        if result and sig is not None:
+            self._prev_response_sig = sig
+        return result
@@ -0,0 +1,95 @@
+# Copyright (c) 2026 Marc Stieffenhofer. All rights reserved.
+# See LICENSE file in the project root for full license information.
+"""Idle throttling and partial display updates for the main loop.
+
+A screen describes what its next frame changes through an optional
+``frame_damage()`` method:
+
+* ``None`` – unknown: render and flip the whole window (the default when
+  the method is missing);
+* ``[]`` – unchanged: skip ``render()`` and the flip;
+* a list of rects – render, then ``pygame.display.update(rects)``.
+
+Reports are only requested once input has settled.  Any event, or a
+``request_redraw()`` call (a poller delivering new data, say), forces full
+frames at ``ACTIVE_FPS`` for ``SETTLE_MS``.  The first report after a full
+frame is also promoted to a full frame, so state that changed after the last
+``render()`` (an expiring status message) always reaches the window.  While
+a screen reports unchanged frames the loop ticks at ``IDLE_FPS``.
+
+Set ``NK_FRAME_PACING=0`` to always render full frames at ``ACTIVE_FPS``.
+"""
+
+import os
+
+import pygame
+
+ACTIVE_FPS = 60
+IDLE_FPS = 10
+SETTLE_MS = 750
+
+_redraw_requested = False
+
+
+def pacing_enabled():
+    return os.environ.get('NK_FRAME_PACING') != '0'
+
+
+def request_redraw():
+    """Wake the loop: the next frames are rendered in full at ``ACTIVE_FPS``."""
+    global _redraw_requested
+    _redraw_requested = True
+
+
+class FramePacer:
+    """Decides per frame whether to render, and which region to flip."""
+
+    def __init__(self, *, enabled=None):
+        self.enabled = pacing_enabled() if enabled is None else bool(enabled)
+        self.idle = False
+        self.last_activity_ms = 0
+        self._last_full = True
+
+    def reset(self, now_ms=None):
+        """Start a new screen: full frames until input settles again."""
+        global _redraw_requested
+        _redraw_requested = False
+        self.idle = False
+        self._last_full = True
+        self.last_activity_ms = pygame.time.get_ticks() if now_ms is None else now_ms
+
+    def plan(self, screen, events, now_ms=None):
+        """Return the damage for this frame: ``None``, ``[]`` or rects."""
+        global _redraw_requested
+        now = pygame.time.get_ticks() if now_ms is None else now_ms
+        if events or _redraw_requested:
+            _redraw_requested = False
+            self.last_activity_ms = now
+        damage = None
+        if self.enabled and now - self.last_activity_ms >= SETTLE_MS:
+            report = getattr(screen, 'frame_damage', None)
+            if callable(report):
+                damage = report()
+        # Promote the first report after a full frame; the report itself
+        # decides whether the frame after it is trusted.
+        promote = damage is not None and self._last_full
+        self._last_full = damage is None
+        if promote:
+            damage = None
+        self.idle = damage is not None and not damage
+        return damage
+
+    def settled(self, now_ms=None):
+        """True once no input or redraw request arrived for ``SETTLE_MS``."""
+        now = pygame.time.get_ticks() if now_ms is None else now_ms
+        return now - self.last_activity_ms >= SETTLE_MS
+
+    def fps(self):
+        return IDLE_FPS if self.idle else ACTIVE_FPS
+
+
+def frame_kind(damage):
+    """``'full'``, ``'partial'`` or ``'skipped'`` for a planned damage value."""
+    if damage is None:
+        return 'full'
+    return 'partial' if damage else 'skipped'
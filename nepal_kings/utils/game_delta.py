@@ -0,0 +1,182 @@
+# Copyright (c) 2026 Marc Stieffenhofer. All rights reserved.
+# See LICENSE file in the project root for full license information.
+"""Client half of versioned ``/games/get_game`` delta polling.
+
+The server stamps every game snapshot with ``state_version``.  A poll that
+sends the version of the last applied snapshot receives either
+``{'unchanged': True}`` or a delta holding the scalar fields plus only the
+list sections that changed; :func:`apply_game_delta` merges that delta onto
+the previous snapshot so callers always see a complete game dict.  Both
+carry ``presence``, the players' online flags, which change without a
+version bump.
+
+``/games/get_game_snapshot`` wraps the same body together with logs, chats,
+active spells and figures so a poll costs one round trip;
+:func:`resolve_game_snapshot` turns it into ``Game.apply_server_data`` input.
+"""
+
+# Keep in sync with server/game_service/game_state_version.py.
+LIST_SECTIONS = (
+    'players',
+    'main_cards',
+    'side_cards',
+    'battle_moves',
+    'conquer_tactics',
+    'active_spells',
+    'log_entries',
+    'chat_messages',
+)
+
+_DELTA_KEYS = ('delta_since_version', 'omitted_sections', 'appended_sections')
+
+
+def is_delta_base(game_dict):
+    """True when ``game_dict`` is a complete, versioned server snapshot."""
+    return (
+        isinstance(game_dict, dict)
+        and game_dict.get('state_version') is not None
+        and all(section in game_dict for section in LIST_SECTIONS)
+    )
+
+
+def max_row_id(rows):
+    """Largest integer ``id`` among *rows*, or ``None``."""
+    ids = [row.get('id') for row in rows or () if isinstance(row, dict)]
+    ids = [row_id for row_id in ids if isinstance(row_id, int)]
+    return max(ids) if ids else None
+
+
+def append_new_rows(rows, new_rows):
+    """Return *rows* extended by the *new_rows* whose ids it lacks."""
+    seen = {row.get('id') for row in rows or () if isinstance(row, dict)}
+    merged = list(rows or [])
+    for row in new_rows or ():
+        if isinstance(row, dict) and row.get('id') in seen:
+            continue
+        merged.append(row)
+    return merged
+
+
+def log_chat_cursors(log_entries, chat_messages):
+    """Return ``get_game_snapshot`` cursors for the rows a game already holds."""
+    cursors = {}
+    logs_after_id = max_row_id(log_entries)
+    if logs_after_id is not None:
+        cursors['logs_after_id'] = logs_after_id
+    chats_after_id = max_row_id(chat_messages)
+    if chats_after_id is not None:
+        cursors['chats_after_id'] = chats_after_id
+    return cursors
+
+
+def delta_poll_params(game_id, base_game=None):
+    """Return ``get_game`` query params, asking for a delta when possible."""
+    params = {'game_id': game_id}
+    if not is_delta_base(base_game) or base_game.get('id') != game_id:
+        return params
+    params['since_version'] = base_game['state_version']
+    log_after_id = max_row_id(base_game.get('log_entries'))
+    if log_after_id is not None:
+        params['log_after_id'] = log_after_id
+    chat_after_id = max_row_id(base_game.get('chat_messages'))
+    if chat_after_id is not None:
+        params['chat_after_id'] = chat_after_id
+    return params
+
+
+def apply_presence(players, presence):
+    """Return *players* with ``is_online`` taken from a poll's *presence*.
+
+    Returns ``None`` when *presence* changes nothing; the player dicts are
+    copied, never mutated.
+    """
+    if not isinstance(presence, dict) or not players:
+        return None
+    updated = []
+    changed = False
+    for player in players:
+        online = presence.get(str(player.get('id'))) if isinstance(player, dict) else None
+        if online is None or player.get('is_online') == online:
+            updated.append(player)
+            continue
+        updated.append(dict(player, is_online=online))
+        changed = True
+    return updated if changed else None
+
+
+def apply_game_delta(base_game, body):
+    """Resolve a ``get_game`` response body into a full game dict.
+
+    Returns ``None`` when the server reported the game unchanged, with the
+    same presence, or the body carries no usable game.  ``base_game`` is
+    never mutated.
+    """
+    if not isinstance(body, dict):
+        return None
+    if body.get('unchanged'):
+        if not is_delta_base(base_game):
+            return None
+        players = apply_presence(base_game.get('players'), body.get('presence'))
+        return None if players is None else dict(base_game, players=players)
+    game_dict = body.get('game')
+    if not game_dict:
+        return None
+    if not body.get('delta'):
+        return game_dict
+    if not is_delta_base(base_game):
+        # A delta is only requested against a complete base; without one
+        # there is nothing to merge into, so let the next poll fetch afresh.
+        return None
+
+    merged = dict(base_game)
+    merged.update({
+        key: value for key, value in game_dict.items() if key not in _DELTA_KEYS
+    })
+    for section in game_dict.get('appended_sections') or ():
+        merged[section] = list(base_game.get(section) or []) + list(
+            game_dict.get(section) or [])
+    players = apply_presence(merged.get('players'), body.get('presence'))
+    if players is not None:
+        merged['players'] = players
+    return merged
+
+
+_SNAPSHOT_KEYS = ('logs', 'chats', 'active_spells')
+# Snapshot keys that stand in for game sections the snapshot leaves out.
+_HISTORY_SECTIONS = (('logs', 'log_entries'), ('chats', 'chat_messages'))
+
+
+def resolve_game_snapshot(base_game, body):
+    """Resolve a ``get_game_snapshot`` body into ``apply_server_data`` input.
+
+    Keys the server left out (unchanged on a delta poll) are left out here
+    too, so the game keeps its current copies; keys named in ``appended``
+    hold only rows past the poll's cursors.  The snapshot sends logs and
+    chats once, outside ``game``; they are folded back into the game's
+    ``log_entries``/``chat_messages`` so it stays a complete delta base.
+    Returns ``None`` when there is nothing to apply.
+    """
+    game_dict = apply_game_delta(base_game, body)
+    if not game_dict:
+        return None
+    server_data = {'game': game_dict}
+    for key in _SNAPSHOT_KEYS:
+        if key in body:
+            server_data[key] = body[key] or []
+    appended = body.get('appended') or ()
+    if appended:
+        server_data['appended'] = list(appended)
+    for key, section in _HISTORY_SECTIONS:
+        if key not in server_data:
+            game_dict.setdefault(section, list((base_game or {}).get(section) or []))
+        elif key in appended:
+            game_dict[section] = append_new_rows(game_dict.get(section), server_data[key])
+        else:
+            game_dict[section] = list(server_data[key])
+    if 'figures' in body:
+        # JSON object keys arrive as strings; the client keys by player id.
+        server_data['figures'] = {
+            int(player_id): figures or []
+            for player_id, figures in (body['figures'] or {}).items()
+        }
+    return server_data
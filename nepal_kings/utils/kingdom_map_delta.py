@@ -0,0 +1,132 @@
+# Copyright (c) 2026 Marc Stieffenhofer. All rights reserved.
+# See LICENSE file in the project root for full license information.
+"""Client half of the versioned kingdom map.
+
+``/kingdom/map/static`` holds the immutable per-land fields behind an
+``ETag``; ``/kingdom/map/changes?since_version=N`` returns the dynamic
+fields of lands changed after map version ``N`` plus every land carrying a
+viewer- or clock-dependent field.  :class:`KingdomMapSync` keeps both
+halves between polls and rebuilds the same document ``GET /kingdom/map``
+returns, so the kingdom screen stays unaware of the split.
+"""
+
+import logging
+
+logger = logging.getLogger('nk.utils.kingdom_map_delta')
+
+# Keep in sync with server/kingdom_map_service.py.
+STATIC_LAND_FIELDS = (
+    'col', 'row', 'region', 'tier', 'gold_rate', 'suit_bonus_suit',
+    'suit_bonus_value',
+)
+VOLATILE_LAND_FIELDS = (
+    'is_mine', 'defence_incomplete', 'is_recommended_tutorial_land',
+    'conquer_cooldown_remaining', 'kingdom_shield_remaining',
+    'kingdom_shield_reason', 'kingdom_is_shielded',
+)
+
+
+def apply_map_changes(dynamic_by_id, changes):
+    """Merge a ``/kingdom/map/changes`` payload into ``dynamic_by_id``.
+
+    A full payload replaces the state.  A delta first clears the volatile
+    fields everywhere (the server resends every land on which one is still
+    set), then replaces the dynamic state of each land it carries.
+    """
+    lands = changes.get('lands') or []
+    if changes.get('full'):
+        dynamic_by_id.clear()
+    else:
+        for land in dynamic_by_id.values():
+            for field in VOLATILE_LAND_FIELDS:
+                land.pop(field, None)
+            land['is_mine'] = False
+    for land in lands:
+        if isinstance(land, dict) and land.get('id') is not None:
+            dynamic_by_id[land['id']] = dict(land)
+    return dynamic_by_id
+
+
+def merge_map_lands(static_lands, dynamic_by_id):
+    """Return full land dicts in static (map grid) order."""
+    merged = []
+    for static in static_lands:
+        land = dict(static)
+        land.update(dynamic_by_id.get(static['id']) or {'is_mine': False, 'owner': None})
+        merged.append(land)
+    return merged
+
+
+class KingdomMapSync:
+    """Fetch the kingdom map as cached static tiles plus change deltas.
+
+    :meth:`fetch` returns the ``{'data', 'status_code', 'error'}`` shape of
+    ``KingdomScreen._fetch_map_data``.  When the server lacks the split
+    endpoints (``404``), it calls ``fallback`` for a full map instead.
+    """
+
+    def __init__(self, server_url, http_get, timeout=None, fallback=None):
+        self._server_url = server_url
+        self._get = http_get
+        self._timeout = timeout
+        self._fallback = fallback
+        self._static_lands = None
+        self._etag = None
+        self._dynamic_by_id = {}
+        self._map_version = None
+        self._unsupported = False
+
+    def reset(self):
+        """Forget every cached tile; the next fetch starts from scratch."""
+        self._static_lands = None
+        self._etag = None
+        self._dynamic_by_id = {}
+        self._map_version = None
+
+    def _failure(self, status_code, error='Failed to load kingdom map'):
+        return {'data': None, 'status_code': status_code, 'error': error}
+
+    def fetch(self):
+        if self._unsupported and self._fallback is not None:
+            return self._fallback()
+        try:
+            return self._fetch()
+        except Exception as e:  # noqa: BLE001 — surface any failure verbatim
+            return self._failure(0, str(e) or 'Connection error')
+
+    def _fetch(self):
+        headers = {'If-None-Match': self._etag} if self._etag and self._static_lands else {}
+        resp = self._get(f'{self._server_url}/kingdom/map/static',
+                         headers=headers, timeout=self._timeout)
+        if resp.status_code == 404 and self._fallback is not None:
+            logger.info('Server has no split kingdom map; using /kingdom/map')
+            self._unsupported = True
+            return self._fallback()
+        if resp.status_code == 200:
+            self._static_lands = resp.json().get('lands') or []
+            self._etag = resp.headers.get('ETag')
+            # New static tiles may come with new land ids; resync fully.
+            self._map_version = None
+        elif resp.status_code != 304 or self._static_lands is None:
+            return self._failure(resp.status_code)
+
+        params = {}
+        if self._map_version is not None:
+            params['since_version'] = self._map_version
+        resp = self._get(f'{self._server_url}/kingdom/map/changes',
+                         params=params, timeout=self._timeout)
+        if resp.status_code != 200:
+            return self._failure(resp.status_code)
+        changes = resp.json()
+        apply_map_changes(self._dynamic_by_id, changes)
+        self._map_version = changes.get('map_version')
+
+        static_ids = {land['id'] for land in self._static_lands}
+        if any(land_id not in static_ids for land_id in self._dynamic_by_id):
+            self._etag = None  # map regenerated mid-poll; refetch next time
+
+        data = dict(changes)
+        for key in ('full', 'since_version'):
+            data.pop(key, None)
+        data['lands'] = merge_map_lands(self._static_lands, self._dynamic_by_id)
+        return {'data': data, 'status_code': 200, 'error': None}
@@ -33,15 +33,22 @@ def add_log_entry(game_id, player_id, round_number, turn_number, message, author
         raise Exception(f"Failed to add log entry: {str(e)}")
 
 
-def fetch_log_entries(game_id):
+def fetch_log_entries(game_id, after_id=None, limit=None):
     """
     Fetch log entries for a game.
 
     :param game_id: ID of the game.
+    :param after_id: Only fetch log entries with a larger id (optional).
+    :param limit: Maximum number of log entries to fetch (optional).
     :return: List of log entries.
     """
+    params = {'game_id': game_id}
+    if after_id is not None:
+        params['after_id'] = after_id
+    if limit is not None:
+        params['limit'] = limit
     try:
-        response = requests.get(f'{settings.SERVER_URL}/msg/get_log_entries', params={'game_id': game_id}, timeout=10)
+        response = requests.get(f'{settings.SERVER_URL}/msg/get_log_entries', params=params, timeout=10)
         response.raise_for_status()
         return response.json().get('log_entries', [])
     except requests.RequestException as e:
@@ -72,15 +79,22 @@ def send_chat_message(game_id, sender_id, receiver_id, message):
         raise Exception(f"Failed to send chat message: {str(e)}")
 
 
-def fetch_chat_messages(game_id):
+def fetch_chat_messages(game_id, after_id=None, limit=None):
     """
     Fetch chat messages for a game.
 
     :param game_id: ID of the game.
+    :param after_id: Only fetch chat messages with a larger id (optional).
+    :param limit: Maximum number of chat messages to fetch (optional).
     :return: List of chat messages.
     """
+    params = {'game_id': game_id}
+    if after_id is not None:
+        params['after_id'] = after_id
+    if limit is not None:
+        params['limit'] = limit
     try:
-        response = requests.get(f'{settings.SERVER_URL}/msg/get_chat_messages', params={'game_id': game_id}, timeout=10)
+        response = requests.get(f'{settings.SERVER_URL}/msg/get_chat_messages', params=params, timeout=10)
         response.raise_for_status()
         return response.json().get('chat_messages', [])
     except requests.RequestException as e:
@@ -24,6 +24,8 @@ class PerfMonitor:
         self.frames = []
         self.slow_events = []
         self.context = {}
+        self.counter_sources = {}
+        self.frame_kinds = {'full': 0, 'partial': 0, 'skipped': 0}
 
     @staticmethod
     def _now_ms():
@@ -37,13 +39,15 @@ class PerfMonitor:
         self.frame_started_at = self._now_ms()
         self.context = dict(context or {})
 
-    def frame_end(self):
+    def frame_end(self, kind='full'):
+        """Close the frame; ``kind`` is ``'full'``, ``'partial'`` or ``'skipped'``."""
         global _ACTIVE_MONITOR
         if not self.enabled or self.frame_started_at is None:
             return
         elapsed = self._now_ms() - self.frame_started_at
         self.frame_started_at = None
         self.frame_count += 1
+        self.frame_kinds[kind] = self.frame_kinds.get(kind, 0) + 1
         self.frames.append(round(elapsed, 3))
         if len(self.frames) > self.max_events:
             self.frames = self.frames[-self.max_events:]
@@ -87,6 +91,10 @@ class PerfMonitor:
             if len(stats['slow']) > 40:
                 stats['slow'] = stats['slow'][-40:]
 
+    def add_counter_source(self, name, provider):
+        """Include ``provider()`` under ``counters[name]`` in the summary."""
+        self.counter_sources[name] = provider
+
     @contextmanager
     def section(self, name):
         self.begin(name)
@@ -122,9 +130,20 @@ class PerfMonitor:
                 'max_ms': round(max(frames), 3) if frames else 0.0,
             },
             'sections': sections,
+            'presented': self._presented_summary(),
             'slow_events': list(self.slow_events),
+            'counters': {name: provider()
+                         for name, provider in self.counter_sources.items()},
         }
 
+    def _presented_summary(self):
+        total = sum(self.frame_kinds.values())
+        presented = dict(self.frame_kinds)
+        for kind in ('partial', 'skipped'):
+            presented[kind + '_ratio'] = (
+                round(self.frame_kinds.get(kind, 0) / total, 3) if total else 0.0)
+        return presented
+
     def publish_if_due(self, *, force=False):
         if not self.enabled or sys.platform != 'emscripten':
             return
@@ -0,0 +1,76 @@
+# Copyright (c) 2026 Marc Stieffenhofer. All rights reserved.
+# See LICENSE file in the project root for full license information.
+"""Idle-time construction of the screens a player is likely to open next.
+
+Screens are built on first use (see ``Client._create_screen``).  While the
+current screen sits idle, the client builds one likely-next screen per
+settled period, so the asset decodes and layout work are done before the
+player navigates there.  Construction may change shared ``State``
+attributes (``GameScreen`` claims ``state.parent_screen``, for example), so
+``preserved_state`` puts back whatever a prefetch overwrote.
+
+Screens built with a sub-progress bar (the duel and conquer battle screens,
+several seconds each) are never prefetched: a build that long would freeze
+the idle screen the moment the player reaches for it.  They keep their
+navigation-time loading bar.
+
+Prefetch runs on desktop by default.  The browser build decodes images far
+more slowly, so a prefetch there would freeze an idle-but-visible screen;
+set ``NK_SCREEN_PREFETCH=1`` to try it anyway, or ``0`` to disable it on
+desktop.
+"""
+
+import os
+import sys
+from contextlib import contextmanager
+
+# Most likely destinations first.  Only unbuilt screens are prefetched.
+LIKELY_NEXT_SCREENS = {
+    'login': ('game_menu',),
+    'game_menu': ('kingdom', 'duel_menu', 'collection', 'rankings', 'settings'),
+    'duel_menu': ('load_game', 'new_game', 'game'),
+    'new_game': ('game',),
+    'load_game': ('game',),
+    'kingdom': ('conquer', 'defence', 'kingdom_config', 'conquer_game'),
+    'conquer': ('conquer_game',),
+    'defence': ('conquer_game',),
+    'collection': ('kingdom',),
+    'rankings': ('kingdom',),
+}
+
+
+def prefetch_enabled():
+    value = os.environ.get('NK_SCREEN_PREFETCH')
+    if value is not None:
+        return value != '0'
+    return sys.platform != 'emscripten'
+
+
+def next_prefetch(current, built, factories):
+    """First likely-next screen of ``current`` that is cheap and unbuilt.
+
+    ``factories`` maps screen keys to ``(label, cls, weight)``.
+    """
+    for key in LIKELY_NEXT_SCREENS.get(current, ()):
+        spec = factories.get(key)
+        if spec is None or key in built or spec[2] > 1:
+            continue
+        return key
+    return None
+
+
+@contextmanager
+def preserved_state(state):
+    """Restore attributes of ``state`` that existed before and were changed.
+
+    Attributes a constructor adds are kept: eager start-up construction used
+    to add them too, and later code may rely on them existing.
+    """
+    before = dict(vars(state))
+    try:
+        yield
+    finally:
+        current = vars(state)
+        for name, value in before.items():
+            if current.get(name, value) is not value or name not in current:
+                setattr(state, name, value)
@@ -0,0 +1,98 @@
+# Copyright (c) 2026 Marc Stieffenhofer. All rights reserved.
+# See LICENSE file in the project root for full license information.
+"""Startup and screen-entry timings for ``--profile-startup``.
+
+Enabled with ``python nepal_kings.py --profile-startup`` (or
+``NK_PROFILE_STARTUP=1``).  Every measurement is printed as one JSON line
+prefixed with ``NK_STARTUP`` so a harness can parse stdout::
+
+    NK_STARTUP {"event":"screen_built","screen":"kingdom","how":"prefetch","ms":412.7,"at_ms":9120.3}
+
+Events: ``boot`` (module imports and window set-up), ``screen_built``
+(``how`` is ``startup``, ``navigate`` or ``prefetch``), ``first_interactive``
+(first presented frame of the first screen) and ``screen_entered``
+(navigation request to first presented frame).  ``at_ms`` counts from the
+import of this module, which ``nepal_kings.py`` performs before anything
+heavy.
+"""
+
+import json
+import os
+import sys
+import time
+
+_T0 = time.perf_counter()
+
+FLAG = '--profile-startup'
+
+
+def profiling_requested(argv=None):
+    argv = sys.argv if argv is None else argv
+    return FLAG in argv or os.environ.get('NK_PROFILE_STARTUP') == '1'
+
+
+def _now_ms():
+    return (time.perf_counter() - _T0) * 1000.0
+
+
+class StartupProfiler:
+    """Collects startup events; prints them only when enabled."""
+
+    def __init__(self, *, enabled=None, stream=None):
+        self.enabled = profiling_requested() if enabled is None else bool(enabled)
+        self.stream = stream
+        self.events = []
+        self.first_interactive_ms = None
+
+    @staticmethod
+    def now_ms():
+        return _now_ms()
+
+    def record(self, event, **fields):
+        if not self.enabled:
+            return None
+        entry = {'event': event}
+        entry.update(fields)
+        entry['at_ms'] = round(_now_ms(), 1)
+        for key, value in entry.items():
+            if isinstance(value, float):
+                entry[key] = round(value, 1)
+        self.events.append(entry)
+        stream = self.stream or sys.stdout
+        try:
+            stream.write('NK_STARTUP ' + json.dumps(entry, separators=(',', ':')) + '\n')
+            stream.flush()
+        except Exception:
+            pass
+        return entry
+
+    def boot_done(self):
+        self.record('boot', ms=_now_ms())
+
+    def screen_built(self, key, ms, how):
+        self.record('screen_built', screen=key, how=how, ms=ms)
+
+    def screen_presented(self, key, requested_ms):
+        """First frame of ``key`` is on the display."""
+        now = _now_ms()
+        if self.first_interactive_ms is None:
+            self.first_interactive_ms = now
+            self.record('first_interactive', screen=key, ms=now)
+        self.record('screen_entered', screen=key, ms=now - requested_ms)
+
+    def summary(self):
+        built = {}
+        for entry in self.events:
+            if entry['event'] == 'screen_built':
+                built[entry['screen']] = {'ms': entry['ms'], 'how': entry['how']}
+        entered = {}
+        for entry in self.events:
+            if entry['event'] == 'screen_entered':
+                entered.setdefault(entry['screen'], []).append(entry['ms'])
+        return {
+            'first_interactive_ms': (round(self.first_interactive_ms, 1)
+                                     if self.first_interactive_ms is not None
+                                     else None),
+            'screens_built': built,
+            'screen_entry_ms': entered,
+        }
@@ -0,0 +1,913 @@
+#!/usr/bin/env python3
+"""Headless AI self-play: decision throughput, latency, profile and win rates.
+
+Drives two AI seats through Duel games and Conquer tactics-hand battles on
+serialized ``game_dict`` snapshots, calling the same
+``ai.action_enum.enumerate_actions`` and ``ai.duel_strategy.choose_action``
+as the hosted AI worker.  No server, database or HTTP is involved: a small
+pure-Python rules stand-in applies each chosen action to the snapshot.
+
+The stand-in keeps the phase flow the AI sees (build / change cards /
+advance, select defender, battle decision, battle shop, three battle
+rounds) but is deliberately coarse: spells other than the two draw spells
+are paid for and have no effect, nobody counters, and a battle is scored
+from figure power plus the moves played each round.  Use it to compare AI
+speed and relative strength between builds, not to validate game rules.
+
+Only the enumerate + choose step is timed and profiled; applying actions
+is excluded.
+
+Examples:
+
+    python scripts/benchmark_ai_selfplay.py --games 20
+    python scripts/benchmark_ai_selfplay.py --mode conquer --games 200 --profile
+    python scripts/benchmark_ai_selfplay.py --seats strategy,random --games 50 --json
+"""
+
+from __future__ import annotations
+
+import argparse
+import cProfile
+import copy
+import json
+import math
+import pstats
+import random
+import sys
+import time
+from collections import defaultdict
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Sequence
+
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+SERVER_DIR = REPO_ROOT / 'server'
+if str(SERVER_DIR) not in sys.path:
+    sys.path.insert(0, str(SERVER_DIR))
+
+from ai import duel_strategy  # noqa: E402
+from ai.action_enum import detect_phase, enumerate_actions  # noqa: E402
+from ai.card_change_strategy import (  # noqa: E402
+    compute_side_tactic_protected_ids,
+    compute_tactic_protected_ids,
+    select_main_cards_to_swap,
+    select_side_cards_to_swap,
+)
+from ai.figure_completion import best_figure_targets  # noqa: E402
+from ai.figure_recipes import find_buildable_figures  # noqa: E402
+from ai.game_state import enrich_figures_with_skills  # noqa: E402
+from ai.state_index import GameStateIndex  # noqa: E402
+import server_settings as settings  # noqa: E402
+
+
+# Mirrors game_service/deck.py.
+MAIN_RANKS = ('7', '8', '9', '10', 'J', 'Q', 'K', 'A')
+SIDE_RANKS = ('2', '3', '4', '5', '6')
+SUITS = ('Hearts', 'Diamonds', 'Clubs', 'Spades')
+RANK_VALUE = {
+    '2': 2, '3': 3, '4': 4, '5': 5, '6': 6, '7': 7, '8': 8, '9': 9, '10': 10,
+    'J': 1, 'Q': 2, 'K': 4, 'A': 3,
+}
+BATTLE_FAMILY = {
+    '7': 'Dagger', '8': 'Dagger', '9': 'Dagger', '10': 'Dagger',
+    'J': 'Call Villager', 'Q': 'Block', 'A': 'Call Military', 'K': 'Call King',
+}
+
+# Stand-in rules that have no server constant.
+SIDE_CARDS_START = 4
+FOLD_POINTS = 10
+AUTO_LOSS_POINTS = 10
+MAX_ROUNDS = 8
+MAX_DECISIONS_PER_GAME = 1500
+CONQUER_FIGURES = 3
+CONQUER_TACTICS = 4
+
+ACTING_PHASES = ('normal_turn', 'select_defender', 'battle_decision',
+                 'battle_shop', 'battle_round')
+
+Policy = Callable[..., dict[str, Any]]
+
+
+# ── Policies ────────────────────────────────────────────────────────
+
+def strategy_policy(game_dict, player_id, phase, actions, rng, index, context):
+    """The hosted AI: ``duel_strategy.choose_action``."""
+    return duel_strategy.choose_action(
+        game_dict, player_id, phase, actions, rng, context=context, index=index,
+    )
+
+
+def random_policy(game_dict, player_id, phase, actions, rng, index, context):
+    """Uniform over the legal actions; the baseline for win rates."""
+    return rng.choice(actions)
+
+
+POLICIES: dict[str, Policy] = {
+    'strategy': strategy_policy,
+    'random': random_policy,
+}
+
+
+# ── Measurements ────────────────────────────────────────────────────
+
+def _nearest_rank(values: Sequence[float], percentile: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(1, math.ceil(len(ordered) * percentile))
+    return ordered[rank - 1]
+
+
+@dataclass
+class DecisionStats:
+    """Per-phase latencies (ms) of enumerate + choose, one entry per decision."""
+
+    latencies_ms: dict[str, list[float]] = field(default_factory=lambda: defaultdict(list))
+
+    def add(self, phase: str, elapsed_ms: float) -> None:
+        self.latencies_ms[phase].append(elapsed_ms)
+
+    def all_latencies(self) -> list[float]:
+        return [ms for values in self.latencies_ms.values() for ms in values]
+
+    def summary(self) -> dict[str, Any]:
+        def _row(values):
+            total_ms = sum(values)
+            return {
+                'decisions': len(values),
+                'decisions_per_sec': round(len(values) / (total_ms / 1000.0), 1) if total_ms else 0.0,
+                'p50_ms': round(_nearest_rank(values, 0.50), 3),
+                'p99_ms': round(_nearest_rank(values, 0.99), 3),
+                'max_ms': round(max(values), 3) if values else 0.0,
+            }
+        return {
+            'overall': _row(self.all_latencies()),
+            'by_phase': {phase: _row(values) for phase, values in sorted(self.latencies_ms.items())},
+        }
+
+
+def _module_label(filename: str) -> str:
+    """``ai.action_enum`` for server modules, coarse buckets for the rest."""
+    if filename.startswith('~') or filename.startswith('<'):
+        return '<builtins>'
+    try:
+        relative = Path(filename).resolve().relative_to(SERVER_DIR)
+    except ValueError:
+        return '<stdlib/other>'
+    return '.'.join(relative.with_suffix('').parts)
+
+
+def profile_by_module(profiler: cProfile.Profile, top: int = 12) -> list[dict[str, Any]]:
+    """Own (``tottime``) seconds per module, largest first."""
+    totals: dict[str, float] = defaultdict(float)
+    for (filename, _line, _func), (_cc, _nc, tottime, _ct, _callers) in pstats.Stats(profiler).stats.items():
+        totals[_module_label(filename)] += tottime
+    grand_total = sum(totals.values()) or 1.0
+    rows = sorted(totals.items(), key=lambda item: item[1], reverse=True)[:top]
+    return [
+        {'module': module, 'seconds': round(seconds, 4), 'share': round(seconds / grand_total, 3)}
+        for module, seconds in rows
+    ]
+
+
+@dataclass
+class GameResult:
+    mode: str
+    seed: int
+    seat_by_player: dict[int, str]
+    winner_seat: str | None
+    points: dict[int, int]
+    decisions: int
+    stalled: bool = False
+
+
+# ── Rules stand-in ──────────────────────────────────────────────────
+
+def _new_card(card_id: int, rank: str, suit: str, card_type: str) -> dict[str, Any]:
+    return {
+        'id': card_id, 'rank': rank, 'suit': suit, 'value': RANK_VALUE[rank],
+        'type': card_type, 'player_id': None, 'in_deck': True,
+        'part_of_figure': False, 'part_of_battle_move': False,
+    }
+
+
+def _new_deck() -> tuple[list[dict[str, Any]], list[dict[str, Any]]]:
+    main_cards, side_cards = [], []
+    for suit in SUITS:
+        for rank in MAIN_RANKS:
+            for _ in range(2):
+                main_cards.append(_new_card(len(main_cards) + 1, rank, suit, 'main'))
+        for rank in SIDE_RANKS:
+            for _ in range(2):
+                side_cards.append(_new_card(1001 + len(side_cards), rank, suit, 'side'))
+    return main_cards, side_cards
+
+
+def _figure_power(fig: dict[str, Any] | None) -> int:
+    if not fig:
+        return 0
+    if fig.get('field') == 'castle':
+        return 15
+    return sum(c.get('value', 0) for c in fig.get('cards', []))
+
+
+class SelfPlayGame:
+    """One Duel game or Conquer battle between players 1 and 2.
+
+    Holds the ``game_dict`` the AI reads and applies actions to it with the
+    coarse rules described in the module docstring.
+    """
+
+    def __init__(self, rng: random.Random, *, mode: str = 'duel',
+                 turns: int = settings.INITIAL_TURNS_INVADER,
+                 stake: int = settings.DEFAULT_GAME_STAKE,
+                 max_rounds: int = MAX_ROUNDS):
+        self.rng = rng
+        self.turns = turns
+        self.stake = stake
+        self.max_rounds = max_rounds
+        self._next_id = 1
+        main_cards, side_cards = _new_deck()
+        invader = rng.choice((1, 2))
+        self.game: dict[str, Any] = {
+            'id': 1,
+            'mode': mode,
+            'state': 'active',
+            'current_round': 1,
+            'stake': stake,
+            'ai_seed': rng.randrange(2 ** 31),
+            'invader_player_id': invader,
+            'turn_player_id': 3 - invader,
+            'ceasefire_active': False,
+            'battle_modifier': [],
+            'active_spells': [],
+            'resting_figure_ids': [],
+            'fold_winner_id': None,
+            'main_cards': main_cards,
+            'side_cards': side_cards,
+            'players': [self._new_player(pid) for pid in (1, 2)],
+        }
+        self._clear_battle()
+        self.winner_id: int | None = None
+
+    def _new_player(self, player_id: int) -> dict[str, Any]:
+        return {
+            'id': player_id, 'user_id': player_id, 'game_id': 1,
+            'username': f'seat{player_id}', 'status': 'active',
+            'points': 0, 'turns_left': self.turns,
+            'main_hand': [], 'side_hand': [], 'figures': [],
+        }
+
+    def _id(self) -> int:
+        self._next_id += 1
+        return self._next_id
+
+    @classmethod
+    def duel(cls, rng: random.Random, **kwargs) -> SelfPlayGame:
+        sim = cls(rng, mode='duel', **kwargs)
+        for player in sim.game['players']:
+            sim._draw(player, settings.NUM_MAIN_CARDS_START, 'main')
+            sim._draw(player, SIDE_CARDS_START, 'side')
+        sim._start_turn(sim.game['turn_player_id'])
+        return sim
+
+    @classmethod
+    def conquer(cls, rng: random.Random, **kwargs) -> SelfPlayGame:
+        """A battle that starts at round 0 with built figures and tactics hands."""
+        sim = cls(rng, mode='conquer', **kwargs)
+        game = sim.game
+        game['conquer_move_model'] = 'tactics_hand'
+        game['conquer_tactics'] = []
+        for player in game['players']:
+            sim._draw(player, settings.NUM_MAIN_CARDS_START, 'main')
+            sim._draw(player, SIDE_CARDS_START, 'side')
+            for _ in range(CONQUER_FIGURES):
+                options = find_buildable_figures(
+                    player['main_hand'], player['side_hand'], player['figures'],
+                )
+                if not options:
+                    break
+                sim._build(player, sim._build_params(rng.choice(options)))
+            while not player['figures']:
+                sim._draw(player, 2, 'main')
+                options = find_buildable_figures(
+                    player['main_hand'], player['side_hand'], player['figures'],
+                )
+                if options:
+                    sim._build(player, sim._build_params(options[0]))
+            free = [c for c in sim._free(player, 'main_hand') if c['rank'] in BATTLE_FAMILY]
+            for card in free[:CONQUER_TACTICS]:
+                sim._add_tactic(player, card)
+
+        attacker = game['invader_player_id']
+        defender = sim._other(attacker)
+        game['advancing_player_id'] = attacker
+        game['advancing_figure_id'] = max(
+            sim._player(attacker)['figures'], key=_figure_power)['id']
+        game['defending_figure_id'] = rng.choice(sim._player(defender)['figures'])['id']
+        game['battle_confirmed'] = True
+        game['battle_moves_confirmed'] = {'1': True, '2': True}
+        game['battle_turn_player_id'] = attacker
+        return sim
+
+    # ── State helpers ───────────────────────────────────────────────
+
+    def _player(self, player_id: int) -> dict[str, Any]:
+        return next(p for p in self.game['players'] if p['id'] == player_id)
+
+    @staticmethod
+    def _other(player_id: int) -> int:
+        return 3 - player_id
+
+    @staticmethod
+    def _free(player: dict[str, Any], hand_key: str) -> list[dict[str, Any]]:
+        return [c for c in player[hand_key]
+                if not c['part_of_figure'] and not c['part_of_battle_move']]
+
+    def _draw(self, player: dict[str, Any], count: int, card_type: str) -> list[dict[str, Any]]:
+        pool = [c for c in self.game[f'{card_type}_cards'] if c['in_deck']]
+        drawn = self.rng.sample(pool, min(count, len(pool)))
+        for card in drawn:
+            card['in_deck'] = False
+            card['player_id'] = player['id']
+            player[f'{card_type}_hand'].append(card)
+        return drawn
+
+    def _return_to_deck(self, card: dict[str, Any]) -> None:
+        owner = card.get('player_id')
+        if owner is not None:
+            hand = self._player(owner)[f"{card['type']}_hand"]
+            if card in hand:
+                hand.remove(card)
+        card.update(in_deck=True, player_id=None, part_of_figure=False, part_of_battle_move=False)
+
+    def _card(self, player: dict[str, Any], card_id: Any, card_type: str = 'main') -> dict[str, Any] | None:
+        return next((c for c in player[f'{card_type}_hand'] if c['id'] == card_id), None)
+
+    def _figure(self, figure_id: Any) -> dict[str, Any] | None:
+        for player in self.game['players']:
+            for fig in player['figures']:
+                if fig['id'] == figure_id:
+                    return fig
+        return None
+
+    def _clear_battle(self) -> None:
+        self.game.update(
+            advancing_figure_id=None, advancing_player_id=None, defending_figure_id=None,
+            battle_decisions={}, battle_confirmed=False, battle_moves=[],
+            battle_moves_confirmed={}, battle_round=0, battle_turn_player_id=None,
+            battle_skipped_rounds={}, battle_gamble_counts={},
+        )
+
+    # ── Turn flow ───────────────────────────────────────────────────
+
+    @property
+    def finished(self) -> bool:
+        return self.game['state'] == 'finished'
+
+    def next_decision(self) -> tuple[int, str] | None:
+        """``(player_id, phase)`` of the seat that acts next, or None."""
+        if self.finished:
+            return None
+        game = self.game
+        first = game.get('advancing_player_id') or game['turn_player_id']
+        for player_id in (first, self._other(first)):
+            phase = detect_phase(game, player_id)
+            if phase in ACTING_PHASES:
+                return player_id, phase
+        return None
+
+    def _start_turn(self, player_id: int) -> None:
+        # Mirrors the auto-fill of /games/start_turn.
+        player = self._player(player_id)
+        missing = settings.NUM_MIN_MAIN_CARDS - len(self._free(player, 'main_hand'))
+        if missing > 0:
+            self._draw(player, missing, 'main')
+
+    def _end_turn(self, player_id: int) -> None:
+        player = self._player(player_id)
+        player['turns_left'] = max(0, player['turns_left'] - 1)
+        other = self._other(player_id)
+        if self._player(other)['turns_left'] > 0:
+            self.game['turn_player_id'] = other
+        elif player['turns_left'] == 0:
+            self._end_round()
+            return
+        self._start_turn(self.game['turn_player_id'])
+
+    def _award(self, player_id: int, points: int) -> None:
+        self._player(player_id)['points'] += points
+
+    def _end_round(self) -> None:
+        game = self.game
+        self._clear_battle()
+        game['resting_figure_ids'] = []
+        if game['mode'] == 'conquer' or self._game_over():
+            self._finish()
+            return
+        game['current_round'] += 1
+        game['invader_player_id'] = self._other(game['invader_player_id'])
+        for player in game['players']:
+            player['turns_left'] = self.turns
+        # The defender opens so the invader's forced advance comes last.
+        game['turn_player_id'] = self._other(game['invader_player_id'])
+        self._start_turn(game['turn_player_id'])
+
+    def _game_over(self) -> bool:
+        return (any(p['points'] >= self.stake for p in self.game['players'])
+                or self.game['current_round'] >= self.max_rounds)
+
+    def _finish(self) -> None:
+        game = self.game
+        game['state'] = 'finished'
+        if self.winner_id is None and game['mode'] == 'duel':
+            one, two = (self._player(pid)['points'] for pid in (1, 2))
+            self.winner_id = 1 if one > two else 2 if two > one else None
+
+    # ── Actions ─────────────────────────────────────────────────────
+
+    def apply(self, player_id: int, phase: str, action: dict[str, Any]) -> None:
+        handler = getattr(self, f"_do_{action['type']}", None)
+        if handler is None:
+            raise ValueError(f"stand-in has no rule for {action['type']!r} in {phase}")
+        handler(player_id, action.get('params') or {})
+
+    def _build_params(self, option: dict[str, Any]) -> dict[str, Any]:
+        recipe = option['recipe']
+        return {
+            'family_name': recipe['family_name'], 'field': recipe['field'],
+            'color': recipe['color'], 'name': option['name'], 'suit': option['suit'],
+            'upgrade_family_name': recipe.get('upgrade_family_name'),
+            'produces': option['produces'], 'requires': option['requires'],
+            'cards': option['cards'],
+        }
+
+    def _build(self, player: dict[str, Any], params: dict[str, Any]) -> dict[str, Any]:
+        upgraded = params.get('upgrade_family_name')
+        if upgraded:
+            old = next((f for f in player['figures'] if f['family_name'] == upgraded), None)
+            if old is not None:
+                player['figures'].remove(old)
+                for link in old['cards']:
+                    card = self._card(player, link['card_id'], link['card_type'])
+                    if card is not None:
+                        card['part_of_figure'] = False
+        figure_id = self._id()
+        links = []
+        for ref in params['cards']:
+            card = self._card(player, ref['id'], ref.get('type', 'main'))
+            card['part_of_figure'] = True
+            links.append({
+                'id': self._id(), 'figure_id': figure_id, 'card_id': card['id'],
+                'card_type': card['type'], 'role': ref.get('role', 'key'),
+                'rank': card['rank'], 'suit': card['suit'], 'value': card['value'],
+                'player_id': player['id'], 'in_deck': False, 'part_of_figure': True,
+            })
+        figure = {
+            'id': figure_id, 'player_id': player['id'], 'game_id': 1,
+            'family_name': params['family_name'], 'field': params['field'],
+            'color': params['color'], 'name': params['name'], 'suit': params['suit'],
+            'description': '', 'upgrade_family_name': upgraded,
+            'produces': params.get('produces') or {}, 'requires': params.get('requires') or {},
+            'checkmate': False, 'cannot_be_blocked': bool(params.get('cannot_be_blocked')),
+            'rest_after_attack': bool(params.get('rest_after_attack')),
+            'is_clone': False, 'cards': links,
+        }
+        player['figures'].append(figure)
+        enrich_figures_with_skills(self.game)
+        return figure
+
+    def _do_build_figure(self, player_id, params):
+        figure = self._build(self._player(player_id), params)
+        if params.get('instant_charge_advance') and not self.game['advancing_figure_id']:
+            self._do_advance_figure(player_id, {'figure_id': figure['id']})
+            return
+        self._end_turn(player_id)
+
+    def _change(self, player_id, hand_key, card_type, select, protect):
+        player = self._player(player_id)
+        free = self._free(player, hand_key)
+        targets = best_figure_targets(self.game, player_id, max_results=3)
+        swap_ids = set(select(free, protect_ids=protect(free, targets, max_targets=3)))
+        swapped = [c for c in free if c['id'] in swap_ids]
+        for card in swapped:
+            self._return_to_deck(card)
+        self._draw(player, len(swapped), card_type)
+        self._end_turn(player_id)
+
+    def _do_change_cards(self, player_id, params):
+        self._change(player_id, 'main_hand', 'main',
+                     select_main_cards_to_swap, compute_tactic_protected_ids)
+
+    def _do_change_side_cards(self, player_id, params):
+        self._change(player_id, 'side_hand', 'side',
+                     select_side_cards_to_swap, compute_side_tactic_protected_ids)
+
+    def _do_cast_spell(self, player_id, params):
+        player = self._player(player_id)
+        for ref in params.get('cards') or []:
+            card = (self._card(player, ref['id'], 'main')
+                    or self._card(player, ref['id'], 'side'))
+            if card is not None:
+                self._return_to_deck(card)
+        if params.get('spell_name') == 'Draw 2 MainCards':
+            self._draw(player, 2, 'main')
+        elif params.get('spell_name') == 'Draw 2 SideCards':
+            self._draw(player, 2, 'side')
+        self._end_turn(player_id)
+
+    def _do_end_infinite_hammer(self, player_id, params):
+        self._end_turn(player_id)
+
+    def _do_advance_figure(self, player_id, params):
+        game = self.game
+        self._player(player_id)['turns_left'] = 0
+        if game['advancing_figure_id'] and game['advancing_player_id'] != player_id:
+            # Counter-advance: the defender picks its own defender.
+            game['defending_figure_id'] = params['figure_id']
+            return
+        game['advancing_figure_id'] = params['figure_id']
+        game['advancing_player_id'] = player_id
+        game['turn_player_id'] = player_id
+
+    def _do_cannot_advance_loss(self, player_id, params):
+        self._award(self._other(player_id), AUTO_LOSS_POINTS)
+        self._end_round()
+
+    def _do_defender_no_figures_loss(self, player_id, params):
+        self._award(player_id, AUTO_LOSS_POINTS)
+        self._end_round()
+
+    def _do_select_defender(self, player_id, params):
+        self.game['defending_figure_id'] = params['figure_id']
+
+    def _do_battle_decision(self, player_id, params):
+        game = self.game
+        game['battle_decisions'][str(player_id)] = params['decision']
+        if params['decision'] == 'fold':
+            self._award(self._other(player_id), FOLD_POINTS)
+            self._end_round()
+        elif len(game['battle_decisions']) == 2:
+            game['battle_confirmed'] = True
+
+    def _new_move(self, player_id, card, family_name, value=None):
+        return {
+            'id': self._id(), 'player_id': player_id, 'card_id': card['id'],
+            'card_type': card['type'], 'family_name': family_name,
+            'suit': card['suit'], 'rank': card['rank'],
+            'value': card['value'] if value is None else value,
+            'played_round': None, 'call_figure_id': None,
+        }
+
+    def _add_tactic(self, player, card):
+        card['part_of_battle_move'] = True
+        tactic = self._new_move(player['id'], card, BATTLE_FAMILY[card['rank']])
+        tactic.update(status='available', source='config',
+                      sort_order=len(self.game['conquer_tactics']))
+        self.game['conquer_tactics'].append(tactic)
+
+    def _do_buy_battle_move(self, player_id, params):
+        card = self._card(self._player(player_id), params['card_id'])
+        card['part_of_battle_move'] = True
+        self.game['battle_moves'].append(self._new_move(player_id, card, params['family_name']))
+
+    def _do_combine_battle_moves(self, player_id, params):
+        moves = self.game['battle_moves']
+        first = next(m for m in moves if m['id'] == params['move_id_a'])
+        second = next(m for m in moves if m['id'] == params['move_id_b'])
+        moves.remove(first)
+        moves.remove(second)
+        combined = dict(first, id=self._id(), family_name='Double Dagger',
+                        value=first['value'] + second['value'], card_id_b=second['card_id'])
+        moves.append(combined)
+
+    def _do_confirm_battle_moves(self, player_id, params):
+        game = self.game
+        game['battle_moves_confirmed'][str(player_id)] = True
+        if len(game['battle_moves_confirmed']) == 2:
+            game['battle_round'] = 0
+            game['battle_turn_player_id'] = game['advancing_player_id']
+
+    def _moves(self):
+        key = 'conquer_tactics' if self.game['mode'] == 'conquer' else 'battle_moves'
+        return self.game[key]
+
+    def _do_play_battle_move(self, player_id, params):
+        move = next(m for m in self._moves() if m['id'] == params['battle_move_id'])
+        move['played_round'] = self.game['battle_round']
+        move['call_figure_id'] = params.get('call_figure_id')
+        if 'status' in move:
+            move['status'] = 'played'
+        self._next_battle_turn(player_id)
+
+    _do_play_conquer_tactic = _do_play_battle_move
+
+    def _do_skip_battle_turn(self, player_id, params):
+        game = self.game
+        game['battle_skipped_rounds'].setdefault(str(player_id), []).append(game['battle_round'])
+        self._next_battle_turn(player_id)
+
+    def _do_gamble_battle_move(self, player_id, params):
+        """Sacrifice a move and draw two random main cards in its place."""
+        game = self.game
+        moves = self._moves()
+        move = next(m for m in moves if m['id'] == params['battle_move_id'])
+        state = game['battle_gamble_counts'].setdefault(str(player_id), {'count': 0, 'rounds': []})
+        state['count'] += 1
+        state['rounds'].append(game['battle_round'])
+        player = self._player(player_id)
+        if 'status' in move:
+            move['status'] = 'gambled'
+        else:
+            moves.remove(move)
+        for card in self._draw(player, 2, 'main'):
+            if card['rank'] in BATTLE_FAMILY:
+                card['part_of_battle_move'] = True
+                if 'status' in move:
+                    self._add_tactic(player, card)
+                else:
+                    moves.append(self._new_move(player_id, card, BATTLE_FAMILY[card['rank']]))
+
+    _do_gamble_conquer_tactic = _do_gamble_battle_move
+
+    def _covered(self, player_id: int, battle_round: int) -> bool:
+        if battle_round in self.game['battle_skipped_rounds'].get(str(player_id), []):
+            return True
+        return any(m['player_id'] == player_id and m['played_round'] == battle_round
+                   for m in self._moves())
+
+    def _next_battle_turn(self, player_id: int) -> None:
+        game = self.game
+        other = self._other(player_id)
+        if not self._covered(other, game['battle_round']):
+            game['battle_turn_player_id'] = other
+            return
+        game['battle_round'] += 1
+        if game['battle_round'] >= 3:
+            self._resolve_battle()
+            return
+        game['battle_turn_player_id'] = game['advancing_player_id']
+
+    def _round_value(self, player_id: int, battle_round: int) -> tuple[int, bool]:
+        """(value, is_block) of the move ``player_id`` played in ``battle_round``."""
+        move = next((m for m in self._moves()
+                     if m['player_id'] == player_id and m['played_round'] == battle_round), None)
+        if move is None:
+            return 0, False
+        if move['family_name'] == 'Block':
+            return 0, True
+        called = self._figure(move.get('call_figure_id'))
+        if called is not None:
+            bonus = move['value'] if called['suit'] == move['suit'] else 0
+            return _figure_power(called) + bonus, False
+        return move['value'], False
+
+    def _resolve_battle(self) -> None:
+        """Figure power plus per-round move values; Block voids its round."""
+        game = self.game
+        attacker = game['advancing_player_id']
+        defender = self._other(attacker)
+        attacking = self._figure(game['advancing_figure_id'])
+        defending = self._figure(game['defending_figure_id'])
+        diff = _figure_power(attacking) - _figure_power(defending)
+        for battle_round in range(3):
+            att_value, att_block = self._round_value(attacker, battle_round)
+            def_value, def_block = self._round_value(defender, battle_round)
+            if not (att_block or def_block):
+                diff += att_value - def_value
+
+        winner = attacker if diff > 0 else defender if diff < 0 else None
+        if game['mode'] == 'conquer':
+            self.winner_id = winner
+        elif winner is not None:
+            loser_figure = defending if winner == attacker else attacking
+            self._award(winner, _figure_power(loser_figure))
+            owner = self._player(loser_figure['player_id'])
+            owner['figures'].remove(loser_figure)
+            for link in loser_figure['cards']:
+                card = self._card(owner, link['card_id'], link['card_type'])
+                if card is not None:
+                    self._return_to_deck(card)
+
+        # Battle-move cards go back to the deck.
+        for player in game['players']:
+            for card in list(player['main_hand']):
+                if card['part_of_battle_move']:
+                    self._return_to_deck(card)
+        self._end_round()
+
+
+# ── Driver ──────────────────────────────────────────────────────────
+
+@dataclass
+class SelfPlayReport:
+    games: list[GameResult] = field(default_factory=list)
+    stats: DecisionStats = field(default_factory=DecisionStats)
+    profile: list[dict[str, Any]] | None = None
+
+    def win_rates(self) -> dict[str, Any]:
+        by_mode: dict[str, dict[str, int]] = defaultdict(lambda: defaultdict(int))
+        for result in self.games:
+            by_mode[result.mode]['games'] += 1
+            by_mode[result.mode][result.winner_seat or 'draw'] += 1
+            if result.stalled:
+                by_mode[result.mode]['stalled'] += 1
+        return {mode: dict(counts) for mode, counts in by_mode.items()}
+
+    def summary(self) -> dict[str, Any]:
+        report = {
+            'games': len(self.games),
+            'latency': self.stats.summary(),
+            'results': self.win_rates(),
+        }
+        if self.profile is not None:
+            report['profile_by_module'] = self.profile
+        return report
+
+
+def play_game(sim: SelfPlayGame, seats: dict[int, tuple[str, Policy]],
+              stats: DecisionStats, *, seed: int,
+              profiler: cProfile.Profile | None = None,
+              snapshots: list | None = None,
+              max_decisions: int = MAX_DECISIONS_PER_GAME) -> GameResult:
+    """Play ``sim`` to the end; time every enumerate + choose into ``stats``."""
+    rngs = {pid: random.Random(seed * 31 + pid) for pid in seats}
+    recent_changes = {pid: 0 for pid in seats}
+    decisions = 0
+    stalled = False
+    while not sim.finished:
+        turn = sim.next_decision()
+        if turn is None or decisions >= max_decisions:
+            stalled = True
+            break
+        player_id, phase = turn
+        game_dict = sim.game
+        if snapshots is not None:
+            snapshots.append((copy.deepcopy(game_dict), player_id, phase))
+        context = {'recent_change_cards_count': recent_changes[player_id]}
+
+        if profiler is not None:
+            profiler.enable()
+        started = time.perf_counter()
+        index = GameStateIndex(game_dict)
+        actions = enumerate_actions(game_dict, player_id, phase, index=index)
+        action = (seats[player_id][1](game_dict, player_id, phase, actions,
+                                      rngs[player_id], index, context)
+                  if actions else None)
+        elapsed_ms = (time.perf_counter() - started) * 1000.0
+        if profiler is not None:
+            profiler.disable()
+
+        if action is None:
+            stalled = True
+            break
+        stats.add(phase, elapsed_ms)
+        decisions += 1
+        if action['type'] in ('change_cards', 'change_side_cards'):
+            recent_changes[player_id] += 1
+        elif phase == 'normal_turn':
+            recent_changes[player_id] = 0
+        sim.apply(player_id, phase, action)
+
+    if stalled:
+        sim.game['state'] = 'finished'
+    winner = sim.winner_id
+    return GameResult(
+        mode=sim.game['mode'],
+        seed=seed,
+        seat_by_player={pid: seat for pid, (seat, _policy) in seats.items()},
+        winner_seat=seats[winner][0] if winner in seats else None,
+        points={p['id']: p['points'] for p in sim.game['players']},
+        decisions=decisions,
+        stalled=stalled,
+    )
+
+
+def run_selfplay(*, games: int, modes: Sequence[str] = ('duel',),
+                 seat_policies: Sequence[str] = ('strategy', 'strategy'),
+                 seed: int = 0, profile: bool = False, profile_top: int = 12,
+                 max_rounds: int = MAX_ROUNDS) -> SelfPlayReport:
+    """Play ``games`` per mode; seats swap player ids every game."""
+    labels = ('A', 'B')
+    report = SelfPlayReport()
+    profiler = cProfile.Profile() if profile else None
+    for mode in modes:
+        for game_index in range(games):
+            game_seed = seed * 100_003 + game_index
+            rng = random.Random(game_seed)
+            if mode == 'conquer':
+                sim = SelfPlayGame.conquer(rng)
+            else:
+                sim = SelfPlayGame.duel(rng, max_rounds=max_rounds)
+            order = (0, 1) if game_index % 2 == 0 else (1, 0)
+            seats = {
+                pid: (f'{labels[i]}:{seat_policies[i]}', POLICIES[seat_policies[i]])
+                for pid, i in zip((1, 2), order)
+            }
+            report.games.append(play_game(sim, seats, report.stats,
+                                          seed=game_seed, profiler=profiler))
+    if profiler is not None:
+        report.profile = profile_by_module(profiler, top=profile_top)
+    return report
+
+
+# ── pytest-benchmark entry point ────────────────────────────────────
+
+def decision_workload(seed: int = 0, games: int = 1,
+                      modes: Sequence[str] = ('duel', 'conquer')) -> list[tuple[dict, int, str]]:
+    """``(game_dict, player_id, phase)`` snapshots of every decision in a few games.
+
+    Feed them to :func:`run_decisions` from a ``benchmark`` fixture to time
+    the AI without the rules stand-in.
+    """
+    snapshots: list[tuple[dict, int, str]] = []
+    stats = DecisionStats()
+    policy = ('strategy', strategy_policy)
+    for mode in modes:
+        for game_index in range(games):
+            game_seed = seed * 100_003 + game_index
+            rng = random.Random(game_seed)
+            sim = SelfPlayGame.conquer(rng) if mode == 'conquer' else SelfPlayGame.duel(rng)
+            play_game(sim, {1: policy, 2: policy}, stats, seed=game_seed, snapshots=snapshots)
+    return snapshots
+
+
+def run_decisions(workload: Sequence[tuple[dict, int, str]], seed: int = 0) -> int:
+    """Enumerate and choose once per snapshot; returns the decision count."""
+    rng = random.Random(seed)
+    for game_dict, player_id, phase in workload:
+        index = GameStateIndex(game_dict)
+        actions = enumerate_actions(game_dict, player_id, phase, index=index)
+        if actions:
+            duel_strategy.choose_action(game_dict, player_id, phase, actions, rng, index=index)
+    return len(workload)
+
+
+# ── CLI ─────────────────────────────────────────────────────────────
+
+def _print_report(report: SelfPlayReport) -> None:
+    summary = report.summary()
+    overall = summary['latency']['overall']
+    print(f"Games: {summary['games']}  decisions: {overall['decisions']}  "
+          f"decisions/sec: {overall['decisions_per_sec']}")
+    print(f"{'phase':<16} {'n':>7} {'dec/s':>9} {'p50 ms':>9} {'p99 ms':>9} {'max ms':>9}")
+    for phase, row in [('overall', overall), *summary['latency']['by_phase'].items()]:
+        print(f"{phase:<16} {row['decisions']:>7} {row['decisions_per_sec']:>9} "
+              f"{row['p50_ms']:>9} {row['p99_ms']:>9} {row['max_ms']:>9}")
+    print("Results:")
+    for mode, counts in summary['results'].items():
+        total = counts.get('games', 0) or 1
+        parts = [f"{key}={value} ({value / total:.0%})"
+                 for key, value in sorted(counts.items()) if key != 'games']
+        print(f"  {mode}: {counts.get('games', 0)} games; {', '.join(parts)}")
+    if report.profile is not None:
+        print("Own time by module (enumerate + choose only):")
+        for row in report.profile:
+            print(f"  {row['module']:<36} {row['seconds']:>9.4f}s {row['share']:>6.1%}")
+
+
+def _parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        description="Play AI vs AI offline and report decision throughput and win rates."
+    )
+    parser.add_argument("--games", type=int, default=10, help="games per mode")
+    parser.add_argument("--mode", choices=("duel", "conquer", "both"), default="duel")
+    parser.add_argument(
+        "--seats",
+        default="strategy,strategy",
+        help=f"two comma-separated policies from: {', '.join(POLICIES)}",
+    )
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--max-rounds", type=int, default=MAX_ROUNDS,
+                        help="Duel rounds before the game ends on points")
+    parser.add_argument("--profile", action="store_true",
+                        help="cProfile the AI and group own time by module")
+    parser.add_argument("--profile-top", type=int, default=12)
+    parser.add_argument("--json", action="store_true", help="print the report as JSON")
+    return parser
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    parser = _parser()
+    args = parser.parse_args(argv)
+    seats = [s.strip() for s in args.seats.split(',')]
+    if len(seats) != 2 or any(s not in POLICIES for s in seats):
+        parser.error(f"--seats needs two of: {', '.join(POLICIES)}")
+    if args.games < 1 or args.max_rounds < 1:
+        parser.error("--games and --max-rounds must be positive")
+
+    modes = ('duel', 'conquer') if args.mode == 'both' else (args.mode,)
+    report = run_selfplay(
+        games=args.games, modes=modes, seat_policies=seats, seed=args.seed,
+        profile=args.profile, profile_top=args.profile_top, max_rounds=args.max_rounds,
+    )
+    if args.json:
+        print(json.dumps(report.summary(), indent=2, sort_keys=True))
+    else:
+        _print_report(report)
+    return 1 if any(result.stalled for result in report.games) else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,278 @@
+#!/usr/bin/env python3
+"""Cold-start benchmark for the pygame client and the Flask server.
+
+Every run starts a fresh interpreter with ``-X importtime`` so imports are
+measured cold, and reports the median over ``--runs``:
+
+client  module imports, window + login construction (``boot``), time to
+        the first presented login frame (``first_interactive``) through the
+        real ``Client.run_screen`` loop, and the construction time of every
+        other screen (built afterwards, one by one, like a prefetch).
+server  ``import server`` (module-level app set-up and blueprint imports),
+        schema creation on in-memory SQLite, and the first and second
+        ``GET /healthz`` through the Flask test client.
+
+The client probe runs headless on SDL's dummy video and audio drivers with
+idle prefetch disabled.  With ``--budget`` the medians are compared against
+a JSON budget (see ``scripts/startup_budget.json``) and the exit status is
+1 when any metric exceeds its ceiling, so CI can fail on regressions.
+
+Examples:
+
+    python scripts/benchmark_startup.py
+    python scripts/benchmark_startup.py --target server --runs 5 --json
+    python scripts/benchmark_startup.py --budget scripts/startup_budget.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Any
+
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+CLIENT_DIR = REPO_ROOT / 'nepal_kings'
+SERVER_DIR = REPO_ROOT / 'server'
+EVENT_PREFIX = 'NK_STARTUP '
+TARGETS = ('client', 'server')
+
+CLIENT_ENV = {
+    'SDL_VIDEODRIVER': 'dummy',
+    'SDL_AUDIODRIVER': 'dummy',
+    'NK_PROFILE_STARTUP': '1',
+    'NK_SCREEN_PREFETCH': '0',
+    'NK_PERF': '0',
+    'PYGAME_HIDE_SUPPORT_PROMPT': '1',
+}
+SERVER_ENV = {
+    'DB_URL': 'sqlite:///:memory:',
+    'AI_ENABLED': 'False',
+    'STARTUP_MAINTENANCE_ENABLED': 'False',
+    'BACKGROUND_SERVICES_ENABLED': 'False',
+}
+
+
+# ── Probes (run inside the fresh interpreter) ──────────────────────────────
+
+def _emit(event: str, **fields: Any) -> None:
+    entry = {'event': event}
+    entry.update({k: round(v, 1) if isinstance(v, float) else v
+                  for k, v in fields.items()})
+    print(EVENT_PREFIX + json.dumps(entry, separators=(',', ':')), flush=True)
+
+
+def probe_client() -> None:
+    os.chdir(CLIENT_DIR)
+    sys.path.insert(0, str(CLIENT_DIR))
+    import asyncio
+
+    import nepal_kings as nk
+    from utils.startup_profile import StartupProfiler
+
+    client = nk.Client()
+
+    class _StopAfterFirstFrame(StartupProfiler):
+        def screen_presented(self, key, requested_ms):
+            super().screen_presented(key, requested_ms)
+            client.state.screen = None
+
+    profiler = _StopAfterFirstFrame(enabled=True)
+    profiler.first_interactive_ms = client.startup.first_interactive_ms
+    client.startup = profiler
+    asyncio.run(client.run_screen('login'))
+
+    for key in list(client._screen_factories):
+        client._create_screen(key, prefetch=True)
+
+
+def probe_server() -> None:
+    os.chdir(SERVER_DIR)
+    sys.path.insert(0, str(SERVER_DIR))
+    started = time.perf_counter()
+    import server
+    from models import db
+    _emit('server_boot', ms=(time.perf_counter() - started) * 1000.0)
+
+    with server.app.app_context():
+        started = time.perf_counter()
+        db.create_all()
+        _emit('server_schema', ms=(time.perf_counter() - started) * 1000.0)
+
+    http = server.app.test_client()
+    for event in ('server_first_request', 'server_second_request'):
+        started = time.perf_counter()
+        response = http.get('/healthz')
+        _emit(event, ms=(time.perf_counter() - started) * 1000.0,
+              status=response.status_code)
+
+
+PROBES = {'client': probe_client, 'server': probe_server}
+
+
+# ── Parsing ────────────────────────────────────────────────────────────────
+
+def parse_importtime(stderr: str) -> dict[str, float]:
+    """Cumulative import time in ms per module from ``-X importtime`` output."""
+    modules = {}
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'imported package' in line:
+            continue
+        try:
+            _self_us, cumulative_us, name = line[len('import time:'):].split('|', 2)
+            modules[name.strip()] = int(cumulative_us) / 1000.0
+        except ValueError:
+            continue
+    return modules
+
+
+def parse_events(stdout: str) -> list[dict[str, Any]]:
+    events = []
+    for line in stdout.splitlines():
+        if line.startswith(EVENT_PREFIX):
+            try:
+                events.append(json.loads(line[len(EVENT_PREFIX):]))
+            except ValueError:
+                continue
+    return events
+
+
+def run_metrics(events: list[dict[str, Any]],
+                imports: dict[str, float]) -> dict[str, float]:
+    """Flatten one run into ``metric name -> ms``."""
+    metrics = {}
+    for event in events:
+        kind = event.get('event')
+        if kind == 'boot':
+            metrics['boot_ms'] = event['ms']
+        elif kind == 'first_interactive':
+            metrics['first_interactive_ms'] = event['ms']
+        elif kind == 'screen_entered':
+            metrics.setdefault('first_frame_ms', event['ms'])
+        elif kind == 'screen_built':
+            metrics[f"screen.{event['screen']}_ms"] = event['ms']
+        elif kind and kind.startswith('server_'):
+            metrics[kind[len('server_'):] + '_ms'] = event['ms']
+    for name, ms in imports.items():
+        metrics[f'import.{name}_ms'] = ms
+    return metrics
+
+
+def run_once(target: str, timeout: float) -> dict[str, float]:
+    env = dict(os.environ)
+    env.update(CLIENT_ENV if target == 'client' else SERVER_ENV)
+    command = [sys.executable, '-X', 'importtime', str(Path(__file__).resolve()),
+               '--probe', target]
+    completed = subprocess.run(
+        command, capture_output=True, text=True, env=env, timeout=timeout,
+        cwd=str(REPO_ROOT))
+    if completed.returncode != 0:
+        tail = '\n'.join(completed.stderr.splitlines()[-15:])
+        raise RuntimeError(f'{target} probe failed ({completed.returncode}):\n{tail}')
+    return run_metrics(parse_events(completed.stdout),
+                       parse_importtime(completed.stderr))
+
+
+def median_metrics(runs: list[dict[str, float]]) -> dict[str, float]:
+    names = sorted({name for run in runs for name in run})
+    return {name: round(statistics.median(run[name] for run in runs if name in run), 1)
+            for name in names}
+
+
+# ── Budget ─────────────────────────────────────────────────────────────────
+
+def check_budget(results: dict[str, dict[str, float]],
+                 budget: dict[str, Any]) -> list[str]:
+    """Return one message per metric above its ceiling in ``budget``.
+
+    ``budget`` maps target -> metric name -> ms.  A ``"scale"`` entry at the
+    top level multiplies every ceiling (useful on slow CI runners).
+    Missing metrics are violations too, so a renamed screen cannot silently
+    drop out of the budget.
+    """
+    scale = float(budget.get('scale', 1.0))
+    violations = []
+    for target, ceilings in budget.items():
+        if target not in results or not isinstance(ceilings, dict):
+            continue
+        measured = results[target]
+        for name, ceiling in sorted(ceilings.items()):
+            limit = float(ceiling) * scale
+            value = measured.get(name)
+            if value is None:
+                violations.append(f'{target}.{name}: not measured (budget {limit:.0f} ms)')
+            elif value > limit:
+                violations.append(
+                    f'{target}.{name}: {value:.1f} ms > budget {limit:.0f} ms')
+    return violations
+
+
+# ── Reporting ──────────────────────────────────────────────────────────────
+
+def format_report(results: dict[str, dict[str, float]], runs: int,
+                  top_imports: int) -> str:
+    lines = []
+    for target, metrics in results.items():
+        lines.append(f'{target} (median of {runs} run{"s" if runs != 1 else ""})')
+        for name, ms in metrics.items():
+            if not name.startswith('import.'):
+                lines.append(f'  {name:<32} {ms:>9.1f} ms')
+        imports = sorted(
+            ((name[len('import.'):-len('_ms')], ms)
+             for name, ms in metrics.items() if name.startswith('import.')),
+            key=lambda item: -item[1])
+        if imports and top_imports:
+            lines.append('  slowest imports (cumulative):')
+            for name, ms in imports[:top_imports]:
+                lines.append(f'    {name:<40} {ms:>9.1f} ms')
+    return '\n'.join(lines)
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--target', choices=TARGETS + ('all',), default='all')
+    parser.add_argument('--runs', type=int, default=3)
+    parser.add_argument('--timeout', type=float, default=300.0,
+                        help='seconds per probe process')
+    parser.add_argument('--budget', type=Path,
+                        help='JSON budget; exit 1 when a median exceeds it')
+    parser.add_argument('--top-imports', type=int, default=12)
+    parser.add_argument('--json', action='store_true',
+                        help='print the medians as JSON')
+    parser.add_argument('--probe', choices=TARGETS, help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.probe:
+        PROBES[args.probe]()
+        return 0
+
+    targets = TARGETS if args.target == 'all' else (args.target,)
+    runs = max(1, args.runs)
+    results = {}
+    for target in targets:
+        results[target] = median_metrics(
+            [run_once(target, args.timeout) for _ in range(runs)])
+
+    if args.json:
+        print(json.dumps(results, indent=2, sort_keys=True))
+    else:
+        print(format_report(results, runs, args.top_imports))
+
+    if args.budget:
+        violations = check_budget(results, json.loads(args.budget.read_text()))
+        for message in violations:
+            print(f'BUDGET {message}', file=sys.stderr)
+        if violations:
+            return 1
+        print(f'All startup metrics within {args.budget}.')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
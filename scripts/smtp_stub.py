@@ -0,0 +1,183 @@
+"""Local stub SMTP server for tests and development.
+
+Accepts plain SMTP (no TLS, any or no login) and keeps every message in
+memory instead of delivering it.  Run it, then start the server as usual
+with ``SMTP_HOST=127.0.0.1 SMTP_PORT=1025 SMTP_STARTTLS=False``::
+
+    python scripts/smtp_stub.py --port 1025
+
+Tests use :class:`StubSMTPServer` directly; ``fail_next(n)`` makes the next
+``n`` messages fail with a temporary ``451`` reply, and ``connections``
+counts the TCP sessions a client opened.
+"""
+
+from __future__ import annotations
+
+import argparse
+import re
+import socketserver
+import threading
+import time
+from email import message_from_bytes, policy
+
+
+_ADDRESS = re.compile(r'<([^>]*)>')
+
+
+def _address(line):
+    match = _ADDRESS.search(line)
+    return match.group(1) if match else line.split(':', 1)[-1].strip()
+
+
+class _SMTPHandler(socketserver.StreamRequestHandler):
+    def _reply(self, line):
+        self.wfile.write((line + '\r\n').encode('ascii'))
+
+    def _read_data(self):
+        lines = []
+        while True:
+            raw = self.rfile.readline()
+            if not raw or raw in (b'.\r\n', b'.\n'):
+                break
+            if raw.startswith(b'..'):
+                raw = raw[1:]
+            lines.append(raw)
+        return b''.join(lines)
+
+    def handle(self):
+        server = self.server
+        server.count_connection()
+        self._reply('220 nepalkings-stub ESMTP')
+        sender, recipients = None, []
+        while True:
+            raw = self.rfile.readline()
+            if not raw:
+                return
+            line = raw.decode('utf-8', 'replace').strip()
+            verb = line.split(' ', 1)[0].upper()
+            if verb == 'EHLO':
+                self._reply('250-nepalkings-stub')
+                self._reply('250-AUTH PLAIN LOGIN')
+                self._reply('250 8BITMIME')
+            elif verb == 'HELO':
+                self._reply('250 nepalkings-stub')
+            elif verb == 'AUTH':
+                self._reply('235 2.7.0 Authentication successful')
+            elif verb == 'MAIL':
+                sender, recipients = _address(line), []
+                self._reply('250 OK')
+            elif verb == 'RCPT':
+                recipients.append(_address(line))
+                self._reply('250 OK')
+            elif verb == 'DATA':
+                self._reply('354 End data with <CR><LF>.<CR><LF>')
+                data = self._read_data()
+                if server.take_failure():
+                    self._reply('451 4.3.0 Temporary failure')
+                else:
+                    server.store(sender, recipients, data)
+                    self._reply('250 OK queued')
+                sender, recipients = None, []
+            elif verb in ('RSET', 'NOOP'):
+                self._reply('250 OK')
+            elif verb == 'QUIT':
+                self._reply('221 Bye')
+                return
+            else:
+                self._reply('502 Command not implemented')
+
+
+class StubSMTPServer(socketserver.ThreadingTCPServer):
+    """In-memory SMTP sink listening on ``host``:``port`` (0 = any free port)."""
+
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self, host='127.0.0.1', port=0):
+        super().__init__((host, port), _SMTPHandler)
+        self._lock = threading.Lock()
+        self._thread = None
+        self.messages = []
+        self.connections = 0
+        self._failures = 0
+
+    @property
+    def host(self):
+        return self.server_address[0]
+
+    @property
+    def port(self):
+        return self.server_address[1]
+
+    def count_connection(self):
+        with self._lock:
+            self.connections += 1
+
+    def fail_next(self, count=1):
+        with self._lock:
+            self._failures += count
+
+    def take_failure(self):
+        with self._lock:
+            if self._failures <= 0:
+                return False
+            self._failures -= 1
+            return True
+
+    def store(self, sender, recipients, data):
+        message = message_from_bytes(data, policy=policy.default)
+        with self._lock:
+            self.messages.append({
+                'from': sender,
+                'to': list(recipients),
+                'subject': str(message['Subject']),
+                'body': message.get_content(),
+            })
+
+    def wait_for(self, count, timeout=5.0):
+        """Block until ``count`` messages arrived; returns whether they did."""
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            with self._lock:
+                if len(self.messages) >= count:
+                    return True
+            time.sleep(0.01)
+        return False
+
+    def start(self):
+        self._thread = threading.Thread(target=self.serve_forever, daemon=True,
+                                        name='smtp-stub')
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.shutdown()
+        self.server_close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=1025)
+    args = parser.parse_args(argv)
+
+    server = StubSMTPServer(args.host, args.port)
+    print(f'Stub SMTP server on {server.host}:{server.port} (Ctrl+C to stop)')
+    seen = 0
+    server.start()
+    try:
+        while True:
+            time.sleep(0.5)
+            for message in server.messages[seen:]:
+                print(f"--- to {', '.join(message['to'])}: {message['subject']}")
+                print(message['body'])
+            seen = len(server.messages)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.stop()
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
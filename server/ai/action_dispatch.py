@@ -0,0 +1,95 @@
+# Copyright (c) 2026 Marc Stieffenhofer. All rights reserved.
+# See LICENSE file in the project root for full license information.
+"""
+In-process dispatch of AI actions.
+
+The AI worker performs every move through the public game routes so it is
+held to exactly the same validation as a human client.  Instead of POSTing
+those requests back to ``settings.SERVER_URL`` over loopback HTTP, this
+module runs them through the Flask request pipeline of the current
+process: ``before_request`` hooks (game transaction lock, maintenance and
+feature switches), ``require_token``, the view itself and the
+``after_request`` hooks all run as they would for a real request, but no
+socket, WSGI worker slot or HTTP timeout is involved.
+
+Each action gets its own app context, and therefore its own database
+session, mirroring the isolation the HTTP round trip used to provide.
+AI loops post from scheduler threads, usually after their own app context
+has closed, so the app is bound once through :func:`bind_app` rather than
+looked up from the caller's context.
+"""
+import logging
+from urllib.parse import urlsplit
+
+from flask import current_app, has_app_context
+
+import server_settings as settings
+
+logger = logging.getLogger('nepalkings.ai.dispatch')
+
+DISPATCH_IN_PROCESS = 'inprocess'
+DISPATCH_HTTP = 'http'
+
+_bound_app = None
+
+
+class InProcessResponse:
+    """The subset of ``requests.Response`` the AI worker relies on."""
+
+    def __init__(self, flask_response):
+        self.status_code = flask_response.status_code
+        self.ok = 200 <= self.status_code < 400
+        self.text = flask_response.get_data(as_text=True)
+        self._json = flask_response.get_json(silent=True)
+
+    def json(self):
+        if self._json is None:
+            raise ValueError(f'Response is not JSON (status {self.status_code})')
+        return self._json
+
+
+def in_process_path(url):
+    """Return the route path for ``url`` when it targets this server, else None."""
+    base = (settings.SERVER_URL or '').rstrip('/')
+    if not base or not url.startswith(base):
+        return None
+    rest = url[len(base):]
+    if rest and not rest.startswith('/'):
+        return None
+    parts = urlsplit(rest or '/')
+    return parts.path + (f'?{parts.query}' if parts.query else '')
+
+
+def bind_app(app):
+    """Use ``app`` for actions posted outside any app context."""
+    global _bound_app
+    _bound_app = app
+
+
+def _dispatch_app():
+    if has_app_context():
+        return current_app._get_current_object()
+    return _bound_app
+
+
+def dispatch_enabled():
+    """True when AI actions should skip the loopback HTTP round trip."""
+    mode = str(getattr(settings, 'AI_ACTION_DISPATCH', DISPATCH_IN_PROCESS))
+    return mode.strip().lower() == DISPATCH_IN_PROCESS and _dispatch_app() is not None
+
+
+def dispatch_post(path, headers=None, json=None):
+    """Run ``POST path`` through this process's Flask app and return the response."""
+    app = _dispatch_app()
+    with app.app_context():
+        with app.test_request_context(
+            path,
+            method='POST',
+            json=json if json is not None else {},
+            headers=headers or {},
+        ):
+            try:
+                response = app.full_dispatch_request()
+            except Exception as exc:  # mirrors Flask.wsgi_app
+                response = app.handle_exception(exc)
+            return InProcessResponse(response)
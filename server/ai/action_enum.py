@@ -14,6 +14,7 @@ from ai.card_change_strategy import (
     summarize_side_change,
 )
 from ai.figure_recipes import find_buildable_figures
+from ai.state_index import GameStateIndex, support_bonus
 
 logger = logging.getLogger('nepalkings.ai.actions')
 
@@ -77,7 +78,7 @@ def _has_own_war_modifier(game_dict, ai_player):
     return False
 
 
-def _enum_forced_counter_advance(game_dict, ai_player, action_id):
+def _enum_forced_counter_advance(game_dict, ai_player, action_id, index):
     """Enumerate legal counter-advance actions for the defender side."""
     actions = []
 
@@ -132,8 +133,7 @@ def _enum_forced_counter_advance(game_dict, ai_player, action_id):
     resting_ids = set(game_dict.get('resting_figure_ids', []))
 
     # Skip figures in resource deficit (server rejects counter-advance for them).
-    from ai.game_state import compute_resource_totals as _crt
-    eff_prod, tot_req = _crt(ai_player.get('figures', []))
+    eff_prod, tot_req = index.resource_totals(ai_player.get('figures', []))
 
     for fig in ai_player.get('figures', []):
         fig_id = fig.get('id')
@@ -165,7 +165,7 @@ def _enum_forced_counter_advance(game_dict, ai_player, action_id):
         if fig.get('must_be_attacked'):
             continue
 
-        power = _est_figure_power(fig, ai_player.get('figures', []))
+        power = _est_figure_power(fig, ai_player.get('figures', []), index)
         if required_color:
             desc = (
                 f"COUNTER-ADVANCE (Civil War second pick): {fig.get('name', '?')} "
@@ -185,18 +185,7 @@ def _enum_forced_counter_advance(game_dict, ai_player, action_id):
     return actions, action_id
 
 
-def _find_figure_by_id(game_dict, figure_id):
-    """Find a serialized figure in game_dict by ID."""
-    if figure_id is None:
-        return None
-    for player in game_dict.get('players', []):
-        for fig in player.get('figures', []):
-            if fig.get('id') == figure_id:
-                return fig
-    return None
-
-
-def _selectable_defender_targets_if_ai_passes(game_dict, ai_player):
+def _selectable_defender_targets_if_ai_passes(game_dict, ai_player, index):
     """Figures the invader could choose if AI does not counter-advance now."""
     targets = [f for f in ai_player.get('figures', [])
                if not f.get('cannot_be_targeted') and not f.get('cannot_defend')]
@@ -208,7 +197,7 @@ def _selectable_defender_targets_if_ai_passes(game_dict, ai_player):
         targets = [f for f in targets if f.get('field') == required_field]
 
     if has_civil_war:
-        advancing_fig = _find_figure_by_id(game_dict, game_dict.get('advancing_figure_id'))
+        advancing_fig = index.figure(game_dict.get('advancing_figure_id'))
         required_color = advancing_fig.get('color') if advancing_fig else None
         if required_color:
             targets = [f for f in targets if f.get('color') == required_color]
@@ -238,9 +227,9 @@ def _defender_matches_battle_modifier(fig, *, required_field=None,
     return True
 
 
-def _should_force_defender_counter_advance(game_dict, ai_player):
+def _should_force_defender_counter_advance(game_dict, ai_player, index):
     """Return (force, reason) for defender-side counter-advance policy."""
-    targets = _selectable_defender_targets_if_ai_passes(game_dict, ai_player)
+    targets = _selectable_defender_targets_if_ai_passes(game_dict, ai_player, index)
 
     # If the invader effectively has no choice, passing is less risky.
     if len(targets) <= 1:
@@ -248,8 +237,7 @@ def _should_force_defender_counter_advance(game_dict, ai_player):
 
     # Resource-deficit figures are especially vulnerable because being selected
     # can immediately trigger auto-loss on the server.
-    from ai.game_state import compute_resource_totals as _crt
-    eff_prod, tot_req = _crt(ai_player.get('figures', []))
+    eff_prod, tot_req = index.resource_totals(ai_player.get('figures', []))
     for fig in targets:
         reqs = fig.get('requires') or {}
         in_deficit = any(tot_req.get(res, 0) > eff_prod.get(res, 0) for res in reqs)
@@ -259,7 +247,7 @@ def _should_force_defender_counter_advance(game_dict, ai_player):
     # If invader has multiple defender options and power spread is large,
     # they can pick the weak one. Force counter-advance in that case.
     ai_figs = ai_player.get('figures', [])
-    powers = [_est_figure_power(f, ai_figs) for f in targets]
+    powers = [_est_figure_power(f, ai_figs, index) for f in targets]
     if powers and (max(powers) - min(powers) >= 4):
         return True, 'vulnerable_target_spread'
 
@@ -273,7 +261,7 @@ def _should_force_defender_counter_advance(game_dict, ai_player):
     return True, 'default_prefer_counter_advance'
 
 
-def _est_power(fig, all_figures=None):
+def _est_power(fig, all_figures=None, index=None):
     """Estimate figure power including support bonus (castle=15 base)."""
     if not fig:
         return 0
@@ -283,11 +271,50 @@ def _est_power(fig, all_figures=None):
         cards = fig.get('cards_to_figure', [])
         base = sum(c.get('card_value', c.get('value', 0)) for c in cards)
     if all_figures:
-        from ai.game_state import compute_support_bonus
-        base += compute_support_bonus(fig, all_figures)
+        base += support_bonus(fig, all_figures, index)
     return base
 
 
+# Scalar ``Game`` columns read by :func:`detect_phase` (directly or through
+# its helpers).  Keep in sync when detect_phase starts reading a new key.
+PHASE_GAME_FIELDS = (
+    'id', 'state', 'mode', 'turn_player_id', 'pending_spell_id',
+    'waiting_for_counter_player_id', 'battle_modifier',
+    'advancing_figure_id', 'advancing_figure_id_2', 'advancing_player_id',
+    'defending_figure_id', 'defending_figure_id_2', 'battle_decisions',
+    'battle_confirmed', 'battle_moves_confirmed', 'fold_winner_id',
+    'battle_turn_player_id', 'battle_skipped_rounds',
+)
+
+
+def phase_state(game) -> dict:
+    """
+    Build the slice of ``game.serialize()`` that :func:`detect_phase` reads.
+
+    Only the phase columns, player ids and — while a battle is confirmed —
+    the ``(player_id, played_round)`` pairs of the battle moves or conquer
+    tactics are loaded, so asking "does the AI need to act?" costs a couple
+    of narrow queries instead of serializing the whole game graph.
+    """
+    state = {field: getattr(game, field) for field in PHASE_GAME_FIELDS}
+    state['conquer_move_model'] = game.conquer_move_model or 'battle_move'
+    state['players'] = [{'id': player.id} for player in game.players]
+    if game.battle_confirmed:
+        from models import BattleMove, ConquerTactic, db
+        if game.mode == 'conquer' and state['conquer_move_model'] == 'tactics_hand':
+            key, model = 'conquer_tactics', ConquerTactic
+        else:
+            key, model = 'battle_moves', BattleMove
+        rows = (
+            db.session.query(model.player_id, model.played_round)
+            .filter(model.game_id == game.id)
+            .all()
+        )
+        state[key] = [{'player_id': pid, 'played_round': played_round}
+                      for pid, played_round in rows]
+    return state
+
+
 def detect_phase(game_dict: dict, ai_player_id: int) -> str:
     """
     Determine the current game phase from the AI player's perspective.
@@ -419,22 +446,27 @@ def _all_battle_rounds_done(game_dict: dict, ai_player_id: int) -> bool:
     return True
 
 
-def enumerate_actions(game_dict: dict, ai_player_id: int, phase: str) -> list:
+def enumerate_actions(game_dict: dict, ai_player_id: int, phase: str,
+                      index: GameStateIndex | None = None) -> list:
     """
     List all legal actions for the AI in the given phase.
     
     Returns a list of dicts:
     [{'id': 1, 'type': 'build_figure', 'description': '...', 'params': {...}}, ...]
+
+    ``index`` is an optional :class:`GameStateIndex` for ``game_dict``;
+    pass it on to ``duel_strategy.choose_action`` to share its caches.
     """
-    ai_player = _get_ai_player(game_dict, ai_player_id)
-    opponent = _get_opponent(game_dict, ai_player_id)
+    index = GameStateIndex.of(game_dict, index)
+    ai_player = index.player(ai_player_id) or {}
+    opponent = index.opponent(ai_player_id) or {}
 
     if phase == 'normal_turn':
-        return _enum_normal_turn(game_dict, ai_player, opponent)
+        return _enum_normal_turn(game_dict, ai_player, opponent, index)
     elif phase == 'select_defender':
-        return _enum_select_defender(game_dict, ai_player, opponent)
+        return _enum_select_defender(game_dict, ai_player, opponent, index)
     elif phase == 'battle_decision':
-        return _enum_battle_decision(game_dict, ai_player, opponent)
+        return _enum_battle_decision(game_dict, ai_player, opponent, index)
     elif phase == 'battle_shop':
         # Conquer tactics-hand games skip the legacy battle_shop buy/confirm
         # phase: the configured battle moves are already the player's
@@ -444,11 +476,11 @@ def enumerate_actions(game_dict: dict, ai_player_id: int, phase: str) -> list:
         if (game_dict.get('mode') == 'conquer'
                 and (game_dict.get('conquer_move_model') or 'battle_move') == 'tactics_hand'):
             return []
-        return _enum_battle_shop(game_dict, ai_player, opponent)
+        return _enum_battle_shop(game_dict, ai_player, opponent, index)
     elif phase == 'battle_round':
-        return _enum_battle_round(game_dict, ai_player, opponent)
+        return _enum_battle_round(game_dict, ai_player, opponent, index)
     elif phase == 'counter_spell':
-        return _enum_counter_spell(game_dict, ai_player, opponent)
+        return _enum_counter_spell(game_dict, ai_player, opponent, index)
     else:
         return []
 
@@ -466,7 +498,7 @@ def format_actions_for_llm(actions: list) -> str:
 # ── Phase-specific enumerators ──────────────────────────────────
 
 
-def _enum_normal_turn(game_dict, ai_player, opponent):
+def _enum_normal_turn(game_dict, ai_player, opponent, index):
     """Enumerate actions for a normal turn."""
     actions = []
     action_id = 1
@@ -475,8 +507,7 @@ def _enum_normal_turn(game_dict, ai_player, opponent):
     infinite_hammer_active = _has_active_infinite_hammer(game_dict, ai_player)
 
     # Compute current resource balance for deficit analysis
-    from ai.game_state import compute_resource_totals
-    current_produces, current_requires = compute_resource_totals(ai_player.get('figures', []))
+    current_produces, current_requires = index.resource_totals(ai_player.get('figures', []))
 
     # Determine whether the invader is on their last turn and MUST advance.
     is_invader = (game_dict.get('invader_player_id') == ai_player.get('id'))
@@ -486,16 +517,16 @@ def _enum_normal_turn(game_dict, ai_player, opponent):
     # Force counter-advance after own Civil War/Peasant War when legal, so AI
     # consistently leverages its own tactics spell investment.
     if not infinite_hammer_active and _has_own_war_modifier(game_dict, ai_player):
-        forced_actions, _next_id = _enum_forced_counter_advance(game_dict, ai_player, action_id)
+        forced_actions, _next_id = _enum_forced_counter_advance(game_dict, ai_player, action_id, index)
         if forced_actions:
             return forced_actions
 
     # General defender policy: in most cases, counter-advance is better than
     # spending the turn and letting the invader choose your defender.
     if not infinite_hammer_active:
-        counter_actions, next_action_id = _enum_forced_counter_advance(game_dict, ai_player, action_id)
+        counter_actions, next_action_id = _enum_forced_counter_advance(game_dict, ai_player, action_id, index)
         if counter_actions:
-            force_counter, reason = _should_force_defender_counter_advance(game_dict, ai_player)
+            force_counter, reason = _should_force_defender_counter_advance(game_dict, ai_player, index)
             if force_counter:
                 return counter_actions
 
@@ -581,8 +612,7 @@ def _enum_normal_turn(game_dict, ai_player, opponent):
         required_field = _battle_required_field_from_dict(game_dict)
         has_civil_war = _civil_war_pick_flow_active(game_dict)
         # Compute which figures are in deficit (cannot advance)
-        from ai.game_state import compute_resource_totals as _crt
-        _eff_prod, _tot_req = _crt(ai_player.get('figures', []))
+        _eff_prod, _tot_req = index.resource_totals(ai_player.get('figures', []))
         for fig in ai_player.get('figures', []):
             fig_id = fig['id']
             # Skip figures that can't attack or are resting
@@ -604,7 +634,7 @@ def _enum_normal_turn(game_dict, ai_player, opponent):
                     break
             if in_deficit:
                 continue
-            power = _est_figure_power(fig, ai_player.get('figures', []))
+            power = _est_figure_power(fig, ai_player.get('figures', []), index)
             field = fig.get('field', '?')
             checkmate_warn = " ⚠️ CHECKMATE RISK" if fig.get('checkmate') else ""
             modifier_note = ""
@@ -641,7 +671,7 @@ def _enum_normal_turn(game_dict, ai_player, opponent):
 
     # 3) Cast spells — blocked during Infinite Hammer and when invader must advance
     if not infinite_hammer_active and not must_advance:
-        spell_actions, action_id = _enum_spells(game_dict, ai_player, opponent, action_id)
+        spell_actions, action_id = _enum_spells(game_dict, ai_player, opponent, action_id, index)
         actions.extend(spell_actions)
 
     # 4) Change cards — blocked during Infinite Hammer and when invader must advance
@@ -652,7 +682,7 @@ def _enum_normal_turn(game_dict, ai_player, opponent):
         free_cards = [c for c in ai_player.get('main_hand', [])
                       if not c.get('part_of_figure') and not c.get('part_of_battle_move')]
         from ai.figure_completion import best_figure_targets
-        top_targets = best_figure_targets(game_dict, ai_player.get('id'), max_results=3)
+        top_targets = best_figure_targets(game_dict, ai_player.get('id'), max_results=3, index=index)
         protect_ids = compute_tactic_protected_ids(free_cards, top_targets, max_targets=3)
         summary = summarize_main_change(free_cards, protect_ids=protect_ids)
         swap_count = summary.get('swap_count', 0)
@@ -679,7 +709,7 @@ def _enum_normal_turn(game_dict, ai_player, opponent):
                      if not c.get('part_of_figure') and not c.get('part_of_battle_move')]
         if free_side:
             from ai.figure_completion import best_figure_targets
-            side_targets = best_figure_targets(game_dict, ai_player.get('id'), max_results=3)
+            side_targets = best_figure_targets(game_dict, ai_player.get('id'), max_results=3, index=index)
             side_protect_ids = compute_side_tactic_protected_ids(free_side, side_targets, max_targets=3)
             side_summary = summarize_side_change(free_side, protect_ids=side_protect_ids)
             side_swap = side_summary.get('swap_count', 0)
@@ -716,7 +746,7 @@ def _enum_normal_turn(game_dict, ai_player, opponent):
     return actions
 
 
-def _enum_select_defender(game_dict, ai_player, opponent):
+def _enum_select_defender(game_dict, ai_player, opponent, index):
     """
     The AI (as invader) selects which OPPONENT figure to fight.
     Includes power estimates to help the LLM choose strategically.
@@ -729,7 +759,7 @@ def _enum_select_defender(game_dict, ai_player, opponent):
     ai_power = 0
     for fig in ai_player.get('figures', []):
         if fig['id'] == adv_fig_id:
-            ai_power = _est_figure_power(fig, ai_player.get('figures', []))
+            ai_power = _est_figure_power(fig, ai_player.get('figures', []), index)
             break
 
     # Check battle modifier restrictions on defender selection
@@ -771,7 +801,7 @@ def _enum_select_defender(game_dict, ai_player, opponent):
 
     opp_figs = opponent.get('figures', [])
     for fig in eligible:
-        fig_power = _est_figure_power(fig, opp_figs)
+        fig_power = _est_figure_power(fig, opp_figs, index)
         diff = ai_power - fig_power
         field = fig.get('field', '?')
         abilities = []
@@ -793,7 +823,7 @@ def _enum_select_defender(game_dict, ai_player, opponent):
     # Fallback: if no non-checkmate targets, allow checkmate figures
     if not actions and checkmate_fallback:
         for fig in checkmate_fallback:
-            fig_power = _est_figure_power(fig, opp_figs)
+            fig_power = _est_figure_power(fig, opp_figs, index)
             diff = ai_power - fig_power
             field = fig.get('field', '?')
             actions.append({
@@ -826,7 +856,7 @@ def _enum_select_defender(game_dict, ai_player, opponent):
     return actions
 
 
-def _est_figure_power(fig, all_figures=None):
+def _est_figure_power(fig, all_figures=None, index=None):
     """Quick power estimate including support bonus (castle=15 base)."""
     if fig.get('field') == 'castle':
         base = 15
@@ -834,8 +864,7 @@ def _est_figure_power(fig, all_figures=None):
         cards = fig.get('cards_to_figure', [])
         base = sum(c.get('card_value', c.get('value', 0)) for c in cards)
     if all_figures:
-        from ai.game_state import compute_support_bonus
-        base += compute_support_bonus(fig, all_figures)
+        base += support_bonus(fig, all_figures, index)
     return base
 
 
@@ -922,7 +951,7 @@ def _is_high_impact_build_option(build_option, current_produces, current_require
     return False
 
 
-def _enum_battle_decision(game_dict, ai_player, opponent):
+def _enum_battle_decision(game_dict, ai_player, opponent, index):
     """AI decides to fold or battle, with rich context about the figures involved."""
     # Find the advancing and defending figures
     adv_fig_id = game_dict.get('advancing_figure_id')
@@ -944,8 +973,8 @@ def _enum_battle_decision(game_dict, ai_player, opponent):
             else:
                 ai_fig = f
 
-    ai_power = _est_power(ai_fig, ai_player.get('figures', []))
-    opp_power = _est_power(opp_fig, opponent.get('figures', []))
+    ai_power = _est_power(ai_fig, ai_player.get('figures', []), index)
+    opp_power = _est_power(opp_fig, opponent.get('figures', []), index)
     ai_fig_name = ai_fig['name'] if ai_fig else '?'
     opp_fig_name = opp_fig['name'] if opp_fig else '?'
 
@@ -982,7 +1011,7 @@ def _enum_battle_decision(game_dict, ai_player, opponent):
     return actions
 
 
-def _enum_battle_shop(game_dict, ai_player, opponent):
+def _enum_battle_shop(game_dict, ai_player, opponent, index):
     """
     AI buys battle moves from hand cards, can combine, and confirms.
     Returns buy + combine + confirm actions.
@@ -1017,7 +1046,7 @@ def _enum_battle_shop(game_dict, ai_player, opponent):
             if fig_color != card_color:
                 continue
             # Base figure power
-            power = _est_power(fig, ai_figures)
+            power = _est_power(fig, ai_figures, index)
             # Healer buff: +4 per same-suit Healer for village figures
             # (Healer buffs are added to base power, so called villagers benefit)
             if target_field == 'village':
@@ -1141,7 +1170,7 @@ _RED_SUITS = {'Hearts', 'Diamonds'}
 _BLACK_SUITS = {'Clubs', 'Spades'}
 
 
-def _figure_power_from_dict(fig, all_figures=None):
+def _figure_power_from_dict(fig, all_figures=None, index=None):
     """Compute power including support bonus from a serialized figure dict."""
     if fig.get('field') == 'castle':
         base = 15
@@ -1149,8 +1178,7 @@ def _figure_power_from_dict(fig, all_figures=None):
         cards = fig.get('cards', fig.get('cards_to_figure', []))
         base = sum(c.get('value', 0) for c in cards)
     if all_figures:
-        from ai.game_state import compute_support_bonus
-        base += compute_support_bonus(fig, all_figures)
+        base += support_bonus(fig, all_figures, index)
     return base
 
 
@@ -1181,7 +1209,7 @@ def _get_player_gamble_state(game_dict, player_id):
     return used_count, used_rounds
 
 
-def _get_best_call_figure(move, game_dict, ai_player):
+def _get_best_call_figure(move, game_dict, ai_player, index):
     """Return the best eligible figure dict for a Call move, or None."""
     family = move.get('family_name', '')
     field_type = _CALL_FIELD_MAP.get(family)
@@ -1222,7 +1250,7 @@ def _get_best_call_figure(move, game_dict, ai_player):
             continue
         if not bm_is_red and fig_suit not in _BLACK_SUITS:
             continue
-        power = _figure_power_from_dict(fig, ai_player.get('figures', []))
+        power = _figure_power_from_dict(fig, ai_player.get('figures', []), index)
         if power > best_power:
             best_power = power
             best_fig = fig
@@ -1230,7 +1258,7 @@ def _get_best_call_figure(move, game_dict, ai_player):
     return best_fig
 
 
-def _enum_battle_round(game_dict, ai_player, opponent):
+def _enum_battle_round(game_dict, ai_player, opponent, index):
     """AI plays a battle move, may gamble once this round, or skips."""
     actions = []
     action_id = 1
@@ -1254,10 +1282,10 @@ def _enum_battle_round(game_dict, ai_player, opponent):
         params = {'battle_move_id': move['id']}
 
         # For Call moves, auto-select the best eligible figure
-        call_fig = _get_best_call_figure(move, game_dict, ai_player) if family in _CALL_FIELD_MAP else None
+        call_fig = _get_best_call_figure(move, game_dict, ai_player, index) if family in _CALL_FIELD_MAP else None
         if call_fig:
             params['call_figure_id'] = call_fig['id']
-            fig_power = _figure_power_from_dict(call_fig, ai_player.get('figures', []))
+            fig_power = _figure_power_from_dict(call_fig, ai_player.get('figures', []), index)
             combined = fig_power + (move.get('value', 0) or 0)
             desc = (f"Play {family} "
                     f"(card={move.get('value', '?')}) + "
@@ -1296,9 +1324,9 @@ def _enum_battle_round(game_dict, ai_player, opponent):
             move_val = move.get('value', 0)
 
             if family in _CALL_FIELD_MAP:
-                call_fig = _get_best_call_figure(move, game_dict, ai_player)
+                call_fig = _get_best_call_figure(move, game_dict, ai_player, index)
                 if call_fig:
-                    fig_power = _figure_power_from_dict(call_fig, ai_player.get('figures', []))
+                    fig_power = _figure_power_from_dict(call_fig, ai_player.get('figures', []), index)
                     suit_bonus = move_val if move.get('suit') == call_fig.get('suit') else 0
                     eff_power = fig_power + suit_bonus
                     desc = (
@@ -1377,7 +1405,7 @@ def _enum_battle_round(game_dict, ai_player, opponent):
     return actions
 
 
-def _enum_counter_spell(game_dict, ai_player, opponent):
+def _enum_counter_spell(game_dict, ai_player, opponent, index):
     """AI decides whether to allow or counter a pending spell.
     Enriched with spell details and counter-cost info."""
     pending_spell_id = game_dict.get('pending_spell_id')
@@ -1486,7 +1514,7 @@ _RED_SUITS_SET = {'Hearts', 'Diamonds'}
 _BLACK_SUITS_SET = {'Clubs', 'Spades'}
 
 
-def _enum_spells(game_dict, ai_player, opponent, action_id):
+def _enum_spells(game_dict, ai_player, opponent, action_id, index):
     """
     Enumerate all castable spells from the AI's hand.
     Returns (actions_list, next_action_id).
@@ -1640,7 +1668,7 @@ def _enum_spells(game_dict, ai_player, opponent, action_id):
         for fig in opp_figures:
             if fig.get('checkmate'):
                 continue  # Can't poison Maharaja
-            fig_power = _est_figure_power(fig, opp_figures)
+            fig_power = _est_figure_power(fig, opp_figures, index)
             desc_cards = '+'.join(f"{c['rank']}{c['suit'][:1]}" for c in poison_cards)
             actions.append({
                 'id': action_id, 'type': 'cast_spell',
@@ -1660,7 +1688,7 @@ def _enum_spells(game_dict, ai_player, opponent, action_id):
         for fig in ai_figures:
             if fig.get('checkmate'):
                 continue  # Can't boost Maharaja (immune to spells)
-            fig_power = _est_figure_power(fig, ai_figures)
+            fig_power = _est_figure_power(fig, ai_figures, index)
             desc_cards = '+'.join(f"{c['rank']}{c['suit'][:1]}" for c in hb_cards)
             actions.append({
                 'id': action_id, 'type': 'cast_spell',
@@ -1699,7 +1727,7 @@ def _enum_spells(game_dict, ai_player, opponent, action_id):
             for fig in opp_figures:
                 if fig.get('checkmate'):
                     continue
-                fig_power = _est_figure_power(fig, opp_figures)
+                fig_power = _est_figure_power(fig, opp_figures, index)
                 desc_cards = '+'.join(f"{c['rank']}{c['suit'][:1]}" for c in cards)
                 actions.append({
                     'id': action_id, 'type': 'cast_spell',
@@ -1728,8 +1756,7 @@ def _enum_spells(game_dict, ai_player, opponent, action_id):
                           if not card.get('part_of_figure') and not card.get('part_of_battle_move')]
         post_hammer_builds = find_buildable_figures(remaining_main, remaining_side, ai_figures)
 
-        from ai.game_state import compute_resource_totals as _crt
-        curr_prod, curr_req = _crt(ai_figures)
+        curr_prod, curr_req = index.resource_totals(ai_figures)
         impactful_builds = [
             b for b in post_hammer_builds
             if _is_high_impact_build_option(b, curr_prod, curr_req)
@@ -1862,20 +1889,3 @@ def _enum_spells(game_dict, ai_player, opponent, action_id):
             break
 
     return actions, action_id
-
-
-# ── Helpers ────────────────────────────────────────────────────
-
-
-def _get_ai_player(game_dict, ai_player_id):
-    for p in game_dict['players']:
-        if p['id'] == ai_player_id:
-            return p
-    return {}
-
-
-def _get_opponent(game_dict, ai_player_id):
-    for p in game_dict['players']:
-        if p['id'] != ai_player_id:
-            return p
-    return {}
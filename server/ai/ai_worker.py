@@ -5,8 +5,9 @@ from __future__ import annotations
 AI Worker — event-driven background AI player.
 
 When a game state change puts an AI player in a position where they need
-to act, `trigger_ai_if_needed(game_id)` spawns a short-lived daemon thread
-that reads the game state and executes the chosen action. Duel-mode
+to act, `trigger_ai_if_needed(game_id)` queues the game's AI loop on the
+bounded `ai.scheduler.AIScheduler` pool, which reads the game state and
+executes the chosen actions. Duel-mode
 decisions are computed by `ai.duel_strategy`; conquer-mode decisions are
 computed inline by the deterministic helpers below.
 """
@@ -18,9 +19,11 @@ import requests as http_requests
 
 import server_settings as settings
 from ai import get_ai_auth_headers
+from ai.action_dispatch import bind_app, dispatch_enabled, dispatch_post, in_process_path
+from ai.scheduler import AIScheduler
 from ai.defence.generator import get_ai_defence_template_for_land
 from ai.game_state import enrich_figures_with_skills
-from ai.action_enum import detect_phase, enumerate_actions
+from ai.action_enum import detect_phase, enumerate_actions, phase_state
 from ai.card_change_strategy import (
     compute_side_tactic_protected_ids,
     compute_tactic_protected_ids,
@@ -30,6 +33,7 @@ from ai.card_change_strategy import (
     summarize_side_change,
 )
 from ai import duel_strategy
+from ai.state_index import GameStateIndex
 from game_service.conquer_counter_spells import CONQUER_DEFENCE_COUNTER_SPELLS
 
 logger = logging.getLogger('nepalkings.ai.worker')
@@ -50,10 +54,9 @@ _ai_watchdog_lock = threading.Lock()
 # game. Independent of the retry-count cap so a pathologically stuck game
 # can't be retried for many minutes if each retry happens to take a while.
 _WATCHDOG_MAX_WALL_SECONDS = 120.0
-# Lock to prevent multiple AI threads for the same game
-_active_games = set()
-_active_games_lock = threading.Lock()
-_pending_retrigger = set()  # Games that need rechecking after current loop
+# Runs AI loops and watchdog retries on a fixed pool; also dedupes per game
+# (one queued or running loop, plus at most one follow-up).
+_ai_scheduler = AIScheduler(settings.AI_WORKER_POOL_SIZE)
 # Per-game planner telemetry events for debugging/rollout visibility
 _planner_events = {}  # game_id -> [event, ...]
 _planner_events_lock = threading.Lock()
@@ -120,6 +123,11 @@ def get_ai_debug_snapshot(game_id, max_notes=20, max_events=40):
     }
 
 
+def get_ai_scheduler_metrics():
+    """Return queue depth, pool usage and latency counters of the AI pool."""
+    return _ai_scheduler.metrics()
+
+
 def _ai_headers(ai_player_id):
     """Return auth headers for requests made on behalf of an AI player."""
     with _ai_player_user_ids_lock:
@@ -213,9 +221,6 @@ def _schedule_watchdog_retry(app, game_id, ai_player_id, reason):
 
     def _retry():
         try:
-            if delay_seconds > 0:
-                time.sleep(delay_seconds)
-
             with app.app_context():
                 from models import Game, db
                 game = db.session.get(Game, game_id)
@@ -223,8 +228,7 @@ def _schedule_watchdog_retry(app, game_id, ai_player_id, reason):
                     _clear_watchdog_retry(game_id)
                     return
 
-                game_dict = enrich_figures_with_skills(game.serialize())
-                phase = detect_phase(game_dict, ai_player_id)
+                phase = detect_phase(phase_state(game), ai_player_id)
                 if not phase:
                     _clear_watchdog_retry(game_id)
                     return
@@ -237,19 +241,22 @@ def _schedule_watchdog_retry(app, game_id, ai_player_id, reason):
         except Exception as e:
             logger.error(f"AI watchdog retry crashed for game {game_id}: {e}", exc_info=True)
 
-    threading.Thread(
-        target=_retry,
-        daemon=True,
-        name=f"ai-watchdog-{game_id}-{attempt}",
-    ).start()
+    _ai_scheduler.submit(('watchdog', game_id), _retry, delay=delay_seconds)
 
 
 def _ai_post(url, ai_player_id, **kwargs):
-    """POST with AI authentication headers. Defaults timeout to 15s."""
+    """POST with AI authentication headers. Defaults timeout to 15s.
+
+    Requests to this server are dispatched in-process (see
+    ``ai.action_dispatch``) unless ``AI_ACTION_DISPATCH`` is ``'http'``.
+    """
     kwargs.setdefault('timeout', 15)
     headers = kwargs.pop('headers', {}) or {}
     headers.update(_ai_headers(ai_player_id))
     headers[_AI_INTERNAL_REQUEST_HEADER] = '1'
+    path = in_process_path(url) if dispatch_enabled() else None
+    if path is not None:
+        return dispatch_post(path, headers=headers, json=kwargs.get('json'))
     return http_requests.post(url, headers=headers, **kwargs)
 
 
@@ -296,7 +303,7 @@ def _conquer_automated_defender_player(game):
 def trigger_ai_if_needed(game_id, app=None):
     """
     Check if an AI player needs to act in this game, and if so,
-    spawn a background thread to handle it.
+    queue its AI loop on the scheduler pool.
     
     Called at the end of state-mutating route handlers.
     This function returns immediately — the AI work happens asynchronously.
@@ -337,32 +344,21 @@ def trigger_ai_if_needed(game_id, app=None):
     with _ai_player_user_ids_lock:
         _ai_player_user_ids[automated_player.id] = automated_player.user_id
     
-    # Check if the AI actually needs to act right now
-    game_dict = enrich_figures_with_skills(game.serialize())
-    if not game_dict:
-        logger.warning(f"AI trigger: game.serialize() returned None/empty for game {game_id}")
-        return
+    # Check if the AI actually needs to act right now.  Only the phase
+    # columns are read here; the loop serializes the full game once it acts.
     try:
-        phase = detect_phase(game_dict, automated_player.id)
+        phase = detect_phase(phase_state(game), automated_player.id)
     except Exception as e:
         logger.error(f"AI trigger: detect_phase crashed for game {game_id}: {e}", exc_info=True)
         return
     if not phase:
         logger.debug(
             f"AI trigger for game {game_id}: no action needed "
-            f"(turn={game_dict.get('turn_player_id')}, "
+            f"(turn={game.turn_player_id}, "
             f"actor={automated_player.id})"
         )
         return
     
-    # Avoid spawning duplicate threads for the same game
-    with _active_games_lock:
-        if game_id in _active_games:
-            _pending_retrigger.add(game_id)
-            logger.info(f"AI trigger for game {game_id}: thread active, marked retrigger")
-            return
-        _active_games.add(game_id)
-    
     # Get the Flask app for context (needed in background thread)
     if app is None:
         from flask import current_app
@@ -370,23 +366,26 @@ def trigger_ai_if_needed(game_id, app=None):
             app = current_app._get_current_object()
         except RuntimeError:
             logger.error("No Flask app context available for AI thread")
-            with _active_games_lock:
-                _active_games.discard(game_id)
             return
-    
-    # Pick the right loop — conquer games use simple rule-based logic
-    loop_fn = _conquer_ai_loop if game.mode == 'conquer' else _ai_game_loop
-
-    # Spawn background thread
-    thread = threading.Thread(
-        target=loop_fn,
-        args=(app, game_id, automated_player.id),
-        daemon=True,
-        name=f"ai-game-{game_id}",
-    )
-    thread.start()
+    # The loops post their actions from scheduler threads.
+    bind_app(app)
+
+    # Pick the right loop — conquer games use simple rule-based logic.
+    # The think delay is spent waiting in the scheduler queue.
+    if game.mode == 'conquer':
+        loop_fn = _conquer_ai_loop
+        think_delay = max(settings.AI_THINK_DELAY * 0.5, 0.3)
+    else:
+        loop_fn = _ai_game_loop
+        think_delay = settings.AI_THINK_DELAY
+
+    outcome = _ai_scheduler.submit(
+        game_id, loop_fn, (app, game_id, automated_player.id), delay=think_delay)
+    if outcome == AIScheduler.RETRIGGER:
+        logger.info(f"AI trigger for game {game_id}: loop active, marked retrigger")
+        return
     logger.info(
-        f"AI thread spawned for game {game_id}, phase={phase}, "
+        f"AI loop {outcome} for game {game_id}, phase={phase}, "
         f"mode={game.mode}, actor={automated_player.id}"
     )
 
@@ -1277,22 +1276,47 @@ def _conquer_civil_war_second_pick_pending(game, ai_player_id):
     return False
 
 
-def _conquer_ai_loop(app, game_id, ai_player_id):
+class _ConquerLoopState:
+    """Progress of one conquer defender run, carried across deferred steps."""
+
+    __slots__ = ('iteration', 'rechecking', 'paused')
+
+    def __init__(self):
+        self.iteration = 0
+        self.rechecking = False  # Waiting out a turn-flip race
+        self.paused = False  # Realism pause before the next action is done
+
+
+def _conquer_ai_loop(app, game_id, ai_player_id, loop_state=None):
     """Rule-based defender auto-play for conquer-mode games.
 
     Unlike the LLM-backed ``_ai_game_loop``, this loop makes deterministic
     decisions: always counter-advance with the pre-configured battle figure,
     always fight (never fold), auto-confirm pre-populated battle moves, and
     play battle rounds via strongest-move policy (optionally using auto-gamble).
+
+    On a pool worker its pauses re-queue the loop with ``loop_state``, like
+    the duel loop.  Direct calls and a pool size of ``0`` (tests, the
+    watchdog) sleep through them and return once the run is over.
     """
+    state = loop_state or _ConquerLoopState()
+
+    def _pause(delay):
+        """Wait ``delay`` seconds; True when the loop was re-queued instead."""
+        if _ai_scheduler.in_pool_job(game_id):
+            _ai_scheduler.defer(game_id, _conquer_ai_loop,
+                                (app, game_id, ai_player_id, state), delay=delay)
+            return True
+        time.sleep(delay)
+        return False
+
     try:
-        time.sleep(max(settings.AI_THINK_DELAY * 0.5, 0.3))
         base = settings.SERVER_URL
         max_iterations = 20
 
-        for iteration in range(max_iterations):
+        while state.iteration < max_iterations:
             with app.app_context():
-                from models import Game, Player, Figure, BattleMove, db
+                from models import Game, db
                 game = db.session.get(Game, game_id)
                 if not game or game.state == 'finished':
                     logger.info(f"[CONQUER-AI] game {game_id} finished/gone")
@@ -1302,19 +1326,24 @@ def _conquer_ai_loop(app, game_id, ai_player_id):
 
             phase = detect_phase(game_dict, ai_player_id)
             if not phase:
-                # Brief wait for turn flip race
-                time.sleep(1)
-                with app.app_context():
-                    from models import Game, db
-                    game = db.session.get(Game, game_id)
-                    if game and game.state != 'finished':
-                        phase = detect_phase(game.serialize(), ai_player_id)
-                if not phase:
+                if state.rechecking:
                     logger.info(f"[CONQUER-AI] no action for game {game_id}")
                     break
+                # Brief wait for turn flip race
+                state.rechecking = True
+                if _pause(1):
+                    return
+                continue
+            state.rechecking = False
 
+            if not state.paused:
+                state.paused = True
+                if _pause(0.3):  # Small delay for realism
+                    return
+            state.paused = False
+            iteration = state.iteration
+            state.iteration += 1
             logger.info(f"[CONQUER-AI] game={game_id} phase={phase} iter={iteration}")
-            time.sleep(0.3)  # Small delay for realism
 
             if phase == 'normal_turn':
                 # Defender response: configured counter spells replace counter-advance.
@@ -1538,35 +1567,48 @@ def _conquer_ai_loop(app, game_id, ai_player_id):
 
     except Exception:
         logger.error(f"[CONQUER-AI] crash in game {game_id}", exc_info=True)
-    finally:
-        retrigger = False
-        with _active_games_lock:
-            _active_games.discard(game_id)
-            if game_id in _pending_retrigger:
-                _pending_retrigger.discard(game_id)
-                retrigger = True
-        if retrigger:
-            logger.info(f"[CONQUER-AI] processing pending retrigger for game {game_id}")
-            with app.app_context():
-                trigger_ai_if_needed(game_id, app=app)
+    # A retrigger submitted meanwhile is re-queued by the scheduler once
+    # this loop returns.
+
+
+class _DuelLoopState:
+    """Progress of one AI turn, carried across deferred loop steps."""
 
+    __slots__ = ('iteration', 'called_start_turn', 'consecutive_normal_turns',
+                 'rechecking')
 
-def _ai_game_loop(app, game_id, ai_player_id):
+    def __init__(self):
+        self.iteration = 0
+        self.called_start_turn = False
+        self.consecutive_normal_turns = 0  # Track Infinite Hammer multi-build sequences
+        self.rechecking = False  # Deferred recheck after "no action needed"
+
+
+def _ai_game_loop(app, game_id, ai_player_id, loop_state=None):
     """
-    Main AI loop. Runs in a background thread.
+    Main AI loop. Runs on an AI scheduler worker once the think delay passed.
     Keeps acting as long as it's the AI's turn (handles multi-step phases like battle shop).
+
+    Pauses between actions are not slept on the worker: the loop returns
+    after :meth:`AIScheduler.defer` re-queues it with ``loop_state``, so a
+    pool thread is free for other games while this one "thinks".
     """
+    state = loop_state or _DuelLoopState()
+    deferred = False
+    unsuccessful_exit = False
+
+    def _defer(delay):
+        nonlocal deferred
+        deferred = True
+        _ai_scheduler.defer(game_id, _ai_game_loop,
+                            (app, game_id, ai_player_id, state), delay=delay)
+
     try:
-        time.sleep(settings.AI_THINK_DELAY)
-        
         max_iterations = 20  # Safety limit to prevent infinite loops
-        iteration = 0
-        called_start_turn = False
-        consecutive_normal_turns = 0  # Track Infinite Hammer multi-build sequences
-        unsuccessful_exit = False
         
-        while iteration < max_iterations:
-            iteration += 1
+        while state.iteration < max_iterations:
+            state.iteration += 1
+            iteration = state.iteration
             
             with app.app_context():
                 from models import Game, db
@@ -1582,45 +1624,39 @@ def _ai_game_loop(app, game_id, ai_player_id):
                 game_dict = enrich_figures_with_skills(game.serialize())
             
             phase = detect_phase(game_dict, ai_player_id)
-            if not phase:
+            if not phase and not state.rechecking:
                 # Check if a concurrent request marked us for retrigger
-                with _active_games_lock:
-                    if game_id in _pending_retrigger:
-                        _pending_retrigger.discard(game_id)
-                        logger.info(f"AI retrigger received for game {game_id}, continuing")
-                        time.sleep(1)
-                        called_start_turn = False
-                        continue
+                if _ai_scheduler.consume_retrigger(game_id):
+                    logger.info(f"AI retrigger received for game {game_id}, continuing")
+                    state.called_start_turn = False
+                    _defer(1)
+                    return
                 # Wait briefly and recheck — handles race where opponent's POST
                 # flips the turn while we're winding down
-                time.sleep(3)
-                with app.app_context():
-                    from models import Game, db
-                    game = db.session.get(Game, game_id)
-                    if game and game.state != 'finished':
-                        game_dict = enrich_figures_with_skills(game.serialize())
-                        phase = detect_phase(game_dict, ai_player_id)
+                state.rechecking = True
+                _defer(3)
+                return
+            if state.rechecking:
+                state.rechecking = False
                 if phase:
                     logger.info(f"AI detected deferred action in game {game_id}, phase={phase}")
-                    called_start_turn = False
-                    continue
-                # Final retrigger check after the wait
-                with _active_games_lock:
-                    if game_id in _pending_retrigger:
-                        _pending_retrigger.discard(game_id)
+                    state.called_start_turn = False
+                else:
+                    # Final retrigger check after the wait
+                    if _ai_scheduler.consume_retrigger(game_id):
                         logger.info(f"AI retrigger (post-wait) for game {game_id}")
-                        called_start_turn = False
+                        state.called_start_turn = False
                         continue
-                logger.info(f"AI loop exit: no action needed in game {game_id}")
-                _clear_watchdog_retry(game_id)
-                break
+                    logger.info(f"AI loop exit: no action needed in game {game_id}")
+                    _clear_watchdog_retry(game_id)
+                    break
             
             logger.info(f"AI acting in game {game_id}: phase={phase}, iteration={iteration}")
             
             # Call start_turn once at the beginning of AI's turn (auto-fills cards)
-            if phase == 'normal_turn' and not called_start_turn:
+            if phase == 'normal_turn' and not state.called_start_turn:
                 _exec_start_turn(settings.SERVER_URL, game_id, ai_player_id)
-                called_start_turn = True
+                state.called_start_turn = True
                 # Re-fetch game state after start_turn (cards may have been filled)
                 with app.app_context():
                     from models import Game, db
@@ -1639,8 +1675,8 @@ def _ai_game_loop(app, game_id, ai_player_id):
                 result = _handle_finish_battle(app, game_id, ai_player_id, game_dict)
                 if result:
                     # After finish_battle, check if we need to pick a card or handle draw
-                    time.sleep(1)
-                    continue  # Loop will detect post_battle_pick or exit
+                    _defer(1)  # Next step will detect post_battle_pick or exit
+                    return
                 unsuccessful_exit = True
                 break
             
@@ -1650,9 +1686,11 @@ def _ai_game_loop(app, game_id, ai_player_id):
                 _clear_watchdog_retry(game_id)
                 break  # After picking, new round starts — turn might be ours or opponent's
             
+            # One lookup index per decision, shared by enumeration and strategy.
+            state_index = GameStateIndex(game_dict)
             # Enumerate legal actions (needs app context for DB queries, e.g. counter_spell)
             with app.app_context():
-                actions = enumerate_actions(game_dict, ai_player_id, phase)
+                actions = enumerate_actions(game_dict, ai_player_id, phase, index=state_index)
             if not actions:
                 logger.warning(f"AI has no actions in phase {phase} for game {game_id}")
                 unsuccessful_exit = True
@@ -1669,7 +1707,7 @@ def _ai_game_loop(app, game_id, ai_player_id):
                 }
                 chosen = duel_strategy.choose_action(
                     game_dict, ai_player_id, phase, actions, rng,
-                    context=planner_context,
+                    context=planner_context, index=state_index,
                 )
 
             # Execute the chosen action
@@ -1724,6 +1762,7 @@ def _ai_game_loop(app, game_id, ai_player_id):
                         try:
                             retry = duel_strategy.choose_action(
                                 game_dict, ai_player_id, phase, remaining, rng,
+                                index=state_index,
                             )
                         except Exception as _err:  # pragma: no cover - safety
                             retry = remaining[0]
@@ -1741,8 +1780,8 @@ def _ai_game_loop(app, game_id, ai_player_id):
                 # Fallback action succeeded — recovery path, not a clean
                 # cycle; reset the anti-cycling counter and continue.
                 _recent_change_cards[game_id] = 0
-                time.sleep(settings.AI_THINK_DELAY)
-                continue
+                _defer(settings.AI_THINK_DELAY)
+                return
 
             _clear_watchdog_retry(game_id)
 
@@ -1755,34 +1794,30 @@ def _ai_game_loop(app, game_id, ai_player_id):
 
             # Track consecutive normal_turn actions (indicates Infinite Hammer mode)
             if phase == 'normal_turn':
-                consecutive_normal_turns += 1
+                state.consecutive_normal_turns += 1
             else:
-                consecutive_normal_turns = 0
+                state.consecutive_normal_turns = 0
 
             # Small delay between consecutive actions (battle shop: buy → buy → confirm)
             if phase in ('battle_shop',):
-                time.sleep(1)
-            elif consecutive_normal_turns > 1:
+                _defer(1)
+            elif state.consecutive_normal_turns > 1:
                 # Infinite Hammer: longer delay to avoid saturating PythonAnywhere's
                 # limited web workers with AI self-calls
-                time.sleep(settings.AI_THINK_DELAY + 3)
+                _defer(settings.AI_THINK_DELAY + 3)
             else:
-                time.sleep(settings.AI_THINK_DELAY)
+                _defer(settings.AI_THINK_DELAY)
+            return
     
     except Exception as e:
         unsuccessful_exit = True
         logger.error(f"AI thread error for game {game_id}: {e}", exc_info=True)
     finally:
-        retrigger = False
-        with _active_games_lock:
-            _active_games.discard(game_id)
-            if game_id in _pending_retrigger:
-                _pending_retrigger.discard(game_id)
-                retrigger = True
-        if retrigger:
-            logger.info(f"Processing pending retrigger for game {game_id} after thread exit")
-            with app.app_context():
-                trigger_ai_if_needed(game_id, app=app)
+        if deferred:
+            logger.debug(f"AI loop for game {game_id} continues after its think delay")
+        elif _ai_scheduler.has_retrigger(game_id):
+            # The scheduler re-queues the pending retrigger once we return.
+            logger.info(f"Pending retrigger for game {game_id} will run after loop exit")
         elif unsuccessful_exit:
             try:
                 with app.app_context():
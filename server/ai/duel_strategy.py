@@ -9,6 +9,10 @@ Public surface: `choose_action`. All other functions are private.
 
 Determinism: every decision is a pure function of (game_dict, ai_player_id,
 phase, actions, rng). Pass a `random.Random(seed)` for replay.
+
+Player, figure and support-bonus lookups go through one
+`ai.state_index.GameStateIndex` per decision; pass the index the actions
+were enumerated with to share its caches.
 """
 from __future__ import annotations
 
@@ -17,6 +21,7 @@ import math
 from typing import Any
 
 from ai import strategy_planner
+from ai.state_index import GameStateIndex, support_bonus
 
 logger = logging.getLogger(__name__)
 
@@ -48,6 +53,7 @@ def choose_action(
     actions: list[dict[str, Any]],
     rng,
     context: dict[str, Any] | None = None,
+    index: GameStateIndex | None = None,
 ) -> dict[str, Any]:
     """Pick exactly one action from `actions`.
 
@@ -58,6 +64,8 @@ def choose_action(
     `context` is an optional per-game decision-history dict (currently used
     by the normal_turn planner to apply an anti-cycling penalty when the AI
     has just spent several turns in a row on change_cards).
+
+    `index` is an optional `GameStateIndex` for `game_dict`.
     """
     if not actions:
         raise ValueError("duel_strategy.choose_action called with no actions")
@@ -68,14 +76,16 @@ def choose_action(
     if handler is None:
         logger.warning("duel_strategy: unknown phase %r, returning first action", phase)
         return actions[0]
+    index = GameStateIndex.of(game_dict, index)
     if phase == 'normal_turn':
-        return _choose_normal_turn(game_dict, ai_player_id, actions, rng, context=context)
-    return handler(game_dict, ai_player_id, actions, rng)
+        return _choose_normal_turn(game_dict, ai_player_id, actions, rng,
+                                   context=context, index=index)
+    return handler(game_dict, ai_player_id, actions, rng, index=index)
 
 
 # ── Phase handlers ──────────────────────────────────────────────────
 
-def _choose_normal_turn(game_dict, ai_player_id, actions, rng, context=None):
+def _choose_normal_turn(game_dict, ai_player_id, actions, rng, context=None, index=None):
     plans = strategy_planner.generate_strategy_plans(
         game_dict,
         ai_player_id,
@@ -83,6 +93,7 @@ def _choose_normal_turn(game_dict, ai_player_id, actions, rng, context=None):
         actions,
         max_plans=max(NORMAL_TURN_TOP_K, min(len(actions), 12)),
         context=context,
+        index=index,
     )
     if not plans:
         return actions[0]
@@ -101,12 +112,13 @@ def _choose_normal_turn(game_dict, ai_player_id, actions, rng, context=None):
     )
 
 
-def _choose_defender(game_dict, ai_player_id, actions, rng):
+def _choose_defender(game_dict, ai_player_id, actions, rng, index=None):
     """Prefer the weakest enemy figure (lowest power). Softmax-sample top-k."""
-    opp = _opponent(game_dict, ai_player_id)
+    index = GameStateIndex.of(game_dict, index)
+    opp = _opponent(index, ai_player_id)
     opp_figs = opp.get('figures', []) or []
     power_by_id = {
-        f.get('id'): _estimate_figure_power(f, opp_figs) for f in opp_figs
+        f.get('id'): _estimate_figure_power(f, opp_figs, index) for f in opp_figs
     }
     scored = []
     for action in actions:
@@ -121,9 +133,9 @@ def _choose_defender(game_dict, ai_player_id, actions, rng):
     )
 
 
-def _choose_battle_decision(game_dict, ai_player_id, actions, rng):
+def _choose_battle_decision(game_dict, ai_player_id, actions, rng, index=None):
     """Fold when the estimated total advantage is bad; otherwise fight."""
-    advantage = _estimated_battle_advantage(game_dict, ai_player_id)
+    advantage = _estimated_battle_advantage(game_dict, ai_player_id, index)
     fight = _by_decision(actions, 'battle')
     fold = _by_decision(actions, 'fold')
     if fight is None:
@@ -135,7 +147,7 @@ def _choose_battle_decision(game_dict, ai_player_id, actions, rng):
     return fight
 
 
-def _choose_battle_round(game_dict, ai_player_id, actions, rng):
+def _choose_battle_round(game_dict, ai_player_id, actions, rng, index=None):
     """Pick the best move for this battle round. Mirrors conquer policy.
 
     Order of preference (matches ``_conquer_play_battle_round``):
@@ -165,11 +177,12 @@ def _choose_battle_round(game_dict, ai_player_id, actions, rng):
                                      'combine_conquer_tactics')]
     skips = [a for a in actions if a.get('type') == 'skip_battle_turn']
 
-    own = _own_player(game_dict, ai_player_id)
+    index = GameStateIndex.of(game_dict, index)
+    own = _own_player(index, ai_player_id)
     ai_figs = own.get('figures', []) or []
     moves_by_id = _battle_moves_by_id(game_dict)
-    opp_blocked = _opponent_played_block_this_round(game_dict, ai_player_id)
-    opp_round_value = _opponent_current_round_value(game_dict, ai_player_id)
+    opp_blocked = _opponent_played_block_this_round(game_dict, ai_player_id, index)
+    opp_round_value = _opponent_current_round_value(game_dict, ai_player_id, index)
 
     # Score each play action; index by move id for gamble cross-reference.
     scored_plays = []
@@ -179,7 +192,7 @@ def _choose_battle_round(game_dict, ai_player_id, actions, rng):
         mv_id = params.get('battle_move_id')
         move = moves_by_id.get(mv_id) or {}
         call_id = params.get('call_figure_id')
-        score = _score_battle_move_play(move, call_id, ai_figs, opp_round_value)
+        score = _score_battle_move_play(move, call_id, ai_figs, opp_round_value, index)
         scored_plays.append({'action': action, 'score': score, 'move': move})
         if mv_id is not None:
             play_score_by_move_id[mv_id] = score
@@ -252,7 +265,7 @@ def _choose_battle_round(game_dict, ai_player_id, actions, rng):
     return actions[0]
 
 
-def _choose_battle_shop(game_dict, ai_player_id, actions, rng):
+def _choose_battle_shop(game_dict, ai_player_id, actions, rng, index=None):
     """Confirm when offered; otherwise combine daggers; otherwise buy strong."""
     by_type: dict[str, list] = {}
     for action in actions:
@@ -269,14 +282,15 @@ def _choose_battle_shop(game_dict, ai_player_id, actions, rng):
         )
     if by_type.get('buy_battle_move'):
         buys = by_type['buy_battle_move']
-        scored = [(a, _score_buy_action(a, game_dict, ai_player_id)) for a in buys]
+        index = GameStateIndex.of(game_dict, index)
+        scored = [(a, _score_buy_action(a, game_dict, ai_player_id, index)) for a in buys]
         return _softmax_sample(
             scored, rng, BATTLE_SHOP_TEMPERATURE, top_k=BATTLE_SHOP_TOP_K,
         )
     return actions[0]
 
 
-def _choose_counter_spell(game_dict, ai_player_id, actions, rng):
+def _choose_counter_spell(game_dict, ai_player_id, actions, rng, index=None):
     """Allow by default. Counter only when we have the cards AND it hurts us."""
     allow = next((a for a in actions if a.get('type') == 'allow_spell'), None)
     counter = next((a for a in actions if a.get('type') == 'counter_spell'), None)
@@ -293,7 +307,7 @@ def _choose_counter_spell(game_dict, ai_player_id, actions, rng):
         return allow
 
     spell_name = params.get('counter_spell_name', '') or ''
-    if _estimated_spell_harm(spell_name, game_dict, ai_player_id) < COUNTER_SPELL_HARM_THRESHOLD:
+    if _estimated_spell_harm(spell_name, game_dict, ai_player_id, index) < COUNTER_SPELL_HARM_THRESHOLD:
         return allow
     return counter
 
@@ -337,18 +351,12 @@ def _softmax_sample(scored, rng, temperature: float, top_k: int | None):
     return scored[-1][0]
 
 
-def _own_player(game_dict, ai_player_id):
-    for p in game_dict.get('players', []) or []:
-        if p.get('id') == ai_player_id:
-            return p
-    return {}
+def _own_player(index, ai_player_id):
+    return index.player(ai_player_id) or {}
 
 
-def _opponent(game_dict, ai_player_id):
-    for p in game_dict.get('players', []) or []:
-        if p.get('id') != ai_player_id:
-            return p
-    return {}
+def _opponent(index, ai_player_id):
+    return index.opponent(ai_player_id) or {}
 
 
 def _by_decision(actions, decision):
@@ -358,7 +366,7 @@ def _by_decision(actions, decision):
     return None
 
 
-def _estimate_figure_power(fig, peer_figures):
+def _estimate_figure_power(fig, peer_figures, index=None):
     """Power estimate from a figure dict. Mirrors action_enum._est_power."""
     if not fig:
         return 0
@@ -371,22 +379,22 @@ def _estimate_figure_power(fig, peer_figures):
         )
     if peer_figures:
         try:
-            from ai.game_state import compute_support_bonus
-            base += compute_support_bonus(fig, peer_figures)
+            base += support_bonus(fig, peer_figures, index)
         except Exception:
             pass
     return int(base)
 
 
-def _estimated_battle_advantage(game_dict, ai_player_id):
+def _estimated_battle_advantage(game_dict, ai_player_id, index=None):
     """Rough total-advantage estimate at the battle_decision moment.
 
     Combines our figure power - their figure power, plus our expected top-3
     battle move value minus a rough opponent move estimate (proportional to
     their main-hand size).
     """
-    own = _own_player(game_dict, ai_player_id)
-    opp = _opponent(game_dict, ai_player_id)
+    index = GameStateIndex.of(game_dict, index)
+    own = _own_player(index, ai_player_id)
+    opp = _opponent(index, ai_player_id)
 
     adv_id = game_dict.get('advancing_figure_id')
     def_id = game_dict.get('defending_figure_id')
@@ -398,8 +406,8 @@ def _estimated_battle_advantage(game_dict, ai_player_id):
     opp_figs = opp.get('figures', []) or []
     own_fig = next((f for f in own_figs if f.get('id') == own_fig_id), None)
     opp_fig = next((f for f in opp_figs if f.get('id') == opp_fig_id), None)
-    own_power = _estimate_figure_power(own_fig, own_figs)
-    opp_power = _estimate_figure_power(opp_fig, opp_figs)
+    own_power = _estimate_figure_power(own_fig, own_figs, index)
+    opp_power = _estimate_figure_power(opp_fig, opp_figs, index)
 
     battle_cards = [
         c for c in own.get('main_hand', []) or []
@@ -433,12 +441,12 @@ def _battle_moves_by_id(game_dict):
     return out
 
 
-def _opponent_played_block_this_round(game_dict, ai_player_id):
+def _opponent_played_block_this_round(game_dict, ai_player_id, index=None):
     """True when the opponent has already played a Block in the current
     battle round. When this is the case, the round neutralises to 0-0 no
     matter what we do, so we should sacrifice the weakest card we hold.
     """
-    opp = _opponent(game_dict, ai_player_id)
+    opp = _opponent(GameStateIndex.of(game_dict, index), ai_player_id)
     if not opp:
         return False
     opp_id = opp.get('id')
@@ -453,10 +461,11 @@ def _opponent_played_block_this_round(game_dict, ai_player_id):
     return False
 
 
-def _opponent_current_round_value(game_dict, ai_player_id):
+def _opponent_current_round_value(game_dict, ai_player_id, index=None):
     """If the opponent has already played a move this battle round, return
     its rough effective value; otherwise None."""
-    opp = _opponent(game_dict, ai_player_id)
+    index = GameStateIndex.of(game_dict, index)
+    opp = _opponent(index, ai_player_id)
     if not opp:
         return None
     current_round = game_dict.get('battle_round')
@@ -480,11 +489,11 @@ def _opponent_current_round_value(game_dict, ai_player_id):
     call_id = opp_move.get('call_figure_id')
     opp_figs = opp.get('figures', []) or []
     call_fig = next((f for f in opp_figs if f.get('id') == call_id), None) if call_id else None
-    return _score_battle_move_play(opp_move, call_id, opp_figs, None) \
+    return _score_battle_move_play(opp_move, call_id, opp_figs, None, index) \
         if call_fig is not None else int(opp_move.get('value') or 0)
 
 
-def _score_battle_move_play(move, call_figure_id, own_figures, opp_round_value):
+def _score_battle_move_play(move, call_figure_id, own_figures, opp_round_value, index=None):
     """Score a 'play_battle_move' style action by its effective combat value.
 
     Mirrors `_conquer_move_effective_value` on dict data. Block scoring keys
@@ -508,7 +517,7 @@ def _score_battle_move_play(move, call_figure_id, own_figures, opp_round_value):
     if not call_fig:
         return base
 
-    fig_power = _estimate_figure_power(call_fig, own_figures)
+    fig_power = _estimate_figure_power(call_fig, own_figures, index)
     move_suit = (move.get('suit') or '').lower()
     fig_suit = (call_fig.get('suit') or '').lower()
     if move_suit and move_suit == fig_suit:
@@ -539,7 +548,7 @@ _BUY_RANK_SCORE = {
 }
 
 
-def _score_buy_action(action, game_dict, ai_player_id):
+def _score_buy_action(action, game_dict, ai_player_id, index=None):
     """Score a `buy_battle_move` action.
 
     Call moves with an eligible figure score by that figure's power; Block
@@ -552,7 +561,8 @@ def _score_buy_action(action, game_dict, ai_player_id):
     value = int(params.get('value', 0) or 0)
 
     if family in ('Call King', 'Call Military', 'Call Villager'):
-        own_figs = _own_player(game_dict, ai_player_id).get('figures', []) or []
+        index = GameStateIndex.of(game_dict, index)
+        own_figs = _own_player(index, ai_player_id).get('figures', []) or []
         field_map = {
             'Call King': 'castle',
             'Call Military': 'military',
@@ -568,7 +578,7 @@ def _score_buy_action(action, game_dict, ai_player_id):
             fig_color = 'red' if fig_suit in _RED_SUITS else 'black'
             if fig_color != card_color:
                 continue
-            power = _estimate_figure_power(fig, own_figs)
+            power = _estimate_figure_power(fig, own_figs, index)
             if suit == fig_suit:
                 power += value
             if power > best:
@@ -597,7 +607,7 @@ _SPELL_BASE_HARM = {
 }
 
 
-def _estimated_spell_harm(spell_name, game_dict, ai_player_id):
+def _estimated_spell_harm(spell_name, game_dict, ai_player_id, index=None):
     """How much does the opponent's pending spell hurt us? Higher = worse.
 
     Base score per spell type, +2 if we're meaningfully ahead on figure count
@@ -605,8 +615,9 @@ def _estimated_spell_harm(spell_name, game_dict, ai_player_id):
     restricting their battle pool).
     """
     base = _SPELL_BASE_HARM.get(spell_name, 3)
-    own = _own_player(game_dict, ai_player_id)
-    opp = _opponent(game_dict, ai_player_id)
+    index = GameStateIndex.of(game_dict, index)
+    own = _own_player(index, ai_player_id)
+    opp = _opponent(index, ai_player_id)
     own_n = len(own.get('figures', []) or [])
     opp_n = len(opp.get('figures', []) or [])
     if own_n > opp_n + 1:
@@ -10,12 +10,8 @@ from math import ceil
 from typing import Any
 
 from ai.figure_recipes import FIGURE_RECIPES
-from ai.game_state import compute_resource_totals
-from ai.probability_engine import (
-    get_deck_counts,
-    probability_at_least,
-    probability_meet_requirements,
-)
+from ai.probability_engine import probability_at_least, probability_meet_requirements
+from ai.state_index import GameStateIndex
 
 
 _RANK_VALUE_MAP = {
@@ -83,22 +79,6 @@ def _card_key(card: dict[str, Any]) -> tuple[str | None, str | None]:
     return card.get('rank'), card.get('suit')
 
 
-def _find_player(game_dict: dict[str, Any], player_id: int) -> dict[str, Any] | None:
-    return next((p for p in game_dict.get('players', []) if p.get('id') == player_id), None)
-
-
-def _free_hand_cards(player: dict[str, Any], hand_key: str) -> list[dict[str, Any]]:
-    cards = player.get(hand_key, [])
-    return [
-        c for c in cards
-        if not c.get('part_of_figure') and not c.get('part_of_battle_move')
-    ]
-
-
-def _free_hand_counts(player: dict[str, Any], hand_key: str) -> Counter[tuple[str | None, str | None]]:
-    return Counter(_card_key(c) for c in _free_hand_cards(player, hand_key))
-
-
 def _card_numeric_value(card: dict[str, Any]) -> int:
     raw_value = card.get('value')
     try:
@@ -230,11 +210,11 @@ def _best_number_value_from_hand(
 
 
 def _resource_gap_after_build(
-    figures: list[dict[str, Any]],
+    current_totals: tuple[dict[str, int], dict[str, int]],
     produces: dict[str, int],
     requires: dict[str, int],
 ) -> dict[str, int]:
-    current_produces, current_requires = compute_resource_totals(figures)
+    current_produces, current_requires = current_totals
 
     sim_produces = dict(current_produces)
     sim_requires = dict(current_requires)
@@ -261,12 +241,16 @@ def estimate_figure_completion(
     remaining_turns: int | None = None,
     max_main_draws_per_turn: int = 2,
     max_side_draws_per_turn: int = 1,
+    index: GameStateIndex | None = None,
 ) -> list[dict[str, Any]]:
     """Estimate completion status/probability for each figure recipe variant.
 
     Returns deterministic estimates sorted by likely impact and feasibility.
+    ``index`` is an optional :class:`GameStateIndex` for ``game_dict``; the
+    estimate dicts are then shared by every caller within that decision.
     """
-    player = _find_player(game_dict, ai_player_id)
+    index = GameStateIndex.of(game_dict, index)
+    player = index.player(ai_player_id)
     if not player:
         return []
 
@@ -277,14 +261,31 @@ def estimate_figure_completion(
     base_main_draws_per_turn = max(0, int(max_main_draws_per_turn))
     base_side_draws_per_turn = max(0, int(max_side_draws_per_turn))
 
-    free_main_cards = _free_hand_cards(player, 'main_hand')
-    free_side_cards = _free_hand_cards(player, 'side_hand')
-    hand_main = _free_hand_counts(player, 'main_hand')
-    hand_side = _free_hand_counts(player, 'side_hand')
-    deck_main = get_deck_counts(game_dict, card_type='main')
-    deck_side = get_deck_counts(game_dict, card_type='side')
+    # Enumeration and the planner ask the same question within one decision.
+    key = ('figure_completion', ai_player_id, horizon,
+           base_main_draws_per_turn, base_side_draws_per_turn)
+    return list(index.memo(key, lambda: _estimate_recipes(
+        index, player, ai_player_id, horizon,
+        base_main_draws_per_turn, base_side_draws_per_turn,
+    )))
+
 
-    figures = list(player.get('figures', []))
+def _estimate_recipes(
+    index: GameStateIndex,
+    player: dict[str, Any],
+    ai_player_id: int,
+    horizon: int,
+    base_main_draws_per_turn: int,
+    base_side_draws_per_turn: int,
+) -> list[dict[str, Any]]:
+    free_main_cards = index.free_hand_cards(ai_player_id, 'main_hand')
+    free_side_cards = index.free_hand_cards(ai_player_id, 'side_hand')
+    hand_main = index.free_hand_counts(ai_player_id, 'main_hand')
+    hand_side = index.free_hand_counts(ai_player_id, 'side_hand')
+    deck_main = index.deck_counts('main')
+    deck_side = index.deck_counts('side')
+
+    current_totals = index.resource_totals(player.get('figures', []))
     estimates: list[FigureCompletionEstimate] = []
 
     for recipe in FIGURE_RECIPES:
@@ -392,7 +393,7 @@ def estimate_figure_completion(
                 requires = dict(recipe.get('requires', {}))
 
             produces = dict(recipe.get('produces_fn', lambda _s, _n: {})(suit, int(number_value_assumed)))
-            gap = _resource_gap_after_build(figures, produces=produces, requires=requires)
+            gap = _resource_gap_after_build(current_totals, produces=produces, requires=requires)
             resource_blocked = bool(gap)
             impossible = completion_probability <= 0.0
 
@@ -448,6 +449,7 @@ def best_figure_targets(
     max_results: int = 6,
     max_main_draws_per_turn: int = 2,
     max_side_draws_per_turn: int = 1,
+    index: GameStateIndex | None = None,
 ) -> list[dict[str, Any]]:
     """Return top feasible figure targets for plan generation."""
     estimates = estimate_figure_completion(
@@ -456,6 +458,7 @@ def best_figure_targets(
         remaining_turns=remaining_turns,
         max_main_draws_per_turn=max_main_draws_per_turn,
         max_side_draws_per_turn=max_side_draws_per_turn,
+        index=index,
     )
 
     scored = [
@@ -36,11 +36,17 @@ def enrich_figures_with_skills(game_dict: dict) -> dict:
     return game_dict
 
 
-def serialize_game_for_llm(game_dict: dict, ai_player_id: int) -> str:
+def serialize_game_for_llm(game_dict: dict, ai_player_id: int, index=None) -> str:
     """
     Convert a game state dict into a human-readable text summary for the LLM.
     Only includes information the AI player should know (no hidden opponent cards).
+
+    ``index`` is an optional :class:`ai.state_index.GameStateIndex` for
+    ``game_dict``; figure lookups and support bonuses go through it.
     """
+    from ai.state_index import GameStateIndex
+
+    index = GameStateIndex.of(game_dict, index)
     lines = []
     
     # Find AI player and opponent
@@ -89,7 +95,7 @@ def serialize_game_for_llm(game_dict: dict, ai_player_id: int) -> str:
     # AI's figures
     lines.append(f"\n=== YOUR FIGURES ({len(ai_player['figures'])}) ===")
     for fig in ai_player['figures']:
-        lines.append(_describe_figure(fig, all_figures=ai_player['figures']))
+        lines.append(_describe_figure(fig, all_figures=ai_player['figures'], index=index))
     
     # Resource balance summary
     resource_summary = _compute_resource_summary(ai_player['figures'])
@@ -98,7 +104,8 @@ def serialize_game_for_llm(game_dict: dict, ai_player_id: int) -> str:
     # Opponent's figures (visible info only — no card details)
     lines.append(f"\n=== OPPONENT'S FIGURES ({len(opponent['figures'])}) ===")
     for fig in opponent['figures']:
-        lines.append(_describe_figure(fig, show_cards=False, all_figures=opponent['figures']))
+        lines.append(_describe_figure(fig, show_cards=False, all_figures=opponent['figures'],
+                                     index=index))
     
     # Check if AI has an active All Seeing Eye spell
     has_all_seeing_eye = any(
@@ -119,7 +126,8 @@ def serialize_game_for_llm(game_dict: dict, ai_player_id: int) -> str:
         # Show opponent's figure card details too
         lines.append(f"\nOpponent's figure cards (revealed):")
         for fig in opponent['figures']:
-            lines.append(_describe_figure(fig, show_cards=True, all_figures=opponent['figures']))
+            lines.append(_describe_figure(fig, show_cards=True, all_figures=opponent['figures'],
+                                         index=index))
     else:
         lines.append(f"\nOpponent has {len(opp_main)} main cards and {len(opp_side)} side cards in hand.")
     
@@ -132,14 +140,14 @@ def serialize_game_for_llm(game_dict: dict, ai_player_id: int) -> str:
         lines.append(f"\n=== BATTLE STATE ===")
         adv_id = game_dict['advancing_figure_id']
         def_id = game_dict.get('defending_figure_id')
-        adv_fig = _find_figure(game_dict, adv_id)
-        def_fig = _find_figure(game_dict, def_id) if def_id else None
+        adv_fig = index.figure(adv_id)
+        def_fig = index.figure(def_id) if def_id else None
         adv_owner_figs = _owner_figures(game_dict, adv_fig)
         def_owner_figs = _owner_figures(game_dict, def_fig) if def_fig else None
         adv_name = adv_fig['name'] if adv_fig else f"ID {adv_id}"
-        lines.append(f"Advancing figure: {adv_name} (power≈{_est_power(adv_fig, adv_owner_figs)})")
+        lines.append(f"Advancing figure: {adv_name} (power≈{_est_power(adv_fig, adv_owner_figs, index)})")
         if def_fig:
-            lines.append(f"Defending figure: {def_fig['name']} (power≈{_est_power(def_fig, def_owner_figs)})")
+            lines.append(f"Defending figure: {def_fig['name']} (power≈{_est_power(def_fig, def_owner_figs, index)})")
         if game_dict.get('battle_confirmed'):
             lines.append(f"Battle confirmed! Round: {game_dict.get('battle_round', 0)+1}/3")
         if game_dict.get('battle_decisions'):
@@ -172,17 +180,6 @@ def _is_tactics_hand_conquer(game_dict: dict) -> bool:
     return is_tactics_hand_conquer_state(game_dict)
 
 
-def _find_figure(game_dict: dict, figure_id: int) -> dict | None:
-    """Find a figure by ID across all players."""
-    if not figure_id:
-        return None
-    for p in game_dict.get('players', []):
-        for f in p.get('figures', []):
-            if f['id'] == figure_id:
-                return f
-    return None
-
-
 def _owner_figures(game_dict: dict, fig: dict | None) -> list | None:
     """Return the figures list of the player who owns *fig*."""
     if not fig:
@@ -194,7 +191,7 @@ def _owner_figures(game_dict: dict, fig: dict | None) -> list | None:
     return None
 
 
-def _est_power(fig: dict | None, all_figures: list | None = None) -> int:
+def _est_power(fig: dict | None, all_figures: list | None = None, index=None) -> int:
     """Estimate a figure's power including support bonus (castle=15 base)."""
     if not fig:
         return 0
@@ -204,7 +201,8 @@ def _est_power(fig: dict | None, all_figures: list | None = None) -> int:
         cards = fig.get('cards_to_figure', [])
         base = sum(c.get('card_value', c.get('value', 0)) for c in cards)
     if all_figures:
-        base += compute_support_bonus(fig, all_figures)
+        base += (index.support_bonus(fig, all_figures) if index is not None
+                 else compute_support_bonus(fig, all_figures))
     return base
 
 
@@ -230,12 +228,13 @@ def _summarize_cards(cards: list) -> str:
     return ' '.join(parts)
 
 
-def _describe_figure(fig: dict, show_cards: bool = True, all_figures: list | None = None) -> str:
+def _describe_figure(fig: dict, show_cards: bool = True, all_figures: list | None = None,
+                     index=None) -> str:
     """Describe a figure for the LLM."""
     name = fig.get('name', '?')
     field = fig.get('field', '?')
     color = fig.get('color', '?')
-    power = _est_power(fig, all_figures)
+    power = _est_power(fig, all_figures, index)
     
     parts = [f"  - {name} ({field}/{color}, power≈{power})"]
     
@@ -368,7 +367,8 @@ def _compute_resource_summary(figures: list) -> str:
     return '\n'.join(lines)
 
 
-def compute_support_bonus(figure: dict, all_player_figures: list) -> int:
+def compute_support_bonus(figure: dict, all_player_figures: list,
+                          deficit_indices=None) -> int:
     """Compute support bonus a figure receives from same-suit allies.
 
     Mirrors server ``_compute_support_bonus()`` but works with serialized
@@ -386,6 +386,10 @@ def compute_support_bonus(figure: dict, all_player_figures: list) -> int:
     This is the *blockable* castle/village support only.  The conquer land
     suit bonus is applied separately and unblockably in the authoritative
     resolver (``routes.games._compute_figure_full_power``).
+
+    ``deficit_indices`` may pass a precomputed
+    :func:`resource_deficit_indices` result for ``all_player_figures``
+    (see :class:`ai.state_index.GameStateIndex`).
     """
     fig_field = (figure.get('field') or '').lower()
     if fig_field == 'castle':
@@ -400,14 +404,8 @@ def compute_support_bonus(figure: dict, all_player_figures: list) -> int:
     fig_suit = (figure.get('suit') or '').lower()
     fig_id = figure.get('id')
 
-    # Pre-compute which figures are in deficit
-    eff_prod, tot_req = compute_resource_totals(all_player_figures)
-    deficit_indices = set()
-    for i, f in enumerate(all_player_figures):
-        for res in (f.get('requires') or {}):
-            if tot_req.get(res, 0) > eff_prod.get(res, 0):
-                deficit_indices.add(i)
-                break
+    if deficit_indices is None:
+        deficit_indices = resource_deficit_indices(all_player_figures)
 
     total = 0
     for i, f in enumerate(all_player_figures):
@@ -436,6 +434,21 @@ def compute_support_bonus(figure: dict, all_player_figures: list) -> int:
     return total
 
 
+def resource_deficit_indices(figures: list, totals: tuple | None = None) -> set:
+    """Return positions in ``figures`` of figures whose requirements are unmet.
+
+    ``totals`` may pass a precomputed ``compute_resource_totals(figures)``.
+    """
+    eff_prod, tot_req = totals if totals is not None else compute_resource_totals(figures)
+    deficit_indices = set()
+    for i, f in enumerate(figures):
+        for res in (f.get('requires') or {}):
+            if tot_req.get(res, 0) > eff_prod.get(res, 0):
+                deficit_indices.add(i)
+                break
+    return deficit_indices
+
+
 def compute_resource_totals(figures: list) -> tuple:
     """Return (effective_produces, total_requires) dicts after iterative deficit exclusion."""
     total_requires = {}
@@ -8,12 +8,7 @@ from collections import Counter
 from math import exp
 from typing import Any
 
-
-def _find_players(game_dict: dict[str, Any], ai_player_id: int) -> tuple[dict[str, Any] | None, dict[str, Any] | None]:
-    players = game_dict.get('players', [])
-    ai_player = next((p for p in players if p.get('id') == ai_player_id), None)
-    opponent = next((p for p in players if p.get('id') != ai_player_id), None)
-    return ai_player, opponent
+from ai.state_index import GameStateIndex
 
 
 def _figure_cards(fig: dict[str, Any]) -> list[dict[str, Any]]:
@@ -168,13 +163,15 @@ def build_opponent_belief_snapshot(
     game_dict: dict[str, Any],
     ai_player_id: int,
     max_figures: int = 3,
+    index: GameStateIndex | None = None,
 ) -> dict[str, Any]:
     """Build a concise opponent model from known board information.
 
     This function never assumes hidden cards; it only scores currently visible
-    figures/cards and active battle modifiers.
+    figures/cards and active battle modifiers.  ``index`` is an optional
+    :class:`GameStateIndex` for ``game_dict``.
     """
-    _, opponent = _find_players(game_dict, ai_player_id)
+    opponent = GameStateIndex.of(game_dict, index).opponent(ai_player_id)
     if not opponent:
         return {
             'opponent_player_id': None,
@@ -0,0 +1,253 @@
+# Copyright (c) 2026 Marc Stieffenhofer. All rights reserved.
+# See LICENSE file in the project root for full license information.
+"""
+Durable queue of games whose AI phase needs re-checking.
+
+Every commit that bumps the state version (see
+``game_service.game_state_version``) of a game with an automated player
+upserts the game into ``ai_pending_game`` in the same transaction.  The hosted background worker
+claims due rows instead of rescanning every open game, so an idle worker
+reads one (normally empty) indexed table and a mutation is seen on the next
+wake-up rather than on the next sweep.
+
+- PostgreSQL: the enqueue also sends ``NOTIFY`` on :data:`NOTIFY_CHANNEL`
+  and :class:`PendingWakeup` blocks on ``LISTEN`` until it arrives.
+- SQLite (local runs): :class:`PendingWakeup` falls back to polling.
+
+Rows carry a ``due_at``.  Mutations enqueue "now"; after the worker handles
+a game it re-enqueues it at the game's next timer (Conquer round deadline,
+post-battle choice deadline), so expiring timers are noticed without a
+sweep.
+"""
+import logging
+import time
+from datetime import datetime, timezone
+
+from sqlalchemy import text
+
+import server_settings as settings
+
+logger = logging.getLogger('nepalkings.ai.pending_work')
+
+NOTIFY_CHANNEL = 'nepalkings_ai_pending'
+
+
+def _utcnow():
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+def _upsert_statement(dialect_name):
+    from models import AIPendingGame
+
+    table = AIPendingGame.__table__
+    if dialect_name == 'postgresql':
+        from sqlalchemy.dialects.postgresql import insert
+    else:
+        from sqlalchemy.dialects.sqlite import insert
+    stmt = insert(table)
+    # An earlier due time always wins, so a mutation is never pushed back
+    # behind a timer that was queued first.
+    return stmt.on_conflict_do_update(
+        index_elements=[table.c.game_id],
+        set_={'due_at': stmt.excluded.due_at},
+        where=table.c.due_at > stmt.excluded.due_at,
+    )
+
+
+def enqueue_games(session, game_ids, due_at=None):
+    """Queue ``game_ids`` for an AI check at ``due_at`` (default: now)."""
+    game_ids = sorted({int(game_id) for game_id in game_ids})
+    if not game_ids:
+        return
+    due_at = due_at or _utcnow()
+    dialect_name = session.get_bind().dialect.name
+    session.execute(
+        _upsert_statement(dialect_name),
+        [{'game_id': game_id, 'due_at': due_at} for game_id in game_ids],
+    )
+    if dialect_name == 'postgresql':
+        # Delivered on commit; only a wake-up hint, the table is the truth.
+        session.execute(text('SELECT pg_notify(:channel, :payload)'),
+                        {'channel': NOTIFY_CHANNEL, 'payload': str(game_ids[0])})
+
+
+def _games_with_automated_player(session, games):
+    """Ids of unfinished ``games`` in which an AI may have to act.
+
+    Conquer games always have the scripted defender; other modes need an
+    ``is_ai`` player, looked up for all of ``games`` in one query.
+    """
+    from models import Player, User
+
+    games = [game for game in games if game.state != 'finished']
+    game_ids = {game.id for game in games if game.mode == 'conquer'}
+    others = [game.id for game in games if game.mode != 'conquer']
+    if others:
+        game_ids.update(
+            game_id for (game_id,) in (
+                session.query(Player.game_id)
+                .join(User, User.id == Player.user_id)
+                .filter(Player.game_id.in_(others), User.is_ai.is_(True))
+                .distinct()
+            )
+        )
+    return game_ids
+
+
+def enqueue_bumped_games(session, games):
+    """State-bump listener: queue the touched games an AI may act in.
+
+    Human-only games are skipped, so PvP commits cost no queue row or
+    ``NOTIFY``.
+    """
+    if not settings.AI_ENABLED:
+        return
+    enqueue_games(session, _games_with_automated_player(session, games))
+
+
+def claim_due_games(limit=200, now=None):
+    """Remove and return the ids of games whose check is due, oldest first.
+
+    Claimed rows are deleted and committed before the caller looks at the
+    games, so a mutation committed afterwards queues a fresh row instead of
+    being lost.
+    """
+    from models import AIPendingGame, db
+
+    now = now or _utcnow()
+    game_ids = [
+        game_id for (game_id,) in (
+            db.session.query(AIPendingGame.game_id)
+            .filter(AIPendingGame.due_at <= now)
+            .order_by(AIPendingGame.due_at, AIPendingGame.game_id)
+            .limit(limit)
+            .all()
+        )
+    ]
+    if game_ids:
+        (
+            AIPendingGame.query
+            .filter(AIPendingGame.game_id.in_(game_ids))
+            .filter(AIPendingGame.due_at <= now)
+            .delete(synchronize_session=False)
+        )
+    db.session.commit()
+    return game_ids
+
+
+def seconds_until_next_due(now=None):
+    """Seconds until the earliest queued check, ``0`` if overdue, else None."""
+    from models import AIPendingGame, db
+
+    due_at = db.session.query(db.func.min(AIPendingGame.due_at)).scalar()
+    if due_at is None:
+        return None
+    return max((due_at - (now or _utcnow())).total_seconds(), 0.0)
+
+
+def next_timer_at(game, now=None):
+    """Earliest future deadline on ``game`` that may need an AI check."""
+    from game_service.post_battle_choice import parse_pending_choice_deadline
+
+    now = now or _utcnow()
+    pending = (game.last_battle_result or {}).get('post_battle_pending_choice')
+    deadlines = [
+        game.battle_round_deadline_at,
+        parse_pending_choice_deadline(pending) if pending else None,
+    ]
+    future = [deadline for deadline in deadlines if deadline is not None and deadline > now]
+    return min(future) if future else None
+
+
+def schedule_game_timers(game_ids, now=None):
+    """Re-queue handled games at their next timer, if they have one."""
+    from models import Game, db
+
+    if not game_ids:
+        return 0
+    scheduled = 0
+    games = (
+        Game.query
+        .filter(Game.id.in_(game_ids))
+        .filter(Game.state != 'finished')
+        .all()
+    )
+    for game in games:
+        timer = next_timer_at(game, now=now)
+        if timer is not None:
+            enqueue_games(db.session, [game.id], due_at=timer)
+            scheduled += 1
+    db.session.commit()
+    return scheduled
+
+
+class PendingWakeup:
+    """Wait for new AI work: ``LISTEN`` on PostgreSQL, polling elsewhere."""
+
+    def __init__(self, app):
+        self._connection = None
+        with app.app_context():
+            from models import db
+
+            if db.engine.dialect.name != 'postgresql':
+                return
+            connection = db.engine.connect()
+            try:
+                connection.execution_options(isolation_level='AUTOCOMMIT')
+                connection.exec_driver_sql(f'LISTEN {NOTIFY_CHANNEL}')
+            except Exception:
+                connection.close()
+                logger.exception('LISTEN %s failed; polling the AI queue instead',
+                                 NOTIFY_CHANNEL)
+                return
+            self._connection = connection
+
+    @property
+    def listening(self):
+        return self._connection is not None
+
+    def wait(self, stop_event, timeout):
+        """Block up to ``timeout`` seconds; True when ``stop_event`` is set."""
+        if self._connection is None:
+            return stop_event.wait(timeout)
+        driver = self._connection.connection.driver_connection
+        deadline = time.monotonic() + timeout
+        try:
+            # Short slices keep shutdown responsive while idling on LISTEN.
+            while not stop_event.is_set():
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                if any(True for _notify in driver.notifies(
+                        timeout=min(remaining, 1.0), stop_after=1)):
+                    break
+        except Exception:
+            logger.exception('AI queue LISTEN connection failed; polling instead')
+            self.close()
+            return stop_event.wait(timeout)
+        return stop_event.is_set()
+
+    def close(self):
+        connection = self._connection
+        self._connection = None
+        if connection is not None:
+            connection.close()
+
+
+def wake_ai_on_game_events(events, context):
+    """Domain-event subscriber: check each game whose turn or phase moved.
+
+    Requests made by the AI worker itself are skipped, as its loop already
+    continues after its own actions.
+    """
+    if not settings.AI_ENABLED or context.ai_internal:
+        return
+    from flask import current_app
+    from ai.ai_worker import trigger_ai_if_needed
+
+    app = current_app._get_current_object()
+    for game_id in dict.fromkeys(item.game_id for item in events):
+        try:
+            trigger_ai_if_needed(game_id, app=app)
+        except Exception as exc:
+            logger.warning('AI trigger error for game %s: %s', game_id, exc)
@@ -4,14 +4,30 @@
 
 This module is intentionally pure and side-effect free so its behavior is
 stable in tests and easy to reason about.
+
+Figure planning asks the same questions many times per decision: every
+recipe x suit pair, again for every strategy candidate.  Results therefore
+depend only on a canonical signature (the sorted ``(available, needed)``
+pairs, the remaining population and the draw count), never on card
+identity, and are memoized on it.  The multivariate case runs as a float
+dynamic program over binomial rows that are shared per deck size; the
+original big-integer enumeration is kept as
+:func:`probability_meet_requirements_exact` for reference and for
+populations too large for float binomials.
 """
 
 from __future__ import annotations
 
 from collections import Counter
+from functools import lru_cache
 from math import comb
 from typing import Any, Callable, Hashable
 
+# Binomial coefficients stay well inside float range below this population
+# (C(1000, 500) ~ 2.7e299); larger decks use exact integer arithmetic.
+_FLOAT_POPULATION_LIMIT = 1000
+_CACHE_SIZE = 8192
+
 
 def _safe_comb(n: int, k: int) -> int:
     """Safe binomial coefficient with 0 for invalid ranges."""
@@ -20,6 +36,18 @@ def _safe_comb(n: int, k: int) -> int:
     return comb(n, k)
 
 
+@lru_cache(maxsize=256)
+def _binomial_row(n: int) -> tuple[float, ...]:
+    """``(C(n, 0), ..., C(n, n))`` as floats, shared by every query on ``n``."""
+    return tuple(float(comb(n, k)) for k in range(n + 1))
+
+
+def _float_comb(n: int, k: int) -> float:
+    if n < 0 or k < 0 or k > n:
+        return 0.0
+    return _binomial_row(n)[k]
+
+
 def get_deck_cards(game_dict: dict[str, Any], card_type: str = "main") -> list[dict[str, Any]]:
     """Return cards currently in deck for the selected card type.
 
@@ -67,6 +95,7 @@ def probability_exact(success_states: int, population_size: int, draws: int, suc
     return float(numerator) / float(denominator)
 
 
+@lru_cache(maxsize=_CACHE_SIZE)
 def probability_at_least(success_states: int, population_size: int, draws: int, at_least: int) -> float:
     """Hypergeometric probability for drawing at least at_least successes."""
     if at_least <= 0:
@@ -91,8 +120,90 @@ def probability_meet_requirements(
 ) -> float:
     """Probability of meeting all minimum keyed card requirements in draws.
 
+    Multivariate hypergeometric probability, memoized on the canonical
+    signature of the query.  Matches
+    :func:`probability_meet_requirements_exact` to float precision.
+    """
+    if draws < 0:
+        return 0.0
+
+    requirements = {k: int(v) for k, v in requirements_by_key.items() if int(v) > 0}
+    if not requirements:
+        return 1.0
+
+    population = {k: int(v) for k, v in population_by_key.items() if int(v) > 0}
+    total_population = sum(population.values())
+    if total_population <= 0:
+        return 0.0
+
+    pairs = []
+    for key, need in requirements.items():
+        available = population.get(key, 0)
+        if available < need:
+            return 0.0
+        pairs.append((available, need))
+    other_population = total_population - sum(available for available, _need in pairs)
+    return _meet_requirements_signature(
+        tuple(sorted(pairs)),
+        other_population,
+        min(int(draws), total_population),
+    )
+
+
+@lru_cache(maxsize=_CACHE_SIZE)
+def _meet_requirements_signature(
+    pairs: tuple[tuple[int, int], ...],
+    other_population: int,
+    draws: int,
+) -> float:
+    """P(at least ``need`` of each ``(available, need)`` pair in ``draws``)."""
+    total_population = other_population + sum(available for available, _need in pairs)
+    if sum(need for _available, need in pairs) > draws:
+        return 0.0
+    if total_population > _FLOAT_POPULATION_LIMIT:
+        return probability_meet_requirements_exact(
+            {('other',): other_population,
+             **{(index,): available for index, (available, _need) in enumerate(pairs)}},
+            {(index,): need for index, (_available, need) in enumerate(pairs)},
+            draws,
+        )
+
+    # ways[u]: weighted count of draws that meet the pairs so far using
+    # exactly u cards from them.
+    ways = [0.0] * (draws + 1)
+    ways[0] = 1.0
+    reserved = sum(need for _available, need in pairs)
+    for available, need in pairs:
+        reserved -= need
+        row = _binomial_row(available)
+        updated = [0.0] * (draws + 1)
+        for used, weight in enumerate(ways):
+            if not weight:
+                continue
+            max_take = min(available, draws - used - reserved)
+            for take in range(need, max_take + 1):
+                updated[used + take] += weight * row[take]
+        ways = updated
+
+    numerator = 0.0
+    for used, weight in enumerate(ways):
+        if weight:
+            numerator += weight * _float_comb(other_population, draws - used)
+    denominator = _float_comb(total_population, draws)
+    if denominator == 0.0:
+        return 0.0
+    return max(0.0, min(1.0, numerator / denominator))
+
+
+def probability_meet_requirements_exact(
+    population_by_key: dict[Hashable, int],
+    requirements_by_key: dict[Hashable, int],
+    draws: int,
+) -> float:
+    """Exact reference for :func:`probability_meet_requirements`.
+
     Computes exact multivariate hypergeometric probability using recursive
-    enumeration across required key dimensions.
+    enumeration across required key dimensions, in integer arithmetic.
     """
     if draws < 0:
         return 0.0
@@ -181,3 +292,22 @@ def expected_hits(success_states: int, population_size: int, draws: int) -> floa
         return 0.0
     draws = min(draws, population_size)
     return float(draws) * (float(success_states) / float(population_size))
+
+
+def probability_cache_info() -> dict[str, dict[str, int]]:
+    """Hit/miss counters of the memoized probability queries."""
+    return {
+        name: fn.cache_info()._asdict()
+        for name, fn in (
+            ('meet_requirements', _meet_requirements_signature),
+            ('at_least', probability_at_least),
+            ('binomial_rows', _binomial_row),
+        )
+    }
+
+
+def clear_probability_caches() -> None:
+    """Drop every memoized probability (tests, memory pressure)."""
+    _meet_requirements_signature.cache_clear()
+    probability_at_least.cache_clear()
+    _binomial_row.cache_clear()
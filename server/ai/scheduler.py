@@ -0,0 +1,267 @@
+# Copyright (c) 2026 Marc Stieffenhofer. All rights reserved.
+# See LICENSE file in the project root for full license information.
+"""
+Bounded scheduler for AI game loops.
+
+AI work used to run on one fresh daemon thread per game, each sleeping
+through its own think delay.  ``AIScheduler`` instead keeps a fixed pool of
+worker threads fed by one queue ordered by due time, so think delays and
+watchdog retries cost a heap entry rather than a sleeping thread, and the
+thread count stays flat however many AI games are live.
+
+Jobs are keyed (normally by game id) and deduplicated:
+
+- submitting a key that is already queued keeps the earlier due time;
+- submitting a key whose job is running records a follow-up, which runs
+  once the current job ends unless the job claims it first through
+  :meth:`AIScheduler.consume_retrigger` and carries on by itself;
+- a running job that must wait before its next step returns after
+  :meth:`AIScheduler.defer`, which queues its continuation at the new due
+  time, so pauses between AI actions never hold a worker thread.
+
+A pool size of ``0`` runs jobs inline on the submitting thread, ignoring
+delays; tests and single-threaded debugging use that mode.  Loops that must
+really wait in that mode check :meth:`AIScheduler.in_pool_job` and sleep
+instead of deferring.
+"""
+from __future__ import annotations
+
+import heapq
+import itertools
+import logging
+import threading
+import time
+
+logger = logging.getLogger('nepalkings.ai.scheduler')
+
+
+class _Job:
+    __slots__ = ('key', 'fn', 'args', 'due')
+
+    def __init__(self, key, fn, args, due):
+        self.key = key
+        self.fn = fn
+        self.args = args
+        self.due = due
+
+
+class AIScheduler:
+    """Fixed-size worker pool running keyed jobs at their due time."""
+
+    QUEUED = 'queued'
+    DEDUPED = 'deduped'
+    RETRIGGER = 'retrigger'
+
+    def __init__(self, workers, name='ai-worker', clock=time.monotonic):
+        self._workers = max(int(workers), 0)
+        self._name = name
+        self._clock = clock
+        self._cond = threading.Condition()
+        self._heap = []  # (due, seq, key)
+        self._seq = itertools.count()
+        self._queued = {}  # key -> _Job
+        self._running = set()
+        self._followups = {}  # key -> _Job submitted while running
+        self._threads = []
+        self._stopping = False
+        self._local = threading.local()  # key of the job a pool thread runs
+        self._stats = {
+            'submitted': 0,
+            'deduped': 0,
+            'retriggered': 0,
+            'completed': 0,
+            'failed': 0,
+        }
+        self._lag_total = 0.0
+        self._lag_max = 0.0
+        self._lag_count = 0
+
+    # ── submission ──────────────────────────────────────────────
+
+    def submit(self, key, fn, args=(), delay=0.0):
+        """Schedule ``fn(*args)`` for ``key`` after ``delay`` seconds.
+
+        Returns :attr:`QUEUED`, :attr:`DEDUPED` or :attr:`RETRIGGER`.
+        """
+        now = self._clock()
+        job = _Job(key, fn, tuple(args), now + max(float(delay), 0.0))
+        with self._cond:
+            self._stats['submitted'] += 1
+            if key in self._running:
+                self._followups.setdefault(key, job)
+                self._stats['retriggered'] += 1
+                return self.RETRIGGER
+            queued = self._queued.get(key)
+            if queued is not None:
+                self._stats['deduped'] += 1
+                if job.due < queued.due:
+                    queued.due = job.due
+                    heapq.heappush(self._heap, (job.due, next(self._seq), key))
+                    self._cond.notify()
+                return self.DEDUPED
+            if self._workers == 0:
+                self._running.add(key)
+            else:
+                self._enqueue(job)
+                self._ensure_threads()
+                return self.QUEUED
+        self._run_inline(job)
+        return self.QUEUED
+
+    def defer(self, key, fn, args=(), delay=0.0):
+        """Continue the running ``key`` job as ``fn(*args)`` after ``delay``.
+
+        The continuation replaces any follow-up recorded meanwhile; it
+        re-reads the game, so nothing the follow-up would have seen is lost.
+        Outside a running job this is a plain :meth:`submit`.
+        """
+        job = _Job(key, fn, tuple(args), self._clock() + max(float(delay), 0.0))
+        with self._cond:
+            if key in self._running:
+                self._followups[key] = job
+                return
+        self.submit(key, fn, args, delay)
+
+    def _enqueue(self, job):
+        self._queued[job.key] = job
+        heapq.heappush(self._heap, (job.due, next(self._seq), job.key))
+        self._cond.notify()
+
+    def consume_retrigger(self, key):
+        """Claim a follow-up submitted while ``key`` was running."""
+        with self._cond:
+            return self._followups.pop(key, None) is not None
+
+    def has_retrigger(self, key):
+        """True when a follow-up is waiting for ``key``'s running job."""
+        with self._cond:
+            return key in self._followups
+
+    def is_active(self, key):
+        """True while ``key`` is queued or running."""
+        with self._cond:
+            return key in self._queued or key in self._running
+
+    def in_pool_job(self, key):
+        """True when called from a pool thread running ``key``'s job.
+
+        Only then can :meth:`defer` free the thread; inline jobs and direct
+        calls run their continuation on the caller's stack.
+        """
+        return getattr(self._local, 'key', None) == key
+
+    # ── execution ───────────────────────────────────────────────
+
+    def _ensure_threads(self):
+        self._threads = [t for t in self._threads if t.is_alive()]
+        while len(self._threads) < self._workers:
+            thread = threading.Thread(
+                target=self._worker,
+                daemon=True,
+                name=f'{self._name}-{len(self._threads)}',
+            )
+            self._threads.append(thread)
+            thread.start()
+
+    def _next_job(self):
+        with self._cond:
+            while True:
+                if self._stopping:
+                    return None
+                if not self._heap:
+                    self._cond.wait()
+                    continue
+                due, _seq, key = self._heap[0]
+                job = self._queued.get(key)
+                if job is None or job.due != due:
+                    heapq.heappop(self._heap)  # stale entry after a dedupe
+                    continue
+                wait = due - self._clock()
+                if wait > 0:
+                    self._cond.wait(wait)
+                    continue
+                heapq.heappop(self._heap)
+                del self._queued[key]
+                self._running.add(key)
+                self._record_lag(self._clock() - job.due)
+                return job
+
+    def _worker(self):
+        while True:
+            job = self._next_job()
+            if job is None:
+                return
+            self._local.key = job.key
+            try:
+                self._execute(job)
+            finally:
+                self._local.key = None
+            with self._cond:
+                self._running.discard(job.key)
+                followup = self._followups.pop(job.key, None)
+                if followup is not None:
+                    self._enqueue(followup)
+
+    def _run_inline(self, job):
+        key = job.key
+        while job is not None:
+            with self._cond:
+                self._record_lag(0.0)
+            self._execute(job)
+            with self._cond:
+                job = self._followups.pop(key, None)
+                if job is None:
+                    self._running.discard(key)
+
+    def _execute(self, job):
+        try:
+            job.fn(*job.args)
+            ok = True
+        except Exception:
+            ok = False
+            logger.exception('AI job %r crashed', job.key)
+        with self._cond:
+            self._stats['completed' if ok else 'failed'] += 1
+
+    def _record_lag(self, lag):
+        # Caller holds ``self._cond``.
+        lag = max(lag, 0.0)
+        self._lag_total += lag
+        self._lag_count += 1
+        self._lag_max = max(self._lag_max, lag)
+
+    # ── observability / lifecycle ───────────────────────────────
+
+    def metrics(self):
+        """Queue depth, pool usage and start-latency counters."""
+        with self._cond:
+            lag_avg = self._lag_total / self._lag_count if self._lag_count else 0.0
+            return {
+                'workers': self._workers,
+                'threads_alive': sum(1 for t in self._threads if t.is_alive()),
+                'queue_depth': len(self._queued),
+                'running': len(self._running),
+                'pending_followups': len(self._followups),
+                **self._stats,
+                'start_lag_avg_ms': round(lag_avg * 1000, 1),
+                'start_lag_max_ms': round(self._lag_max * 1000, 1),
+            }
+
+    def clear(self):
+        """Drop queued work and bookkeeping (tests, shutdown)."""
+        with self._cond:
+            self._heap.clear()
+            self._queued.clear()
+            self._running.clear()
+            self._followups.clear()
+
+    def shutdown(self, timeout=None):
+        """Stop the worker threads after their current job."""
+        with self._cond:
+            self._stopping = True
+            self._cond.notify_all()
+        for thread in self._threads:
+            thread.join(timeout)
+        self._threads = []
+        with self._cond:
+            self._stopping = False
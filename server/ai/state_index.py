@@ -0,0 +1,183 @@
+# Copyright (c) 2026 Marc Stieffenhofer. All rights reserved.
+# See LICENSE file in the project root for full license information.
+"""Per-decision lookup index over a serialized game state.
+
+Action enumeration, the strategy planner, figure completion, the opponent
+model and the duel strategy all read the same ``game_dict``.  Without a
+shared view each of them rescans the player list, recounts the deck and
+recomputes the iterative resource-deficit pass behind
+``compute_support_bonus`` - several of them once per legal action.
+
+:class:`GameStateIndex` is built once per decision and answers those
+lookups from precomputed maps and lazily filled caches.  Every AI entry
+point accepts it as an optional ``index`` argument and builds its own when
+none is passed, so callers that decide once per ``game_dict`` pay the
+O(state) cost once.
+
+The index treats ``game_dict`` as frozen: build a new one after the state
+changes.  Caches keyed on a figure list keep the list and match it by
+identity, so a list the index never saw (e.g. ``figures + [new_fig]`` for a
+hypothetical build) is computed afresh instead of being served stale.
+"""
+
+from __future__ import annotations
+
+from collections import Counter
+from types import MappingProxyType
+from typing import Any
+
+from ai.game_state import compute_resource_totals, compute_support_bonus, resource_deficit_indices
+from ai.probability_engine import get_deck_counts
+
+
+def _free(card: dict[str, Any]) -> bool:
+    return not card.get('part_of_figure') and not card.get('part_of_battle_move')
+
+
+class GameStateIndex:
+    """Read-only view of one ``game_dict`` for a single AI decision."""
+
+    __slots__ = (
+        'game_dict', 'players', 'players_by_id', 'figures_by_id',
+        'figures_by_owner', 'figures_by_field', '_cache', '_list_cache',
+    )
+
+    def __init__(self, game_dict: dict[str, Any]):
+        self.game_dict = game_dict
+        self.players = tuple(game_dict.get('players') or [])
+
+        players_by_id: dict[Any, dict[str, Any]] = {}
+        figures_by_id: dict[Any, dict[str, Any]] = {}
+        figures_by_owner: dict[Any, tuple[dict[str, Any], ...]] = {}
+        figures_by_field: dict[tuple[Any, str], list[dict[str, Any]]] = {}
+        for player in self.players:
+            player_id = player.get('id')
+            # First match wins, like the linear scans this replaces.
+            players_by_id.setdefault(player_id, player)
+            figures = player.get('figures') or []
+            figures_by_owner.setdefault(player_id, tuple(figures))
+            for fig in figures:
+                figures_by_id.setdefault(fig.get('id'), fig)
+                field = str(fig.get('field') or '').lower()
+                figures_by_field.setdefault((player_id, field), []).append(fig)
+
+        self.players_by_id = MappingProxyType(players_by_id)
+        self.figures_by_id = MappingProxyType(figures_by_id)
+        self.figures_by_owner = MappingProxyType(figures_by_owner)
+        self.figures_by_field = MappingProxyType(
+            {key: tuple(figs) for key, figs in figures_by_field.items()}
+        )
+        self._cache: dict[Any, Any] = {}
+        self._list_cache: dict[tuple[str, int], tuple[Any, Any]] = {}
+
+    @classmethod
+    def of(cls, game_dict: dict[str, Any], index: GameStateIndex | None = None) -> GameStateIndex:
+        """Return ``index`` when it covers ``game_dict``, else a fresh index."""
+        if index is not None and index.game_dict is game_dict:
+            return index
+        return cls(game_dict)
+
+    # ── Players and figures ─────────────────────────────────────────
+
+    def player(self, player_id: Any) -> dict[str, Any] | None:
+        return self.players_by_id.get(player_id)
+
+    def opponent(self, player_id: Any) -> dict[str, Any] | None:
+        """First player whose id differs from ``player_id``."""
+        key = ('opponent', player_id)
+        if key not in self._cache:
+            self._cache[key] = next(
+                (p for p in self.players if p.get('id') != player_id), None,
+            )
+        return self._cache[key]
+
+    def figure(self, figure_id: Any) -> dict[str, Any] | None:
+        if figure_id is None:
+            return None
+        return self.figures_by_id.get(figure_id)
+
+    def figures_in_field(self, player_id: Any, field: str) -> tuple[dict[str, Any], ...]:
+        return self.figures_by_field.get((player_id, str(field or '').lower()), ())
+
+    # ── Cards ───────────────────────────────────────────────────────
+
+    def deck_counts(self, card_type: str = 'main') -> dict[Any, int]:
+        """``get_deck_counts`` by (rank, suit); shared, do not mutate."""
+        key = ('deck_counts', card_type)
+        if key not in self._cache:
+            self._cache[key] = get_deck_counts(self.game_dict, card_type=card_type)
+        return self._cache[key]
+
+    def free_hand_cards(self, player_id: Any, hand_key: str) -> list[dict[str, Any]]:
+        """Cards of ``hand_key`` not tied to a figure or battle move; do not mutate."""
+        key = ('free_hand_cards', player_id, hand_key)
+        if key not in self._cache:
+            player = self.player(player_id) or {}
+            self._cache[key] = [c for c in player.get(hand_key, []) if _free(c)]
+        return self._cache[key]
+
+    def free_hand_counts(self, player_id: Any, hand_key: str) -> Counter:
+        """Counter of (rank, suit) over :meth:`free_hand_cards`; do not mutate."""
+        key = ('free_hand_counts', player_id, hand_key)
+        if key not in self._cache:
+            self._cache[key] = Counter(
+                (c.get('rank'), c.get('suit'))
+                for c in self.free_hand_cards(player_id, hand_key)
+            )
+        return self._cache[key]
+
+    # ── Resources, support and power ────────────────────────────────
+
+    def _per_list(self, kind: str, figures: list[dict[str, Any]], compute):
+        key = (kind, id(figures))
+        hit = self._list_cache.get(key)
+        if hit is not None and hit[0] is figures:
+            return hit[1]
+        value = compute(figures)
+        # Holding ``figures`` keeps its id from being reused by another list.
+        self._list_cache[key] = (figures, value)
+        return value
+
+    def resource_totals(self, figures: list[dict[str, Any]]) -> tuple[dict, dict]:
+        """``compute_resource_totals(figures)`` as fresh dicts."""
+        produces, requires = self._per_list('totals', figures, compute_resource_totals)
+        return dict(produces), dict(requires)
+
+    def deficit_indices(self, figures: list[dict[str, Any]]) -> frozenset[int]:
+        """Positions in ``figures`` of figures left in resource deficit."""
+        return self._per_list(
+            'deficit', figures,
+            lambda figs: frozenset(resource_deficit_indices(
+                figs, self._per_list('totals', figs, compute_resource_totals),
+            )),
+        )
+
+    def support_bonus(self, figure: dict[str, Any], figures: list[dict[str, Any]]) -> int:
+        """``compute_support_bonus(figure, figures)`` with a shared deficit pass."""
+        bonuses = self._per_list('support', figures, lambda _figs: {})
+        hit = bonuses.get(id(figure))
+        if hit is not None and hit[0] is figure:
+            return hit[1]
+        value = compute_support_bonus(
+            figure, figures, deficit_indices=self.deficit_indices(figures),
+        )
+        bonuses[id(figure)] = (figure, value)
+        return value
+
+    def memo(self, key: Any, compute):
+        """Cache ``compute()`` under ``key`` for the lifetime of the index."""
+        key = ('memo', key)
+        if key not in self._cache:
+            self._cache[key] = compute()
+        return self._cache[key]
+
+
+def support_bonus(
+    figure: dict[str, Any],
+    figures: list[dict[str, Any]],
+    index: GameStateIndex | None = None,
+) -> int:
+    """``compute_support_bonus`` through ``index`` when one is available."""
+    if index is None:
+        return compute_support_bonus(figure, figures)
+    return index.support_bonus(figure, figures)
@@ -10,6 +10,7 @@ from typing import Any
 
 from ai.figure_completion import best_figure_targets
 from ai.opponent_model import build_opponent_belief_snapshot
+from ai.state_index import GameStateIndex, support_bonus
 from game_service.game_mode import is_tactics_hand_conquer_state
 
 
@@ -75,23 +76,18 @@ class StrategyPlan:
         }
 
 
-def _find_player(game_dict: dict[str, Any], player_id: int) -> dict[str, Any] | None:
-    return next((p for p in game_dict.get('players', []) if p.get('id') == player_id), None)
-
-
-def _find_opponent(game_dict: dict[str, Any], ai_player_id: int) -> dict[str, Any] | None:
-    return next((p for p in game_dict.get('players', []) if p.get('id') != ai_player_id), None)
-
-
-def _figure_power(fig: dict[str, Any], all_figures: list[dict[str, Any]] | None = None) -> int:
+def _figure_power(
+    fig: dict[str, Any],
+    all_figures: list[dict[str, Any]] | None = None,
+    index: GameStateIndex | None = None,
+) -> int:
     if fig.get('field') == 'castle':
         base = 15
     else:
         cards = fig.get('cards', fig.get('cards_to_figure', []))
         base = sum(int(c.get('value') or c.get('card_value') or 0) for c in cards)
     if all_figures:
-        from ai.game_state import compute_support_bonus
-        base += compute_support_bonus(fig, all_figures)
+        base += support_bonus(fig, all_figures, index)
     return base
 
 
@@ -162,6 +158,7 @@ def _estimate_target_figure_for_action(
     action: dict[str, Any],
     ai_player: dict[str, Any],
     top_targets: list[dict[str, Any]],
+    index: GameStateIndex | None = None,
 ) -> dict[str, Any] | None:
     action_type = action.get('type')
     params = action.get('params', {}) or {}
@@ -177,7 +174,7 @@ def _estimate_target_figure_for_action(
                 'field': fig.get('field'),
                 'suit': fig.get('suit'),
                 'state': 'already_built',
-                'power_estimate': _figure_power(fig, ai_figs),
+                'power_estimate': _figure_power(fig, ai_figs, index),
             }
 
     if action_type == 'build_figure':
@@ -288,14 +285,14 @@ def _estimate_target_figure_for_action(
 
     current_figs = ai_player.get('figures', [])
     if current_figs:
-        strongest = max(current_figs, key=lambda f: _figure_power(f, current_figs))
+        strongest = max(current_figs, key=lambda f: _figure_power(f, current_figs, index))
         return {
             'figure_id': strongest.get('id'),
             'name': strongest.get('name'),
             'field': strongest.get('field'),
             'suit': strongest.get('suit'),
             'state': 'already_built',
-            'power_estimate': _figure_power(strongest, current_figs),
+            'power_estimate': _figure_power(strongest, current_figs, index),
         }
 
     return None
@@ -361,6 +358,7 @@ def _modifier_bonus(
     game_dict: dict[str, Any] | None = None,
     ai_player_id: int | None = None,
     recent_change_cards: int = 0,
+    index: GameStateIndex | None = None,
 ) -> float:
     """Compute action bonus using board state when available.
 
@@ -539,11 +537,11 @@ def _modifier_bonus(
         if 'Peasant War' in desc or 'Civil War' in desc:
             bonus += 2.5
             opp_mil_power = sum(
-                _figure_power(f, opp_figures) for f in opp_figures
+                _figure_power(f, opp_figures, index) for f in opp_figures
                 if f.get('field') == 'military' and not f.get('cannot_attack')
             )
             own_mil_power = sum(
-                _figure_power(f, own_figures) for f in own_figures
+                _figure_power(f, own_figures, index) for f in own_figures
                 if f.get('field') == 'military' and not f.get('cannot_attack')
             )
             if opp_mil_power > own_mil_power + 5:
@@ -580,7 +578,7 @@ def _modifier_bonus(
             if is_invader:
                 # Sum defensive strength: fortress/wall power + wall bonus
                 defensive_power = sum(
-                    _figure_power(f, own_figures) for f in own_figures
+                    _figure_power(f, own_figures, index) for f in own_figures
                     if f.get('cannot_attack') or f.get('must_be_attacked')
                 )
                 if defensive_power > 0:
@@ -600,7 +598,7 @@ def _modifier_bonus(
         if spell_name == 'Poison' and target_fid is not None:
             fig = next((f for f in opp_figures if f.get('id') == target_fid), None)
             if fig:
-                fig_power = _figure_power(fig, opp_figures)
+                fig_power = _figure_power(fig, opp_figures, index)
                 bonus += min(6.0, fig_power * 0.4)
             else:
                 bonus += 3.0
@@ -608,7 +606,7 @@ def _modifier_bonus(
         elif spell_name == 'Health Boost' and target_fid is not None:
             fig = next((f for f in own_figures if f.get('id') == target_fid), None)
             if fig:
-                fig_power = _figure_power(fig, own_figures)
+                fig_power = _figure_power(fig, own_figures, index)
                 bonus += min(6.0, fig_power * 0.3 + 3.0)
             else:
                 bonus += 3.0
@@ -616,7 +614,7 @@ def _modifier_bonus(
         elif spell_name == 'Explosion' and target_fid is not None:
             fig = next((f for f in opp_figures if f.get('id') == target_fid), None)
             if fig:
-                fig_power = _figure_power(fig, opp_figures)
+                fig_power = _figure_power(fig, opp_figures, index)
                 resource_value = sum(
                     int(v) for v in (fig.get('produces') or {}).values()
                 )
@@ -724,6 +722,7 @@ def generate_strategy_plans(
     max_main_draws_per_turn: int = 2,
     max_side_draws_per_turn: int = 1,
     context: dict[str, Any] | None = None,
+    index: GameStateIndex | None = None,
 ) -> list[dict[str, Any]]:
     """Generate bounded strategy plans seeded by currently legal actions.
 
@@ -731,13 +730,17 @@ def generate_strategy_plans(
       - ``recent_change_cards_count``: consecutive prior change_cards /
         change_side_cards turns, used to apply a stacking anti-cycling
         penalty in :func:`_modifier_bonus`.
+
+    ``index`` is an optional :class:`GameStateIndex` for ``game_dict``;
+    pass the one the actions were enumerated with to share its caches.
     """
     context = context or {}
     recent_change_cards = int(context.get('recent_change_cards_count', 0) or 0)
     if not actions:
         return []
 
-    ai_player = _find_player(game_dict, ai_player_id)
+    index = GameStateIndex.of(game_dict, index)
+    ai_player = index.player(ai_player_id)
     if not ai_player:
         return []
 
@@ -751,8 +754,9 @@ def generate_strategy_plans(
         max_results=max(6, max_plans),
         max_main_draws_per_turn=max_main_draws_per_turn,
         max_side_draws_per_turn=max_side_draws_per_turn,
+        index=index,
     )
-    opponent_snapshot = build_opponent_belief_snapshot(game_dict, ai_player_id)
+    opponent_snapshot = build_opponent_belief_snapshot(game_dict, ai_player_id, index=index)
     likely_opp = (opponent_snapshot.get('likely_battle_figures') or [None])[0]
 
     if _is_tactics_hand_conquer(game_dict):
@@ -762,17 +766,17 @@ def generate_strategy_plans(
         conquer_tactics = []
         battle_moves = _planned_battle_moves(ai_player, count=3)
     expected_bm_power = float(sum(int(m.get('value') or 0) for m in battle_moves))
+    opp_player = index.opponent(ai_player_id)
 
     plans: list[StrategyPlan] = []
     for idx, action in enumerate(actions, start=1):
-        target = _estimate_target_figure_for_action(action, ai_player, top_targets)
+        target = _estimate_target_figure_for_action(action, ai_player, top_targets, index)
         feasibility = _action_feasibility(action, target)
 
         own_power = float(target.get('power_estimate') if target else 0.0)
         opp_power = float(likely_opp.get('power_estimate') if likely_opp else 0.0)
         expected_power_diff = own_power - opp_power
 
-        opp_player = _find_opponent(game_dict, ai_player_id)
         mod_bonus = _modifier_bonus(
             action,
             opponent_snapshot.get('active_battle_modifiers', []),
@@ -781,6 +785,7 @@ def generate_strategy_plans(
             game_dict=game_dict,
             ai_player_id=ai_player_id,
             recent_change_cards=recent_change_cards,
+            index=index,
         )
         turns_pressure = max(0.0, (4.0 - horizon_turns) * 0.5)
         total_score, score_breakdown = _score_plan(
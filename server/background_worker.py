@@ -45,15 +45,57 @@ def _candidate_game_ids(app):
         return [game_id for (game_id,) in rows]
 
 
+def _claim_pending_game_ids(app):
+    """Claim queued AI checks that are due, limited to AI candidate games."""
+    with app.app_context():
+        from ai.pending_work import claim_due_games
+        from models import Game, Player, User, db
+
+        claimed = claim_due_games()
+        if not claimed:
+            return []
+        ai_game_ids = (
+            db.session.query(Player.game_id)
+            .join(User, User.id == Player.user_id)
+            .filter(User.is_ai.is_(True))
+        )
+        rows = (
+            db.session.query(Game.id)
+            .filter(Game.id.in_(claimed))
+            .filter(Game.state.in_(('open', 'active')))
+            .filter(or_(
+                Game.mode == 'conquer',
+                Game.id.in_(ai_game_ids),
+            ))
+            .all()
+        )
+        wanted = {game_id for (game_id,) in rows}
+        return [game_id for game_id in claimed if game_id in wanted]
+
+
 def run_worker_iteration(app, *, run_sweeper=False):
-    """Trigger pending AI work and optionally run the stuck-game sweep."""
+    """Trigger queued AI work and optionally reconcile and sweep.
+
+    Each iteration drains only the games queued in ``ai_pending_game``, then
+    sends one batch of due notification mail.
+    ``run_sweeper`` iterations also re-check every candidate game, as a
+    safety net for games queued before the table existed, and run the
+    stuck-game sweep.
+    """
     from ai.ai_worker import trigger_ai_if_needed
 
-    game_ids = _candidate_game_ids(app)
+    pending_ids = _claim_pending_game_ids(app) if settings.AI_JOBS_ENABLED else []
+    candidate_ids = _candidate_game_ids(app) if run_sweeper else []
+    game_ids = list(dict.fromkeys(pending_ids + candidate_ids))
     if settings.AI_JOBS_ENABLED:
         for game_id in game_ids:
             with app.app_context():
                 trigger_ai_if_needed(game_id, app=app)
+        if game_ids:
+            with app.app_context():
+                from ai.pending_work import schedule_game_timers
+
+                schedule_game_timers(game_ids)
 
     swept = 0
     if run_sweeper:
@@ -61,13 +103,46 @@ def run_worker_iteration(app, *, run_sweeper=False):
             from sweepers import sweep_stuck_conquer_games
 
             swept = sweep_stuck_conquer_games()
+
+    # Notification mail queued by web processes (or left over from a restart).
+    with app.app_context():
+        from mail_queue import deliver_due
+
+        mailed = deliver_due()
     return {
-        'candidate_games': len(game_ids),
+        'pending_games': len(pending_ids),
+        'candidate_games': len(candidate_ids),
         'ai_jobs_enabled': bool(settings.AI_JOBS_ENABLED),
         'swept_games': swept,
+        'mail_sent': mailed['sent'],
     }
 
 
+def reconcile_rankings_once(app):
+    """Recount every leaderboard row; returns how many were corrected."""
+    with app.app_context():
+        from models import db
+        from ranking_service import reconcile_rankings
+
+        try:
+            return reconcile_rankings(commit=True)
+        except Exception:
+            db.session.rollback()
+            logger.exception('Ranking reconciliation failed')
+            return 0
+
+
+def _next_wait_seconds(app, idle_seconds):
+    """Sleep until the next queued timer, but never longer than idle."""
+    with app.app_context():
+        from ai.pending_work import seconds_until_next_due
+
+        due_in = seconds_until_next_due()
+    if due_in is None:
+        return idle_seconds
+    return min(idle_seconds, due_in)
+
+
 class _WorkerLeadership:
     """Lifetime leadership handle for one always-on worker."""
 
@@ -209,6 +284,9 @@ def run_forever(app, *, stop_event=None):
         float(settings.STUCK_CONQUER_SWEEP_INTERVAL_SECONDS),
     )
 
+    from ai.pending_work import PendingWakeup
+
+    wakeup = PendingWakeup(app)
     try:
         with app.app_context():
             from ai import init_ai_users
@@ -216,12 +294,15 @@ def run_forever(app, *, stop_event=None):
             init_ai_users()
 
         logger.info(
-            'Background worker started environment=%s poll=%ss sweep=%ss',
+            'Background worker started environment=%s poll=%ss sweep=%ss '
+            'wakeup=%s',
             settings.APP_ENVIRONMENT,
             poll_seconds,
             sweep_seconds,
+            'listen' if wakeup.listening else 'poll',
         )
         last_sweep = 0.0
+        last_ranking_reconcile = time.monotonic()
         while not stop_event.is_set():
             now = time.monotonic()
             run_sweeper = now - last_sweep >= sweep_seconds
@@ -236,8 +317,20 @@ def run_forever(app, *, stop_event=None):
                     result['candidate_games'],
                     result['swept_games'],
                 )
-            stop_event.wait(poll_seconds)
+            ranking_seconds = settings.RANKING_RECONCILE_INTERVAL_SECONDS
+            if ranking_seconds > 0 and now - last_ranking_reconcile >= ranking_seconds:
+                last_ranking_reconcile = now
+                reconcile_rankings_once(app)
+            # With LISTEN, a commit wakes the worker; without it, poll.
+            idle_seconds = poll_seconds
+            if wakeup.listening:
+                idle_seconds = max(
+                    poll_seconds,
+                    last_sweep + sweep_seconds - time.monotonic(),
+                )
+            wakeup.wait(stop_event, _next_wait_seconds(app, idle_seconds))
     finally:
+        wakeup.close()
         leadership.close()
         for signum, handler in previous_handlers.items():
             signal.signal(signum, handler)
@@ -0,0 +1,296 @@
+# Copyright (c) 2026 Marc Stieffenhofer. All rights reserved.
+# See LICENSE file in the project root for full license information.
+"""Counted collection inventory kept beside the per-copy card rows.
+
+``CollectionCard`` keeps one row per physical copy because locks point at
+individual copies: configurations store copy ids, loot and the battle
+shop move them, and clients send them back.  Those rows are therefore the
+lock-allocation ledger.  ``CollectionStack`` holds one row per
+``(user, suit, rank)`` with free/locked counters, so collection reads and
+availability checks cost O(distinct cards) instead of O(copies).
+
+Stacks are maintained by SQLAlchemy session events, like
+:mod:`game_service.game_state_version`, so every writer (routes, loot,
+migrations, the orphan-lock sweep) is covered without bookkeeping:
+
+- ``before_flush``/``after_flush`` mark the keys of deleted, new and
+  changed copies, including the key a copy moved away from;
+- ``do_orm_execute`` marks keys for bulk ``insert()``, ``query.update()``
+  and ``query.delete()``, which carry no row identity;
+- ``before_commit`` locks the marked stack rows and recounts just those
+  keys, so concurrent commits touching one card serialize on its stack.
+
+:func:`sync_collection_stacks` applies pending marks early, for reads that
+must see this transaction's own writes.
+"""
+
+from __future__ import annotations
+
+from itertools import chain
+
+from sqlalchemy import (
+    bindparam, case, event, func, insert, inspect as sa_inspect, select, text, tuple_,
+)
+
+
+_PENDING_KEY = 'nk_collection_stack_pending'
+_SYNCING_KEY = 'nk_collection_stack_syncing'
+_KEY_COLUMNS = ('user_id', 'suit', 'rank')
+_TRACKED_COLUMNS = _KEY_COLUMNS + ('value', 'locked')
+# Keep tuple IN lists well under SQLite's bound-parameter limit.
+_CHUNK = 300
+
+_installed = False
+
+
+def _pending(session):
+    return session.info.setdefault(_PENDING_KEY, set())
+
+
+def _cards():
+    from models import CollectionCard
+
+    return CollectionCard
+
+
+def _chunks(keys):
+    keys = sorted(keys)
+    for start in range(0, len(keys), _CHUNK):
+        yield keys[start:start + _CHUNK]
+
+
+# ── Change tracking ─────────────────────────────────────────────────
+
+def _key(instance):
+    return tuple(getattr(instance, key) for key in _KEY_COLUMNS)
+
+
+def _old_keys(instance):
+    """Yield the current key and, for a moved copy, the key it left."""
+    state = sa_inspect(instance)
+    current = _key(instance)
+    yield current
+    histories = [state.attrs[key].history for key in _KEY_COLUMNS]
+    if any(history.deleted for history in histories):
+        yield tuple(
+            history.deleted[0] if history.deleted else value
+            for history, value in zip(histories, current)
+        )
+
+
+def _before_flush(session, _flush_context, _instances):
+    # Deleted copies are read while their rows still exist.
+    CollectionCard = _cards()
+    _pending(session).update(
+        _key(instance) for instance in session.deleted
+        if isinstance(instance, CollectionCard)
+    )
+
+
+def _after_flush(session, _flush_context):
+    CollectionCard = _cards()
+    pending = _pending(session)
+    for instance in chain(session.new, session.dirty):
+        if not isinstance(instance, CollectionCard) or instance in session.deleted:
+            continue
+        if instance in session.dirty:
+            state = sa_inspect(instance)
+            if not any(state.attrs[key].history.has_changes() for key in _TRACKED_COLUMNS):
+                continue
+        pending.update(key for key in _old_keys(instance) if None not in key)
+
+
+def _statement_keys(session, statement):
+    """Return the distinct keys of the rows a bulk statement will touch."""
+    card = _cards().__table__
+    query = select(card.c.user_id, card.c.suit, card.c.rank).distinct()
+    if statement.whereclause is not None:
+        query = query.where(statement.whereclause)
+    return {tuple(row) for row in session.connection().execute(query)}
+
+
+def _do_orm_execute(orm_execute_state):
+    if not (orm_execute_state.is_insert or orm_execute_state.is_update
+            or orm_execute_state.is_delete):
+        return
+    mapper = orm_execute_state.bind_mapper
+    if mapper is None or mapper.class_ is not _cards():
+        return
+    session = orm_execute_state.session
+    if session.info.get(_SYNCING_KEY):
+        return
+    pending = _pending(session)
+    if orm_execute_state.is_insert:
+        params = orm_execute_state.parameters or []
+        if isinstance(params, dict):
+            params = [params]
+        pending.update(tuple(row[key] for key in _KEY_COLUMNS) for row in params)
+        return
+    pending.update(_statement_keys(session, orm_execute_state.statement))
+
+
+# ── Stack maintenance ───────────────────────────────────────────────
+
+def _recount(session, keys):
+    from models import CollectionStack
+
+    card = _cards().__table__
+    stack = CollectionStack.__table__
+    for chunk in _chunks(keys):
+        rows = [dict(zip(_KEY_COLUMNS, key)) for key in chunk]
+        # Create missing stacks, then lock them: a concurrent commit on the
+        # same card waits here and recounts after this one is visible.
+        session.execute(text(
+            'INSERT INTO collection_stack '
+            '(user_id, suit, rank, value, free_count, locked_count) '
+            'VALUES (:user_id, :suit, :rank, 0, 0, 0) '
+            'ON CONFLICT (user_id, suit, rank) DO NOTHING'
+        ), rows)
+        in_chunk = tuple_(stack.c.user_id, stack.c.suit, stack.c.rank).in_(chunk)
+        session.execute(select(stack.c.user_id).where(in_chunk).with_for_update())
+
+        counts = session.execute(
+            select(
+                card.c.user_id, card.c.suit, card.c.rank,
+                func.max(card.c.value),
+                func.count(),
+                func.sum(case((card.c.locked.is_(True), 1), else_=0)),
+            )
+            .where(tuple_(card.c.user_id, card.c.suit, card.c.rank).in_(chunk))
+            .group_by(card.c.user_id, card.c.suit, card.c.rank)
+        ).all()
+        counted = {}
+        for user_id, suit, rank, value, total, locked in counts:
+            locked = int(locked or 0)
+            counted[(user_id, suit, rank)] = {
+                'k_user_id': user_id, 'k_suit': suit, 'k_rank': rank,
+                'value': int(value or 0),
+                'free_count': int(total) - locked,
+                'locked_count': locked,
+            }
+        if counted:
+            session.execute(
+                stack.update().where(
+                    stack.c.user_id == bindparam('k_user_id'),
+                    stack.c.suit == bindparam('k_suit'),
+                    stack.c.rank == bindparam('k_rank'),
+                ),
+                list(counted.values()),
+            )
+        empty = [key for key in chunk if key not in counted]
+        if empty:
+            session.execute(stack.delete().where(
+                tuple_(stack.c.user_id, stack.c.suit, stack.c.rank).in_(empty)))
+
+
+def sync_collection_stacks(session=None):
+    """Flush and recount every stack marked in this transaction."""
+    if session is None:
+        from models import db
+        session = db.session
+    if session.info.get(_SYNCING_KEY):
+        return
+    session.flush()
+    keys = session.info.pop(_PENDING_KEY, None)
+    if not keys:
+        return
+    session.info[_SYNCING_KEY] = True
+    try:
+        _recount(session, keys)
+    finally:
+        session.info.pop(_SYNCING_KEY, None)
+
+
+def _before_commit(session):
+    sync_collection_stacks(session)
+
+
+def _after_rollback(session):
+    session.info.pop(_PENDING_KEY, None)
+
+
+def _load_previous_value(*_args):
+    """No-op ``set`` listener; registering it turns on ``active_history``."""
+
+
+def install_collection_inventory(session):
+    """Register the stack-maintenance listeners on ``session`` (idempotent)."""
+    global _installed
+    if _installed:
+        return
+    CollectionCard = _cards()
+    for key in _KEY_COLUMNS:
+        # Load the previous value on assignment so a moved copy also
+        # recounts the stack it left.
+        event.listen(getattr(CollectionCard, key), 'set', _load_previous_value,
+                     active_history=True)
+    event.listen(session, 'before_flush', _before_flush)
+    event.listen(session, 'after_flush', _after_flush)
+    event.listen(session, 'do_orm_execute', _do_orm_execute)
+    event.listen(session, 'before_commit', _before_commit)
+    event.listen(session, 'after_rollback', _after_rollback)
+    _installed = True
+
+
+def rebuild_collection_stacks(session=None):
+    """Recount every stack from the copy rows (migration and repair)."""
+    if session is None:
+        from models import db
+        session = db.session
+    session.flush()
+    session.info.pop(_PENDING_KEY, None)
+    session.execute(text('DELETE FROM collection_stack'))
+    session.execute(text(
+        'INSERT INTO collection_stack '
+        '(user_id, suit, rank, value, free_count, locked_count) '
+        'SELECT user_id, suit, rank, MAX(value), '
+        'SUM(CASE WHEN locked THEN 0 ELSE 1 END), '
+        'SUM(CASE WHEN locked THEN 1 ELSE 0 END) '
+        'FROM collection_card GROUP BY user_id, suit, rank'
+    ))
+
+
+# ── Reads and claims ────────────────────────────────────────────────
+
+def free_copies(user_id, suit, rank):
+    """Return the number of unlocked copies of one card."""
+    from models import CollectionStack, db
+
+    sync_collection_stacks(db.session)
+    stack = db.session.get(CollectionStack, (user_id, suit, rank), populate_existing=True)
+    return int(stack.free_count) if stack is not None else 0
+
+
+def consume_free_copies(user_id, suit, rank, count):
+    """Delete ``count`` unlocked copies in one statement; returns rows deleted.
+
+    Callers compare the result with ``count`` and roll back on a shortfall,
+    which keeps concurrent sells/conversions all-or-nothing.
+    """
+    CollectionCard = _cards()
+    ids = (
+        select(CollectionCard.id)
+        .where(CollectionCard.user_id == user_id,
+               CollectionCard.suit == suit,
+               CollectionCard.rank == rank,
+               CollectionCard.locked.is_(False))
+        .limit(count)
+        .scalar_subquery()
+    )
+    return CollectionCard.query.filter(
+        CollectionCard.id.in_(ids),
+        CollectionCard.locked.is_(False),
+    ).delete(synchronize_session=False)
+
+
+def add_copies(user_id, cards):
+    """Insert unlocked copies for ``cards`` (dicts with suit/rank/value)."""
+    from models import db
+
+    rows = [
+        {'user_id': user_id, 'suit': card['suit'], 'rank': card['rank'],
+         'value': card['value'], 'locked': False}
+        for card in cards
+    ]
+    if rows:
+        db.session.execute(insert(_cards()), rows)
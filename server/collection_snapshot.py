@@ -2,50 +2,44 @@
 # See LICENSE file in the project root for full license information.
 """Read-only, grouped collection snapshots shared by configuration routes."""
 
-from sqlalchemy import case
-
-from models import CollectionCard, db
+from collection_inventory import sync_collection_stacks
+from models import CollectionStack, db
 
 
 def serialize_collection_snapshot(user):
     """Return the compact collection payload used by setup screens.
 
-    Grouping in SQL avoids loading every physical card row merely to calculate
-    the total/free/locked counts.  The result intentionally matches
-    ``GET /collection/cards`` so clients can consume either source.
+    Counts come from the per-card ``CollectionStack`` rows, so the read costs
+    one row per distinct card rather than one per physical copy.  The result
+    intentionally matches ``GET /collection/cards`` so clients can consume
+    either source.
     """
-    locked_count = db.func.sum(
-        case((CollectionCard.locked.is_(True), 1), else_=0)
-    )
+    # Include this transaction's own, not yet committed, card changes.
+    sync_collection_stacks(db.session)
     rows = (
         db.session.query(
-            CollectionCard.suit,
-            CollectionCard.rank,
-            CollectionCard.value,
-            db.func.count(CollectionCard.id),
-            locked_count,
-        )
-        .filter(CollectionCard.user_id == user.id)
-        .group_by(
-            CollectionCard.suit,
-            CollectionCard.rank,
-            CollectionCard.value,
+            CollectionStack.suit,
+            CollectionStack.rank,
+            CollectionStack.value,
+            CollectionStack.free_count,
+            CollectionStack.locked_count,
         )
-        .order_by(CollectionCard.suit, CollectionCard.rank)
+        .filter(CollectionStack.user_id == user.id)
+        .order_by(CollectionStack.suit, CollectionStack.rank)
         .all()
     )
 
     cards = []
-    for suit, rank, value, total, locked in rows:
-        total = int(total or 0)
+    for suit, rank, value, free, locked in rows:
+        free = int(free or 0)
         locked = int(locked or 0)
         cards.append({
             'suit': suit,
             'rank': rank,
             'value': value,
-            'total': total,
+            'total': free + locked,
             'locked': locked,
-            'free': total - locked,
+            'free': free,
         })
 
     return {
@@ -0,0 +1,249 @@
+# Copyright (c) 2026 Marc Stieffenhofer. All rights reserved.
+# See LICENSE file in the project root for full license information.
+"""Typed game events, dispatched once per request after they commit.
+
+Replaces the per-blueprint ``after_request`` hooks that re-parsed every
+POST body for a ``game_id`` and reloaded the game to decide whether to
+wake the AI or email a player.  Now the mutation itself is the signal:
+
+- ``after_flush`` compares the flushed ``Game`` columns with their loaded
+  values (new games count as changed from nothing) and records :class:`TurnChanged`, :class:`GameFinished` and
+  :class:`BattlePhaseChanged` events; new or changed ``BattleMove`` /
+  ``ConquerTactic`` rows count as a battle phase change too, since
+  ``detect_phase`` reads their rounds.
+- ``after_commit`` moves the transaction's events to the committed list;
+  ``after_rollback`` drops them.
+- At the end of the request, :func:`dispatch_committed` coalesces them (one
+  event of each kind per game) and hands each subscriber the events it
+  asked for, together with a :class:`DispatchContext`.
+
+A POST that commits nothing relevant (chat, onboarding, collection) emits
+no events and runs no subscriber.  Commits made outside a request (the
+background worker, sweepers) are not dispatched here; the durable AI
+queue (``ai.pending_work``) already covers them, as before.
+
+Analytics stays out of the bus on purpose: ``analytics.track`` records
+``game_finished`` inside the finishing transaction, so the event commits or
+rolls back with the result it describes.
+"""
+
+from __future__ import annotations
+
+import logging
+from dataclasses import dataclass, replace
+from itertools import chain
+from typing import Callable, ClassVar, Optional
+
+from sqlalchemy import event, inspect as sa_inspect
+
+
+logger = logging.getLogger('nepalkings.domain_events')
+
+_PENDING_KEY = 'nk_domain_events_pending'
+_COMMITTED_KEY = 'nk_domain_events_committed'
+# Subscribers may commit; events those commits emit get a few more rounds.
+_MAX_DISPATCH_ROUNDS = 3
+
+_installed = False
+_subscribers = []
+
+
+@dataclass(frozen=True)
+class TurnChanged:
+    """``Game.turn_player_id`` moved to another player.
+
+    ``previous_turn_player_id`` is ``None`` when the old value was never
+    loaded in this transaction.
+    """
+
+    name: ClassVar[str] = 'turn_changed'
+    game_id: int
+    mode: Optional[str]
+    turn_player_id: Optional[int]
+    previous_turn_player_id: Optional[int]
+
+    def merge(self, later: 'TurnChanged') -> 'TurnChanged':
+        return replace(later, previous_turn_player_id=self.previous_turn_player_id)
+
+
+@dataclass(frozen=True)
+class GameFinished:
+    """``Game.state`` became ``'finished'``."""
+
+    name: ClassVar[str] = 'game_finished'
+    game_id: int
+    mode: Optional[str]
+    winner_player_id: Optional[int]
+
+    def merge(self, later: 'GameFinished') -> 'GameFinished':
+        return later
+
+
+@dataclass(frozen=True)
+class BattlePhaseChanged:
+    """A phase column ``detect_phase`` reads (game state, battle, counter
+    spell) or a battle round row changed.
+
+    ``fields`` names the changed ``Game`` columns, plus ``'battle_moves'`` or
+    ``'conquer_tactics'`` for row changes.
+    """
+
+    name: ClassVar[str] = 'battle_phase_changed'
+    game_id: int
+    mode: Optional[str]
+    fields: tuple
+
+    def merge(self, later: 'BattlePhaseChanged') -> 'BattlePhaseChanged':
+        return replace(later, mode=later.mode or self.mode,
+                       fields=tuple(sorted(set(self.fields) | set(later.fields))))
+
+
+EVENT_TYPES = (TurnChanged, GameFinished, BattlePhaseChanged)
+
+
+@dataclass(frozen=True)
+class DispatchContext:
+    """Who caused the events being dispatched."""
+
+    requester_user_id: Optional[int] = None
+    # The request came from the AI worker itself (X-NepalKings-AI-Internal).
+    ai_internal: bool = False
+
+
+# ── Recording ──────────────────────────────────────────────────────
+
+def _phase_columns():
+    from ai.action_enum import PHASE_GAME_FIELDS
+
+    return tuple(
+        field for field in PHASE_GAME_FIELDS
+        if field not in {'id', 'mode', 'turn_player_id'}
+    )
+
+
+def _changed(state, key):
+    """``(changed, previous)`` for a flushed scalar column."""
+    history = state.attrs[key].history
+    if not history.has_changes():
+        return False, None
+    return True, history.deleted[0] if history.deleted else None
+
+
+def _game_events(game):
+    state = sa_inspect(game)
+    events = []
+    changed, previous = _changed(state, 'turn_player_id')
+    if changed and previous != game.turn_player_id:
+        events.append(TurnChanged(game.id, game.mode, game.turn_player_id, previous))
+    # The winner is often set by a later flush of the same transaction.
+    if game.state == 'finished' and (_changed(state, 'state')[0]
+                                     or _changed(state, 'winner_player_id')[0]):
+        events.append(GameFinished(game.id, game.mode, game.winner_player_id))
+    fields = tuple(key for key in _phase_columns() if _changed(state, key)[0])
+    if fields:
+        events.append(BattlePhaseChanged(game.id, game.mode, fields))
+    return events
+
+
+def _battle_row_models():
+    from models import BattleMove, ConquerTactic
+
+    return {BattleMove: 'battle_moves', ConquerTactic: 'conquer_tactics'}
+
+
+def _after_flush(session, _flush_context):
+    # Runs before the flushed history is reset, with primary keys assigned.
+    from models import Game
+
+    pending = session.info.setdefault(_PENDING_KEY, [])
+    row_models = _battle_row_models()
+    for instance in chain(session.new, session.dirty):
+        if isinstance(instance, Game) and instance.id is not None:
+            pending.extend(_game_events(instance))
+    for instance in chain(session.new, session.dirty, session.deleted):
+        section = row_models.get(type(instance))
+        if section is None or instance.game_id is None:
+            continue
+        if instance in session.dirty and not session.is_modified(instance):
+            continue
+        pending.append(BattlePhaseChanged(int(instance.game_id), None, (section,)))
+
+
+def _after_commit(session):
+    pending = session.info.pop(_PENDING_KEY, None)
+    if pending:
+        session.info.setdefault(_COMMITTED_KEY, []).extend(pending)
+
+
+def _after_rollback(session):
+    session.info.pop(_PENDING_KEY, None)
+
+
+def install_domain_events(session):
+    """Register the recording listeners on ``session`` (idempotent)."""
+    global _installed
+    if _installed:
+        return
+    event.listen(session, 'after_flush', _after_flush)
+    event.listen(session, 'after_commit', _after_commit)
+    event.listen(session, 'after_rollback', _after_rollback)
+    _installed = True
+
+
+# ── Dispatch ───────────────────────────────────────────────────────
+
+def subscribe(handler: Callable, *event_types) -> None:
+    """Call ``handler(events, context)`` with committed events of these types.
+
+    ``events`` is a non-empty list holding at most one event per game and
+    type.  Handlers run after the commit, outside its transaction; they
+    must not raise (failures are logged and swallowed).
+    """
+    entry = (handler, tuple(event_types or EVENT_TYPES))
+    if entry not in _subscribers:
+        _subscribers.append(entry)
+
+
+def coalesce(events):
+    """Merge events into one per ``(type, game_id)``, in first-seen order."""
+    merged = {}
+    for item in events:
+        key = (type(item), item.game_id)
+        earlier = merged.get(key)
+        merged[key] = item if earlier is None else earlier.merge(item)
+    return list(merged.values())
+
+
+def take_committed(session):
+    """Remove and return the events committed on ``session`` so far."""
+    return session.info.pop(_COMMITTED_KEY, [])
+
+
+def discard_committed(session):
+    session.info.pop(_COMMITTED_KEY, None)
+
+
+def dispatch(events, context: DispatchContext) -> None:
+    events = coalesce(events)
+    if not events:
+        return
+    for handler, event_types in list(_subscribers):
+        wanted = [item for item in events if isinstance(item, event_types)]
+        if not wanted:
+            continue
+        try:
+            handler(wanted, context)
+        except Exception:
+            logger.exception('domain event subscriber %s failed',
+                             getattr(handler, '__name__', handler))
+
+
+def dispatch_committed(session, context: DispatchContext) -> None:
+    """Dispatch everything committed on ``session``, then anything the
+    subscribers themselves committed (bounded)."""
+    for _round in range(_MAX_DISPATCH_ROUNDS):
+        events = take_committed(session)
+        if not events:
+            return
+        dispatch(events, context)
+    discard_committed(session)
@@ -144,10 +144,16 @@ def reconcile_conquered_land_kingdom(
                     'cleared_defence_config_ids'
                 ] = cleared_ids
 
+        moved_land_ids = None  # unknown land: reconcile both realms fully
+        if land_id is not None:
+            moved_land_ids = [land_id] + list(
+                (split_transfer_summary or {}).get('transferred_land_ids') or []
+            )
         reconcile_after_land_transfer(
             old_owner_id=old_land_owner_id,
             new_owner_id=attacker_user.id,
             commit=False,
+            land_ids=moved_land_ids,
         )
         _reconcile_affected_regions(
             land,
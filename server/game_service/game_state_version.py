@@ -0,0 +1,229 @@
+# Copyright (c) 2026 Marc Stieffenhofer. All rights reserved.
+# See LICENSE file in the project root for full license information.
+"""Per-game state versions for delta polling.
+
+Every committed transaction that touches a game's graph bumps
+``Game.state_version`` once and stamps the touched payload sections in
+``Game.state_section_versions``.  ``/games/get_game?since_version=N`` uses
+the stamps to answer "unchanged" or to send only the sections that moved.
+
+Tracking is driven by SQLAlchemy session events, so route mutations, AI
+actions and sweepers are all covered without per-route bookkeeping:
+
+- ``before_flush`` maps new/dirty/deleted rows to ``(game_id, sections)``.
+- ``do_orm_execute`` records bulk ``query.update()``/``query.delete()``
+  sections; they carry no row identity, so they are attributed to every game
+  touched or scoped (see :func:`scoped_game_mutation`) in the transaction.
+- ``before_commit`` locks the affected game rows and applies one bump each,
+  then hands the bumped games to any listener registered with
+  :func:`add_state_bump_listener` (the AI work queue uses this).
+
+Versions only ever err on the low side: a payload serialized before its own
+commit carries the previous version, which makes the next poll resend the
+changed sections rather than miss them.
+"""
+
+from __future__ import annotations
+
+from contextlib import contextmanager
+from itertools import chain
+
+from sqlalchemy import event, inspect as sa_inspect
+
+
+LIST_SECTIONS = (
+    'players',
+    'main_cards',
+    'side_cards',
+    'battle_moves',
+    'conquer_tactics',
+    'active_spells',
+    'log_entries',
+    'chat_messages',
+)
+# Append-only sections: delta responses may send only rows past a cursor.
+APPEND_SECTIONS = ('log_entries', 'chat_messages')
+# An active All Seeing Eye un-redacts the opponent's rows in these sections
+# for its caster, so a reveal starting or ending stamps them too.
+REVEAL_SECTIONS = ('players', 'main_cards', 'side_cards', 'battle_moves',
+                   'conquer_tactics')
+_REVEAL_SPELL = 'All Seeing Eye'
+
+_VERSION_COLUMNS = frozenset({'state_version', 'state_section_versions'})
+_PENDING_KEY = 'nk_game_state_pending'
+_BULK_KEY = 'nk_game_state_bulk_sections'
+_SCOPED_KEY = 'nk_game_state_scoped_games'
+
+_installed = False
+_bump_listeners = []
+
+
+def _sections_by_model():
+    from models import (
+        ActiveSpell, BattleMove, CardToFigure, ChatMessage, ConquerTactic,
+        Figure, LogEntry, MainCard, Player, SideCard,
+    )
+    return {
+        Player: ('players',),
+        MainCard: ('players', 'main_cards'),
+        SideCard: ('players', 'side_cards'),
+        Figure: ('players',),
+        CardToFigure: ('players',),
+        BattleMove: ('battle_moves',),
+        ConquerTactic: ('conquer_tactics',),
+        ActiveSpell: ('active_spells',),
+        LogEntry: ('log_entries',),
+        ChatMessage: ('chat_messages',),
+    }
+
+
+def _spell_sections(instance, sections):
+    """Add :data:`REVEAL_SECTIONS` for All Seeing Eye spell rows."""
+    if _REVEAL_SPELL in str(getattr(instance, 'spell_name', None) or ''):
+        return sections + REVEAL_SECTIONS
+    return sections
+
+
+def _pending(session):
+    return session.info.setdefault(_PENDING_KEY, {})
+
+
+def _instance_game_id(instance):
+    game_id = getattr(instance, 'game_id', None)
+    if game_id is None and hasattr(instance, 'figure_id'):
+        figure = getattr(instance, 'figure', None)
+        game_id = getattr(figure, 'game_id', None)
+    return game_id
+
+
+def _game_columns_changed(game):
+    state = sa_inspect(game)
+    for attr in state.mapper.column_attrs:
+        if attr.key in _VERSION_COLUMNS:
+            continue
+        if state.attrs[attr.key].history.has_changes():
+            return True
+    return False
+
+
+def _before_flush(session, _flush_context, _instances):
+    from models import ActiveSpell, Game
+
+    sections_by_model = _sections_by_model()
+    pending = _pending(session)
+    for instance in chain(session.new, session.dirty, session.deleted):
+        if isinstance(instance, Game):
+            if instance.id is not None and _game_columns_changed(instance):
+                pending.setdefault(instance.id, set()).add('game')
+            continue
+        sections = sections_by_model.get(type(instance))
+        if not sections:
+            continue
+        if instance in session.dirty and not session.is_modified(instance):
+            continue
+        if isinstance(instance, ActiveSpell):
+            sections = _spell_sections(instance, sections)
+        game_id = _instance_game_id(instance)
+        if game_id is not None:
+            pending.setdefault(int(game_id), set()).update(sections)
+
+
+def _do_orm_execute(orm_execute_state):
+    if not (orm_execute_state.is_update or orm_execute_state.is_delete):
+        return
+    mapper = orm_execute_state.bind_mapper
+    if mapper is None:
+        return
+    from models import ActiveSpell
+
+    sections = _sections_by_model().get(mapper.class_)
+    if mapper.class_ is ActiveSpell:
+        # Bulk statements carry no spell names; any of them may end a reveal.
+        sections = sections + REVEAL_SECTIONS
+    if sections:
+        orm_execute_state.session.info.setdefault(_BULK_KEY, set()).update(sections)
+
+
+def _before_commit(session):
+    # Flush first so rows added since the last flush are attributed too.
+    session.flush()
+    pending = session.info.pop(_PENDING_KEY, {})
+    bulk_sections = session.info.pop(_BULK_KEY, set())
+    if bulk_sections:
+        for game_id in chain(list(pending), session.info.get(_SCOPED_KEY, ())):
+            pending.setdefault(game_id, set()).update(bulk_sections)
+    changed = {game_id: sections for game_id, sections in pending.items() if sections}
+    if not changed:
+        return
+
+    from models import Game
+
+    games = (
+        session.query(Game)
+        .filter(Game.id.in_(sorted(changed)))
+        .with_for_update()
+        .populate_existing()
+        .all()
+    )
+    for game in games:
+        version = int(game.state_version or 0) + 1
+        stamps = dict(game.state_section_versions or {})
+        for section in changed[game.id]:
+            stamps[section] = version
+        game.state_version = version
+        game.state_section_versions = stamps
+    session.flush()
+    # The bump flush itself must not leave pending work behind.
+    session.info.pop(_PENDING_KEY, None)
+    for listener in _bump_listeners:
+        listener(session, games)
+
+
+def _after_rollback(session):
+    session.info.pop(_PENDING_KEY, None)
+    session.info.pop(_BULK_KEY, None)
+
+
+def install_state_version_tracking(session):
+    """Register the version-tracking listeners on ``session`` (idempotent)."""
+    global _installed
+    if _installed:
+        return
+    event.listen(session, 'before_flush', _before_flush)
+    event.listen(session, 'do_orm_execute', _do_orm_execute)
+    event.listen(session, 'before_commit', _before_commit)
+    event.listen(session, 'after_rollback', _after_rollback)
+    _installed = True
+
+
+def add_state_bump_listener(listener):
+    """Call ``listener(session, games)`` inside every commit that bumps games.
+
+    The listener runs in the committing transaction, after the version bump
+    and while the game rows are locked; anything it writes commits with it.
+    """
+    if listener not in _bump_listeners:
+        _bump_listeners.append(listener)
+
+
+@contextmanager
+def scoped_game_mutation(game_id, session=None):
+    """Attribute bulk updates/deletes inside this block to ``game_id``."""
+    if session is None:
+        from models import db
+        session = db.session
+    scoped = session.info.setdefault(_SCOPED_KEY, [])
+    scoped.append(int(game_id))
+    try:
+        yield
+    finally:
+        scoped.remove(int(game_id))
+
+
+def changed_sections_since(game, since_version):
+    """Return the list sections stamped after ``since_version``."""
+    stamps = game.state_section_versions or {}
+    return [
+        section for section in LIST_SECTIONS
+        if int(stamps.get(section) or 0) > since_version
+    ]
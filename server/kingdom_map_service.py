@@ -0,0 +1,317 @@
+# Copyright (c) 2026 Marc Stieffenhofer. All rights reserved.
+# See LICENSE file in the project root for full license information.
+"""Versioned kingdom map: static document, change stamps and map reads.
+
+The kingdom map is split in two:
+
+- the *static* part of each land (position, region, tier, gold rate, suit
+  bonus) never changes after map generation.  :func:`static_map_document`
+  builds it once per process and fingerprints it for ``ETag`` revalidation;
+- the *dynamic* part (owner, connected component, kingdom name, level,
+  style and shield, conquer cooldown) is versioned.  Every commit that
+  changes it bumps the global ``kingdom_map_version`` counter once and
+  stamps the affected lands' ``Land.map_version``, so
+  ``/kingdom/map/changes?since_version=N`` sends only lands stamped after
+  ``N``.  :func:`cached_map_state` keeps the viewer- and clock-independent
+  map built for the current version, so polls only add the per-viewer
+  fields.
+
+Stamping is driven by SQLAlchemy session events, like
+:mod:`game_service.game_state_version`, so conquests, sweepers and kingdom
+management routes are covered without per-route bookkeeping.  An ownership
+change stamps every land of the previous and the new owner because
+connected-component ids are numbered per owner; a kingdom change stamps
+every land of that kingdom.  Bulk ``query.update()``/``delete()`` on these
+models carries no row identity and stamps the whole map.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+from collections import namedtuple
+from contextlib import contextmanager
+from itertools import chain
+
+from sqlalchemy import event, func, or_, text, true
+
+import server_settings as config
+
+
+# Land columns whose change alters a tile's dynamic state.
+LAND_COLUMNS = ('owner_user_id', 'owned_since', 'kingdom_id', 'conquer_cooldown_until')
+# Kingdom columns rendered on the map (name, level, style, shield).
+KINGDOM_COLUMNS = (
+    'owner_user_id', 'name', 'level', 'shield_until', 'badge_key',
+    'border_key', 'surface_key', 'color_key', 'sigil_key',
+)
+# Fields of the static map document; everything else on a tile is dynamic.
+STATIC_LAND_FIELDS = (
+    'col', 'row', 'region', 'tier', 'gold_rate', 'suit_bonus_suit',
+    'suit_bonus_value',
+)
+# Tile fields that depend on the viewer or the clock rather than on the map
+# version.  Change feeds resend every tile on which one of them is set.
+VOLATILE_LAND_FIELDS = (
+    'is_mine', 'defence_incomplete', 'is_recommended_tutorial_land',
+    'conquer_cooldown_remaining', 'kingdom_shield_remaining',
+    'kingdom_shield_reason', 'kingdom_is_shielded',
+)
+
+# Read-only land row used for cached map builds; duck-types ``Land`` for
+# the kingdom/region helpers, which only read these attributes.
+MapLand = namedtuple('MapLand', (
+    'id', 'col', 'row', 'region', 'tier', 'gold_rate', 'suit_bonus_suit',
+    'suit_bonus_value', 'owner_user_id', 'owned_since', 'kingdom_id',
+    'conquer_cooldown_until', 'map_version',
+))
+
+_PENDING_KEY = 'nk_kingdom_map_pending'
+_STAMPING_KEY = 'nk_kingdom_map_stamping'
+_SUSPENDED_KEY = 'nk_kingdom_map_suspended'
+
+_installed = False
+_static_cache = {}
+_state_cache = {}
+
+
+# ── Change tracking ─────────────────────────────────────────────────
+
+def _pending(session):
+    return session.info.setdefault(_PENDING_KEY, {
+        'all': False, 'lands': set(), 'owners': set(), 'kingdoms': set(),
+    })
+
+
+def _column_history(instance, key):
+    from sqlalchemy import inspect as sa_inspect
+
+    return sa_inspect(instance).attrs[key].history
+
+
+def _changed(instance, keys):
+    return [key for key in keys if _column_history(instance, key).has_changes()]
+
+
+def _history_values(instance, key):
+    history = _column_history(instance, key)
+    return [value for value in chain(history.added, history.deleted) if value is not None]
+
+
+def _before_flush(session, _flush_context, _instances):
+    from models import Kingdom, KingdomSkillAllocation, Land, User
+
+    pending = _pending(session)
+    for instance in chain(session.new, session.dirty, session.deleted):
+        if isinstance(instance, Land):
+            if instance in session.new or instance in session.deleted:
+                pending['all'] = True
+                continue
+            changed = _changed(instance, LAND_COLUMNS)
+            if not changed:
+                continue
+            pending['lands'].add(instance.id)
+            pending['owners'].update(_history_values(instance, 'owner_user_id'))
+            pending['kingdoms'].update(_history_values(instance, 'kingdom_id'))
+        elif isinstance(instance, Kingdom):
+            if instance.id is None:
+                continue  # its lands are stamped when they join it
+            if instance in session.deleted or _changed(instance, KINGDOM_COLUMNS):
+                pending['kingdoms'].add(instance.id)
+        elif isinstance(instance, KingdomSkillAllocation):
+            if instance.kingdom_id is not None:
+                pending['kingdoms'].add(instance.kingdom_id)
+        elif isinstance(instance, User):
+            if instance.id is not None and _changed(instance, ('username',)):
+                pending['owners'].add(instance.id)
+
+
+def _do_orm_execute(orm_execute_state):
+    if not (orm_execute_state.is_update or orm_execute_state.is_delete):
+        return
+    session = orm_execute_state.session
+    if session.info.get(_STAMPING_KEY):
+        return
+    mapper = orm_execute_state.bind_mapper
+    if mapper is None:
+        return
+    from models import Kingdom, KingdomSkillAllocation, Land
+
+    if mapper.class_ in (Land, Kingdom, KingdomSkillAllocation):
+        _pending(session)['all'] = True
+
+
+def _bump_version(session):
+    return int(session.execute(text(
+        'INSERT INTO kingdom_map_version (id, version) VALUES (1, 1) '
+        'ON CONFLICT (id) DO UPDATE SET '
+        'version = kingdom_map_version.version + 1 '
+        'RETURNING version'
+    )).scalar_one())
+
+
+def _before_commit(session):
+    if session.info.get(_SUSPENDED_KEY):
+        session.info.pop(_PENDING_KEY, None)
+        return
+    session.flush()
+    pending = session.info.pop(_PENDING_KEY, None)
+    if not pending or not (pending['all'] or pending['lands']
+                           or pending['owners'] or pending['kingdoms']):
+        return
+
+    from models import Land
+
+    land = Land.__table__
+    if pending['all']:
+        condition = true()
+    else:
+        clauses = []
+        if pending['lands']:
+            clauses.append(land.c.id.in_(sorted(pending['lands'])))
+        if pending['owners']:
+            clauses.append(land.c.owner_user_id.in_(sorted(pending['owners'])))
+        if pending['kingdoms']:
+            clauses.append(land.c.kingdom_id.in_(sorted(pending['kingdoms'])))
+        condition = or_(*clauses)
+
+    session.info[_STAMPING_KEY] = True
+    try:
+        version = _bump_version(session)
+        session.execute(land.update().where(condition).values(map_version=version))
+    finally:
+        session.info.pop(_STAMPING_KEY, None)
+
+
+def _after_rollback(session):
+    session.info.pop(_PENDING_KEY, None)
+
+
+def install_map_version_tracking(session):
+    """Register the map-version listeners on ``session`` (idempotent)."""
+    global _installed
+    if _installed:
+        return
+    event.listen(session, 'before_flush', _before_flush)
+    event.listen(session, 'do_orm_execute', _do_orm_execute)
+    event.listen(session, 'before_commit', _before_commit)
+    event.listen(session, 'after_rollback', _after_rollback)
+    _installed = True
+
+
+@contextmanager
+def map_version_tracking_suspended(session):
+    """Skip stamping inside the block.
+
+    Schema migrations rewrite lands before ``land.map_version`` and
+    ``kingdom_map_version`` exist; clients resync from version ``0`` anyway.
+    """
+    session.info[_SUSPENDED_KEY] = True
+    try:
+        yield
+    finally:
+        session.info.pop(_SUSPENDED_KEY, None)
+        session.info.pop(_PENDING_KEY, None)
+
+
+def current_map_version():
+    """Return the committed map version (``0`` before the first change)."""
+    from models import db
+
+    version = db.session.execute(
+        text('SELECT version FROM kingdom_map_version WHERE id = 1')
+    ).scalar()
+    return int(version or 0)
+
+
+# ── Map reads ───────────────────────────────────────────────────────
+
+def _region_of(col, row, region):
+    if region:
+        return region
+    from region_service import region_for
+
+    return region_for(col, row, config.KINGDOM_MAP_COLS, config.KINGDOM_MAP_ROWS)
+
+
+def static_map_document():
+    """Return ``(json_body, etag)`` for the static map, cached per process.
+
+    Static columns are only written by map generation, so a one-row
+    aggregate over them is enough to notice a regenerated map.
+    """
+    from models import Land, db
+
+    fingerprint = tuple(db.session.query(
+        func.count(Land.id), func.max(Land.id), func.sum(Land.col + Land.row),
+        func.sum(Land.tier), func.sum(Land.gold_rate),
+        func.sum(Land.suit_bonus_value),
+    ).one())
+    if _static_cache.get('fingerprint') == fingerprint:
+        return _static_cache['body'], _static_cache['etag']
+
+    rows = (
+        db.session.query(Land.id, *(getattr(Land, field) for field in STATIC_LAND_FIELDS))
+        .order_by(Land.row, Land.col)
+        .all()
+    )
+    lands = []
+    for row in rows:
+        land = dict(zip(('id',) + STATIC_LAND_FIELDS, row))
+        land['region'] = _region_of(land['col'], land['row'], land['region'])
+        lands.append(land)
+    canonical = json.dumps({'lands': lands}, sort_keys=True, separators=(',', ':'))
+    etag = hashlib.sha256(canonical.encode('utf-8')).hexdigest()[:32]
+    body = json.dumps({'lands': lands, 'static_version': etag}, separators=(',', ':'))
+    _static_cache.update(fingerprint=fingerprint, body=body, etag=etag)
+    return body, etag
+
+
+def load_map_lands():
+    """Return every land as a :class:`MapLand`, ordered like the map grid.
+
+    Column-only rows skip ORM identity-map bookkeeping for the ~5k-tile
+    map read; the kingdom and region helpers accept them in place of
+    ``Land`` instances.
+    """
+    from models import Land, db
+
+    rows = (
+        db.session.query(*(getattr(Land, field) for field in MapLand._fields))
+        .order_by(Land.row, Land.col)
+        .all()
+    )
+    return [MapLand(*row) for row in rows]
+
+
+def _has_uncommitted_map_changes(session):
+    if session.new or session.dirty or session.deleted:
+        return True
+    pending = session.info.get(_PENDING_KEY)
+    return bool(pending) and any(pending.values())
+
+
+def cached_map_state(map_version, build):
+    """Return ``build(load_map_lands())``, reused while ``map_version`` holds.
+
+    Every commit that changes dynamic land state moves the version, so the
+    viewer- and clock-independent part of the map is built once per version
+    and per process rather than on every poll.  A session holding its own
+    uncommitted map changes builds a private copy instead.
+    """
+    from models import db
+
+    if _has_uncommitted_map_changes(db.session):
+        return build(load_map_lands())
+    entry = _state_cache.get('entry')
+    if entry is not None and entry[0] == map_version:
+        return entry[1]
+    state = build(load_map_lands())
+    _state_cache['entry'] = (map_version, state)
+    return state
+
+
+def clear_map_caches():
+    """Drop the per-process static map and map state caches."""
+    _static_cache.clear()
+    _state_cache.clear()
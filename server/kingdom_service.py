@@ -819,16 +819,27 @@ def kingdom_shield_block_reason(land, now=None):
     kingdom = db.session.get(Kingdom, land.kingdom_id)
     if not kingdom:
         return 0, None, None
-    now = now or _utcnow()
-    if kingdom.shield_until:
-        remaining = int((kingdom.shield_until - now).total_seconds())
+    remaining, reason = kingdom_shield_status(
+        kingdom.shield_until, kingdom_core_protection_active(kingdom),
+        now or _utcnow())
+    return remaining, kingdom, reason
+
+
+def kingdom_shield_status(shield_until, core_protected, now):
+    """Return ``(remaining_seconds, reason)`` for a kingdom's shield state.
+
+    The rule behind :func:`kingdom_shield_block_reason`, taking plain values
+    so cached map state can re-evaluate it against the clock.
+    """
+    if shield_until:
+        remaining = int((shield_until - now).total_seconds())
         if remaining > 0:
-            return remaining, kingdom, 'shield'
+            return remaining, 'shield'
     # Core protection: when the kingdom has shrunk to <= protected_count
     # lands, ALL of those lands are permanently shielded.
-    if kingdom_core_protection_active(kingdom):
-        return -1, kingdom, 'core_protection'
-    return 0, kingdom, None
+    if core_protected:
+        return -1, 'core_protection'
+    return 0, None
 
 
 # ── Persistent kingdom configuration ────────────────────────────────────────
@@ -1902,9 +1913,55 @@ def _choose_component_kingdom(component_lands, used_kingdom_ids):
     return candidates[0][-1]
 
 
-def reconcile_user_kingdoms(user_id, commit=False):
-    """Ensure each connected land component has one persistent kingdom."""
-    lands = Land.query.filter_by(owner_user_id=user_id).all()
+def _kingdom_scope_lands(user_id, land_ids):
+    """Return the user's lands whose kingdom may change after ``land_ids`` moved.
+
+    ``Land.kingdom_id`` is the persistent component index: after a
+    reconcile every kingdom covers exactly one connected component.  A
+    transfer can therefore only split a kingdom next to a lost land or
+    merge kingdoms next to a gained one.  The scope is every gained or
+    kingdom-less land plus all lands of the kingdoms bordering them.
+    """
+    seeds = Land.query.filter(
+        Land.owner_user_id == user_id,
+        Land.kingdom_id.is_(None),
+    ).all()
+    if land_ids:
+        seeds.extend(Land.query.filter(Land.id.in_(sorted(set(land_ids)))).all())
+    coords = set()
+    for land in seeds:
+        coords.add((land.col, land.row))
+        coords.update(kingdom_neighbor_coords(land.col, land.row))
+    if not coords:
+        return []
+    nearby = [
+        land for land in Land.query.filter(
+            Land.owner_user_id == user_id,
+            Land.col.in_({col for col, _row in coords}),
+            Land.row.in_({row for _col, row in coords}),
+        ).all()
+        if (land.col, land.row) in coords
+    ]
+    kingdom_ids = {land.kingdom_id for land in nearby if land.kingdom_id}
+    clauses = [Land.id.in_([land.id for land in nearby])]
+    if kingdom_ids:
+        clauses.append(Land.kingdom_id.in_(sorted(kingdom_ids)))
+    return Land.query.filter(
+        Land.owner_user_id == user_id,
+        db.or_(*clauses),
+    ).all()
+
+
+def reconcile_user_kingdoms(user_id, commit=False, land_ids=None):
+    """Ensure each connected land component has one persistent kingdom.
+
+    With ``land_ids`` (lands that just changed owner), only the components
+    around those lands are rebuilt; see :func:`_kingdom_scope_lands`.
+    """
+    if land_ids is None:
+        lands = Land.query.filter_by(owner_user_id=user_id).all()
+    else:
+        lands = _kingdom_scope_lands(user_id, land_ids)
     if not lands:
         delete_orphan_kingdoms(user_id, commit=False)
         if commit:
@@ -1965,11 +2022,18 @@ def reconcile_all_kingdoms(commit=False):
     return kingdoms
 
 
-def reconcile_after_land_transfer(old_owner_id=None, new_owner_id=None, commit=False):
+def reconcile_after_land_transfer(old_owner_id=None, new_owner_id=None, commit=False,
+                                  land_ids=None):
+    """Reconcile both owners' kingdoms after lands moved between them.
+
+    Passing the moved ``land_ids`` limits the work to the affected
+    components instead of each owner's whole realm.
+    """
     touched = []
     for user_id in {old_owner_id, new_owner_id}:
         if user_id:
-            touched.extend(reconcile_user_kingdoms(user_id, commit=False))
+            touched.extend(reconcile_user_kingdoms(
+                user_id, commit=False, land_ids=land_ids))
     if commit:
         db.session.commit()
     return touched
@@ -0,0 +1,411 @@
+# Copyright (c) 2026 Marc Stieffenhofer. All rights reserved.
+# See LICENSE file in the project root for full license information.
+"""Durable outbound mail queue with one pooled-SMTP delivery worker.
+
+Notification emails used to start a thread per message, and every thread
+opened its own SMTP connection (EHLO, STARTTLS, login).  A burst of turn
+changes or finished games became a burst of threads and TCP handshakes.
+Now:
+
+- :func:`enqueue_email` stores the message in ``outbound_email`` and wakes
+  the worker.  The table is bounded by ``MAIL_QUEUE_MAX_PENDING``; beyond
+  it new mail is dropped with a warning rather than growing without limit.
+- :func:`deliver_due` claims up to ``MAIL_BATCH_SIZE`` due rows (a claim
+  token keeps a second drainer off them) and sends them over one
+  :class:`SMTPSession`, which stays open between batches until it has been
+  idle for ``MAIL_SMTP_IDLE_SECONDS``.
+- A failed message is retried with exponential backoff
+  (``MAIL_RETRY_BASE_SECONDS`` doubling up to ``MAIL_RETRY_MAX_SECONDS``)
+  and given up after ``MAIL_MAX_ATTEMPTS``.
+- Rows survive restarts.  The in-process :class:`MailWorker` drains them
+  when it starts, and the dedicated background worker drains the same
+  table on every iteration.
+
+:func:`get_mail_queue_metrics` reports queue depth, the age of the oldest
+message, and SMTP send latency and queue latency (enqueue to delivery);
+``/readyz`` includes it.  ``scripts/smtp_stub.py`` is a local SMTP server
+for tests and development.
+"""
+
+from __future__ import annotations
+
+import logging
+import smtplib
+import threading
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+from email.mime.text import MIMEText
+
+from sqlalchemy import func
+
+import server_settings as settings
+from models import db, OutboundEmail
+
+
+logger = logging.getLogger('nepalkings.mail_queue')
+
+_SMTP_TIMEOUT_SECONDS = 30
+# A claimed row whose sender died becomes due again after this long.
+_CLAIM_LEASE_SECONDS = 300
+# Upper bound on the worker's sleep when nothing is due.
+_IDLE_POLL_SECONDS = 60.0
+
+
+def _utcnow():
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+def smtp_configured():
+    return bool(getattr(settings, 'NOTIFY_EMAILS_ENABLED', True) and settings.SMTP_HOST)
+
+
+# ── Metrics ────────────────────────────────────────────────────────
+
+class _MailStats:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._clear()
+
+    def _clear(self):
+        self.counts = {
+            'enqueued': 0, 'sent': 0, 'retried': 0, 'failed': 0,
+            'dropped_full': 0, 'connections_opened': 0,
+        }
+        self._send_total = 0.0
+        self._send_max = 0.0
+        self._queue_total = 0.0
+        self._queue_max = 0.0
+
+    def reset(self):
+        with self._lock:
+            self._clear()
+
+    def incr(self, key, amount=1):
+        with self._lock:
+            self.counts[key] += amount
+
+    def record_sent(self, send_seconds, queued_seconds):
+        with self._lock:
+            self.counts['sent'] += 1
+            self._send_total += send_seconds
+            self._send_max = max(self._send_max, send_seconds)
+            self._queue_total += queued_seconds
+            self._queue_max = max(self._queue_max, queued_seconds)
+
+    def snapshot(self):
+        with self._lock:
+            sent = self.counts['sent']
+            return {
+                **self.counts,
+                'send_latency_avg_ms': round(self._send_total / sent * 1000, 1) if sent else 0.0,
+                'send_latency_max_ms': round(self._send_max * 1000, 1),
+                'queue_latency_avg_ms': round(self._queue_total / sent * 1000, 1) if sent else 0.0,
+                'queue_latency_max_ms': round(self._queue_max * 1000, 1),
+            }
+
+
+_stats = _MailStats()
+
+
+# ── SMTP session ───────────────────────────────────────────────────
+
+class SMTPSession:
+    """One SMTP connection, opened on demand and reused across messages."""
+
+    def __init__(self):
+        self._smtp = None
+        self._last_used = 0.0
+
+    @property
+    def is_open(self):
+        return self._smtp is not None
+
+    def _open(self):
+        smtp = smtplib.SMTP(settings.SMTP_HOST, settings.SMTP_PORT,
+                            timeout=_SMTP_TIMEOUT_SECONDS)
+        try:
+            smtp.ehlo()
+            if settings.SMTP_STARTTLS:
+                smtp.starttls()
+                smtp.ehlo()
+            if settings.SMTP_USER and settings.SMTP_PASSWORD:
+                smtp.login(settings.SMTP_USER, settings.SMTP_PASSWORD)
+        except Exception:
+            smtp.close()
+            raise
+        _stats.incr('connections_opened')
+        self._smtp = smtp
+
+    def send(self, msg):
+        """Send ``msg``; a connection the server dropped is reopened once."""
+        if self._smtp is None:
+            self._open()
+        try:
+            self._smtp.send_message(msg)
+        except smtplib.SMTPServerDisconnected:
+            self.close()
+            self._open()
+            self._smtp.send_message(msg)
+        self._last_used = time.monotonic()
+
+    def close_if_idle(self, idle_seconds):
+        if self._smtp is not None and time.monotonic() - self._last_used >= idle_seconds:
+            self.close()
+
+    def close(self):
+        smtp, self._smtp = self._smtp, None
+        if smtp is None:
+            return
+        try:
+            smtp.quit()
+        except Exception:
+            smtp.close()
+
+
+_session = SMTPSession()
+# deliver_due is called by the worker thread and by the background worker
+# iteration; the session is not thread-safe.
+_session_lock = threading.Lock()
+
+
+# ── Queue ──────────────────────────────────────────────────────────
+
+def queue_depth():
+    return db.session.query(func.count(OutboundEmail.id)).scalar() or 0
+
+
+def enqueue_email(to_addr, subject, body):
+    """Store a notification email for delivery. Never raises.
+
+    Returns True if the message was queued.  Without SMTP configured the
+    email is only logged, as before.
+    """
+    if not smtp_configured():
+        logger.info('[EMAIL OFF] To: %s — %s', to_addr, subject)
+        return False
+    try:
+        if queue_depth() >= settings.MAIL_QUEUE_MAX_PENDING:
+            _stats.incr('dropped_full')
+            logger.warning('Mail queue full (%d pending); dropped mail to %s — %s',
+                           settings.MAIL_QUEUE_MAX_PENDING, to_addr, subject)
+            return False
+        db.session.add(OutboundEmail(to_addr=to_addr, subject=subject[:255], body=body))
+        db.session.commit()
+    except Exception:
+        logger.exception('Failed to queue notification to %s', to_addr)
+        db.session.rollback()
+        return False
+    _stats.incr('enqueued')
+    _wake_worker()
+    return True
+
+
+def _retry_delay(attempts):
+    delay = settings.MAIL_RETRY_BASE_SECONDS * (2 ** max(0, attempts - 1))
+    return min(delay, settings.MAIL_RETRY_MAX_SECONDS)
+
+
+def _claim_batch(now, limit):
+    """Claim up to ``limit`` due rows for this drainer and return them."""
+    token = uuid.uuid4().hex
+    due_ids = [
+        row_id for (row_id,) in (
+            db.session.query(OutboundEmail.id)
+            .filter(OutboundEmail.due_at <= now)
+            .order_by(OutboundEmail.due_at, OutboundEmail.id)
+            .limit(limit)
+            .all()
+        )
+    ]
+    if not due_ids:
+        return []
+    (
+        OutboundEmail.query
+        .filter(OutboundEmail.id.in_(due_ids))
+        .filter(OutboundEmail.due_at <= now)
+        .update({'claim_token': token,
+                 'due_at': now + timedelta(seconds=_CLAIM_LEASE_SECONDS)},
+                synchronize_session=False)
+    )
+    db.session.commit()
+    return (
+        OutboundEmail.query
+        .filter_by(claim_token=token)
+        .order_by(OutboundEmail.id)
+        .all()
+    )
+
+
+def _message(row):
+    msg = MIMEText(row.body)
+    msg['Subject'] = row.subject
+    msg['From'] = settings.SMTP_FROM
+    msg['To'] = row.to_addr
+    return msg
+
+
+def _reschedule(row, now, error):
+    """Back the row off after a failed send; returns the outcome key."""
+    row.attempts = (row.attempts or 0) + 1
+    row.claim_token = None
+    row.last_error = str(error)[:255]
+    if row.attempts >= settings.MAIL_MAX_ATTEMPTS:
+        logger.error('Giving up on notification to %s after %d attempts: %s',
+                     row.to_addr, row.attempts, row.last_error)
+        db.session.delete(row)
+        outcome = 'failed'
+    else:
+        row.due_at = now + timedelta(seconds=_retry_delay(row.attempts))
+        outcome = 'retried'
+    _stats.incr(outcome)
+    return outcome
+
+
+def deliver_due(limit=None, now=None):
+    """Send one batch of due mail over the shared SMTP session.
+
+    Needs an app context.  Returns ``{'sent': n, 'retried': n, 'failed': n}``
+    for this batch.
+    """
+    result = {'sent': 0, 'retried': 0, 'failed': 0}
+    if not smtp_configured():
+        return result
+    with _session_lock:
+        now = now or _utcnow()
+        rows = _claim_batch(now, limit or settings.MAIL_BATCH_SIZE)
+        for row in rows:
+            started = time.perf_counter()
+            try:
+                _session.send(_message(row))
+            except Exception as exc:
+                logger.warning('Notification to %s failed (attempt %d): %s',
+                               row.to_addr, (row.attempts or 0) + 1, exc)
+                # Whatever went wrong, start the next message on a fresh connection.
+                _session.close()
+                result[_reschedule(row, now, exc)] += 1
+                continue
+            queued_seconds = max(0.0, (_utcnow() - row.created_at).total_seconds())
+            _stats.record_sent(time.perf_counter() - started, queued_seconds)
+            logger.info('Notification sent to %s — %s', row.to_addr, row.subject)
+            db.session.delete(row)
+            result['sent'] += 1
+        if rows:
+            db.session.commit()
+    return result
+
+
+def seconds_until_next_due(now=None):
+    """Seconds until the earliest queued row is due, or None if empty."""
+    due_at = db.session.query(func.min(OutboundEmail.due_at)).scalar()
+    if due_at is None:
+        return None
+    return max(0.0, (due_at - (now or _utcnow())).total_seconds())
+
+
+def close_idle_session():
+    with _session_lock:
+        _session.close_if_idle(settings.MAIL_SMTP_IDLE_SECONDS)
+
+
+# ── Worker ─────────────────────────────────────────────────────────
+
+class MailWorker:
+    """Single daemon thread that drains the queue for this process."""
+
+    def __init__(self, app):
+        self._app = app
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True,
+                                        name='nk-mail-worker')
+
+    @property
+    def alive(self):
+        return self._thread.is_alive()
+
+    def start(self):
+        self._thread.start()
+
+    def wake(self):
+        self._wake.set()
+
+    def stop(self, timeout=None):
+        self._stop.set()
+        self._wake.set()
+        self._thread.join(timeout)
+
+    def _drain(self):
+        with self._app.app_context():
+            try:
+                while not self._stop.is_set():
+                    result = deliver_due()
+                    if not any(result.values()):
+                        break
+                due_in = seconds_until_next_due()
+            except Exception:
+                logger.exception('Mail worker iteration failed')
+                db.session.rollback()
+                due_in = None
+            finally:
+                db.session.remove()
+        return due_in
+
+    def _run(self):
+        while not self._stop.is_set():
+            self._wake.clear()
+            due_in = self._drain()
+            wait = _IDLE_POLL_SECONDS if due_in is None else min(due_in, _IDLE_POLL_SECONDS)
+            # Keep the connection for the next burst, but not past the idle limit.
+            if not self._wake.wait(min(wait, settings.MAIL_SMTP_IDLE_SECONDS)):
+                close_idle_session()
+        with _session_lock:
+            _session.close()
+
+
+_worker = None
+_worker_lock = threading.Lock()
+
+
+def start_mail_worker(app):
+    """Start this process's mail worker (idempotent); returns it."""
+    global _worker
+    with _worker_lock:
+        if _worker is None or not _worker.alive:
+            _worker = MailWorker(app)
+            _worker.start()
+        return _worker
+
+
+def _wake_worker():
+    if not settings.MAIL_WORKER_IN_PROCESS:
+        return
+    try:
+        from flask import current_app
+
+        start_mail_worker(current_app._get_current_object()).wake()
+    except Exception:
+        logger.exception('Failed to start the mail worker')
+
+
+def get_mail_queue_metrics():
+    """Queue depth, oldest message age, delivery counters and latencies."""
+    oldest = db.session.query(func.min(OutboundEmail.created_at)).scalar()
+    return {
+        'queue_depth': queue_depth(),
+        'oldest_age_s': round((_utcnow() - oldest).total_seconds(), 1) if oldest else 0.0,
+        'worker_alive': bool(_worker is not None and _worker.alive),
+        **_stats.snapshot(),
+    }
+
+
+def reset_for_tests():
+    """Stop the worker, close the SMTP session and clear the counters."""
+    global _worker
+    with _worker_lock:
+        worker, _worker = _worker, None
+    if worker is not None:
+        worker.stop(timeout=5)
+    with _session_lock:
+        _session.close()
+    _stats.reset()
@@ -423,6 +423,80 @@ def _m_moderation_tables():
             table.create(bind=db.engine, checkfirst=True)
 
 
+def _m_game_state_version_columns():
+    """Add the per-game state version used by delta polling."""
+    _add_column_if_missing('game', 'state_version',
+                           'INTEGER NOT NULL DEFAULT 0')
+    _add_column_if_missing('game', 'state_section_versions', 'JSON')
+
+
+def _m_log_chat_cursor_indexes():
+    """Index log and chat rows by ``(game_id, id)`` for cursor fetches."""
+    db.session.execute(text(
+        'CREATE INDEX IF NOT EXISTS ix_log_entry_game_id_id '
+        'ON log_entry (game_id, id)'))
+    db.session.execute(text(
+        'CREATE INDEX IF NOT EXISTS ix_chat_message_game_id_id '
+        'ON chat_message (game_id, id)'))
+    db.session.flush()
+
+
+def _m_ai_pending_game_table():
+    """Create the durable queue the background worker drains."""
+    table = db.metadata.tables.get('ai_pending_game')
+    if table is not None:
+        table.create(bind=db.engine, checkfirst=True)
+
+
+def _m_kingdom_map_version():
+    """Add per-land map version stamps and the global map version counter."""
+    _add_column_if_missing('land', 'map_version',
+                           'INTEGER NOT NULL DEFAULT 0')
+    db.session.execute(text(
+        'CREATE INDEX IF NOT EXISTS ix_land_map_version '
+        'ON land (map_version)'))
+    db.session.flush()
+    table = db.metadata.tables.get('kingdom_map_version')
+    if table is not None:
+        table.create(bind=db.engine, checkfirst=True)
+
+
+def _m_outbound_email_table():
+    """Create the durable outbound notification mail queue."""
+    table = db.metadata.tables.get('outbound_email')
+    if table is not None:
+        table.create(bind=db.engine, checkfirst=True)
+
+
+def _m_collection_stack_table():
+    """Create counted collection stacks and fill them from the copy rows."""
+    from collection_inventory import rebuild_collection_stacks
+
+    table = db.metadata.tables.get('collection_stack')
+    if table is not None:
+        table.create(bind=db.engine, checkfirst=True)
+        rebuild_collection_stacks(db.session)
+
+
+def _m_user_ranking_table():
+    """Create materialized leaderboard rows and index their history sources."""
+    from ranking_service import reconcile_rankings
+
+    db.session.execute(text(
+        'CREATE INDEX IF NOT EXISTS ix_player_user_id ON player (user_id)'))
+    db.session.execute(text(
+        'CREATE INDEX IF NOT EXISTS ix_land_attack_log_attacker_user_id '
+        'ON land_attack_log (attacker_user_id)'))
+    db.session.execute(text(
+        'CREATE INDEX IF NOT EXISTS ix_land_attack_log_defender_user_id '
+        'ON land_attack_log (defender_user_id)'))
+    db.session.flush()
+    table = db.metadata.tables.get('user_ranking')
+    if table is not None:
+        table.create(bind=db.engine, checkfirst=True)
+        reconcile_rankings()
+
+
 # ── Registry ───────────────────────────────────────────────────────
 
 MIGRATIONS = [
@@ -451,6 +525,15 @@ MIGRATIONS = [
      _m_account_safety_columns),
     (19, 'player blocks, safety reports, and moderation audit',
      _m_moderation_tables),
+    (20, 'game state version for delta polling',
+     _m_game_state_version_columns),
+    (21, 'log/chat (game_id, id) cursor indexes',
+     _m_log_chat_cursor_indexes),
+    (22, 'AI pending-game work queue', _m_ai_pending_game_table),
+    (23, 'kingdom map version stamps', _m_kingdom_map_version),
+    (24, 'outbound notification email queue', _m_outbound_email_table),
+    (25, 'counted collection stacks', _m_collection_stack_table),
+    (26, 'materialized leaderboard rankings', _m_user_ranking_table),
 ]
 
 CURRENT_SCHEMA_VERSION = max(version for version, _description, _fn in MIGRATIONS)
@@ -480,23 +563,26 @@ def run_migrations():
     Stops at the first failing migration (after rollback) so later
     migrations never run against an unexpected intermediate schema.
     """
+    from kingdom_map_service import map_version_tracking_suspended
+
     applied = applied_versions()
     ran = []
-    for version, description, fn in sorted(MIGRATIONS, key=lambda m: m[0]):
-        if version in applied:
-            continue
-        try:
-            fn()
-            db.session.execute(
-                text('INSERT INTO schema_version (version, description, applied_at)'
-                     ' VALUES (:v, :d, :t)'),
-                {'v': version, 'd': description, 't': _utcnow_iso()})
-            db.session.commit()
-            ran.append(version)
-            logger.info('Migration %04d applied: %s', version, description)
-        except Exception:
-            db.session.rollback()
-            logger.exception('Migration %04d FAILED: %s — halting migration run',
-                             version, description)
-            raise
+    with map_version_tracking_suspended(db.session):
+        for version, description, fn in sorted(MIGRATIONS, key=lambda m: m[0]):
+            if version in applied:
+                continue
+            try:
+                fn()
+                db.session.execute(
+                    text('INSERT INTO schema_version (version, description, applied_at)'
+                         ' VALUES (:v, :d, :t)'),
+                    {'v': version, 'd': description, 't': _utcnow_iso()})
+                db.session.commit()
+                ran.append(version)
+                logger.info('Migration %04d applied: %s', version, description)
+            except Exception:
+                db.session.rollback()
+                logger.exception('Migration %04d FAILED: %s — halting migration run',
+                                 version, description)
+                raise
     return ran
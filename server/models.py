@@ -14,6 +14,11 @@ db = SQLAlchemy()
 def _utcnow():
     return datetime.now(timezone.utc).replace(tzinfo=None)
 
+
+def player_is_online(last_active):
+    """Presence shown for a game's players: active within the last minute."""
+    return bool(last_active) and (_utcnow() - last_active).total_seconds() < 60
+
 class ChallengeStatus(enum.Enum):
   OPEN = "open"
   ACCEPTED = "accepted"
@@ -382,6 +387,13 @@ class Game(db.Model):
     conquer_resolution_step = db.Column(db.Integer, nullable=False, default=0,
                                         server_default='0')
 
+    # Delta polling: bumped once per committed transaction that touches the
+    # game graph; section stamps record which payload lists moved at which
+    # version (see game_service.game_state_version).
+    state_version = db.Column(db.Integer, nullable=False, default=0,
+                              server_default='0')
+    state_section_versions = db.Column(db.JSON, nullable=True)
+
     land = db.relationship('Land', foreign_keys=[land_id], lazy=True)
     log_entries = db.relationship('LogEntry', backref='game', lazy=True)
     chat_messages = db.relationship('ChatMessage', backref='game', lazy=True)
@@ -389,8 +401,19 @@ class Game(db.Model):
     battle_moves = db.relationship('BattleMove', backref='game', lazy=True, foreign_keys='BattleMove.game_id')
     conquer_tactics = db.relationship('ConquerTactic', backref='game', lazy=True,
                                       foreign_keys='ConquerTactic.game_id')
-    def serialize(self):
-        return {
+    def serialize(self, skip_sections=(), log_after_id=None, chat_after_id=None):
+        """Serialize the full game graph in a fixed number of queries.
+
+        Players, users, cards, figures and card links are bulk-loaded once by
+        :class:`GameGraph` instead of per player/figure/link, so the query
+        count does not grow with hand size or figure count.
+
+        ``log_entries`` and ``chat_messages`` grow with game length: sections
+        named in ``skip_sections`` are left out, and ``log_after_id`` /
+        ``chat_after_id`` fetch only rows past the cursor, by ``(game_id, id)``.
+        """
+        graph = GameGraph.load(self)
+        data = {
             'id': self.id,
             'state': self.state,
             'mode': self.mode,
@@ -442,20 +465,33 @@ class Game(db.Model):
             'ai_seed': self.ai_seed,
             'conquer_move_model': self.conquer_move_model or 'battle_move',
             'conquer_resolution_step': int(getattr(self, 'conquer_resolution_step', 0) or 0),
-            'players': [player.serialize() for player in self.players],
-            'main_cards': [card.serialize() for card in self.main_cards],
-            'side_cards': [card.serialize() for card in self.side_cards],
-            'log_entries': [entry.serialize() for entry in self.log_entries],
-            'chat_messages': [message.serialize() for message in self.chat_messages],
+            'state_version': int(self.state_version or 0),
+            'players': [player.serialize(graph=graph) for player in graph.players],
+            'main_cards': [card.serialize() for card in graph.main_cards],
+            'side_cards': [card.serialize() for card in graph.side_cards],
             'battle_moves': [move.serialize() for move in self.battle_moves],
             'conquer_tactics': [tactic.serialize() for tactic in self.conquer_tactics],
             'active_spells': [spell.serialize() for spell in self.active_spells],
         }
+        for section, model, after_id in (
+            ('log_entries', LogEntry, log_after_id),
+            ('chat_messages', ChatMessage, chat_after_id),
+        ):
+            if section in skip_sections:
+                continue
+            if after_id is None:
+                rows = getattr(self, section)
+            else:
+                rows = model.query.filter(
+                    model.game_id == self.id, model.id > after_id,
+                ).order_by(model.id).all()
+            data[section] = [row.serialize() for row in rows]
+        return data
 
 
 class Player(db.Model):
     id = db.Column(db.Integer, primary_key=True)
-    user_id = db.Column(db.Integer, db.ForeignKey('user.id'))
+    user_id = db.Column(db.Integer, db.ForeignKey('user.id'), index=True)
     game_id = db.Column(db.Integer, db.ForeignKey('game.id'))
     main_hand = db.relationship('MainCard', backref='player', lazy=True)
     side_hand = db.relationship('SideCard', backref='player', lazy=True)
@@ -468,23 +504,35 @@ class Player(db.Model):
     sent_messages = db.relationship('ChatMessage', foreign_keys='ChatMessage.sender_id', backref='sender', lazy=True)
     received_messages = db.relationship('ChatMessage', foreign_keys='ChatMessage.receiver_id', backref='receiver', lazy=True)
 
-    def serialize(self):
-        user = db.session.get(User, self.user_id)
+    def serialize(self, graph=None):
+        """Serialize this player.
+
+        ``graph`` is an optional :class:`GameGraph` holding bulk-loaded rows
+        for the whole game; without it the player's own rows are queried.
+        """
+        if graph is not None:
+            user = graph.users.get(self.user_id)
+        else:
+            user = db.session.get(User, self.user_id)
         username = user.username if user else None
-        is_online = False
-        if user and user.last_active:
-            is_online = (_utcnow() - user.last_active).total_seconds() < 60
-
-        # Query cards directly to avoid SQLAlchemy relationship caching issues
-        main_hand_cards = MainCard.query.filter_by(
-            player_id=self.id,
-            in_deck=False
-        ).all()
-        
-        side_hand_cards = SideCard.query.filter_by(
-            player_id=self.id,
-            in_deck=False
-        ).all()
+        is_online = player_is_online(user.last_active) if user else False
+
+        if graph is not None:
+            main_hand_cards = graph.main_hand(self.id)
+            side_hand_cards = graph.side_hand(self.id)
+            figures = graph.figures_by_player.get(self.id, [])
+        else:
+            # Query cards directly to avoid SQLAlchemy relationship caching issues
+            main_hand_cards = MainCard.query.filter_by(
+                player_id=self.id,
+                in_deck=False
+            ).all()
+
+            side_hand_cards = SideCard.query.filter_by(
+                player_id=self.id,
+                in_deck=False
+            ).all()
+            figures = self.figures
 
         return {
             'id': self.id,
@@ -492,7 +540,7 @@ class Player(db.Model):
             'game_id': self.game_id,
             'main_hand': [card.serialize() for card in main_hand_cards],
             'side_hand': [card.serialize() for card in side_hand_cards],
-            'figures': [figure.serialize() for figure in self.figures],
+            'figures': [figure.serialize(graph=graph) for figure in figures],
             'turns_left': self.turns_left,
             'points': self.points,
             'status': self.status,
@@ -575,7 +623,7 @@ class CardToFigure(db.Model):
     card_type = db.Column(db.String(10), nullable=False)  # 'main' or 'side', to differentiate card decks
     role = db.Column(ChoiceType(CardRole, impl=db.String()), nullable=False)  # Role in the figure
 
-    def serialize(self):
+    def serialize(self, graph=None):
         # Base metadata
         card_data = {
             'id': self.id,
@@ -586,7 +634,9 @@ class CardToFigure(db.Model):
         }
 
         # Fetch card details based on card type
-        if self.card_type == 'main':
+        if graph is not None:
+            card = graph.card(self.card_type, self.card_id)
+        elif self.card_type == 'main':
             card = db.session.get(MainCard, self.card_id)
         elif self.card_type == 'side':
             card = db.session.get(SideCard, self.card_id)
@@ -638,7 +688,8 @@ class Figure(db.Model):
     cards = db.relationship('CardToFigure', backref='figure', lazy=True)
     date_created = db.Column(db.DateTime, default=_utcnow)
 
-    def serialize(self):
+    def serialize(self, graph=None):
+        links = graph.links_by_figure.get(self.id, []) if graph is not None else self.cards
         return {
             'id': self.id,
             'player_id': self.player_id,
@@ -656,11 +707,106 @@ class Figure(db.Model):
             'cannot_be_blocked': self.cannot_be_blocked,
             'rest_after_attack': self.rest_after_attack,
             'is_clone': bool(self.is_clone),
-            'cards': [card.serialize() for card in self.cards],
+            'cards': [link.serialize(graph=graph) for link in links],
             'date_created': self.date_created.isoformat(),
         }
     
+class GameGraph:
+    """Bulk-loaded rows backing :meth:`Game.serialize`.
+
+    Every table is read with one ``IN``/``game_id`` query, and card links
+    resolve through dictionaries keyed by ``(card_type, card_id)`` instead of
+    one ``db.session.get`` per link.  Row order within each group follows the
+    query order, matching the per-row relationship loads it replaces.
+    """
+
+    def __init__(self, game, players, users, main_cards, side_cards,
+                 player_main_cards, player_side_cards, figures_by_player,
+                 links_by_figure, cards_by_key):
+        self.game = game
+        self.players = players
+        self.users = users
+        self.main_cards = main_cards
+        self.side_cards = side_cards
+        self._player_main_cards = player_main_cards
+        self._player_side_cards = player_side_cards
+        self.figures_by_player = figures_by_player
+        self.links_by_figure = links_by_figure
+        self._cards_by_key = cards_by_key
+
+    @classmethod
+    def load(cls, game):
+        players = list(game.players)
+        player_ids = [player.id for player in players]
+        user_ids = {player.user_id for player in players if player.user_id is not None}
+        users = (
+            {user.id: user for user in User.query.filter(User.id.in_(user_ids)).all()}
+            if user_ids else {}
+        )
+
+        def _load_cards(model):
+            condition = model.game_id == game.id
+            if player_ids:
+                condition = db.or_(condition, model.player_id.in_(player_ids))
+            rows = model.query.filter(condition).all()
+            game_rows = [card for card in rows if card.game_id == game.id]
+            hands = {}
+            for card in rows:
+                if card.player_id is not None and not card.in_deck:
+                    hands.setdefault(card.player_id, []).append(card)
+            return rows, game_rows, hands
+
+        main_rows, main_cards, player_main_cards = _load_cards(MainCard)
+        side_rows, side_cards, player_side_cards = _load_cards(SideCard)
+        cards_by_key = {('main', card.id): card for card in main_rows}
+        cards_by_key.update({('side', card.id): card for card in side_rows})
+
+        figures_by_player = {}
+        links_by_figure = {}
+        if player_ids:
+            figures = Figure.query.filter(Figure.player_id.in_(player_ids)).all()
+            for figure in figures:
+                figures_by_player.setdefault(figure.player_id, []).append(figure)
+            figure_ids = [figure.id for figure in figures]
+            links = (
+                CardToFigure.query.filter(CardToFigure.figure_id.in_(figure_ids)).all()
+                if figure_ids else []
+            )
+            for link in links:
+                links_by_figure.setdefault(link.figure_id, []).append(link)
+            # Links normally point at this game's cards; fetch any stragglers
+            # with one query per card table rather than one per link.
+            for card_type, model in (('main', MainCard), ('side', SideCard)):
+                missing = {
+                    link.card_id for link in links
+                    if link.card_type == card_type
+                    and (card_type, link.card_id) not in cards_by_key
+                }
+                if missing:
+                    for card in model.query.filter(model.id.in_(missing)).all():
+                        cards_by_key[(card_type, card.id)] = card
+
+        return cls(
+            game, players, users, main_cards, side_cards,
+            player_main_cards, player_side_cards, figures_by_player,
+            links_by_figure, cards_by_key,
+        )
+
+    def main_hand(self, player_id):
+        return self._player_main_cards.get(player_id, [])
+
+    def side_hand(self, player_id):
+        return self._player_side_cards.get(player_id, [])
+
+    def card(self, card_type, card_id):
+        return self._cards_by_key.get((card_type, card_id))
+
+
 class LogEntry(db.Model):
+    __table_args__ = (
+        db.Index('ix_log_entry_game_id_id', 'game_id', 'id'),
+    )
+
     id = db.Column(db.Integer, primary_key=True)
     game_id = db.Column(db.Integer, db.ForeignKey('game.id'), nullable=False)
     player_id = db.Column(db.Integer, db.ForeignKey('player.id'), nullable=True)  # Player associated with the event
@@ -686,6 +832,10 @@ class LogEntry(db.Model):
 
 
 class ChatMessage(db.Model):
+    __table_args__ = (
+        db.Index('ix_chat_message_game_id_id', 'game_id', 'id'),
+    )
+
     id = db.Column(db.Integer, primary_key=True)
     game_id = db.Column(db.Integer, db.ForeignKey('game.id'), nullable=False)
     sender_id = db.Column(db.Integer, db.ForeignKey('player.id'), nullable=False)  # Sender of the message
@@ -906,6 +1056,32 @@ class SecurityRateLimitCounter(db.Model):
     expires_at = db.Column(db.DateTime, nullable=False, index=True)
 
 
+class AIPendingGame(db.Model):
+    """Game whose AI phase the background worker must re-check at ``due_at``."""
+    __tablename__ = 'ai_pending_game'
+
+    # No foreign key: the row is a wake-up hint and the worker skips games
+    # that no longer exist.
+    game_id = db.Column(db.Integer, primary_key=True)
+    due_at = db.Column(db.DateTime, nullable=False, default=_utcnow, index=True)
+
+
+class OutboundEmail(db.Model):
+    """Notification email waiting for the mail worker (see ``mail_queue``)."""
+    __tablename__ = 'outbound_email'
+
+    id = db.Column(db.Integer, primary_key=True)
+    to_addr = db.Column(db.String(255), nullable=False)
+    subject = db.Column(db.String(255), nullable=False)
+    body = db.Column(db.Text, nullable=False)
+    created_at = db.Column(db.DateTime, nullable=False, default=_utcnow)
+    due_at = db.Column(db.DateTime, nullable=False, default=_utcnow, index=True)
+    attempts = db.Column(db.Integer, nullable=False, default=0)
+    # Set while one worker is sending the row, so a second drainer skips it.
+    claim_token = db.Column(db.String(32), nullable=True, index=True)
+    last_error = db.Column(db.String(255), nullable=True)
+
+
 class GameResult(db.Model):
     """Persisted record of a finished game for statistics and ranking."""
     id = db.Column(db.Integer, primary_key=True)
@@ -938,6 +1114,25 @@ class GameResult(db.Model):
         }
 
 
+class UserRanking(db.Model):
+    """Leaderboard totals for one user, kept current by ``ranking_service``."""
+    __tablename__ = 'user_ranking'
+    __table_args__ = (
+        db.Index('ix_user_ranking_games', 'wins', 'total_games'),
+        db.Index('ix_user_ranking_kingdom', 'lands_owned', 'total_gold_rate'),
+    )
+
+    user_id          = db.Column(db.Integer, db.ForeignKey('user.id'), primary_key=True)
+    total_games      = db.Column(db.Integer, nullable=False, default=0)
+    wins             = db.Column(db.Integer, nullable=False, default=0)
+    lands_owned      = db.Column(db.Integer, nullable=False, default=0)
+    total_gold_rate  = db.Column(db.Float,   nullable=False, default=0.0)
+    conquer_attempts = db.Column(db.Integer, nullable=False, default=0)
+    conquer_wins     = db.Column(db.Integer, nullable=False, default=0)
+    defence_wins     = db.Column(db.Integer, nullable=False, default=0)
+    updated_at       = db.Column(db.DateTime, nullable=False, default=_utcnow)
+
+
 # ──────────────────────────────────────────────────────────────────────────────
 # v2.0 Models: Collection, Kingdom, Lands
 # ──────────────────────────────────────────────────────────────────────────────
@@ -974,6 +1169,26 @@ class CollectionCard(db.Model):
         }
 
 
+class CollectionStack(db.Model):
+    """Counted copies of one (suit, rank) in a user's collection.
+
+    Derived from ``CollectionCard`` rows on every commit (see
+    ``collection_inventory``); read it instead of counting copies.
+    """
+    __tablename__ = 'collection_stack'
+
+    user_id      = db.Column(db.Integer, db.ForeignKey('user.id'), primary_key=True)
+    suit         = db.Column(db.String(10), primary_key=True)
+    rank         = db.Column(db.String(5), primary_key=True)
+    value        = db.Column(db.Integer, nullable=False)
+    free_count   = db.Column(db.Integer, nullable=False, default=0)
+    locked_count = db.Column(db.Integer, nullable=False, default=0)
+
+    @property
+    def total(self):
+        return int(self.free_count or 0) + int(self.locked_count or 0)
+
+
 class Land(db.Model):
     """A single hex tile on the kingdom map."""
     __tablename__ = 'land'
@@ -992,6 +1207,10 @@ class Land(db.Model):
     kingdom_id       = db.Column(db.Integer, db.ForeignKey('kingdom.id'), nullable=True, index=True)
     owned_since      = db.Column(db.DateTime, nullable=True)
     conquer_cooldown_until = db.Column(db.DateTime, nullable=True)
+    # Kingdom map version that last changed this tile's dynamic state
+    # (see kingdom_map_service); drives GET /kingdom/map/changes.
+    map_version      = db.Column(db.Integer, nullable=False, default=0,
+                                 server_default='0', index=True)
     defence_config_id = db.Column(db.Integer, db.ForeignKey('land_config.id',
                                   use_alter=True, name='fk_land_defence_config'),
                                   nullable=True)
@@ -1040,6 +1259,14 @@ class Land(db.Model):
         }
 
 
+class KingdomMapVersion(db.Model):
+    """Single-row counter bumped by every commit that changes the map."""
+    __tablename__ = 'kingdom_map_version'
+
+    id      = db.Column(db.Integer, primary_key=True)
+    version = db.Column(db.Integer, nullable=False, default=0)
+
+
 class Kingdom(db.Model):
     """Persistent configuration for one connected owned-land kingdom."""
     __tablename__ = 'kingdom'
@@ -1330,8 +1557,8 @@ class LandAttackLog(db.Model):
 
     id               = db.Column(db.Integer, primary_key=True)
     land_id          = db.Column(db.Integer, db.ForeignKey('land.id'), nullable=False)
-    attacker_user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
-    defender_user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=True)  # NULL for AI
+    attacker_user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False, index=True)
+    defender_user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=True, index=True)  # NULL for AI
     result           = db.Column(db.String(15), nullable=False)  # 'attacker_won'|'defender_won'
     card_won_suit    = db.Column(db.String(10), nullable=True)
     card_won_rank    = db.Column(db.String(5),  nullable=True)
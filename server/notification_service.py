@@ -6,8 +6,8 @@ Without these, an async duel dies the moment one player closes the app —
 they never learn it's their turn again. Three notification kinds:
 
 - challenge received   (hooked in routes/challenges.py)
-- it's your turn       (app-level after_request hook, debounced per game)
-- game finished        (same hook, once per recipient)
+- it's your turn       (``TurnChanged`` domain event, debounced per game)
+- game finished        (``GameFinished`` domain event, once per recipient)
 
 Safety properties:
 - Only sent to human accounts that have an email, have not opted out
@@ -15,7 +15,9 @@ Safety properties:
   and are NOT currently online (heartbeat within ONLINE_WINDOW_SECONDS).
 - "Your turn" is debounced: at most one email per game per recipient per
   TURN_EMAIL_MIN_INTERVAL_HOURS, tracked in Game.turn_email_log.
-- SMTP happens on a daemon thread; the request never waits on it.
+- Emails go through the durable outbound queue (mail_queue): the request
+  only inserts a row, and one worker sends batches over a reused SMTP
+  connection, retrying failures with backoff.
 - Without SMTP_HOST configured (or with NOTIFY_EMAILS_ENABLED=False) the
   would-be email is logged instead — safe default for dev.
 """
@@ -23,15 +25,13 @@ Safety properties:
 import hashlib
 import hmac
 import logging
-import smtplib
-import threading
 from datetime import datetime, timezone
-from email.mime.text import MIMEText
 
 from sqlalchemy.orm.attributes import flag_modified
 
 import server_settings as settings
 import security_settings
+from mail_queue import enqueue_email
 from models import db, Game, Player, User
 
 logger = logging.getLogger('nepalkings.notifications')
@@ -92,31 +92,9 @@ def _footer(user):
 
 # ── Transport ──────────────────────────────────────────────────────
 
-def _send_sync(to_addr, subject, body):
-    if not getattr(settings, 'NOTIFY_EMAILS_ENABLED', True) or not settings.SMTP_HOST:
-        logger.info('[EMAIL OFF] To: %s — %s', to_addr, subject)
-        return False
-    try:
-        msg = MIMEText(body)
-        msg['Subject'] = subject
-        msg['From'] = settings.SMTP_FROM
-        msg['To'] = to_addr
-        with smtplib.SMTP(settings.SMTP_HOST, settings.SMTP_PORT) as smtp:
-            smtp.ehlo()
-            smtp.starttls()
-            if settings.SMTP_USER and settings.SMTP_PASSWORD:
-                smtp.login(settings.SMTP_USER, settings.SMTP_PASSWORD)
-            smtp.send_message(msg)
-        logger.info('Notification sent to %s — %s', to_addr, subject)
-        return True
-    except Exception:
-        logger.exception('Failed to send notification to %s', to_addr)
-        return False
-
-
-def _send_async(to_addr, subject, body):
-    threading.Thread(target=_send_sync, args=(to_addr, subject, body),
-                     daemon=True, name='nk-notify-email').start()
+def _send_email(to_addr, subject, body):
+    """Queue the email for the mail worker; the request never waits on SMTP."""
+    return enqueue_email(to_addr, subject, body)
 
 
 # ── Notifications ──────────────────────────────────────────────────
@@ -136,7 +114,7 @@ def notify_challenge_received(challenge):
             f'Log in to accept or decline.\n'
             f'{_footer(opponent)}'
         )
-        _send_async(opponent.email, subject, body)
+        _send_email(opponent.email, subject, body)
         return True
     except Exception:
         logger.exception('notify_challenge_received failed')
@@ -182,7 +160,7 @@ def _notify_turn(game, player, user):
         f'Log in to make your move.\n'
         f'{_footer(user)}'
     )
-    _send_async(user.email, subject, body)
+    _send_email(user.email, subject, body)
     return True
 
 
@@ -211,47 +189,72 @@ def _notify_finished(game, player, user):
         f'Log in to review the result and start your next match.\n'
         f'{_footer(user)}'
     )
-    _send_async(user.email, subject, body)
+    _send_email(user.email, subject, body)
     return True
 
 
-def maybe_notify_turn_or_finish(game_id, requester_user_id=None):
-    """Inspect a game after a state-changing request and email whoever
-    should hear about it. Cheap, debounced, never raises."""
-    try:
-        game = db.session.get(Game, int(game_id))
-        if not game or game.mode != 'duel':
-            return False
-
-        if game.state == 'finished':
-            sent = False
-            for p in game.players:
-                user = db.session.get(User, p.user_id)
-                if not _user_wants_email(user) or user.id == requester_user_id:
-                    continue
-                if _user_recently_active(user):
-                    continue
-                sent = _notify_finished(game, p, user) or sent
-            return sent
-
-        turn_player_id = game.turn_player_id
-        if not turn_player_id:
-            return False
-        player = db.session.get(Player, turn_player_id)
-        if not player:
-            return False
-        user = db.session.get(User, player.user_id)
-        if not _user_wants_email(user):
-            return False
-        if user.id == requester_user_id:
-            return False  # it's the requester's own turn; they're right here
+def _notify_finished_players(game, requester_user_id=None):
+    sent = False
+    for p in game.players:
+        user = db.session.get(User, p.user_id)
+        if not _user_wants_email(user) or user.id == requester_user_id:
+            continue
         if _user_recently_active(user):
-            return False  # actively playing — in-app polling covers them
-        return _notify_turn(game, player, user)
+            continue
+        sent = _notify_finished(game, p, user) or sent
+    return sent
+
+
+def _notify_turn_player(turn_player_id, requester_user_id=None):
+    """Email the owner of ``turn_player_id`` if eligible; the game row is
+    only loaded (for the debounce log) once the recipient qualifies."""
+    if not turn_player_id:
+        return False
+    player = db.session.get(Player, turn_player_id)
+    if not player:
+        return False
+    user = db.session.get(User, player.user_id)
+    if not _user_wants_email(user):
+        return False
+    if user.id == requester_user_id:
+        return False  # it's the requester's own turn; they're right here
+    if _user_recently_active(user):
+        return False  # actively playing — in-app polling covers them
+    game = db.session.get(Game, player.game_id)
+    # The turn may have moved on again before the event was dispatched.
+    if (not game or game.mode != 'duel' or game.state == 'finished'
+            or game.turn_player_id != player.id):
+        return False
+    return _notify_turn(game, player, user)
+
+
+def _rollback_quietly():
+    try:
+        db.session.rollback()
     except Exception:
-        logger.exception('maybe_notify_turn_or_finish failed for game %s', game_id)
+        pass
+
+
+def notify_on_game_events(events, context):
+    """Domain-event subscriber for ``TurnChanged`` / ``GameFinished``.
+
+    Only duel events are considered, straight from the event payload, so a
+    conquer turn or an unrelated commit costs no query at all.
+    """
+    if not getattr(settings, 'NOTIFY_EMAILS_ENABLED', True):
+        return
+    finished = {item.game_id for item in events if item.name == 'game_finished'}
+    for item in events:
+        if item.mode != 'duel':
+            continue
         try:
-            db.session.rollback()
+            if item.name == 'game_finished':
+                game = db.session.get(Game, item.game_id)
+                if game and game.state == 'finished':
+                    _notify_finished_players(game, context.requester_user_id)
+            elif item.name == 'turn_changed' and item.game_id not in finished:
+                _notify_turn_player(item.turn_player_id, context.requester_user_id)
         except Exception:
-            pass
-        return False
+            logger.exception('%s notification failed for game %s',
+                             item.name, item.game_id)
+            _rollback_quietly()
@@ -0,0 +1,139 @@
+# Copyright (c) 2026 Marc Stieffenhofer. All rights reserved.
+# See LICENSE file in the project root for full license information.
+"""Short-lived, per-process cache of authenticated principals.
+
+``require_token`` used to load the ``User`` row on every request just to
+compare the token version and check the account status.  Client polls hit
+authenticated routes several times a second, so the accepted result is
+cached here for ``AUTH_PRINCIPAL_CACHE_TTL_SECONDS`` under
+``(user_id, token_version, token_kind)``.
+
+Only the fields the auth checks need are cached (:class:`Principal`), and
+the checks themselves still run on every request, so an elapsed timed
+suspension is honoured immediately.  Routes that need the full row load it
+with ``routes.auth.current_user()``.
+
+Revocations made by this process (``logout_all``, password change, account
+deletion) call :func:`invalidate_user` after their commit.  The cache is not
+shared between WSGI workers or with ``manage.py`` moderation actions: those
+bump ``token_version`` in the database, and other processes notice once
+their cached entry expires, so the TTL is the upper bound on how long a
+revoked session stays usable.  ``AUTH_PRINCIPAL_CACHE_TTL_SECONDS=0``
+disables the cache.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Optional
+
+import security_settings
+
+
+_MAX_ENTRIES = 4096
+
+
+@dataclass(frozen=True)
+class Principal:
+    """The ``User`` fields ``require_token`` checks."""
+
+    user_id: int
+    token_version: int
+    account_status: str
+    suspended_until: Optional[datetime]
+
+    @classmethod
+    def from_user(cls, user) -> 'Principal':
+        return cls(
+            user_id=int(user.id),
+            token_version=int(user.token_version or 0),
+            account_status=(user.account_status or 'active').strip().lower(),
+            suspended_until=user.suspended_until,
+        )
+
+
+class PrincipalCache:
+    """LRU + TTL map of ``(user_id, token_version, kind)`` to principals."""
+
+    def __init__(self, max_entries: int = _MAX_ENTRIES) -> None:
+        self._max_entries = max_entries
+        self._store: "OrderedDict[tuple, tuple[float, Principal]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def ttl_seconds() -> float:
+        return float(security_settings.AUTH_PRINCIPAL_CACHE_TTL_SECONDS)
+
+    def get(self, key: tuple) -> Optional[Principal]:
+        now = time.monotonic()
+        with self._lock:
+            entry = self._store.get(key)
+            if entry is None or entry[0] <= now:
+                if entry is not None:
+                    del self._store[key]
+                self.misses += 1
+                return None
+            self._store.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def put(self, key: tuple, principal: Principal) -> None:
+        ttl = self.ttl_seconds()
+        if ttl <= 0:
+            return
+        with self._lock:
+            self._store[key] = (time.monotonic() + ttl, principal)
+            self._store.move_to_end(key)
+            while len(self._store) > self._max_entries:
+                self._store.popitem(last=False)
+
+    def invalidate_user(self, user_id: int) -> None:
+        user_id = int(user_id)
+        with self._lock:
+            for key in [key for key in self._store if key[0] == user_id]:
+                del self._store[key]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._store.clear()
+            self.hits = 0
+            self.misses = 0
+
+
+_PRINCIPALS = PrincipalCache()
+
+
+def principal_key(user_id, token_version, token_kind) -> tuple:
+    return (
+        int(user_id),
+        None if token_version is None else int(token_version),
+        token_kind,
+    )
+
+
+def cached_principal(key: tuple) -> Optional[Principal]:
+    return _PRINCIPALS.get(key)
+
+
+def remember_principal(key: tuple, principal: Principal) -> None:
+    _PRINCIPALS.put(key, principal)
+
+
+def invalidate_user(user_id) -> None:
+    """Drop every cached principal of ``user_id``; call after committing."""
+    if user_id is not None:
+        _PRINCIPALS.invalidate_user(user_id)
+
+
+def cache_stats() -> dict:
+    return {'hits': _PRINCIPALS.hits, 'misses': _PRINCIPALS.misses}
+
+
+def reset_cache_for_tests() -> None:
+    _PRINCIPALS.clear()
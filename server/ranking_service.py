@@ -0,0 +1,423 @@
+# Copyright (c) 2026 Marc Stieffenhofer. All rights reserved.
+# See LICENSE file in the project root for full license information.
+"""Materialized player rankings behind the public leaderboards.
+
+``/auth/get_rankings`` (duel record) and ``/kingdom/rankings`` (lands,
+gold rate, conquests) used to aggregate every finished game, land and
+attack log on each poll.  ``UserRanking`` keeps one row per user with
+those totals, so a leaderboard page or a "my rank" lookup reads a handful
+of indexed rows however long the history grows.
+
+Rows are refreshed by SQLAlchemy session events, like
+:mod:`collection_inventory`:
+
+- ``before_flush``/``after_flush`` mark the users behind a finished or
+  deleted game, an added or removed player, a land that changed owner or
+  gold rate, and a recorded attack;
+- ``do_orm_execute`` marks every user for bulk statements that delete
+  these rows or rewrite a ranked column (map regeneration);
+- ``before_commit`` locks the marked users' ranking rows and recounts just
+  those users from their own, indexed history.
+
+:func:`reconcile_rankings` recounts everyone; the background worker runs it
+every ``RANKING_RECONCILE_INTERVAL_SECONDS`` as a safety net.
+"""
+
+from __future__ import annotations
+
+import logging
+from datetime import datetime, timezone
+
+from sqlalchemy import and_, bindparam, case, event, func, or_, select, text
+from sqlalchemy import inspect as sa_inspect
+
+import server_settings as settings
+
+logger = logging.getLogger('nepalkings.ranking_service')
+
+_PENDING_KEY = 'nk_ranking_pending'
+_REFRESHING_KEY = 'nk_ranking_refreshing'
+_STAT_COLUMNS = (
+    'total_games', 'wins', 'lands_owned', 'total_gold_rate',
+    'conquer_attempts', 'conquer_wins', 'defence_wins',
+)
+_CHUNK = 500
+
+_installed = False
+
+
+def _utcnow():
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+def _pending(session):
+    return session.info.setdefault(_PENDING_KEY, {
+        'all': False, 'users': set(), 'games': set(),
+    })
+
+
+def _models():
+    from models import Game, Land, LandAttackLog, Player, User
+
+    return Game, Land, LandAttackLog, Player, User
+
+
+def _ranked_columns():
+    """Columns, per model, whose change moves a user on a leaderboard."""
+    Game, Land, LandAttackLog, Player, _User = _models()
+    return {
+        Game: ('state', 'winner_player_id'),
+        Land: ('owner_user_id', 'gold_rate'),
+        Player: ('user_id', 'game_id'),
+        LandAttackLog: ('attacker_user_id', 'defender_user_id', 'result'),
+    }
+
+
+def _values(instance, key):
+    """Return the current and, if it changed, the previous value of ``key``."""
+    history = sa_inspect(instance).attrs[key].history
+    return [value for value in (getattr(instance, key), *history.deleted)
+            if value is not None]
+
+
+def _changed(instance, keys):
+    state = sa_inspect(instance)
+    return any(state.attrs[key].history.has_changes() for key in keys)
+
+
+# ── Change tracking ─────────────────────────────────────────────────
+
+def _before_flush(session, _flush_context, _instances):
+    Game, Land, LandAttackLog, Player, _User = _models()
+    pending = _pending(session)
+    for instance in session.deleted:
+        if isinstance(instance, Player):
+            pending['users'].update(_values(instance, 'user_id'))
+        elif isinstance(instance, Land):
+            pending['users'].update(_values(instance, 'owner_user_id'))
+        elif isinstance(instance, LandAttackLog):
+            pending['users'].update(_values(instance, 'attacker_user_id'))
+            pending['users'].update(_values(instance, 'defender_user_id'))
+        elif isinstance(instance, Game) and instance.id is not None:
+            # Its players may outlive it; read them while the game exists.
+            player = Player.__table__
+            pending['users'].update(
+                user_id for (user_id,) in session.connection().execute(
+                    select(player.c.user_id).where(player.c.game_id == instance.id))
+                if user_id is not None
+            )
+
+
+def _after_flush(session, _flush_context):
+    Game, Land, LandAttackLog, Player, User = _models()
+    ranked = _ranked_columns()
+    pending = _pending(session)
+    for instance in list(session.new) + list(session.dirty):
+        if instance in session.deleted:
+            continue
+        is_new = instance in session.new
+        if isinstance(instance, User):
+            if is_new:
+                pending['users'].add(instance.id)
+        elif isinstance(instance, Game):
+            if instance.id is None:
+                continue
+            if (is_new or _changed(instance, ranked[Game])) \
+                    and 'finished' in _values(instance, 'state'):
+                pending['games'].add(instance.id)
+        elif isinstance(instance, Player):
+            if is_new or _changed(instance, ranked[Player]):
+                pending['users'].update(_values(instance, 'user_id'))
+        elif isinstance(instance, Land):
+            if is_new or _changed(instance, ranked[Land]):
+                pending['users'].update(_values(instance, 'owner_user_id'))
+        elif isinstance(instance, LandAttackLog):
+            if is_new or _changed(instance, ranked[LandAttackLog]):
+                pending['users'].update(_values(instance, 'attacker_user_id'))
+                pending['users'].update(_values(instance, 'defender_user_id'))
+
+
+def _assigned_columns(statement):
+    values = getattr(statement, '_values', None) or {}
+    return {getattr(key, 'key', key) for key in values}
+
+
+def _do_orm_execute(orm_execute_state):
+    if not (orm_execute_state.is_update or orm_execute_state.is_delete):
+        return
+    session = orm_execute_state.session
+    if session.info.get(_REFRESHING_KEY):
+        return
+    mapper = orm_execute_state.bind_mapper
+    if mapper is None:
+        return
+    ranked = _ranked_columns().get(mapper.class_)
+    if ranked is None:
+        return
+    if orm_execute_state.is_delete or _assigned_columns(
+            orm_execute_state.statement) & set(ranked):
+        _pending(session)['all'] = True
+
+
+# ── Ranking maintenance ─────────────────────────────────────────────
+
+def _chunks(values):
+    values = sorted(values)
+    for start in range(0, len(values), _CHUNK):
+        yield values[start:start + _CHUNK]
+
+
+def _count_stats(session, user_ids):
+    """Return ``{user_id: stats}`` recounted from history for ``user_ids``."""
+    Game, Land, LandAttackLog, Player, _User = _models()
+    stats = {user_id: dict.fromkeys(_STAT_COLUMNS, 0) for user_id in user_ids}
+    stats_rows = [
+        (('total_games', 'wins'), session.query(
+            Player.user_id,
+            func.count(Game.id),
+            func.sum(case((Game.winner_player_id == Player.id, 1), else_=0)),
+        ).join(Game, Game.id == Player.game_id)
+         .filter(Game.state == 'finished', Player.user_id.in_(user_ids))
+         .group_by(Player.user_id)),
+        (('lands_owned', 'total_gold_rate'), session.query(
+            Land.owner_user_id,
+            func.count(Land.id),
+            func.coalesce(func.sum(Land.gold_rate), 0.0),
+        ).filter(Land.owner_user_id.in_(user_ids))
+         .group_by(Land.owner_user_id)),
+        (('conquer_attempts', 'conquer_wins'), session.query(
+            LandAttackLog.attacker_user_id,
+            func.count(LandAttackLog.id),
+            func.sum(case((LandAttackLog.result == 'attacker_won', 1), else_=0)),
+        ).filter(LandAttackLog.attacker_user_id.in_(user_ids))
+         .group_by(LandAttackLog.attacker_user_id)),
+        (('defence_wins',), session.query(
+            LandAttackLog.defender_user_id,
+            func.count(LandAttackLog.id),
+        ).filter(LandAttackLog.defender_user_id.in_(user_ids),
+                 LandAttackLog.result == 'defender_won')
+         .group_by(LandAttackLog.defender_user_id)),
+    ]
+    for columns, query in stats_rows:
+        for user_id, *values in query:
+            for column, value in zip(columns, values):
+                stats[user_id][column] = value or 0
+    for row in stats.values():
+        row['total_gold_rate'] = round(float(row['total_gold_rate']), 3)
+        for column in _STAT_COLUMNS:
+            if column != 'total_gold_rate':
+                row[column] = int(row[column])
+    return stats
+
+
+def _refresh(session, user_ids):
+    """Recount ranking rows for ``user_ids``; returns how many changed."""
+    from models import UserRanking
+
+    table = UserRanking.__table__
+    changed = 0
+    for chunk in _chunks(user_ids):
+        # Create missing rows, then lock them: a concurrent commit for the
+        # same user waits here and recounts after this one is visible.
+        session.execute(text(
+            'INSERT INTO user_ranking (user_id, total_games, wins, lands_owned, '
+            'total_gold_rate, conquer_attempts, conquer_wins, defence_wins, updated_at) '
+            'VALUES (:user_id, 0, 0, 0, 0, 0, 0, 0, :now) '
+            'ON CONFLICT (user_id) DO NOTHING'
+        ), [{'user_id': user_id, 'now': _utcnow()} for user_id in chunk])
+        current = {
+            row.user_id: row for row in session.execute(
+                select(table).where(table.c.user_id.in_(chunk)).with_for_update())
+        }
+        stats = _count_stats(session, chunk)
+        now = _utcnow()
+        updates = []
+        for user_id in chunk:
+            row = current.get(user_id)
+            if row is not None and all(
+                    getattr(row, column) == stats[user_id][column]
+                    for column in _STAT_COLUMNS):
+                continue
+            updates.append(dict(stats[user_id], k_user_id=user_id, updated_at=now))
+        if updates:
+            session.execute(
+                table.update().where(table.c.user_id == bindparam('k_user_id')),
+                updates,
+            )
+            changed += len(updates)
+    return changed
+
+
+def _all_user_ids(session):
+    from models import User
+
+    return [user_id for (user_id,) in session.query(User.id)]
+
+
+def refresh_pending_rankings(session=None):
+    """Flush and recount every user marked in this transaction."""
+    if session is None:
+        from models import db
+        session = db.session
+    if session.info.get(_REFRESHING_KEY):
+        return
+    session.flush()
+    pending = session.info.pop(_PENDING_KEY, None)
+    if not pending:
+        return
+    users = set(pending['users'])
+    session.info[_REFRESHING_KEY] = True
+    try:
+        if pending['all']:
+            users = _all_user_ids(session)
+        elif pending['games']:
+            _Game, _Land, _LandAttackLog, Player, _User = _models()
+            users.update(
+                user_id for (user_id,) in session.query(Player.user_id)
+                .filter(Player.game_id.in_(sorted(pending['games'])))
+                if user_id is not None
+            )
+        if users:
+            _refresh(session, users)
+    finally:
+        session.info.pop(_REFRESHING_KEY, None)
+
+
+def _before_commit(session):
+    refresh_pending_rankings(session)
+
+
+def _after_rollback(session):
+    session.info.pop(_PENDING_KEY, None)
+
+
+def _load_previous_value(*_args):
+    """No-op ``set`` listener; registering it turns on ``active_history``."""
+
+
+def install_ranking_tracking(session):
+    """Register the ranking listeners on ``session`` (idempotent)."""
+    global _installed
+    if _installed:
+        return
+    _Game, Land, LandAttackLog, Player, _User = _models()
+    # Load the previous owner/user on assignment so the user who lost a
+    # land (or a player row) is recounted too.
+    for attribute in (Land.owner_user_id, Player.user_id,
+                      LandAttackLog.attacker_user_id, LandAttackLog.defender_user_id):
+        event.listen(attribute, 'set', _load_previous_value, active_history=True)
+    event.listen(session, 'before_flush', _before_flush)
+    event.listen(session, 'after_flush', _after_flush)
+    event.listen(session, 'do_orm_execute', _do_orm_execute)
+    event.listen(session, 'before_commit', _before_commit)
+    event.listen(session, 'after_rollback', _after_rollback)
+    _installed = True
+
+
+def reconcile_rankings(commit=False):
+    """Recount every user's ranking row; returns how many rows were corrected."""
+    from models import db
+
+    session = db.session
+    session.info[_REFRESHING_KEY] = True
+    try:
+        session.flush()
+        session.info.pop(_PENDING_KEY, None)
+        corrected = _refresh(session, _all_user_ids(session))
+    finally:
+        session.info.pop(_REFRESHING_KEY, None)
+    if commit:
+        session.commit()
+    if corrected:
+        logger.info('Ranking reconciliation corrected %d row(s)', corrected)
+    return corrected
+
+
+# ── Leaderboard reads ───────────────────────────────────────────────
+
+def _board(kind):
+    from models import User, UserRanking, db
+
+    if kind == 'games':
+        order = (UserRanking.wins.desc(), UserRanking.total_games.asc(),
+                 UserRanking.user_id.asc())
+        extra = ()
+    else:
+        order = (UserRanking.lands_owned.desc(), UserRanking.total_gold_rate.desc(),
+                 UserRanking.user_id.asc())
+        extra = (or_(UserRanking.lands_owned > 0, UserRanking.conquer_attempts > 0,
+                     UserRanking.defence_wins > 0),)
+    query = (
+        db.session.query(UserRanking, User)
+        .join(User, User.id == UserRanking.user_id)
+        .filter(User.is_ai.is_(False), *extra)
+    )
+    return query, order
+
+
+def parse_ranking_page(args):
+    """Return ``(limit, offset)`` from request args, or ``None`` if invalid.
+
+    ``limit`` is optional (``None`` = whole list) and capped at
+    ``RANKINGS_PAGE_MAX``.
+    """
+    try:
+        limit = args.get('limit')
+        limit = None if limit in (None, '') else int(limit)
+        offset = int(args.get('offset') or 0)
+    except (TypeError, ValueError):
+        return None
+    if offset < 0 or (limit is not None and limit < 0):
+        return None
+    if limit is not None:
+        limit = min(limit, settings.RANKINGS_PAGE_MAX)
+    return limit, offset
+
+
+def leaderboard(kind, limit=None, offset=0):
+    """Return ``(total, [(rank, ranking, user), ...])`` for one leaderboard.
+
+    ``kind`` is ``'games'`` (duel record) or ``'kingdom'``.  ``total`` is
+    only counted for paginated reads (``limit`` given); otherwise ``None``.
+    """
+    refresh_pending_rankings()
+    query, order = _board(kind)
+    total = query.count() if limit is not None else None
+    page = query.order_by(*order).offset(offset)
+    if limit is not None:
+        page = page.limit(limit)
+    return total, [
+        (offset + index + 1, ranking, user)
+        for index, (ranking, user) in enumerate(page.all())
+    ]
+
+
+def rank_of(kind, user_id):
+    """Return ``(rank, ranking, user)`` for ``user_id``, or ``None`` if unranked."""
+    from models import UserRanking
+
+    refresh_pending_rankings()
+    query, _order = _board(kind)
+    found = query.filter(UserRanking.user_id == user_id).first()
+    if found is None:
+        return None
+    ranking, user = found
+    if kind == 'games':
+        ahead = or_(
+            UserRanking.wins > ranking.wins,
+            and_(UserRanking.wins == ranking.wins,
+                 UserRanking.total_games < ranking.total_games),
+            and_(UserRanking.wins == ranking.wins,
+                 UserRanking.total_games == ranking.total_games,
+                 UserRanking.user_id < ranking.user_id),
+        )
+    else:
+        ahead = or_(
+            UserRanking.lands_owned > ranking.lands_owned,
+            and_(UserRanking.lands_owned == ranking.lands_owned,
+                 UserRanking.total_gold_rate > ranking.total_gold_rate),
+            and_(UserRanking.lands_owned == ranking.lands_owned,
+                 UserRanking.total_gold_rate == ranking.total_gold_rate,
+                 UserRanking.user_id < ranking.user_id),
+        )
+    return query.filter(ahead).count() + 1, ranking, user
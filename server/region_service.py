@@ -401,11 +401,16 @@ def collect_region_tributes(user, now=None):
     return total, breakdown
 
 
-def serialize_regions(user_id, lands=None, now=None):
-    """Build the ordered read-only region block for ``GET /kingdom/map``."""
+def serialize_regions(user_id, lands=None, now=None, standings=None):
+    """Build the ordered read-only region block for ``GET /kingdom/map``.
+
+    ``standings`` takes a precomputed :func:`region_standings` result, which
+    the map caches per map version.
+    """
     now = now or _utcnow()
-    lands = list(lands) if lands is not None else Land.query.all()
-    standings = region_standings(lands=lands)
+    if standings is None:
+        lands = list(lands) if lands is not None else Land.query.all()
+        standings = region_standings(lands=lands)
     rows = {row.region: row for row in RegionChampion.query.all()}
     # Names follow the live read-only standings rather than the persisted row.
     # This keeps snapshots truthful if a prior mutation failed before its
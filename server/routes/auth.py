@@ -11,13 +11,21 @@ from datetime import datetime, timezone
 
 from flask import Blueprint, request, jsonify, g
 from itsdangerous import URLSafeTimedSerializer, SignatureExpired, BadSignature
-from sqlalchemy import case, func
+from sqlalchemy import and_
 from sqlalchemy.exc import OperationalError
 from werkzeug.security import generate_password_hash, check_password_hash
 
 from models import db, User, Player, Game
+from principal_cache import (
+    Principal,
+    cached_principal,
+    invalidate_user,
+    principal_key,
+    remember_principal,
+)
 import server_settings as settings
 from analytics import track
+from ranking_service import leaderboard, parse_ranking_page, rank_of
 
 auth = Blueprint('auth', __name__)
 
@@ -145,6 +153,10 @@ def require_token(f):
 
     On success, sets ``flask.g.user_id`` to the authenticated user's ID.
     Returns 401 JSON on missing / expired / invalid tokens.
+
+    Accepted principals are cached briefly (see ``principal_cache``), so a
+    cache hit skips the ``User`` lookup; use ``current_user()`` rather
+    than ``g.current_user`` when a route needs the row.
     """
     @functools.wraps(f)
     def decorated(*args, **kwargs):
@@ -158,49 +170,74 @@ def require_token(f):
             return jsonify({'success': False, 'message': 'Session expired, please log in again'}), 401
         except (BadSignature, KeyError, TypeError, ValueError):
             return jsonify({'success': False, 'message': 'Invalid token'}), 401
-        user = db.session.get(User, user_id)
-        if not user:
-            return jsonify({
-                'success': False,
-                'message': 'Session is no longer valid',
-                'reason': 'session_revoked',
-            }), 401
-        if (
-            token_kind == 'human'
-            and int(token_version or 0) != int(user.token_version or 0)
-        ):
-            return jsonify({
-                'success': False,
-                'message': 'Session was revoked. Please log in again.',
-                'reason': 'session_revoked',
-            }), 401
-        status = (user.account_status or 'active').strip().lower()
-        now = _utcnow()
-        if status in {'deleted', 'banned'}:
-            return jsonify({
-                'success': False,
-                'message': 'This account is unavailable.',
-                'reason': f'account_{status}',
-            }), 403
-        if (
-            status == 'suspended'
-            and (user.suspended_until is None or user.suspended_until > now)
-        ):
-            return jsonify({
-                'success': False,
-                'message': 'This account is temporarily suspended.',
-                'reason': 'account_suspended',
-                'suspended_until': (
-                    user.suspended_until.isoformat()
-                    if user.suspended_until else None
-                ),
-            }), 403
+        key = principal_key(user_id, token_version, token_kind)
+        principal = cached_principal(key)
+        user = None
+        if principal is None:
+            user = db.session.get(User, user_id)
+            if not user:
+                return jsonify({
+                    'success': False,
+                    'message': 'Session is no longer valid',
+                    'reason': 'session_revoked',
+                }), 401
+            principal = Principal.from_user(user)
+        denied = _principal_denial(principal, token_kind, token_version)
+        if denied is not None:
+            return denied
+        if user is not None:
+            remember_principal(key, principal)
         g.user_id = user_id
+        # Loaded lazily by current_user() when the principal came from cache.
         g.current_user = user
+        g.game_memberships = {}
         return f(*args, **kwargs)
     return decorated
 
 
+def _principal_denial(principal, token_kind, token_version):
+    """Return the 401/403 response for a principal that may not proceed."""
+    if (
+        token_kind == 'human'
+        and int(token_version or 0) != principal.token_version
+    ):
+        return jsonify({
+            'success': False,
+            'message': 'Session was revoked. Please log in again.',
+            'reason': 'session_revoked',
+        }), 401
+    status = principal.account_status
+    if status in {'deleted', 'banned'}:
+        return jsonify({
+            'success': False,
+            'message': 'This account is unavailable.',
+            'reason': f'account_{status}',
+        }), 403
+    suspended_until = principal.suspended_until
+    if (
+        status == 'suspended'
+        and (suspended_until is None or suspended_until > _utcnow())
+    ):
+        return jsonify({
+            'success': False,
+            'message': 'This account is temporarily suspended.',
+            'reason': 'account_suspended',
+            'suspended_until': (
+                suspended_until.isoformat() if suspended_until else None
+            ),
+        }), 403
+    return None
+
+
+def current_user():
+    """Return the authenticated ``User`` row, loading it on first use."""
+    user = g.get('current_user')
+    if user is None:
+        user = db.session.get(User, g.user_id)
+        g.current_user = user
+    return user
+
+
 # ── Player-ownership helper ───────────────────────────────────────
 
 def verify_player_ownership(player_id):
@@ -213,13 +250,19 @@ def verify_player_ownership(player_id):
     stuck-game sweeper doesn't kill games with active client activity.
     Only conquer games get the timestamp bump — regular battles don't have
     a sweeper, so updating their timestamp on every poll is unnecessary
-    write churn.
+    write churn.  Repeat checks of the same player within one request are
+    answered from the request's membership map.
     """
+    memberships = _request_memberships()
+    verified_key = ('player', player_id)
+    if verified_key in memberships:
+        return None
     player = db.session.get(Player, player_id)
     if not player:
         return jsonify({'success': False, 'message': 'Player not found'}), 404
     if player.user_id != g.user_id:
         return jsonify({'success': False, 'message': 'Forbidden: player does not belong to authenticated user'}), 403
+    memberships[verified_key] = player.id
     # Touch game activity timestamp for conquer games only (best-effort,
     # don't fail auth on error).  The stuck-game sweeper only targets
     # conquer mode, so other game modes don't need this write.
@@ -259,18 +302,42 @@ def get_game_membership(game_id):
             400,
         )
 
-    game = db.session.get(Game, normalized_game_id)
-    if not game:
+    memberships = _request_memberships()
+    member_key = ('game', normalized_game_id, g.user_id)
+    player_id = memberships.get(member_key)
+    if player_id is not None:
+        player = db.session.get(Player, player_id)
+        if player is not None:
+            return player, None, None
+
+    # One round trip for both rows; the Game lands in the session's identity
+    # map, so the route's own ``db.session.get(Game, ...)`` is free.
+    row = (
+        db.session.query(Game, Player)
+        .outerjoin(Player, and_(
+            Player.game_id == Game.id,
+            Player.user_id == g.user_id,
+        ))
+        .filter(Game.id == normalized_game_id)
+        .first()
+    )
+    if row is None:
         return None, jsonify({'success': False, 'message': 'Game not found'}), 404
-    player = Player.query.filter_by(
-        game_id=normalized_game_id,
-        user_id=g.user_id,
-    ).first()
+    _game, player = row
     if not player:
         return None, jsonify({'success': False, 'message': 'Forbidden'}), 403
+    memberships[member_key] = player.id
     return player, None, None
 
 
+def _request_memberships():
+    """Membership checks already passed in this request (see require_token)."""
+    memberships = g.get('game_memberships')
+    if memberships is None:
+        memberships = g.game_memberships = {}
+    return memberships
+
+
 def verify_game_membership(game_id):
     """Check the authenticated user participates in game_id."""
     _, response, status = get_game_membership(game_id)
@@ -649,6 +716,7 @@ def change_password():
     user.set_password(new_password)
     user.token_version = int(user.token_version or 0) + 1
     db.session.commit()
+    invalidate_user(user.id)
     token = generate_token(user.id, user.token_version)
     logger.info(
         'Password changed and prior sessions revoked',
@@ -670,6 +738,7 @@ def logout_all():
         return jsonify({'success': False, 'message': 'User not found'}), 404
     user.token_version = int(user.token_version or 0) + 1
     db.session.commit()
+    invalidate_user(user.id)
     logger.info(
         'All sessions revoked',
         extra={'event': 'sessions_revoked', 'user_id': user.id},
@@ -949,6 +1018,7 @@ def delete_account():
     user.token_version = int(user.token_version or 0) + 1
     user.set_password(secrets.token_urlsafe(48))
     db.session.commit()
+    invalidate_user(user.id)
     logger.info(
         'Account anonymized',
         extra={'event': 'account_deleted', 'user_id': user.id},
@@ -960,52 +1030,56 @@ def delete_account():
 
 @auth.route('/get_rankings', methods=['GET'])
 def get_rankings():
-    """Return ranking data for all users: gold, total games, wins, losses."""
-    try:
-        # Aggregate finished-game stats per user in a single query instead
-        # of per-user/per-game lookups (the endpoint is public, so its cost
-        # must stay flat as the user base grows).
-        stat_rows = (
-            db.session.query(
-                Player.user_id,
-                func.count(Game.id).label('total'),
-                func.sum(
-                    case((Game.winner_player_id == Player.id, 1), else_=0)
-                ).label('wins'),
-            )
-            .join(Game, Game.id == Player.game_id)
-            .filter(Game.state == 'finished')
-            .group_by(Player.user_id)
-            .all()
-        )
-        stats_by_user = {row.user_id: row for row in stat_rows}
+    """Return ranking data for human users: gold, total games, wins, losses.
 
-        rankings = []
+    Read from the maintained ``UserRanking`` rows (the endpoint is public,
+    so its cost must not grow with game history), most wins first.
+    Optional ``limit``/``offset`` page the list (``total`` is then
+    included); ``username`` adds that player's own entry as ``me``.
+    """
+    page = parse_ranking_page(request.args)
+    if page is None:
+        return jsonify({'success': False,
+                        'message': 'limit and offset must be non-negative integers'}), 400
+    limit, offset = page
+    try:
         # AI opponents participate in games, but rankings are a comparison
-        # between human players.  Filter on the persisted flag rather than a
-        # username convention so renamed/additional bots stay excluded.
-        for user in User.query.filter(User.is_ai.is_(False)).all():
-            stats = stats_by_user.get(user.id)
-            total = stats.total if stats else 0
-            wins = int(stats.wins) if stats and stats.wins is not None else 0
-            is_online = False
-            if user.last_active:
-                is_online = (_utcnow() - user.last_active).total_seconds() < 60
-            rankings.append({
-                'username': user.username,
-                'gold': user.gold,
-                'total_games': total,
-                'wins': wins,
-                'losses': total - wins,
-                'is_online': is_online,
-            })
-        return jsonify({'success': True, 'rankings': rankings})
+        # between human players; the leaderboard filters on the persisted
+        # flag rather than a username convention.
+        total, rows = leaderboard('games', limit=limit, offset=offset)
+        payload = {
+            'success': True,
+            'rankings': [_ranking_entry(*row) for row in rows],
+        }
+        if total is not None:
+            payload['total'] = total
+        username = (request.args.get('username') or '').strip()
+        if username:
+            user = User.query.filter_by(username=username).first()
+            found = rank_of('games', user.id) if user else None
+            payload['me'] = _ranking_entry(*found) if found else None
+        return jsonify(payload)
     except Exception as e:
         db.session.rollback()
         logging.error(f"Rankings failed: {e}")
         return jsonify({'success': False, 'message': 'Failed to fetch rankings'}), 500
 
 
+def _ranking_entry(rank, ranking, user):
+    is_online = False
+    if user.last_active:
+        is_online = (_utcnow() - user.last_active).total_seconds() < 60
+    return {
+        'rank': rank,
+        'username': user.username,
+        'gold': user.gold,
+        'total_games': int(ranking.total_games),
+        'wins': int(ranking.wins),
+        'losses': int(ranking.total_games) - int(ranking.wins),
+        'is_online': is_online,
+    }
+
+
 # ── Notification email preferences ────────────────────────────────
 
 @auth.route('/unsubscribe', methods=['GET'])
@@ -4,37 +4,15 @@
 
 import random
 import logging
-from flask import Blueprint, request, jsonify, current_app, g
+from flask import Blueprint, request, jsonify, g
 from models import db, Game, Player, MainCard, SideCard, BattleMove, User, LogEntry
 from game_service.game_mode import is_tactics_hand_conquer
-import server_settings as settings
 from routes.auth import require_token, verify_game_membership, verify_player_ownership
 from routes.serialization import serialize_battle_moves_for_viewer, serialize_game_for_viewer
 
 battle_shop = Blueprint('battle_shop', __name__)
 
 logger = logging.getLogger('nepalkings.server')
-_ai_logger = logging.getLogger('nepalkings.ai.trigger')
-
-@battle_shop.after_request
-def _ai_trigger_hook(response):
-    """After every POST, check if an AI player needs to act."""
-    if request.method == 'POST' and settings.AI_ENABLED:
-        if request.headers.get('X-NepalKings-AI-Internal') == '1':
-            return response
-        game_id = None
-        try:
-            if request.is_json and request.json:
-                game_id = request.json.get('game_id')
-        except Exception:
-            pass
-        if game_id:
-            try:
-                from ai.ai_worker import trigger_ai_if_needed
-                trigger_ai_if_needed(int(game_id), app=current_app._get_current_object())
-            except Exception as e:
-                _ai_logger.warning(f"AI trigger error in battle_shop hook: {e}")
-    return response
 
 # Max battle moves per player
 MAX_BATTLE_MOVES = 3
@@ -6,7 +6,13 @@ import random
 import logging
 from flask import Blueprint, request, jsonify, g
 
-from models import db, User, CollectionCard
+from models import db, User, CollectionCard, CollectionStack
+from collection_inventory import (
+    add_copies,
+    consume_free_copies,
+    free_copies,
+    sync_collection_stacks,
+)
 from collection_snapshot import serialize_collection_snapshot
 from routes.auth import require_token
 import server_settings as config
@@ -97,14 +103,7 @@ def _request_quantity(default=1):
 
 
 def _add_drawn_cards(user, drawn):
-    for card in drawn:
-        cc = CollectionCard(
-            user_id=user.id,
-            suit=card['suit'],
-            rank=card['rank'],
-            value=card['value'],
-        )
-        db.session.add(cc)
+    add_copies(user.id, drawn)
 
 
 # ── GET /collection/cards ───────────────────────────────────────────────────
@@ -144,20 +143,21 @@ def sell_card():
     if not user:
         return jsonify({'success': False, 'message': 'User not found'}), 404
 
-    # Find unlocked cards to sell
-    free_cards = CollectionCard.query.filter_by(
-        user_id=user.id, suit=suit, rank=rank, locked=False
-    ).limit(quantity).all()
-
-    if len(free_cards) < quantity:
+    free = free_copies(user.id, suit, rank)
+    if free < quantity:
         return jsonify({
             'success': False,
-            'message': f'Not enough free cards to sell (have {len(free_cards)}, need {quantity})',
+            'message': f'Not enough free cards to sell (have {free}, need {quantity})',
         }), 400
 
+    if consume_free_copies(user.id, suit, rank, quantity) != quantity:
+        db.session.rollback()
+        return jsonify({
+            'success': False,
+            'message': 'Cards changed while selling. Refresh and try again.',
+        }), 409
+
     gold_earned = _sell_price(rank, quantity)
-    for card in free_cards:
-        db.session.delete(card)
     user.gold += gold_earned
     from onboarding_service import (
         mark_step,
@@ -365,23 +365,23 @@ def convert_card():
     if not user:
         return jsonify({'success': False, 'message': 'User not found'}), 404
 
-    free_cards = CollectionCard.query.filter_by(
-        user_id=user.id, suit=suit, rank=rank, locked=False
-    ).limit(needed).all()
-
-    if len(free_cards) < needed:
+    free = free_copies(user.id, suit, rank)
+    if free < needed:
         return jsonify({
             'success': False,
             'message': (f'Not enough free cards to convert '
-                        f'(have {len(free_cards)}, need {needed})'),
+                        f'(have {free}, need {needed})'),
         }), 400
 
+    if consume_free_copies(user.id, suit, rank, needed) != needed:
+        db.session.rollback()
+        return jsonify({
+            'success': False,
+            'message': 'Cards changed while converting. Refresh and try again.',
+        }), 409
+
     value = RANK_TO_VALUE[rank]
-    for card in free_cards:
-        db.session.delete(card)
-    for _ in range(quantity):
-        db.session.add(CollectionCard(
-            user_id=user.id, suit=target_suit, rank=rank, value=value))
+    add_copies(user.id, [{'suit': target_suit, 'rank': rank, 'value': value}] * quantity)
     from onboarding_service import mark_step, serialize_onboarding_state
     mark_step(user, 'trade_first_card')
     db.session.commit()
@@ -424,27 +424,35 @@ def craft_maharaja():
     if not user:
         return jsonify({'success': False, 'message': 'User not found'}), 404
 
-    # Select candidate IDs first, then claim all thirteen with one conditional
+    # Check availability on the suit's stacks, pick one free copy per rank
+    # in a single grouped read, then claim all thirteen with one conditional
     # DELETE.  The row-count check makes concurrent craft/build requests
     # all-or-nothing: a card locked or consumed after this read causes a
     # rollback instead of producing an unearned Maharaja.
-    to_consume_ids = []
-    missing = []
-    for rank in MAHARAJA_CRAFT_RANKS:
-        card_id = db.session.query(CollectionCard.id).filter_by(
-            user_id=user.id, suit=suit, rank=rank, locked=False
-        ).limit(1).scalar()
-        if card_id is None:
-            missing.append(rank)
-        else:
-            to_consume_ids.append(card_id)
-
+    sync_collection_stacks(db.session)
+    available = {
+        rank for (rank,) in db.session.query(CollectionStack.rank).filter(
+            CollectionStack.user_id == user.id,
+            CollectionStack.suit == suit,
+            CollectionStack.rank.in_(MAHARAJA_CRAFT_RANKS),
+            CollectionStack.free_count > 0,
+        )
+    }
+    missing = [rank for rank in MAHARAJA_CRAFT_RANKS if rank not in available]
     if missing:
         return jsonify({
             'success': False,
             'message': f'Missing free {suit} cards for rank(s): {", ".join(missing)}',
         }), 400
 
+    to_consume_ids = [
+        card_id for (card_id,) in db.session.query(db.func.min(CollectionCard.id)).filter(
+            CollectionCard.user_id == user.id,
+            CollectionCard.suit == suit,
+            CollectionCard.rank.in_(MAHARAJA_CRAFT_RANKS),
+            CollectionCard.locked.is_(False),
+        ).group_by(CollectionCard.rank)
+    ]
     deleted = CollectionCard.query.filter(
         CollectionCard.id.in_(to_consume_ids),
         CollectionCard.user_id == user.id,
@@ -1,6 +1,6 @@
 # Copyright (c) 2026 Marc Stieffenhofer. All rights reserved.
 # See LICENSE file in the project root for full license information.
-from flask import Blueprint, request, jsonify, current_app, g
+from flask import Blueprint, request, jsonify, g
 from sqlalchemy.orm.attributes import flag_modified
 from models import db, Figure, CardToFigure, CardRole, Game, Player, MainCard, SideCard, LogEntry, User, ActiveSpell
 import logging
@@ -13,27 +13,6 @@ logger = logging.getLogger('nepalkings.routes.figures')
 
 figures = Blueprint('figures', __name__)
 
-_ai_logger = logging.getLogger('nepalkings.ai.trigger')
-
-@figures.after_request
-def _ai_trigger_hook(response):
-    """After every POST, check if an AI player needs to act."""
-    if request.method == 'POST' and settings.AI_ENABLED:
-        if request.headers.get('X-NepalKings-AI-Internal') == '1':
-            return response
-        game_id = None
-        try:
-            if request.is_json and request.json:
-                game_id = request.json.get('game_id')
-        except Exception:
-            pass
-        if game_id:
-            try:
-                from ai.ai_worker import trigger_ai_if_needed
-                trigger_ai_if_needed(int(game_id), app=current_app._get_current_object())
-            except Exception as e:
-                _ai_logger.warning(f"AI trigger error in figures hook: {e}")
-    return response
 
 def _has_active_infinite_hammer(player_id, game_id):
     """Check if player has an active Infinite Hammer spell."""
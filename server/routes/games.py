@@ -79,6 +79,12 @@ from game_service.conquer_ownership_transfer import (
     _wipe_defence_drafts_for_lost_land,
 )
 from game_service.conquer_outcome_recording import record_conquer_outcome
+from game_service.game_state_version import (
+    APPEND_SECTIONS as GAME_STATE_APPEND_SECTIONS,
+    LIST_SECTIONS as GAME_STATE_LIST_SECTIONS,
+    changed_sections_since,
+    scoped_game_mutation,
+)
 from game_service.conquer_result_serialization import (
     build_conquer_resolution_cache,
     build_live_conquer_resolution_response,
@@ -114,7 +120,7 @@ from game_service.challenge_coordination import (
     locked_challenge_for_game_creation,
 )
 from routes.auth import get_game_membership, require_token, verify_game_membership, verify_player_ownership
-from routes.serialization import serialize_game_for_viewer, serialize_spell_for_viewer, viewer_has_all_seeing_eye
+from routes.serialization import serialize_game_delta, serialize_game_for_viewer, serialize_player_presence, serialize_spell_for_viewer, viewer_has_all_seeing_eye, viewer_player_for_game
 from analytics import track
 from ai.defence.config import AI_DEFENCE_RANK_VALUES
 from ai.defence.generator import get_ai_defence_template_for_land
@@ -126,6 +132,8 @@ def _serialized_game_mutation(handler):
     The endpoint remains responsible for validating ``game_id``.  This wrapper
     only extracts a usable identifier early enough to acquire the shared
     PostgreSQL advisory lock before the endpoint reads mutable game state.
+    It also scopes bulk row updates/deletes to the game so they bump its
+    ``state_version`` like ordinary ORM changes do.
     """
     @wraps(handler)
     def wrapped(*args, **kwargs):
@@ -138,7 +146,7 @@ def _serialized_game_mutation(handler):
         except (TypeError, ValueError):
             # Preserve the endpoint's existing validation/error response.
             return handler(*args, **kwargs)
-        with _conquer_game_lock(lock_id):
+        with _conquer_game_lock(lock_id), scoped_game_mutation(lock_id):
             return handler(*args, **kwargs)
     return wrapped
 
@@ -148,8 +156,6 @@ logger = logging.getLogger('nepalkings.routes.games')
 
 games = Blueprint('games', __name__)
 
-_ai_logger = logging.getLogger('nepalkings.ai.trigger')
-
 
 # --- Conquer per-round move timer (human players only) ------------------
 # Each human player gets up to ``CONQUER_ROUND_TIMEOUT_SEC`` seconds per
@@ -1127,28 +1133,6 @@ def _complete_conquer_own_defender_response(game, defender_player):
         game.turn_player_id = game.advancing_player_id
     _record_conquer_automated_invader_battle_decision(game)
 
-@games.after_request
-def _ai_trigger_hook(response):
-    """After every POST, check if an AI player needs to act."""
-    if request.method == 'POST' and settings.AI_ENABLED:
-        if request.headers.get('X-NepalKings-AI-Internal') == '1':
-            return response
-        game_id = None
-        try:
-            if request.is_json and request.json:
-                game_id = request.json.get('game_id')
-            elif request.form:
-                game_id = request.form.get('game_id')
-        except Exception:
-            pass
-        if game_id:
-            try:
-                from ai.ai_worker import trigger_ai_if_needed
-                trigger_ai_if_needed(int(game_id), app=current_app._get_current_object())
-            except Exception as e:
-                _ai_logger.warning(f"AI trigger error in games hook: {e}")
-    return response
-
 def _guard_battle_active(game, *, player_id=None, action_label='action'):
     """Return an error response if a battle is in progress, else None.
 
@@ -2550,11 +2534,76 @@ def get_games():
         return jsonify({'success': False, 'message': 'Failed to fetch games'}), 400
 
 
+def _refresh_polled_game(game):
+    """Run the per-poll housekeeping and return the conquer round deadline."""
+    # Check if Blitzkrieg ceasefire should end (runs on every poll)
+    _check_and_update_ceasefire(game)
+
+    # Conquer per-round 60s move timer: ensure deadline + auto-finalize
+    # if expired for any human player that has not played yet.
+    _ensure_conquer_round_deadline(game)
+    _check_conquer_round_timeout(game)
+    deadline = _conquer_round_deadline_for(game)
+
+    # Revive a stalled automated conquer defender (throttled no-op when
+    # nothing is pending).
+    _conquer_ai_watchdog_check(game)
+    return deadline
+
+
+def _serialize_polled_game(game, deadline, **serialize_options):
+    serialized = serialize_game_for_viewer(game, g.user_id, **serialize_options)
+    if deadline is not None:
+        serialized['conquer_round_deadline_ts'] = deadline
+        serialized['conquer_round_timeout_sec'] = CONQUER_ROUND_TIMEOUT_SEC
+    return serialized
+
+
+def _polled_game_body(game, deadline, since_version, with_history=True):
+    """Serialize the viewer's game as a full or delta ``get_game`` body.
+
+    Returns ``(body, serialized)``.  A delta loads log and chat rows only
+    when their section changed, and then only past ``log_after_id`` /
+    ``chat_after_id``; ``with_history=False`` leaves both sections out.
+    """
+    skip_sections = set() if with_history else set(GAME_STATE_APPEND_SECTIONS)
+    if since_version is None or not 0 <= since_version < int(game.state_version or 0):
+        serialized = _serialize_polled_game(game, deadline, skip_sections=skip_sections)
+        return {'game': serialized}, serialized
+
+    changed = set(changed_sections_since(game, since_version))
+    skip_sections.update(
+        section for section in GAME_STATE_APPEND_SECTIONS if section not in changed)
+    cursors = {
+        'log_after_id': request.args.get('log_after_id', type=int),
+        'chat_after_id': request.args.get('chat_after_id', type=int),
+    }
+    serialized = _serialize_polled_game(
+        game, deadline, skip_sections=skip_sections, **cursors)
+    body = {
+        'game': serialize_game_delta(serialized, game, since_version, **cursors),
+        'delta': True,
+        'presence': serialize_player_presence(game),
+    }
+    return body, serialized
+
+
 @games.route('/get_game', methods=['GET'])
 @require_token
 def get_game():
+    """Return the viewer's game snapshot.
+
+    With ``since_version`` the response is ``{'unchanged': True}`` when the
+    game's ``state_version`` still matches, otherwise a delta holding the
+    scalar fields plus only the list sections stamped after that version.
+    Both carry ``presence`` (``{player_id: is_online}``), which changes
+    without a version bump.
+    ``log_after_id`` / ``chat_after_id`` further trim changed log and chat
+    sections to the rows the client has not seen.
+    """
     try:
         game_id = request.args.get('game_id', type=int)
+        since_version = request.args.get('since_version', type=int)
         membership_err = verify_game_membership(game_id)
         if membership_err:
             return membership_err
@@ -2563,32 +2612,103 @@ def get_game():
         if not game:
             return jsonify({'success': False, 'message': 'Game not found'}), 400
 
-        # Check if Blitzkrieg ceasefire should end (runs on every poll)
-        _check_and_update_ceasefire(game)
+        deadline = _refresh_polled_game(game)
 
-        # Conquer per-round 60s move timer: ensure deadline + auto-finalize
-        # if expired for any human player that has not played yet.
-        _ensure_conquer_round_deadline(game)
-        _check_conquer_round_timeout(game)
-        deadline = _conquer_round_deadline_for(game)
+        state_version = int(game.state_version or 0)
+        if since_version is not None and since_version == state_version:
+            return jsonify({'unchanged': True, 'state_version': state_version,
+                            'presence': serialize_player_presence(game)})
 
-        # Revive a stalled automated conquer defender (throttled no-op when
-        # nothing is pending).
-        _conquer_ai_watchdog_check(game)
-
-        serialized = serialize_game_for_viewer(game, g.user_id)
-        if deadline is not None:
-            serialized['conquer_round_deadline_ts'] = deadline
-            serialized['conquer_round_timeout_sec'] = CONQUER_ROUND_TIMEOUT_SEC
-        return jsonify({
-            'game': serialized
-        })
+        body, _serialized = _polled_game_body(game, deadline, since_version)
+        return jsonify(body)
     except Exception as e:
         db.session.rollback()
         logger.exception('Failed to fetch game')
         return jsonify({'success': False, 'message': 'Failed to fetch game'}), 400
 
 
+@games.route('/get_game_snapshot', methods=['GET'])
+@require_token
+def get_game_snapshot():
+    """Return everything one client poll needs in a single response.
+
+    The body is the ``get_game`` body (full, delta or ``unchanged``) plus the
+    viewer's ``logs``, ``chats``, ``active_spells`` and per-player
+    ``figures``, shaped like the dedicated endpoints return them.  Logs and
+    chats are sent only there: ``game`` carries no ``log_entries`` or
+    ``chat_messages``.  On a delta poll those extra keys are only present
+    when their section changed after ``since_version``; the client keeps its
+    copies of the rest.
+    ``logs_after_id`` / ``chats_after_id`` cut logs and chats to newer rows
+    and list them in ``appended`` so the client extends its lists.
+    """
+    try:
+        game_id = request.args.get('game_id', type=int)
+        since_version = request.args.get('since_version', type=int)
+        membership_err = verify_game_membership(game_id)
+        if membership_err:
+            return membership_err
+        game = db.session.get(Game, game_id)
+
+        if not game:
+            return jsonify({'success': False, 'message': 'Game not found'}), 400
+
+        deadline = _refresh_polled_game(game)
+
+        state_version = int(game.state_version or 0)
+        if since_version is not None and since_version == state_version:
+            return jsonify({'unchanged': True, 'state_version': state_version,
+                            'presence': serialize_player_presence(game)})
+
+        # Logs and chats travel once, in ``logs``/``chats`` below.
+        body, serialized = _polled_game_body(
+            game, deadline, since_version, with_history=False)
+        if body.get('delta'):
+            changed = set(changed_sections_since(game, since_version))
+        else:
+            changed = set(GAME_STATE_LIST_SECTIONS)
+
+        from routes.msg import game_log_entries, visible_chat_messages
+        from routes.spells import serialize_active_spells_for_viewer
+
+        viewer = viewer_player_for_game(game, g.user_id)
+        logs_after_id = request.args.get('logs_after_id', type=int)
+        chats_after_id = request.args.get('chats_after_id', type=int)
+        appended = []
+        if 'log_entries' in changed:
+            body['logs'] = [
+                entry.serialize()
+                for entry in game_log_entries(game_id, after_id=logs_after_id)
+            ]
+            if logs_after_id is not None:
+                appended.append('logs')
+        if 'chat_messages' in changed:
+            body['chats'] = [
+                message.serialize()
+                for message in visible_chat_messages(
+                    game_id, g.user_id, after_id=chats_after_id)
+            ]
+            if chats_after_id is not None:
+                appended.append('chats')
+        if appended:
+            body['appended'] = appended
+        if 'active_spells' in changed:
+            reveal = viewer_has_all_seeing_eye(serialized, viewer.id)
+            body['active_spells'] = serialize_active_spells_for_viewer(
+                game_id, game, viewer.id, reveal)
+        if 'players' in changed:
+            # Figures are public and already serialized per player.
+            body['figures'] = {
+                str(player['id']): player.get('figures', [])
+                for player in serialized.get('players', [])
+            }
+        return jsonify(body)
+    except Exception:
+        db.session.rollback()
+        logger.exception('Failed to fetch game snapshot')
+        return jsonify({'success': False, 'message': 'Failed to fetch game snapshot'}), 400
+
+
 @games.route('/get_ai_debug', methods=['GET'])
 @require_token
 def get_ai_debug():
@@ -5,9 +5,11 @@
 import math
 import secrets
 import logging
+from bisect import bisect_right
+from collections import namedtuple
 from copy import deepcopy
 from datetime import datetime, timezone, timedelta
-from flask import Blueprint, jsonify, request, g
+from flask import Blueprint, current_app, jsonify, request, g
 
 from models import (db, User, Land, LandAttackLog, KingdomMessage,
                     KingdomNotification, KingdomLootEvent,
@@ -18,7 +20,7 @@ from models import (db, User, Land, LandAttackLog, KingdomMessage,
                     Game, Player, Figure, BattleMove, ConquerTactic,
                     CardToFigure, ActiveSpell,
                     MainCard, SideCard, Suit, MainRank, CardRole)
-from routes.auth import require_token
+from routes.auth import current_user, require_token
 from moderation_service import (
     active_chat_mute,
     blocked_user_ids,
@@ -31,6 +33,7 @@ from routes.serialization import (
 )
 from game_service.deck_manager import DeckManager
 from collection_snapshot import serialize_collection_snapshot
+from ranking_service import leaderboard, parse_ranking_page, rank_of
 from game_service.conquer_prelude_replay_targets import (
     conquer_destroyed_replay_targets_for_prelude,
 )
@@ -373,104 +376,50 @@ def collect_production_all_route():
 
 @kingdom.route('/rankings', methods=['GET'])
 def get_kingdom_rankings():
-    """Return kingdom ranking data for all users with owned lands.
+    """Return kingdom ranking data for users with lands or conquest history.
 
-    Returns list sorted by lands_owned descending, then total_gold_rate descending.
+    Sorted by lands_owned descending, then total_gold_rate descending, from
+    the maintained ``UserRanking`` rows.  Optional ``limit``/``offset`` page
+    the list (``total`` is then included); ``username`` adds that player's
+    own entry as ``me``.
     """
+    page = parse_ranking_page(request.args)
+    if page is None:
+        return jsonify({'success': False,
+                        'message': 'limit and offset must be non-negative integers'}), 400
+    limit, offset = page
     try:
-        from sqlalchemy import func, case, or_
-
-        # Subquery: per-user land stats
-        land_stats = (
-            db.session.query(
-                Land.owner_user_id.label('user_id'),
-                func.count(Land.id).label('lands_owned'),
-                func.coalesce(func.sum(Land.gold_rate), 0.0).label('total_gold_rate'),
-            )
-            .filter(Land.owner_user_id.isnot(None))
-            .group_by(Land.owner_user_id)
-            .subquery()
-        )
-
-        # Subquery: conquer attempts (user was attacker)
-        conquer_attempts = (
-            db.session.query(
-                LandAttackLog.attacker_user_id.label('user_id'),
-                func.count(LandAttackLog.id).label('conquer_attempts'),
-                func.sum(
-                    case(
-                        (LandAttackLog.result == 'attacker_won', 1),
-                        else_=0,
-                    )
-                ).label('conquer_wins'),
-            )
-            .group_by(LandAttackLog.attacker_user_id)
-            .subquery()
-        )
-
-        # Subquery: defence wins (user was defender and won)
-        defence_stats = (
-            db.session.query(
-                LandAttackLog.defender_user_id.label('user_id'),
-                func.sum(
-                    case(
-                        (LandAttackLog.result == 'defender_won', 1),
-                        else_=0,
-                    )
-                ).label('defence_wins'),
-            )
-            .filter(LandAttackLog.defender_user_id.isnot(None))
-            .group_by(LandAttackLog.defender_user_id)
-            .subquery()
-        )
-
-        # Get all users that have land or attack log entries
-        # Use LEFT OUTER JOINs to include users with partial data
-        rows = (
-            db.session.query(
-                User.username,
-                func.coalesce(land_stats.c.lands_owned, 0).label('lands_owned'),
-                func.coalesce(land_stats.c.total_gold_rate, 0.0).label('total_gold_rate'),
-                func.coalesce(conquer_attempts.c.conquer_attempts, 0).label('conquer_attempts'),
-                func.coalesce(conquer_attempts.c.conquer_wins, 0).label('conquer_wins'),
-                func.coalesce(defence_stats.c.defence_wins, 0).label('defence_wins'),
-            )
-            .outerjoin(land_stats, User.id == land_stats.c.user_id)
-            .outerjoin(conquer_attempts, User.id == conquer_attempts.c.user_id)
-            .outerjoin(defence_stats, User.id == defence_stats.c.user_id)
-            .filter(
-                User.is_ai.is_(False),
-                or_(
-                    land_stats.c.lands_owned > 0,
-                    conquer_attempts.c.conquer_attempts > 0,
-                    defence_stats.c.defence_wins > 0,
-                )
-            )
-            .order_by(
-                func.coalesce(land_stats.c.lands_owned, 0).desc(),
-                func.coalesce(land_stats.c.total_gold_rate, 0.0).desc(),
-            )
-            .all()
-        )
-
-        rankings = []
-        for row in rows:
-            rankings.append({
-                'username': row.username,
-                'lands_owned': int(row.lands_owned),
-                'total_gold_rate': round(float(row.total_gold_rate), 1),
-                'conquer_attempts': int(row.conquer_attempts),
-                'conquer_wins': int(row.conquer_wins),
-                'defence_wins': int(row.defence_wins),
-            })
-
-        return jsonify({'success': True, 'rankings': rankings})
+        total, rows = leaderboard('kingdom', limit=limit, offset=offset)
+        payload = {
+            'success': True,
+            'rankings': [_kingdom_ranking_entry(*row) for row in rows],
+        }
+        if total is not None:
+            payload['total'] = total
+        username = (request.args.get('username') or '').strip()
+        if username:
+            user = User.query.filter_by(username=username).first()
+            found = rank_of('kingdom', user.id) if user else None
+            payload['me'] = _kingdom_ranking_entry(*found) if found else None
+        return jsonify(payload)
     except Exception as e:
         db.session.rollback()
         logger.error(f'Kingdom rankings failed: {e}')
         return jsonify({'success': False, 'message': 'Failed to fetch kingdom rankings'}), 500
 
 
+def _kingdom_ranking_entry(rank, ranking, user):
+    return {
+        'rank': rank,
+        'username': user.username,
+        'lands_owned': int(ranking.lands_owned),
+        'total_gold_rate': round(float(ranking.total_gold_rate), 1),
+        'conquer_attempts': int(ranking.conquer_attempts),
+        'conquer_wins': int(ranking.conquer_wins),
+        'defence_wins': int(ranking.defence_wins),
+    }
+
+
 # ── Persistent kingdom configuration ───────────────────────────────────────
 
 def _kingdom_config_or_404(kingdom_id):
@@ -972,12 +921,13 @@ def _user_defensive_suit(user):
         return 'Spades'
 
 
-def _recommended_tutorial_land_id(user, lands, now=None):
-    if _first_conquer_complete_for_user(user):
-        return None
-    now = now or _utcnow()
-    attack_suit = _user_offensive_suit(user)
-    attacker_beats = _SUIT_ADVANTAGE.get(attack_suit)
+def _tutorial_land_candidates(lands):
+    """Return unowned tier-1 lands, best first-conquest target first.
+
+    The order ignores the attacker's suit and conquer cooldowns, which
+    :func:`_pick_tutorial_land_id` applies per request; the map caches this
+    list per map version.
+    """
     cols = [int(land.col) for land in lands if land.col is not None]
     rows = [int(land.row) for land in lands if land.row is not None]
     center_col = (min(cols) + max(cols)) / 2 if cols else 0.0
@@ -988,11 +938,8 @@ def _recommended_tutorial_land_id(user, lands, now=None):
             continue
         if int(land.tier or 1) != 1:
             continue
-        if land.conquer_cooldown_until and land.conquer_cooldown_until > now:
-            continue
         # First-conquest battles use the scripted-safe defender regardless of
         # the land's normal AI template, so keep map loading cheap here.
-        suit_score = 0 if land.suit_bonus_suit == attacker_beats else 1
         # Prefer a target near the middle of the world. Edge/corner lands are
         # pinned against the viewport by camera clamping and can end up under
         # map chrome, which makes the very first tap unnecessarily difficult
@@ -1001,15 +948,34 @@ def _recommended_tutorial_land_id(user, lands, now=None):
         dy = (float(land.row) - center_row) * math.sqrt(3)
         center_score = dx * dx + dy * dy
         candidates.append((
-            suit_score,
             center_score,
             -float(land.gold_rate or 0),
             int(land.id or 0),
+            land,
         ))
-    if not candidates:
+    candidates.sort(key=lambda candidate: candidate[:3])
+    return [candidate[-1] for candidate in candidates]
+
+
+def _pick_tutorial_land_id(user, candidates, now):
+    """Pick the first candidate off cooldown, preferring the beaten suit."""
+    attacker_beats = _SUIT_ADVANTAGE.get(_user_offensive_suit(user))
+    fallback = None
+    for land in candidates:
+        if land.conquer_cooldown_until and land.conquer_cooldown_until > now:
+            continue
+        if land.suit_bonus_suit == attacker_beats:
+            return land.id
+        if fallback is None:
+            fallback = land.id
+    return fallback
+
+
+def _recommended_tutorial_land_id(user, lands, now=None):
+    if _first_conquer_complete_for_user(user):
         return None
-    candidates.sort()
-    return candidates[0][-1]
+    return _pick_tutorial_land_id(
+        user, _tutorial_land_candidates(lands), now or _utcnow())
 
 
 def _should_use_tutorial_safe_ai_defence(user, land):
@@ -1194,18 +1160,21 @@ def _bulk_defence_incomplete_by_land(land_ids, user_id):
     return incomplete_by_land
 
 
-def _compute_top_kingdoms(components_by_user, lands, kingdoms_by_id, my_user_id):
-    """Compute the server-wide top-3 leaderboards for the kingdom map.
+def _compute_top_kingdoms(components_by_user, lands, kingdom_names, usernames_by_id):
+    """Rank kingdoms server-wide for the kingdom map leaderboards.
 
     Returns a dict with:
       - ``top_largest_kingdoms``: top 3 connected kingdom-components by size.
       - ``top_greatest_realms``: top 3 players by total owned-lands count.
-      - ``my_largest_rank`` / ``my_largest_size``: requester's rank/size in (A).
-      - ``my_realm_rank``   / ``my_realm_size``  : requester's rank/size in (B).
+      - ``largest_by_user``: ``user_id -> (rank, size)`` of each player's
+        largest component in (A).
+      - ``realm_by_user``: ``user_id -> (rank, size)`` in (B).
 
     Each leaderboard entry carries the data the client needs to find the
     matching badge group on the map (kingdom_id and component_id) and to pan
-    the camera (land_ids).
+    the camera (land_ids).  Nothing here depends on the viewer, so the map
+    caches it per map version; :func:`_my_kingdom_ranks` picks the
+    requester's rows.
     """
     flat_components = []
     total_by_user = {}
@@ -1234,24 +1203,10 @@ def _compute_top_kingdoms(components_by_user, lands, kingdoms_by_id, my_user_id)
                 return land.kingdom_id
         return None
 
-    user_ids_needed = set()
-    for entry in flat_components[:3]:
-        user_ids_needed.add(entry['user_id'])
-    for uid, _ in realm_ranking[:3]:
-        user_ids_needed.add(uid)
-    user_ids_needed.add(my_user_id)
-
-    usernames_by_id = {}
-    if user_ids_needed:
-        for row in User.query.filter(User.id.in_(user_ids_needed)).all():
-            usernames_by_id[row.id] = row.username
-
     def _component_name(entry):
         kid = _kingdom_id_for_land_ids(entry['land_ids'])
-        if kid:
-            k = kingdoms_by_id.get(kid)
-            if k and getattr(k, 'name', None):
-                return k.name
+        if kid and kingdom_names.get(kid):
+            return kingdom_names[kid]
         return usernames_by_id.get(entry['user_id']) or 'Kingdom'
 
     top_largest = []
@@ -1285,26 +1240,32 @@ def _compute_top_kingdoms(components_by_user, lands, kingdoms_by_id, my_user_id)
             'largest_land_ids': largest_land_ids,
         })
 
-    my_components = components_by_user.get(my_user_id) or []
-    my_largest_size = max(
-        (int(c.get('size') or 0) for c in my_components), default=0)
-    my_realm_size = int(total_by_user.get(my_user_id) or 0)
-
-    my_largest_rank = None
+    # Components are sorted by size, so a player's first entry is their
+    # largest.
+    largest_by_user = {}
     for i, entry in enumerate(flat_components, start=1):
-        if entry['user_id'] == my_user_id and entry['size'] == my_largest_size:
-            my_largest_rank = i
-            break
-
-    my_realm_rank = None
-    for i, (uid, _size) in enumerate(realm_ranking, start=1):
-        if uid == my_user_id:
-            my_realm_rank = i
-            break
+        largest_by_user.setdefault(entry['user_id'], (i, entry['size']))
+    realm_by_user = {
+        uid: (i, size) for i, (uid, size) in enumerate(realm_ranking, start=1)
+    }
 
     return {
         'top_largest_kingdoms': top_largest,
         'top_greatest_realms': top_realms,
+        'largest_by_user': largest_by_user,
+        'realm_by_user': realm_by_user,
+    }
+
+
+def _my_kingdom_ranks(rankings, my_user_id):
+    """Return the leaderboard fields of the map payload for one viewer."""
+    my_largest_rank, my_largest_size = rankings['largest_by_user'].get(
+        my_user_id, (None, 0))
+    my_realm_rank, my_realm_size = rankings['realm_by_user'].get(
+        my_user_id, (None, 0))
+    return {
+        'top_largest_kingdoms': rankings['top_largest_kingdoms'],
+        'top_greatest_realms': rankings['top_greatest_realms'],
         'my_largest_rank': my_largest_rank,
         'my_largest_size': my_largest_size,
         'my_realm_rank': my_realm_rank,
@@ -1312,60 +1273,66 @@ def _compute_top_kingdoms(components_by_user, lands, kingdoms_by_id, my_user_id)
     }
 
 
-@kingdom.route('/map', methods=['GET'])
-@require_token
-def get_kingdom_map():
-    """Return all lands with ownership info for the hex map.
+# Viewer-independent kingdom fields the map overlays per request.
+_MapKingdom = namedtuple('_MapKingdom', (
+    'id', 'owner_user_id', 'name', 'shield_until', 'core_protected'))
+# Per-version map state; see ``_build_map_state``.
+_MapState = namedtuple('_MapState', (
+    'lands', 'land_dicts', 'grid_index', 'lands_by_version', 'versions',
+    'lands_by_owner', 'lands_by_kingdom', 'kingdoms', 'cooldown_lands',
+    'tutorial_candidates', 'rankings', 'region_standings',
+))
 
-    Response includes per-land data (tier, gold rate, suit bonus, owner)
-    and aggregate stats for the requesting user.
+
+def _build_map_state(lands):
+    """Build the viewer- and clock-independent kingdom map for ``lands``.
+
+    Cached per map version by ``kingdom_map_service.cached_map_state``, so it
+    holds plain values only: ORM rows expire when the request's session
+    ends.  Base land dicts leave out every ``VOLATILE_LAND_FIELDS`` entry.
     """
     from kingdom_service import (compute_owned_land_components,
-                                 describe_kingdom_bonuses, effective_gold_rate_for_lands,
-                                 kingdom_shield_block_reason, kingdom_skill_bonuses,
-                                 serialize_kingdom_config,
-                                 summarize_user_kingdom)
-    from region_service import region_for, serialize_regions
-
-    user = db.session.get(User, g.user_id)
-    if not user:
-        return jsonify({'error': 'User not found'}), 404
+                                 describe_kingdom_bonuses,
+                                 kingdom_core_protection_active,
+                                 kingdom_skill_bonuses)
+    from region_service import region_for, region_standings
 
-    now = _utcnow()
-    lands = Land.query.order_by(Land.row, Land.col).all()
     owner_ids = {land.owner_user_id for land in lands if land.owner_user_id}
     owner_usernames = {
         row.id: row.username
         for row in User.query.filter(User.id.in_(owner_ids)).all()
     } if owner_ids else {}
     kingdom_ids = {land.kingdom_id for land in lands if land.kingdom_id}
-    kingdoms_by_id = {
-        row.id: row for row in KingdomModel.query.filter(KingdomModel.id.in_(kingdom_ids)).all()
-    } if kingdom_ids else {}
+    kingdom_rows = KingdomModel.query.filter(
+        KingdomModel.id.in_(kingdom_ids)).all() if kingdom_ids else []
     component_info_by_land, components_by_user = compute_owned_land_components(lands)
-    my_kingdom = summarize_user_kingdom(user.id, lands)
-    my_persistent_kingdoms = [
-        serialize_kingdom_config(row)
-        for row in sorted(kingdoms_by_id.values(), key=lambda k: k.id)
-        if row.owner_user_id == user.id
-    ]
-    my_effective_gold_rate = effective_gold_rate_for_lands(
-        [land for land in lands if land.owner_user_id == user.id])
 
-    my_total_gold_rate = 0.0
-    my_lands_count = 0
-    lands_data = []
-    my_land_ids = [land.id for land in lands if land.owner_user_id == user.id]
-    defence_incomplete_by_land = _bulk_defence_incomplete_by_land(my_land_ids, user.id)
-    recommended_tutorial_land_id = _recommended_tutorial_land_id(user, lands, now=now)
-    skill_bonuses_by_kingdom = {}
-    shield_status_by_kingdom = {}
+    kingdoms = {}
+    kingdom_fields = {}
+    for row in kingdom_rows:
+        name = row.name or f'Kingdom #{row.id}'
+        kingdoms[row.id] = _MapKingdom(
+            row.id, row.owner_user_id, name, row.shield_until,
+            kingdom_core_protection_active(row))
+        fields = {
+            'kingdom_id': row.id,
+            'kingdom_name': name,
+            'kingdom_level': int(row.level or 1),
+            'kingdom_skill_bonuses': kingdom_skill_bonuses(row),
+            'owner_style': row.serialize_style(),
+        }
+        if row.shield_until:
+            fields['kingdom_shield_until'] = row.shield_until.isoformat()
+        kingdom_fields[row.id] = fields
 
+    land_dicts = {}
+    lands_by_owner = {}
+    lands_by_kingdom = {}
     for land in lands:
-        is_mine = (land.owner_user_id == user.id)
-        if is_mine:
-            my_total_gold_rate += land.gold_rate
-            my_lands_count += 1
+        if land.owner_user_id:
+            lands_by_owner.setdefault(land.owner_user_id, []).append(land)
+        if land.kingdom_id in kingdoms:
+            lands_by_kingdom.setdefault(land.kingdom_id, []).append(land)
 
         # Keep the full-map representation sparse. ``Land.serialize()`` also
         # includes configuration/internal AI fields that the map client never
@@ -1397,56 +1364,142 @@ def get_kingdom_map():
             'suit_bonus_suit': land.suit_bonus_suit,
             'suit_bonus_value': land.suit_bonus_value,
             'owner': owner,
-            'is_mine': is_mine,
         }
         component_info = component_info_by_land.get(land.id)
         if component_info:
             land_dict.update(component_info)
-        persistent_kingdom = kingdoms_by_id.get(land.kingdom_id)
-        shield_remaining = 0
-        shield_reason = None
-        if persistent_kingdom:
-            if persistent_kingdom.id not in shield_status_by_kingdom:
-                shield_status_by_kingdom[persistent_kingdom.id] = kingdom_shield_block_reason(
-                    land, now=now)
-            shield_remaining, _shield_kingdom, shield_reason = shield_status_by_kingdom[
-                persistent_kingdom.id]
-        if persistent_kingdom:
+        fields = kingdom_fields.get(land.kingdom_id)
+        if fields:
             legacy_bonuses = dict(land_dict.get('kingdom_bonuses') or {})
-            if persistent_kingdom.id not in skill_bonuses_by_kingdom:
-                skill_bonuses_by_kingdom[persistent_kingdom.id] = kingdom_skill_bonuses(
-                    persistent_kingdom)
-            legacy_bonuses.update(skill_bonuses_by_kingdom[persistent_kingdom.id])
-            land_dict['kingdom_id'] = persistent_kingdom.id
-            land_dict['kingdom_name'] = (
-                persistent_kingdom.name or
-                f'Kingdom #{persistent_kingdom.id}'
-            )
-            land_dict['kingdom_level'] = int(persistent_kingdom.level or 1)
+            legacy_bonuses.update(fields['kingdom_skill_bonuses'])
+            land_dict['kingdom_id'] = fields['kingdom_id']
+            land_dict['kingdom_name'] = fields['kingdom_name']
+            land_dict['kingdom_level'] = fields['kingdom_level']
             land_dict['kingdom_bonuses'] = legacy_bonuses
             land_dict['kingdom_skill_effects'] = (
                 describe_kingdom_bonuses(legacy_bonuses)
             )
-            if persistent_kingdom.shield_until:
-                land_dict['kingdom_shield_until'] = (
-                    persistent_kingdom.shield_until.isoformat()
-                )
+            if 'kingdom_shield_until' in fields:
+                land_dict['kingdom_shield_until'] = fields['kingdom_shield_until']
+            land_dict['owner_style'] = fields['owner_style']
+        elif land.kingdom_id:
+            # Preserve a dangling/legacy identifier without expanding every
+            # healthy unowned row with ``kingdom_id: null``.
+            land_dict['kingdom_id'] = land.kingdom_id
+        land_dicts[land.id] = land_dict
+
+    lands_by_version = sorted(lands, key=lambda land: land.map_version or 0)
+    return _MapState(
+        lands=lands,
+        land_dicts=land_dicts,
+        grid_index={land.id: i for i, land in enumerate(lands)},
+        lands_by_version=lands_by_version,
+        versions=[land.map_version or 0 for land in lands_by_version],
+        lands_by_owner=lands_by_owner,
+        lands_by_kingdom=lands_by_kingdom,
+        kingdoms=kingdoms,
+        cooldown_lands=[land for land in lands if land.conquer_cooldown_until],
+        tutorial_candidates=_tutorial_land_candidates(lands),
+        # Server-wide leaderboards: largest single connected kingdom and
+        # greatest total realm (sum of all owned lands per player).  Top-3 of
+        # each drives the on-map crowns + the leaderboard panel.
+        rankings=_compute_top_kingdoms(
+            components_by_user, lands,
+            {kid: kingdom.name for kid, kingdom in kingdoms.items()},
+            owner_usernames),
+        region_standings=region_standings(lands=lands),
+    )
+
+
+def _map_lands_to_send(state, user_id, now, since_version, recommended_land_id):
+    """Return the lands of a change feed, in map grid order.
+
+    Lands stamped after ``since_version`` plus every land that carries a
+    viewer- or clock-dependent field: own lands, cooling-down lands, lands
+    of shielded kingdoms and the tutorial recommendation.
+    """
+    from kingdom_service import kingdom_shield_status
+
+    if since_version < 0:
+        return state.lands
+    start = bisect_right(state.versions, since_version)
+    selected = {land.id: land for land in state.lands_by_version[start:]}
+    for land in state.lands_by_owner.get(user_id, ()):
+        selected[land.id] = land
+    for land in state.cooldown_lands:
+        if int((land.conquer_cooldown_until - now).total_seconds()) > 0:
+            selected[land.id] = land
+    for kingdom in state.kingdoms.values():
+        if kingdom_shield_status(kingdom.shield_until, kingdom.core_protected, now)[1]:
+            for land in state.lands_by_kingdom.get(kingdom.id, ()):
+                selected[land.id] = land
+    if recommended_land_id is not None:
+        land = state.lands[state.grid_index[recommended_land_id]]
+        selected[land.id] = land
+    return sorted(selected.values(), key=lambda land: state.grid_index[land.id])
+
+
+def _kingdom_map_payload(user, map_version, now, since_version=None):
+    """Build the ``GET /kingdom/map`` document for ``user``.
+
+    The map itself comes from the per-version cache (``_build_map_state``);
+    this adds the viewer's aggregates and the viewer/clock dependent tile
+    fields.  With ``since_version`` set, static land fields are left out and
+    only lands stamped after that map version, or carrying a viewer/clock
+    dependent field, are included (see ``kingdom_map_service``); ``-1``
+    sends every land.
+    """
+    from kingdom_map_service import STATIC_LAND_FIELDS, cached_map_state
+    from kingdom_service import (effective_gold_rate_for_lands,
+                                 kingdom_shield_status,
+                                 serialize_kingdom_config,
+                                 summarize_user_kingdom)
+    from region_service import serialize_regions
+
+    state = cached_map_state(map_version, _build_map_state)
+    my_lands = state.lands_by_owner.get(user.id, [])
+    my_kingdom = summarize_user_kingdom(user.id, my_lands)
+    my_kingdom_ids = sorted(
+        kingdom.id for kingdom in state.kingdoms.values()
+        if kingdom.owner_user_id == user.id)
+    my_persistent_kingdoms = [
+        serialize_kingdom_config(row)
+        for row in KingdomModel.query.filter(
+            KingdomModel.id.in_(my_kingdom_ids)).order_by(KingdomModel.id).all()
+    ] if my_kingdom_ids else []
+    my_effective_gold_rate = effective_gold_rate_for_lands(my_lands)
+    my_total_gold_rate = sum((land.gold_rate for land in my_lands), 0.0)
+
+    defence_incomplete_by_land = _bulk_defence_incomplete_by_land(
+        [land.id for land in my_lands], user.id)
+    recommended_tutorial_land_id = None
+    if not _first_conquer_complete_for_user(user):
+        recommended_tutorial_land_id = _pick_tutorial_land_id(
+            user, state.tutorial_candidates, now)
+    shield_status_by_kingdom = {}
+
+    lands_data = []
+    for land in _map_lands_to_send(
+            state, user.id, now,
+            since_version if since_version is not None else -1,
+            recommended_tutorial_land_id):
+        is_mine = (land.owner_user_id == user.id)
+        land_dict = dict(state.land_dicts[land.id])
+        land_dict['is_mine'] = is_mine
+        persistent_kingdom = state.kingdoms.get(land.kingdom_id)
+        if persistent_kingdom:
+            if persistent_kingdom.id not in shield_status_by_kingdom:
+                shield_status_by_kingdom[persistent_kingdom.id] = kingdom_shield_status(
+                    persistent_kingdom.shield_until,
+                    persistent_kingdom.core_protected, now)
+            shield_remaining, shield_reason = shield_status_by_kingdom[
+                persistent_kingdom.id]
             if shield_remaining:
                 land_dict['kingdom_shield_remaining'] = shield_remaining
             if shield_reason:
                 land_dict['kingdom_shield_reason'] = shield_reason
                 land_dict['kingdom_is_shielded'] = True
-            land_dict['owner_style'] = (
-                persistent_kingdom.serialize_style()
-            )
-        elif land.kingdom_id:
-            # Preserve a dangling/legacy identifier without expanding every
-            # healthy unowned row with ``kingdom_id: null``.
-            land_dict['kingdom_id'] = land.kingdom_id
-        if (
-            recommended_tutorial_land_id is not None
-            and land.id == recommended_tutorial_land_id
-        ):
+        if land.id == recommended_tutorial_land_id:
             land_dict['is_recommended_tutorial_land'] = True
         land_cooldown_remaining = 0
         if land.conquer_cooldown_until:
@@ -1459,6 +1512,9 @@ def get_kingdom_map():
         if is_mine:
             land_dict['defence_incomplete'] = defence_incomplete_by_land.get(
                 land.id, True)
+        if since_version is not None:
+            for field in STATIC_LAND_FIELDS:
+                land_dict.pop(field, None)
         lands_data.append(land_dict)
 
     # Conquer cooldown
@@ -1468,25 +1524,42 @@ def get_kingdom_map():
         remaining = config.CONQUER_COOLDOWN_SECONDS - elapsed
         cooldown_remaining = max(0, int(remaining))
 
-    # Server-wide leaderboards: largest single connected kingdom and greatest
-    # total realm (sum of all owned lands per player).  Top-3 of each drives
-    # the on-map crowns + the leaderboard panel.
-    leaderboards = _compute_top_kingdoms(
-        components_by_user, lands, kingdoms_by_id, user.id)
-    regions = serialize_regions(user.id, lands=lands, now=now)
+    regions = serialize_regions(user.id, now=now, standings=state.region_standings)
 
-    response = jsonify({
+    return {
         'lands': lands_data,
         'my_total_gold_rate': round(my_total_gold_rate, 1),
         'my_effective_gold_rate': round(my_effective_gold_rate, 3),
-        'my_lands_count': my_lands_count,
+        'my_lands_count': len(my_lands),
         'my_kingdom': my_kingdom,
         'my_kingdoms': my_persistent_kingdoms,
         'recommended_tutorial_land_id': recommended_tutorial_land_id,
         'conquer_cooldown_remaining': cooldown_remaining,
         'regions': regions,
-        **leaderboards,
-    })
+        **_my_kingdom_ranks(state.rankings, user.id),
+    }
+
+
+@kingdom.route('/map', methods=['GET'])
+@require_token
+def get_kingdom_map():
+    """Return all lands with ownership info for the hex map.
+
+    Response includes per-land data (tier, gold rate, suit bonus, owner)
+    and aggregate stats for the requesting user.  Clients that keep the map
+    between polls should prefer ``/map/static`` plus ``/map/changes``.
+    """
+    from kingdom_map_service import current_map_version
+
+    user = db.session.get(User, g.user_id)
+    if not user:
+        return jsonify({'error': 'User not found'}), 404
+
+    now = _utcnow()
+    map_version = current_map_version()
+    payload = _kingdom_map_payload(user, map_version, now)
+    payload['map_version'] = map_version
+    response = jsonify(payload)
     # The 4,800-land snapshot is intentionally read-only. End its SQLite read
     # transaction before returning so a slow client response cannot delay an
     # unrelated writer waiting to commit.
@@ -1494,6 +1567,59 @@ def get_kingdom_map():
     return response
 
 
+@kingdom.route('/map/static', methods=['GET'])
+@require_token
+def get_kingdom_map_static():
+    """Return the immutable per-land map fields with an ``ETag``.
+
+    The body is built once per process; clients revalidate with
+    ``If-None-Match`` and normally get an empty ``304``.
+    """
+    from kingdom_map_service import static_map_document
+
+    body, etag = static_map_document()
+    db.session.rollback()
+    response = current_app.response_class(body, mimetype='application/json')
+    response.set_etag(etag)
+    # Revalidate on every use: the ETag changes when the map is regenerated.
+    response.headers['Cache-Control'] = 'private, no-cache'
+    return response.make_conditional(request)
+
+
+@kingdom.route('/map/changes', methods=['GET'])
+@require_token
+def get_kingdom_map_changes():
+    """Return dynamic land state changed since ``since_version``.
+
+    Lands are sent without the fields of ``/map/static``.  A missing or
+    unknown ``since_version`` (newer than the server's) returns every land
+    with ``full: true``.  Lands with a viewer- or clock-dependent field
+    (own lands, cooldowns, shields) are always sent, so a client resets
+    those fields before merging.
+    """
+    from kingdom_map_service import current_map_version
+
+    user = db.session.get(User, g.user_id)
+    if not user:
+        return jsonify({'error': 'User not found'}), 404
+
+    since_version = request.args.get('since_version', type=int)
+    now = _utcnow()
+    map_version = current_map_version()
+    full = since_version is None or since_version < 0 or since_version > map_version
+    payload = _kingdom_map_payload(
+        user, map_version, now,
+        since_version=-1 if full else since_version)
+    payload.update({
+        'map_version': map_version,
+        'since_version': None if full else since_version,
+        'full': full,
+    })
+    response = jsonify(payload)
+    db.session.rollback()
+    return response
+
+
 # ── Conquer Config Helpers ───────────────────────────────────────────────────
 
 # Card requirements for each modifier/spell: (rank, count, color_constraint)
@@ -5674,7 +5800,8 @@ def conquer_start_battle():
         return jsonify({'success': False, 'message': 'Cannot conquer your own land'}), 400
 
     if land.owner_user_id:
-        reconcile_user_kingdoms(land.owner_user_id, commit=False)
+        reconcile_user_kingdoms(land.owner_user_id, commit=False,
+                                land_ids=[land.id])
         db.session.flush()
         from kingdom_service import kingdom_shield_block_reason
         shield_remaining, defended_kingdom, reason = kingdom_shield_block_reason(land, now=_utcnow())
@@ -6859,12 +6986,12 @@ def kingdom_messages_send():
             'message': 'This player is unavailable for direct messages.',
             'reason': 'player_unavailable',
         }), 403
-    if active_chat_mute(g.current_user):
+    if active_chat_mute(current_user()):
         return jsonify({
             'success': False,
             'message': 'Chat is temporarily unavailable for this account.',
             'reason': 'chat_muted',
-            'muted_until': g.current_user.chat_muted_until.isoformat(),
+            'muted_until': current_user().chat_muted_until.isoformat(),
         }), 403
     if direct_contact_blocked(g.user_id, recipient.id):
         return jsonify({
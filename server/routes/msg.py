@@ -11,7 +11,12 @@ from moderation_service import (
 import logging
 
 import server_settings as settings
-from routes.auth import require_token, verify_game_membership, verify_player_ownership
+from routes.auth import (
+    current_user,
+    require_token,
+    verify_game_membership,
+    verify_player_ownership,
+)
 
 msg = Blueprint('msg', __name__)
 
@@ -25,6 +30,67 @@ _MAX_LOG_TYPE = 50
 _MAX_ROUND_TURN = 10000   # sane upper bound for round/turn counters
 
 
+# Cursor page size cap for ``after_id`` / ``limit`` fetches.
+_MAX_PAGE_LIMIT = 500
+
+
+def _cursor_args():
+    after_id = request.args.get('after_id', type=int)
+    limit = request.args.get('limit', type=int)
+    if limit is not None:
+        limit = max(1, min(limit, _MAX_PAGE_LIMIT))
+    return after_id, limit
+
+
+def _ordered_page(query, model, after_id=None, limit=None):
+    """Order a game's rows; with a cursor or limit, page by ascending id."""
+    if after_id is None and limit is None:
+        return query.order_by(model.timestamp).all()
+    if after_id is not None:
+        query = query.filter(model.id > after_id)
+    query = query.order_by(model.id)
+    if limit is not None:
+        query = query.limit(limit)
+    return query.all()
+
+
+def _page_response(key, rows, after_id, limit):
+    """Serialize a cursor page; one extra row was fetched to detect more."""
+    has_more = limit is not None and len(rows) > limit
+    if has_more:
+        rows = rows[:limit]
+    ids = [row.id for row in rows]
+    return jsonify({
+        'success': True,
+        key: [row.serialize() for row in rows],
+        'next_after_id': max(ids) if ids else after_id,
+        'has_more': has_more,
+    })
+
+
+def game_log_entries(game_id, after_id=None, limit=None):
+    """Return a game's log entries in display order, optionally after a cursor."""
+    return _ordered_page(LogEntry.query.filter_by(game_id=game_id), LogEntry,
+                         after_id, limit)
+
+
+def visible_chat_messages(game_id, viewer_user_id, after_id=None, limit=None):
+    """Return a game's chat messages minus senders the viewer blocked."""
+    query = ChatMessage.query.filter_by(game_id=game_id)
+    hidden_user_ids = blocked_user_ids(viewer_user_id)
+    if hidden_user_ids:
+        hidden_player_ids = [
+            player_id for (player_id,) in db.session.query(Player.id).filter(
+                Player.game_id == game_id,
+                Player.user_id.in_(hidden_user_ids),
+            ).all()
+        ]
+        if hidden_player_ids:
+            query = query.filter(
+                ChatMessage.sender_id.notin_(hidden_player_ids))
+    return _ordered_page(query, ChatMessage, after_id, limit)
+
+
 @msg.route('/add_log_entry', methods=['POST'])
 @require_token
 def add_log_entry():
@@ -79,6 +145,15 @@ def add_log_entry():
 @msg.route('/get_log_entries', methods=['GET'])
 @require_token
 def get_log_entries():
+    """
+    Get a game's log entries.
+
+    Query params:
+        game_id: int
+        after_id: int (optional) only rows with a larger id, in id order
+        limit: int (optional) page size, capped at 500; ``has_more`` and
+            ``next_after_id`` in the response continue the page
+    """
     try:
         game_id = request.args.get('game_id', type=int)
 
@@ -88,9 +163,11 @@ def get_log_entries():
         if membership_err:
             return membership_err
 
-        log_entries = LogEntry.query.filter_by(game_id=game_id).order_by(LogEntry.timestamp).all()
+        after_id, limit = _cursor_args()
+        log_entries = game_log_entries(
+            game_id, after_id, None if limit is None else limit + 1)
 
-        return jsonify({'success': True, 'log_entries': [entry.serialize() for entry in log_entries]})
+        return _page_response('log_entries', log_entries, after_id, limit)
 
     except Exception as e:
         db.session.rollback()
@@ -118,12 +195,12 @@ def add_chat_message():
             or not receiver or receiver.game_id != game_id
         ):
             return jsonify({'success': False, 'message': 'Player not found in this game'}), 403
-        if active_chat_mute(g.current_user):
+        if active_chat_mute(current_user()):
             return jsonify({
                 'success': False,
                 'message': 'Chat is temporarily unavailable for this account.',
                 'reason': 'chat_muted',
-                'muted_until': g.current_user.chat_muted_until.isoformat(),
+                'muted_until': current_user().chat_muted_until.isoformat(),
             }), 403
         if direct_contact_blocked(sender.user_id, receiver.user_id):
             return jsonify({
@@ -162,6 +239,15 @@ def add_chat_message():
 @msg.route('/get_chat_messages', methods=['GET'])
 @require_token
 def get_chat_messages():
+    """
+    Get a game's chat messages.
+
+    Query params:
+        game_id: int
+        after_id: int (optional) only rows with a larger id, in id order
+        limit: int (optional) page size, capped at 500; ``has_more`` and
+            ``next_after_id`` in the response continue the page
+    """
     try:
         game_id = request.args.get('game_id', type=int)
 
@@ -171,21 +257,11 @@ def get_chat_messages():
         if membership_err:
             return membership_err
 
-        query = ChatMessage.query.filter_by(game_id=game_id)
-        hidden_user_ids = blocked_user_ids(g.user_id)
-        if hidden_user_ids:
-            hidden_player_ids = [
-                player_id for (player_id,) in db.session.query(Player.id).filter(
-                    Player.game_id == game_id,
-                    Player.user_id.in_(hidden_user_ids),
-                ).all()
-            ]
-            if hidden_player_ids:
-                query = query.filter(
-                    ChatMessage.sender_id.notin_(hidden_player_ids))
-        chat_messages = query.order_by(ChatMessage.timestamp).all()
-
-        return jsonify({'success': True, 'chat_messages': [message.serialize() for message in chat_messages]})
+        after_id, limit = _cursor_args()
+        chat_messages = visible_chat_messages(
+            game_id, g.user_id, after_id, None if limit is None else limit + 1)
+
+        return _page_response('chat_messages', chat_messages, after_id, limit)
 
     except Exception as e:
         db.session.rollback()
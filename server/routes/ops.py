@@ -61,11 +61,16 @@ def readyz():
             })
             return _no_store(response), 503
 
+        from ai.ai_worker import get_ai_scheduler_metrics
+        from mail_queue import get_mail_queue_metrics
+
         response = jsonify({
             'success': True,
             'status': 'ready',
             'database': db.engine.dialect.name,
             'schema_version': current_schema_version,
+            'ai_scheduler': get_ai_scheduler_metrics(),
+            'mail_queue': get_mail_queue_metrics(),
             **_release_metadata(),
         })
         return _no_store(response)
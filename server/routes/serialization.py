@@ -7,6 +7,12 @@ Routes should use these helpers before sending game state to a client.
 """
 from copy import deepcopy
 
+from game_service.game_state_version import (
+    APPEND_SECTIONS,
+    LIST_SECTIONS,
+    changed_sections_since,
+)
+
 def viewer_player_for_game(game, viewer_user_id):
     if game is None or viewer_user_id is None:
         return None
@@ -27,6 +33,24 @@ def viewer_has_all_seeing_eye(game_dict, viewer_player_id):
     )
 
 
+def serialize_player_presence(game):
+    """Return ``{player_id: is_online}`` for ``game``, keyed by string id.
+
+    Presence follows ``User.last_active`` and never bumps the game's
+    ``state_version``, so ``unchanged`` and delta polls carry it beside the
+    game instead of in the players section.
+    """
+    from models import Player, User, db, player_is_online
+
+    rows = (
+        db.session.query(Player.id, User.last_active)
+        .join(User, User.id == Player.user_id)
+        .filter(Player.game_id == game.id)
+    )
+    return {str(player_id): player_is_online(last_active)
+            for player_id, last_active in rows}
+
+
 def _redact_card(card):
     redacted = dict(card or {})
     redacted.update({
@@ -140,8 +164,8 @@ def serialize_battle_moves_for_viewer(moves, viewer_player_id, reveal_opponent=F
     return output
 
 
-def serialize_game_for_viewer(game, viewer_user_id):
-    data = deepcopy(game.serialize())
+def serialize_game_for_viewer(game, viewer_user_id, **serialize_options):
+    data = deepcopy(game.serialize(**serialize_options))
     viewer_player = viewer_player_for_game(game, viewer_user_id)
     viewer_player_id = viewer_player.id if viewer_player else None
     reveal_opponent = viewer_has_all_seeing_eye(data, viewer_player_id)
@@ -195,3 +219,30 @@ def serialize_game_for_viewer(game, viewer_user_id):
     # AI seed is useful internally for deterministic planning, not for clients.
     data['ai_seed'] = None
     return data
+
+
+def serialize_game_delta(payload, game, since_version, log_after_id=None,
+                         chat_after_id=None):
+    """Trim a viewer payload to what changed after ``since_version``.
+
+    Scalar fields are always kept; list sections not stamped after
+    ``since_version``, or left out of ``payload``, are dropped, and
+    ``omitted_sections`` names them so the client keeps its copies.  Pass
+    the cursors ``payload`` was serialized with (see :meth:`Game.serialize`):
+    changed append-only sections then hold only newer rows and are listed
+    in ``appended_sections``.
+    """
+    changed = set(changed_sections_since(game, since_version))
+    cursors = {'log_entries': log_after_id, 'chat_messages': chat_after_id}
+    delta = {key: value for key, value in payload.items() if key not in LIST_SECTIONS}
+    appended = []
+    for section in LIST_SECTIONS:
+        if section not in changed or section not in payload:
+            continue
+        if section in APPEND_SECTIONS and cursors.get(section) is not None:
+            appended.append(section)
+        delta[section] = payload[section]
+    delta['delta_since_version'] = since_version
+    delta['omitted_sections'] = [s for s in LIST_SECTIONS if s not in delta]
+    delta['appended_sections'] = appended
+    return delta
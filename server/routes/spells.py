@@ -5,7 +5,7 @@ Server-side spell routes for handling spell casting, countering, and management.
 """
 
 import logging
-from flask import Blueprint, request, jsonify, current_app, g
+from flask import Blueprint, request, jsonify, g
 from models import db, Game, Player, ActiveSpell, MainCard, SideCard, LogEntry, Figure, CardToFigure, User, GameResult, BattleMove
 from datetime import datetime, timezone
 from game_service.deck_manager import DeckManager
@@ -35,8 +35,6 @@ logger = logging.getLogger('nepalkings.routes.spells')
 
 spells = Blueprint('spells', __name__)
 
-_ai_logger = logging.getLogger('nepalkings.ai.trigger')
-
 
 def _utcnow():
     return datetime.now(timezone.utc).replace(tzinfo=None)
@@ -46,27 +44,6 @@ def _redact_spell_effect_for_requester(spell_effect, game, viewer_player_id):
     reveal = viewer_has_all_seeing_eye(game.serialize(), viewer_player_id) if game else False
     return redact_payload_for_viewer(spell_effect, viewer_player_id, reveal)
 
-@spells.after_request
-def _ai_trigger_hook(response):
-    """After every POST, check if an AI player needs to act."""
-    if request.method == 'POST' and settings.AI_ENABLED:
-        if request.headers.get('X-NepalKings-AI-Internal') == '1':
-            return response
-        game_id = None
-        try:
-            if request.is_json and request.json:
-                game_id = request.json.get('game_id')
-        except Exception:
-            pass
-        if game_id:
-            try:
-                from ai.ai_worker import trigger_ai_if_needed
-                _ai_logger.info(f"Spells trigger hook firing for game {game_id}")
-                trigger_ai_if_needed(int(game_id), app=current_app._get_current_object())
-            except Exception as e:
-                _ai_logger.warning(f"AI trigger error in spells hook: {e}")
-    return response
-
 
 def _guard_spell_mutation(game, *, action_label='spell_action', player_id=None):
     """Block non-battle spell mutations during active battle and pre-decision lock."""
@@ -521,6 +498,16 @@ def get_active_spells():
     game = db.session.get(Game, game_id)
     reveal = viewer_has_all_seeing_eye(game.serialize(), viewer.id) if game else False
 
+    return jsonify({
+        'success': True,
+        'active_spells': serialize_active_spells_for_viewer(
+            game_id, game, viewer.id, reveal, player_id=player_id),
+    }), 200
+
+
+def serialize_active_spells_for_viewer(game_id, game, viewer_player_id, reveal,
+                                       player_id=None):
+    """Serialize the spells ``/get_active_spells`` reports for a viewer."""
     if game and game.mode == 'conquer':
         query = ActiveSpell.query.filter_by(game_id=game_id)
         if player_id:
@@ -535,14 +522,10 @@ def get_active_spells():
         if player_id:
             query = query.filter_by(player_id=player_id)
         active_spells = query.all()
-    
-    return jsonify({
-        'success': True,
-        'active_spells': [
-            serialize_spell_for_viewer(spell, viewer.id, reveal)
-            for spell in active_spells
-        ]
-    }), 200
+    return [
+        serialize_spell_for_viewer(spell, viewer_player_id, reveal)
+        for spell in active_spells
+    ]
 
 
 def _is_conquer_prelude_replay_spell(spell):
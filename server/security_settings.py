@@ -46,6 +46,10 @@ RATE_LIMIT_REPORT = os.getenv('RATE_LIMIT_REPORT', '5 per hour')
 # ── Auth token settings ───────────────────────────────────────────
 # Signed user tokens expire after TOKEN_EXPIRY_SECONDS (default 24 hours).
 TOKEN_EXPIRY_SECONDS = int(os.getenv('TOKEN_EXPIRY_SECONDS', '86400'))
+# require_token caches an accepted principal this long per process (0 = off).
+# Revocations from another worker take effect after at most this delay.
+AUTH_PRINCIPAL_CACHE_TTL_SECONDS = float(
+    os.getenv('AUTH_PRINCIPAL_CACHE_TTL_SECONDS', '5'))
 
 # ── Legal acceptance versions ─────────────────────────────────────
 LEGAL_TERMS_VERSION = os.getenv('LEGAL_TERMS_VERSION', '2026-07-20')
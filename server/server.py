@@ -16,6 +16,7 @@ import uuid
 
 import server_settings as settings
 from observability import JsonLogFormatter, configure_logging
+from domain_events import DispatchContext, discard_committed, dispatch_committed
 from routes import (auth, battle_shop, challenges, collection, figures, games,
                     kingdom, legal, msg, onboarding, ops, safety, spells)
 
@@ -207,30 +208,24 @@ def _route_not_found(_e):
 def _method_not_allowed(_e):
     return jsonify({'success': False, 'message': 'Method not allowed'}), 405
 
-# ── Async-play email notifications ──
+# ── Post-commit domain events (AI wake-ups, turn emails) ──
+@app.before_request
+def _drop_stale_domain_events():
+    """Events committed outside this request (fixtures, background work)
+    belong to nobody's request; don't dispatch them here."""
+    discard_committed(db.session)
+
+
 @app.after_request
-def _turn_notification_hook(response):
-    """After any state-changing POST that names a game, check whether an
-    offline player should be emailed (it's-your-turn / game finished).
-    Debouncing and eligibility live in notification_service."""
+def _dispatch_domain_events(response):
+    """Hand the events this request committed to their subscribers."""
     try:
-        if (request.method == 'POST'
-                and getattr(settings, 'NOTIFY_EMAILS_ENABLED', True)
-                and response.status_code < 400):
-            game_id = None
-            try:
-                if request.is_json and request.json:
-                    game_id = request.json.get('game_id')
-                elif request.form:
-                    game_id = request.form.get('game_id')
-            except Exception:
-                game_id = None
-            if game_id:
-                from notification_service import maybe_notify_turn_or_finish
-                maybe_notify_turn_or_finish(
-                    game_id, requester_user_id=getattr(g, 'user_id', None))
+        dispatch_committed(db.session, DispatchContext(
+            requester_user_id=getattr(g, 'user_id', None),
+            ai_internal=request.headers.get('X-NepalKings-AI-Internal') == '1',
+        ))
     except Exception:
-        logging.getLogger('nepalkings').exception('turn notification hook failed')
+        logging.getLogger('nepalkings').exception('domain event dispatch failed')
     return response
 
 
@@ -359,6 +354,43 @@ else:
     }
 db.init_app(app)
 
+# ── Per-game state versions for delta polling ──
+from game_service.game_state_version import (
+    add_state_bump_listener,
+    install_state_version_tracking,
+)
+install_state_version_tracking(db.session)
+
+# ── Durable AI work queue fed by the same commits ──
+from ai.pending_work import enqueue_bumped_games
+add_state_bump_listener(enqueue_bumped_games)
+
+# ── Kingdom map version stamps for /kingdom/map/changes ──
+from kingdom_map_service import install_map_version_tracking
+install_map_version_tracking(db.session)
+
+# ── Counted collection stacks beside the per-copy rows ──
+from collection_inventory import install_collection_inventory
+install_collection_inventory(db.session)
+
+# ── Materialized leaderboard rows ──
+from ranking_service import install_ranking_tracking
+install_ranking_tracking(db.session)
+
+# ── Typed game events, dispatched after commit (see domain_events) ──
+from domain_events import (
+    BattlePhaseChanged,
+    GameFinished,
+    TurnChanged,
+    install_domain_events,
+    subscribe,
+)
+from ai.pending_work import wake_ai_on_game_events
+from notification_service import notify_on_game_events
+install_domain_events(db.session)
+subscribe(wake_ai_on_game_events, TurnChanged, BattlePhaseChanged)
+subscribe(notify_on_game_events, TurnChanged, GameFinished)
+
 # ── Cross-worker request coordination ──
 _GAME_MUTATION_BLUEPRINTS = {
     'games',
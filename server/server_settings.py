@@ -121,6 +121,19 @@ SERVER_BASE_URL = os.getenv('SERVER_BASE_URL', SERVER_URL)
 NOTIFY_EMAILS_ENABLED = os.getenv('NOTIFY_EMAILS_ENABLED', 'True').lower() == 'true'
 # Public URL of the playable web client, included in notification emails.
 WEB_CLIENT_URL = os.getenv('WEB_CLIENT_URL', '')
+# Require STARTTLS before logging in (disable only for a local stub server).
+SMTP_STARTTLS = os.getenv('SMTP_STARTTLS', 'True').lower() == 'true'
+# Outbound notification queue (server/mail_queue.py). Emails are stored in
+# the outbound_email table and sent by one worker over a reused SMTP session.
+MAIL_QUEUE_MAX_PENDING = int(os.getenv('MAIL_QUEUE_MAX_PENDING', '1000'))
+MAIL_BATCH_SIZE = int(os.getenv('MAIL_BATCH_SIZE', '20'))
+MAIL_MAX_ATTEMPTS = int(os.getenv('MAIL_MAX_ATTEMPTS', '6'))
+MAIL_RETRY_BASE_SECONDS = float(os.getenv('MAIL_RETRY_BASE_SECONDS', '30'))
+MAIL_RETRY_MAX_SECONDS = float(os.getenv('MAIL_RETRY_MAX_SECONDS', '3600'))
+MAIL_SMTP_IDLE_SECONDS = float(os.getenv('MAIL_SMTP_IDLE_SECONDS', '60'))
+# Send from a thread in the web process; the background worker drains the
+# same table either way, so hosted setups may turn this off.
+MAIL_WORKER_IN_PROCESS = os.getenv('MAIL_WORKER_IN_PROCESS', 'True').lower() == 'true'
 
 # Conquer move model rollout flag.
 # When True (default), new conquer games are created with conquer_move_model='tactics_hand':
@@ -135,7 +148,13 @@ CONQUER_TACTICS_HAND_ENABLED = os.getenv('CONQUER_TACTICS_HAND_ENABLED', 'True')
 AI_USERNAMES = ['[AI] Strategos']  # AI player usernames created at startup
 AI_INITIAL_GOLD = 999999  # AI starts with effectively infinite gold
 AI_THINK_DELAY = 2  # Seconds of artificial "thinking" delay
+# Fixed number of threads running AI game loops; think delays and watchdog
+# retries wait in the scheduler queue instead of on sleeping threads.
+AI_WORKER_POOL_SIZE = int(os.getenv('AI_WORKER_POOL_SIZE', '4'))
 AI_ENABLED = os.getenv('AI_ENABLED', 'True').lower() == 'true'
+# How AI actions reach the game routes: 'inprocess' dispatches them through
+# this process's Flask app; 'http' POSTs them to SERVER_URL as before.
+AI_ACTION_DISPATCH = os.getenv('AI_ACTION_DISPATCH', 'inprocess').strip().lower()
 
 # Strategy planner (bounded multi-turn planning used by duel decision module)
 AI_STRATEGY_PLANNER_ENABLED = os.getenv('AI_STRATEGY_PLANNER_ENABLED', 'True').lower() == 'true'
@@ -448,6 +467,12 @@ STUCK_CONQUER_SWEEP_INTERVAL_SECONDS = int(
 # from the SQLite database, keeping every WSGI worker on the same lock.
 STUCK_CONQUER_SWEEPER_LOCK_PATH = os.getenv(
     'STUCK_CONQUER_SWEEPER_LOCK_PATH', '')
+# Leaderboards: the background worker recounts every ranking row this often
+# (0 disables); public ranking pages return at most RANKINGS_PAGE_MAX rows.
+RANKING_RECONCILE_INTERVAL_SECONDS = int(
+    os.getenv('RANKING_RECONCILE_INTERVAL_SECONDS', str(3600))
+)
+RANKINGS_PAGE_MAX = int(os.getenv('RANKINGS_PAGE_MAX', '100'))
 POST_BATTLE_CHOICE_TIMEOUT_SECONDS = int(
     os.getenv('POST_BATTLE_CHOICE_TIMEOUT_SECONDS', str(5 * 60))
 )
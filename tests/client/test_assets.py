@@ -0,0 +1,74 @@
+# Copyright (c) 2026 Marc Stieffenhofer. All rights reserved.
+# See LICENSE file in the project root for full license information.
+"""Tests for the shared client image cache (utils.assets)."""
+
+import pygame
+
+from utils.assets import AssetManager, surface_bytes
+from utils.perf_monitor import PerfMonitor
+
+
+def _png(tmp_path, name, size=(40, 20)):
+    surf = pygame.Surface(size, pygame.SRCALPHA)
+    surf.fill((200, 100, 50, 255))
+    path = str(tmp_path / name)
+    pygame.image.save(surf, path)
+    return path
+
+
+def test_sources_are_decoded_once_and_scaled_variants_shared(tmp_path):
+    path = _png(tmp_path, 'a.png')
+    manager = AssetManager()
+
+    first = manager.get_scaled(path, (10, 5))
+    again = manager.get_scaled(path, (10, 5))
+    other = manager.get_scaled(path, (20, 10))
+
+    assert first is again
+    assert first.get_size() == (10, 5)
+    assert other.get_size() == (20, 10)
+    assert manager.get_scaled(path, (40, 20)) is manager.get(path)
+    stats = manager.stats()
+    assert stats['misses'] == 1
+    assert stats['scaled_hits'] == 1
+    assert stats['scaled'] == 2
+    assert stats['scaled_bytes'] == surface_bytes(first) + surface_bytes(other)
+
+
+def test_scaled_variants_are_evicted_least_recently_used_first(tmp_path):
+    path = _png(tmp_path, 'a.png')
+    one_variant = 10 * 10 * 4
+    manager = AssetManager(scaled_budget_bytes=2 * one_variant)
+
+    small = manager.get_scaled(path, (10, 10))
+    manager.get_scaled(path, (11, 9))
+    manager.get_scaled(path, (10, 10))  # refresh: (11, 9) is now oldest
+    manager.get_scaled(path, (9, 11))
+
+    stats = manager.stats()
+    assert stats['evictions'] == 1
+    assert stats['scaled_bytes'] <= manager.scaled_budget_bytes
+    assert manager.get_scaled(path, (10, 10)) is small
+    assert manager.stats()['scaled_hits'] == 2
+
+
+def test_max_dim_caps_the_kept_source(tmp_path):
+    path = _png(tmp_path, 'big.png', size=(100, 50))
+    manager = AssetManager()
+
+    capped = manager.get(path, max_dim=40)
+
+    assert capped.get_size() == (40, 20)
+    assert manager.stats()['source_bytes'] == surface_bytes(capped)
+
+
+def test_perf_monitor_summary_includes_counter_sources(tmp_path):
+    manager = AssetManager()
+    manager.get(_png(tmp_path, 'a.png'))
+    monitor = PerfMonitor(enabled=True)
+    monitor.add_counter_source('assets', manager.stats)
+
+    counters = monitor.summary()['counters']
+
+    assert counters['assets']['misses'] == 1
+    assert counters['assets']['sources'] == 1
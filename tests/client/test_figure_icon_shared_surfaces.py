@@ -0,0 +1,66 @@
+# Copyright (c) 2026 Marc Stieffenhofer. All rights reserved.
+# See LICENSE file in the project root for full license information.
+"""Figure icon decorations are built once per size and shared."""
+
+from types import SimpleNamespace
+
+import pygame
+
+
+def _field_icon(is_castle=False, render_scale=1.0, glow_img=None, suit='Hearts'):
+    from game.components.figures.figure_icon import FieldFigureIcon
+
+    icon = FieldFigureIcon.__new__(FieldFigureIcon)
+    icon.is_castle_figure = is_castle
+    icon.render_scale = render_scale
+    icon.glow_img = glow_img
+    icon.icon_scale_factor = 1.3
+    icon.figure = SimpleNamespace(suit=suit)
+    icon.load_glow_effects()
+    return icon
+
+
+GLOW_ATTRS = (
+    'glow_yellow', 'glow_yellow_big', 'glow_yellow_dark', 'glow_yellow_dark_big',
+    'glow_black', 'glow_white', 'glow_white_big', 'glow_orange',
+    'glow_orange_big', 'glow_clone', 'glow_clone_big',
+)
+
+
+def test_icons_of_the_same_size_share_glow_surfaces():
+    first = _field_icon()
+    second = _field_icon()
+
+    for attr in GLOW_ATTRS:
+        assert getattr(first, attr) is getattr(second, attr), attr
+    assert first.glow_yellow_dark is not first.glow_yellow
+    assert first.glow_yellow_dark.get_size() == first.glow_yellow.get_size()
+
+
+def test_glow_cache_is_keyed_by_size_and_source():
+    from config import settings
+
+    plain = _field_icon()
+    castle = _field_icon(is_castle=True)
+    dense = _field_icon(render_scale=0.5)
+    family_glow = pygame.Surface((64, 64), pygame.SRCALPHA)
+    family = _field_icon(glow_img=family_glow)
+
+    assert castle.glow_yellow is not plain.glow_yellow
+    assert castle.glow_yellow.get_width() == int(settings.FIGURE_ICON_GLOW_WIDTH * 1.2)
+    # render_scale shrinks only the resting glow.
+    assert dense.glow_white.get_width() < plain.glow_white.get_width()
+    assert dense.glow_white_big is plain.glow_white_big
+    assert family.glow_yellow is not plain.glow_yellow
+    assert family.glow_white is plain.glow_white
+    assert _field_icon(glow_img=family_glow).glow_yellow_dark is family.glow_yellow_dark
+
+
+def test_field_icon_overlays_are_shared():
+    first = _field_icon()
+    second = _field_icon()
+
+    assert first._load_suit_icon() is second._load_suit_icon()
+    assert first._load_suit_icon(is_big=True) is second._load_suit_icon(is_big=True)
+    assert first._load_advance_icon(is_own=False) is second._load_advance_icon(is_own=False)
+    assert first._create_skill_glow(20) is second._create_skill_glow(20)
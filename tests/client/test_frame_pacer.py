@@ -0,0 +1,98 @@
+# Copyright (c) 2026 Marc Stieffenhofer. All rights reserved.
+# See LICENSE file in the project root for full license information.
+"""Idle throttling and partial flips in the main loop (utils.frame_pacer)."""
+
+import pygame
+
+from utils import frame_pacer
+from utils.frame_pacer import ACTIVE_FPS, IDLE_FPS, SETTLE_MS, FramePacer, frame_kind
+from utils.perf_monitor import PerfMonitor
+
+
+class _Screen:
+    def __init__(self, damage):
+        self.damage = damage
+        self.asked = 0
+
+    def frame_damage(self):
+        self.asked += 1
+        return self.damage
+
+
+def _settled_pacer():
+    pacer = FramePacer(enabled=True)
+    pacer.reset(now_ms=0)
+    return pacer
+
+
+def test_full_frames_until_input_settles_then_idle():
+    pacer = _settled_pacer()
+    screen = _Screen([])
+
+    assert pacer.plan(screen, [], now_ms=SETTLE_MS - 1) is None
+    assert screen.asked == 0
+    # The first report after a full frame is promoted to a full frame.
+    assert pacer.plan(screen, [], now_ms=SETTLE_MS) is None
+    assert pacer.plan(screen, [], now_ms=SETTLE_MS + 16) == []
+    assert pacer.fps() == IDLE_FPS
+
+    event = pygame.event.Event(pygame.MOUSEMOTION, pos=(1, 1))
+    assert pacer.plan(screen, [event], now_ms=SETTLE_MS + 32) is None
+    assert pacer.fps() == ACTIVE_FPS
+
+
+def test_request_redraw_wakes_an_idle_loop():
+    pacer = _settled_pacer()
+    screen = _Screen([])
+    pacer.plan(screen, [], now_ms=SETTLE_MS)
+    assert pacer.plan(screen, [], now_ms=SETTLE_MS + 10) == []
+
+    frame_pacer.request_redraw()
+
+    assert pacer.plan(screen, [], now_ms=SETTLE_MS + 20) is None
+    assert pacer.plan(screen, [], now_ms=2 * SETTLE_MS + 20) is None
+    assert pacer.plan(screen, [], now_ms=2 * SETTLE_MS + 30) == []
+
+
+def test_partial_damage_and_screens_without_the_hook():
+    pacer = _settled_pacer()
+    rect = pygame.Rect(1, 2, 3, 4)
+    screen = _Screen([rect])
+    pacer.plan(screen, [], now_ms=SETTLE_MS)
+
+    assert pacer.plan(screen, [], now_ms=SETTLE_MS + 10) == [rect]
+    assert pacer.fps() == ACTIVE_FPS
+    assert pacer.plan(object(), [], now_ms=SETTLE_MS + 20) is None
+    disabled = FramePacer(enabled=False)
+    disabled.reset(now_ms=0)
+    assert disabled.plan(_Screen([]), [], now_ms=10 * SETTLE_MS) is None
+
+
+def test_perf_monitor_reports_partial_and_skipped_ratios():
+    monitor = PerfMonitor(enabled=True)
+    for damage in (None, [], [], [pygame.Rect(0, 0, 1, 1)]):
+        monitor.frame_start()
+        monitor.frame_end(frame_kind(damage))
+
+    presented = monitor.summary()['presented']
+
+    assert presented['full'] == 1
+    assert presented['skipped'] == 2
+    assert presented['skipped_ratio'] == 0.5
+    assert presented['partial_ratio'] == 0.25
+
+
+def test_hex_map_reports_unchanged_cached_frames():
+    from game.components.hex_map import HexMap
+
+    lands = [{'id': col + 1, 'col': col, 'row': 0, 'tier': 2, 'gold_rate': 5.0,
+              'suit_bonus_suit': 'Hearts', 'suit_bonus_value': 2,
+              'owner': None, 'is_mine': False} for col in range(6)]
+    hm = HexMap(lands, pygame.Surface((320, 240)), viewport_rect=(0, 0, 320, 240))
+    assert hm.frame_damage() == [pygame.Rect(0, 0, 320, 240)]
+
+    hm.render()
+    assert hm.frame_damage() == []
+
+    hm.zoom_in()
+    assert hm.frame_damage() == [pygame.Rect(0, 0, 320, 240)]
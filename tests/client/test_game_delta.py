@@ -0,0 +1,192 @@
+# Copyright (c) 2026 Marc Stieffenhofer. All rights reserved.
+# See LICENSE file in the project root for full license information.
+"""Tests for merging versioned ``get_game`` / ``get_game_snapshot`` responses."""
+
+from utils.game_delta import (
+    LIST_SECTIONS,
+    append_new_rows,
+    apply_game_delta,
+    delta_poll_params,
+    is_delta_base,
+    log_chat_cursors,
+    resolve_game_snapshot,
+)
+
+
+def _snapshot(version=3, **overrides):
+    game = {section: [] for section in LIST_SECTIONS}
+    game.update({
+        'id': 7,
+        'state': 'open',
+        'turn_player_id': 1,
+        'state_version': version,
+        'players': [{'id': 1, 'points': 0}, {'id': 2, 'points': 0}],
+        'log_entries': [{'id': 10, 'message': 'a'}, {'id': 11, 'message': 'b'}],
+        'chat_messages': [{'id': 4, 'message': 'hi'}],
+    })
+    game.update(overrides)
+    return game
+
+
+def test_poll_params_request_delta_only_for_complete_snapshot():
+    base = _snapshot()
+
+    assert delta_poll_params(7, base) == {
+        'game_id': 7, 'since_version': 3, 'log_after_id': 11, 'chat_after_id': 4,
+    }
+    assert delta_poll_params(8, base) == {'game_id': 8}
+    partial = {key: value for key, value in base.items() if key != 'players'}
+    assert not is_delta_base(partial)
+    assert delta_poll_params(7, partial) == {'game_id': 7}
+
+
+def test_unchanged_body_resolves_to_none():
+    assert apply_game_delta(_snapshot(), {'unchanged': True, 'state_version': 3}) is None
+
+
+def test_unchanged_body_applies_changed_presence_only():
+    base = _snapshot(players=[{'id': 1, 'is_online': True}, {'id': 2, 'is_online': True}])
+    same = {'unchanged': True, 'state_version': 3, 'presence': {'1': True, '2': True}}
+    left = {'unchanged': True, 'state_version': 3, 'presence': {'1': True, '2': False}}
+
+    assert apply_game_delta(base, same) is None
+    merged = apply_game_delta(base, left)
+
+    assert [p['is_online'] for p in merged['players']] == [True, False]
+    assert merged['state_version'] == 3
+    assert merged['log_entries'] is base['log_entries']
+    assert base['players'][1]['is_online'] is True
+
+
+def test_delta_without_players_still_refreshes_presence():
+    base = _snapshot(players=[{'id': 1, 'is_online': True}, {'id': 2, 'is_online': False}])
+    body = {
+        'delta': True,
+        'presence': {'1': True, '2': True},
+        'game': {'id': 7, 'state_version': 4, 'delta_since_version': 3,
+                 'omitted_sections': ['players'], 'appended_sections': []},
+    }
+
+    merged = apply_game_delta(base, body)
+
+    assert [p['is_online'] for p in merged['players']] == [True, True]
+
+
+def test_full_body_is_returned_as_is():
+    full = _snapshot(version=5)
+
+    assert apply_game_delta(_snapshot(), {'game': full}) is full
+
+
+def test_delta_merges_scalars_replaced_and_appended_sections():
+    base = _snapshot()
+    body = {
+        'delta': True,
+        'game': {
+            'id': 7,
+            'state': 'open',
+            'turn_player_id': 2,
+            'state_version': 5,
+            'players': [{'id': 1, 'points': 4}, {'id': 2, 'points': 0}],
+            'log_entries': [{'id': 12, 'message': 'c'}],
+            'delta_since_version': 3,
+            'omitted_sections': ['main_cards', 'chat_messages'],
+            'appended_sections': ['log_entries'],
+        },
+    }
+
+    merged = apply_game_delta(base, body)
+
+    assert merged['turn_player_id'] == 2
+    assert merged['state_version'] == 5
+    assert merged['players'][0]['points'] == 4
+    assert [entry['id'] for entry in merged['log_entries']] == [10, 11, 12]
+    assert merged['chat_messages'] is base['chat_messages']
+    assert 'omitted_sections' not in merged
+    assert is_delta_base(merged)
+    # The previous snapshot is left untouched.
+    assert base['turn_player_id'] == 1
+    assert len(base['log_entries']) == 2
+
+
+def test_delta_without_base_is_dropped():
+    body = {'delta': True, 'game': {'id': 7, 'state_version': 5}}
+
+    assert apply_game_delta(None, body) is None
+
+
+def test_snapshot_keeps_only_sent_sections_and_int_figure_keys():
+    body = {
+        'delta': True,
+        'game': {'id': 7, 'state_version': 5, 'turn_player_id': 2},
+        'chats': [{'id': 5, 'message': 'hello'}],
+        'figures': {'1': [{'id': 30}], '2': []},
+    }
+
+    data = resolve_game_snapshot(_snapshot(), body)
+
+    assert data['game']['turn_player_id'] == 2
+    assert data['chats'] == [{'id': 5, 'message': 'hello'}]
+    assert data['figures'] == {1: [{'id': 30}], 2: []}
+    assert 'logs' not in data and 'active_spells' not in data
+    assert resolve_game_snapshot(_snapshot(), {'unchanged': True}) is None
+
+
+def test_async_poller_assembles_single_snapshot_response():
+    from types import SimpleNamespace
+
+    from utils.background_poller import BackgroundPoller
+
+    game = _snapshot(version=4)
+    body = {'game': game, 'logs': [], 'chats': [], 'active_spells': [],
+            'figures': {'1': []}}
+    poller = BackgroundPoller(lambda: None)
+    poller._async_responses = {
+        'snapshot': SimpleNamespace(status_code=200, text='v4', json=lambda: body),
+    }
+
+    data = poller._assemble_server_data()
+
+    assert data['game'] is game
+    assert data['figures'] == {1: []}
+    # An identical body is not re-delivered.
+    poller._async_responses = {
+        'snapshot': SimpleNamespace(status_code=200, text='v4', json=lambda: body),
+    }
+    assert poller._assemble_server_data() is None
+
+
+def test_log_chat_cursors_and_append_skip_known_rows():
+    logs = [{'id': 10}, {'id': 11}]
+
+    assert log_chat_cursors(logs, []) == {'logs_after_id': 11}
+    # A server that ignores the cursor resends everything; known ids are skipped.
+    merged = append_new_rows(logs, [{'id': 10}, {'id': 11}, {'id': 12}])
+    assert [row['id'] for row in merged] == [10, 11, 12]
+    assert len(logs) == 2
+
+
+def test_snapshot_passes_appended_keys_through():
+    body = {'game': _snapshot(), 'logs': [{'id': 12}], 'appended': ['logs']}
+
+    assert resolve_game_snapshot(None, body)['appended'] == ['logs']
+
+
+def test_snapshot_folds_logs_and_chats_back_into_game():
+    history = ('log_entries', 'chat_messages')
+    full_game = {key: value for key, value in _snapshot().items() if key not in history}
+    full = resolve_game_snapshot(None, {
+        'game': full_game, 'logs': [{'id': 10}], 'chats': [{'id': 4}]})
+
+    assert full['game']['log_entries'] == [{'id': 10}]
+    assert is_delta_base(full['game'])
+
+    delta_game = {'id': 7, 'state_version': 5, 'delta_since_version': 3,
+                  'omitted_sections': list(history), 'appended_sections': []}
+    data = resolve_game_snapshot(full['game'], {
+        'delta': True, 'game': delta_game,
+        'logs': [{'id': 11}], 'appended': ['logs']})
+
+    assert [entry['id'] for entry in data['game']['log_entries']] == [10, 11]
+    assert data['game']['chat_messages'] == [{'id': 4}]
+    assert delta_poll_params(7, data['game'])['since_version'] == 5
@@ -0,0 +1,69 @@
+# Copyright (c) 2026 Marc Stieffenhofer. All rights reserved.
+# See LICENSE file in the project root for full license information.
+"""HexGridIndex agrees with the linear scans it replaces."""
+import math
+import random
+from types import SimpleNamespace
+
+from game.components.hex_grid_index import HexGridIndex
+
+SIZE = 10.0
+
+
+def _grid(cols, rows, holes=()):
+    tiles = []
+    for col in range(cols):
+        for row in range(rows):
+            if (col, row) in holes:
+                continue
+            tiles.append(SimpleNamespace(
+                col=col, row=row,
+                cx=col * 1.5 * SIZE,
+                cy=row * math.sqrt(3) * SIZE + (col % 2) * math.sqrt(3) / 2 * SIZE,
+            ))
+    return tiles
+
+
+def _linear_pick(tiles, wx, wy):
+    best, best_dist = None, float('inf')
+    for tile in tiles:
+        dist = math.hypot(wx - tile.cx, wy - tile.cy)
+        if dist < SIZE and dist < best_dist:
+            best, best_dist = tile, dist
+    return best
+
+
+def test_tile_at_matches_a_linear_scan():
+    tiles = _grid(12, 9, holes={(3, 4), (7, 0)})
+    index = HexGridIndex(tiles, SIZE)
+    rng = random.Random(5)
+
+    for _ in range(2000):
+        wx = rng.uniform(-2 * SIZE, 20 * SIZE)
+        wy = rng.uniform(-2 * SIZE, 18 * SIZE)
+        assert index.tile_at(wx, wy) is _linear_pick(tiles, wx, wy)
+
+
+def test_tiles_in_rect_covers_every_centre_inside_in_original_order():
+    tiles = _grid(20, 15)
+    rng = random.Random(9)
+    rng.shuffle(tiles)
+    index = HexGridIndex(tiles, SIZE)
+
+    for _ in range(300):
+        x0, y0 = rng.uniform(-50, 300), rng.uniform(-50, 250)
+        x1, y1 = x0 + rng.uniform(0, 120), y0 + rng.uniform(0, 120)
+        found = index.tiles_in_rect(x0, y0, x1, y1)
+        inside = [t for t in tiles if x0 <= t.cx <= x1 and y0 <= t.cy <= y1]
+        assert [t for t in found if t in inside] == inside
+        # Only the outward rounding may add tiles: at most one lattice step.
+        assert all(x0 - 1.5 * SIZE <= t.cx <= x1 + 1.5 * SIZE for t in found)
+
+
+def test_rect_covering_the_map_returns_every_tile():
+    tiles = _grid(4, 3)
+    index = HexGridIndex(tiles, SIZE)
+
+    assert index.tiles_in_rect(-100, -100, 1000, 1000) == tiles
+    assert HexGridIndex([], SIZE).tiles_in_rect(0, 0, 10, 10) == []
+    assert HexGridIndex([], SIZE).tile_at(0, 0) is None
@@ -0,0 +1,105 @@
+# Copyright (c) 2026 Marc Stieffenhofer. All rights reserved.
+# See LICENSE file in the project root for full license information.
+"""Pre-rendered map chunks used while the kingdom map camera moves."""
+
+import pygame
+
+from game.components.hex_map_pyramid import HexMapPyramid
+
+
+def _land(col, row, owner=None, is_mine=False):
+    return {
+        'id': col * 100 + row + 1, 'col': col, 'row': row,
+        'tier': 1 + (col + row) % 3, 'gold_rate': 5.0,
+        'suit_bonus_suit': 'Hearts' if col < 6 else 'Spades',
+        'suit_bonus_value': 2, 'owner': owner, 'is_mine': is_mine,
+    }
+
+
+def _lands(owned=()):
+    me = {'user_id': 1, 'username': 'me'}
+    return [_land(col, row, *((me, True) if (col, row) in owned else ()))
+            for col in range(12) for row in range(8)]
+
+
+def _map(owned=()):
+    from game.components.hex_map import HexMap
+    window = pygame.Surface((320, 240))
+    return HexMap(_lands(owned), window, viewport_rect=(0, 0, 320, 240))
+
+
+def _painter(calls):
+    def render_chunk(surface, zoom, world_x, world_y):
+        calls.append((zoom, world_x, world_y))
+        surface.fill((int(world_x) % 256, int(world_y) % 256, 90, 255))
+    return render_chunk
+
+
+def test_chunks_are_cached_per_level_and_bounded_by_the_byte_budget():
+    pyramid = HexMapPyramid(chunk_px=32, budget_bytes=3 * 32 * 32 * 4)
+    calls = []
+    target = pygame.Surface((64, 64))
+
+    pyramid.compose(target, target.get_rect(), 0.0, 0.0, 1.0, _painter(calls))
+    pyramid.compose(target, target.get_rect(), 0.0, 0.0, 1.0, _painter(calls))
+
+    # Four chunks were needed, three fit: the oldest keeps being re-rendered.
+    assert len(pyramid) == 3
+    assert pyramid.bytes_used <= pyramid.budget_bytes
+    assert len(calls) > 4
+    # Between levels the stitched chunks are scaled, never re-rendered.
+    assert HexMapPyramid.level_for(1.05) == 0
+    assert HexMapPyramid.level_zoom(HexMapPyramid.level_for(2.0)) == 2.0
+
+
+def test_invalidation_drops_only_overlapping_chunks():
+    pyramid = HexMapPyramid(chunk_px=32)
+    calls = []
+    for ix in range(4):
+        pyramid.chunk(0, ix, 0, _painter(calls))
+
+    dropped = pyramid.invalidate_world_rects([(40.0, 5.0, 50.0, 10.0)])
+
+    assert dropped == 1
+    assert sorted(key[1] for key in pyramid._chunks) == [0, 2, 3]
+
+
+def test_map_pans_from_chunks_and_renders_in_full_at_rest():
+    hm = _map()
+    hm.render()
+    assert len(hm._pyramid) == 0
+
+    hm._did_drag = True
+    for _ in range(3):
+        hm.camera_x += 0.5
+        hm.render()
+    cold = hm._pyramid.misses
+    hm.camera_x += 0.5
+    hm.render()
+
+    assert cold > 0
+    assert hm._pyramid.misses == cold
+    assert hm._render_cache_key[4] != round(hm.camera_x, 3)
+
+    hm._did_drag = False
+    hm.render()
+    assert hm._render_cache_key[4] == round(hm.camera_x, 3)
+
+
+def test_data_refresh_invalidates_only_chunks_near_changed_lands():
+    hm = _map(owned={(11, 7)})
+    hm.camera_x = hm.camera_y = 0.0
+    hm._did_drag = True
+    hm.render()
+    cached = len(hm._pyramid)
+    assert cached > 1
+
+    hm.update_data(_lands(owned={(11, 7), (0, 0)}))
+    assert 0 < len(hm._pyramid) < cached
+
+    hm.update_data(_lands(owned={(11, 7), (0, 0)}))
+    hm.set_map_mode('terrain')
+    remaining = len(hm._pyramid)
+    assert remaining > 0
+    hm.set_map_mode('gold')
+    assert len(hm._pyramid) == 0
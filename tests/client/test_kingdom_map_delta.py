@@ -0,0 +1,93 @@
+# Copyright (c) 2026 Marc Stieffenhofer. All rights reserved.
+# See LICENSE file in the project root for full license information.
+"""Tests for merging ``/kingdom/map/static`` with ``/kingdom/map/changes``."""
+
+from utils.kingdom_map_delta import (
+    KingdomMapSync,
+    apply_map_changes,
+    merge_map_lands,
+)
+
+
+class _Response:
+    def __init__(self, status_code, body=None, headers=None):
+        self.status_code = status_code
+        self._body = body
+        self.headers = headers or {}
+
+    def json(self):
+        return self._body
+
+
+_STATIC = [
+    {'id': 1, 'col': 0, 'row': 0, 'tier': 1},
+    {'id': 2, 'col': 1, 'row': 0, 'tier': 2},
+]
+
+
+def test_delta_clears_volatile_fields_before_applying_tiles():
+    dynamic = {}
+    apply_map_changes(dynamic, {'full': True, 'lands': [
+        {'id': 1, 'is_mine': True, 'owner': {'user_id': 5}, 'defence_incomplete': True},
+        {'id': 2, 'is_mine': False, 'owner': None, 'conquer_cooldown_remaining': 30},
+    ]})
+
+    apply_map_changes(dynamic, {'full': False, 'lands': [
+        {'id': 1, 'is_mine': True, 'owner': {'user_id': 5}},
+    ]})
+
+    lands = merge_map_lands(_STATIC, dynamic)
+    assert lands[0] == {'id': 1, 'col': 0, 'row': 0, 'tier': 1,
+                        'is_mine': True, 'owner': {'user_id': 5}}
+    assert lands[1] == {'id': 2, 'col': 1, 'row': 0, 'tier': 2,
+                        'is_mine': False, 'owner': None}
+
+
+def test_sync_revalidates_static_and_polls_changes_since_last_version():
+    calls = []
+    responses = [
+        _Response(200, {'lands': _STATIC}, {'ETag': '"abc"'}),
+        _Response(200, {'full': True, 'map_version': 4, 'my_lands_count': 0,
+                        'lands': [{'id': 1, 'is_mine': False, 'owner': None},
+                                  {'id': 2, 'is_mine': False, 'owner': None}]}),
+        _Response(304),
+        _Response(200, {'full': False, 'map_version': 6, 'my_lands_count': 1,
+                        'lands': [{'id': 2, 'is_mine': True, 'owner': {'user_id': 1}}]}),
+    ]
+
+    def fake_get(url, **kwargs):
+        calls.append((url.rsplit('/kingdom', 1)[1], kwargs))
+        return responses.pop(0)
+
+    sync = KingdomMapSync('http://server', fake_get)
+    first = sync.fetch()
+    second = sync.fetch()
+
+    assert first['status_code'] == 200
+    assert second['data']['my_lands_count'] == 1
+    assert [land['is_mine'] for land in second['data']['lands']] == [False, True]
+    assert second['data']['lands'][1]['tier'] == 2
+    assert 'full' not in second['data']
+    assert calls[2] == ('/map/static', {'headers': {'If-None-Match': '"abc"'}, 'timeout': None})
+    assert calls[3] == ('/map/changes', {'params': {'since_version': 4}, 'timeout': None})
+
+
+def test_sync_falls_back_to_full_map_on_old_servers():
+    fallback_calls = []
+
+    def fallback():
+        fallback_calls.append(1)
+        return {'data': {'lands': []}, 'status_code': 200, 'error': None}
+
+    requested = []
+
+    def fake_get(url, **_kwargs):
+        requested.append(url)
+        return _Response(404)
+
+    sync = KingdomMapSync('http://server', fake_get, fallback=fallback)
+
+    assert sync.fetch()['status_code'] == 200
+    assert sync.fetch()['status_code'] == 200
+    assert len(fallback_calls) == 2
+    assert len(requested) == 1
@@ -0,0 +1,102 @@
+# Copyright (c) 2026 Marc Stieffenhofer. All rights reserved.
+# See LICENSE file in the project root for full license information.
+"""Lazy screen construction, idle prefetch and ``--profile-startup``."""
+
+import io
+import json
+import os
+
+import pygame
+
+from utils import screen_prefetch
+from utils.startup_profile import StartupProfiler, profiling_requested
+
+SCREEN_CLASSES = (
+    'LoginScreen', 'GameMenuScreen', 'DuelMenuScreen', 'NewGameScreen',
+    'LoadGameScreen', 'RankingScreen', 'SettingsScreen', 'KingdomScreen',
+    'KingdomConfigScreen', 'ConquerScreen', 'DefenceScreen',
+    'CollectionScreen', 'GameScreen', 'ConquerGameScreen',
+)
+
+
+def _client(monkeypatch, platform='linux'):
+    os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+    os.environ.setdefault('NK_SCREEN_WIDTH', '854')
+    os.environ.setdefault('NK_SCREEN_HEIGHT', '480')
+
+    import nepal_kings as nk
+    from config import settings
+
+    created = []
+
+    def screen_class(name):
+        class DummyScreen:
+            @staticmethod
+            def _load_bg():
+                return pygame.Surface(
+                    (settings.SCREEN_WIDTH, settings.SCREEN_HEIGHT))
+
+            def __init__(self, state, *args, **kwargs):
+                self.state = state
+                # Like GameScreen: constructors may claim shared state.
+                state.parent_screen = self
+                created.append(name)
+
+        return DummyScreen
+
+    for name in SCREEN_CLASSES:
+        monkeypatch.setattr(nk, name, screen_class(name))
+    monkeypatch.setattr(nk._sys, 'platform', platform)
+    monkeypatch.delenv('NK_SCREEN_PREFETCH', raising=False)
+    return nk.Client(), created
+
+
+def test_desktop_start_builds_only_the_login_screen(monkeypatch):
+    client, created = _client(monkeypatch)
+
+    assert created == ['LoginScreen']
+    assert set(client.screens) == {'login'}
+    assert 'game' in client._screen_factories
+    assert client.prefetch_enabled
+
+
+def test_idle_prefetch_builds_the_likely_next_screen_without_side_effects(
+        monkeypatch):
+    client, created = _client(monkeypatch)
+    login = client.screens['login']
+    client.state.parent_screen = login
+
+    assert client._prefetch_next('login') == 'game_menu'
+    assert client.state.parent_screen is login
+    assert created[-1] == 'GameMenuScreen'
+    # Nothing left to prefetch from the login screen.
+    assert client._prefetch_next('login') is None
+    assert screen_prefetch.next_prefetch(
+        'game_menu', client.screens, client._screen_factories) == 'kingdom'
+    # Multi-second battle screens keep their navigation-time loading bar.
+    assert screen_prefetch.next_prefetch(
+        'new_game', client.screens, client._screen_factories) is None
+
+    web, _created = _client(monkeypatch, platform='emscripten')
+    assert not web.prefetch_enabled
+
+
+def test_startup_profiler_prints_one_json_line_per_event():
+    out = io.StringIO()
+    profiler = StartupProfiler(enabled=True, stream=out)
+
+    profiler.screen_built('login', 12.34, 'startup')
+    profiler.screen_presented('login', profiler.now_ms() - 5)
+    profiler.screen_presented('game_menu', profiler.now_ms() - 3)
+
+    events = [json.loads(line.split(' ', 1)[1])
+              for line in out.getvalue().splitlines()]
+    assert [e['event'] for e in events] == [
+        'screen_built', 'first_interactive', 'screen_entered', 'screen_entered']
+    summary = profiler.summary()
+    assert summary['screens_built'] == {'login': {'ms': 12.3, 'how': 'startup'}}
+    assert summary['first_interactive_ms'] is not None
+    assert profiling_requested(['nepal_kings.py', '--profile-startup'])
+    silent = StartupProfiler(enabled=False, stream=out)
+    silent.screen_built('login', 1.0, 'startup')
+    assert silent.events == []
@@ -79,6 +79,36 @@ def _reset_conquer_idempotency_cache():
     reset_cache_for_tests()
 
 
+@pytest.fixture(autouse=True)
+def _reset_principal_cache():
+    """Reset the process-level ``require_token`` principal cache.
+
+    Entries are keyed by ``(user_id, token_version, kind)``; ids restart at
+    1 in every test's fresh database, so a stale entry could accept a token
+    for a user the next test never created.
+    """
+    from principal_cache import reset_cache_for_tests
+
+    reset_cache_for_tests()
+    yield
+    reset_cache_for_tests()
+
+
+@pytest.fixture(autouse=True)
+def _reset_kingdom_map_caches():
+    """Drop the per-process kingdom map caches.
+
+    Map state is cached per ``kingdom_map_version``, which restarts with
+    every fresh test database, so a cached map could otherwise belong to a
+    previous test's lands.
+    """
+    from kingdom_map_service import clear_map_caches
+
+    clear_map_caches()
+    yield
+    clear_map_caches()
+
+
 @pytest.fixture(autouse=True)
 def _reset_conquer_timer_state():
     """Reset routes.games' module-level conquer timer/watchdog maps.
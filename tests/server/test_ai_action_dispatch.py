@@ -0,0 +1,136 @@
+# Copyright (c) 2026 Marc Stieffenhofer. All rights reserved.
+# See LICENSE file in the project root for full license information.
+"""Tests for in-process AI action dispatch.
+
+Test oracle (desired outcomes):
+- AI POSTs to ``SERVER_URL`` run through the local Flask pipeline without
+  any HTTP request, with the same auth and validation as over the wire,
+  including from scheduler threads that hold no app context.
+- Foreign URLs and ``AI_ACTION_DISPATCH='http'`` keep the HTTP path.
+"""
+
+import threading
+
+import pytest
+
+import server_settings as settings
+from ai import action_dispatch, ai_worker
+
+
+@pytest.fixture
+def ai_game(db, two_users):
+    from models import Game, Player
+
+    u1, u2 = two_users
+    game = Game(current_round=1, stake=35)
+    db.session.add(game)
+    db.session.commit()
+    human = Player(user_id=u1.id, game_id=game.id, turns_left=6, points=0)
+    ai_player = Player(user_id=u2.id, game_id=game.id, turns_left=6, points=0)
+    db.session.add_all([human, ai_player])
+    db.session.commit()
+    with ai_worker._ai_player_user_ids_lock:
+        ai_worker._ai_player_user_ids[ai_player.id] = u2.id
+    yield game, ai_player
+    with ai_worker._ai_player_user_ids_lock:
+        ai_worker._ai_player_user_ids.pop(ai_player.id, None)
+    with ai_worker._internal_service_tokens_lock:
+        ai_worker._internal_service_tokens.clear()
+
+
+@pytest.fixture
+def no_http(monkeypatch):
+    def fail(*_args, **_kwargs):
+        raise AssertionError('AI action left the process')
+
+    monkeypatch.setattr(ai_worker.http_requests, 'post', fail)
+
+
+def test_in_process_path_only_matches_server_url(monkeypatch):
+    monkeypatch.setattr(settings, 'SERVER_URL', 'http://localhost:5000')
+
+    assert action_dispatch.in_process_path('http://localhost:5000/games/start_turn') == '/games/start_turn'
+    assert action_dispatch.in_process_path('http://localhost:50001/games/x') is None
+    assert action_dispatch.in_process_path('http://example.invalid/games/x') is None
+
+
+def test_ai_post_runs_route_in_process(db, ai_game, no_http):
+    from models import LogEntry
+
+    game, ai_player = ai_game
+
+    resp = ai_worker._ai_post(f'{settings.SERVER_URL}/msg/add_log_entry', ai_player.id, json={
+        'game_id': game.id,
+        'player_id': ai_player.id,
+        'round_number': 1,
+        'turn_number': 1,
+        'message': 'AI drew a card',
+        'author': 'AI',
+        'type': 'draw',
+    })
+
+    assert resp.ok and resp.json()['success'] is True
+    db.session.expire_all()
+    assert [entry.message for entry in LogEntry.query.filter_by(game_id=game.id)] == ['AI drew a card']
+
+
+def test_ai_post_without_app_context_stays_in_process(app, db, ai_game, no_http, monkeypatch):
+    from models import LogEntry
+
+    game, ai_player = ai_game
+    game_id, ai_player_id = game.id, ai_player.id
+    monkeypatch.setattr(action_dispatch, '_bound_app', None)
+    action_dispatch.bind_app(app)
+    results = []
+
+    def post():
+        results.append(ai_worker._ai_post(
+            f'{settings.SERVER_URL}/msg/add_log_entry', ai_player_id, json={
+                'game_id': game_id,
+                'player_id': ai_player_id,
+                'round_number': 1,
+                'turn_number': 1,
+                'message': 'posted from a pool thread',
+                'author': 'AI',
+                'type': 'draw',
+            }))
+
+    thread = threading.Thread(target=post)
+    thread.start()
+    thread.join(timeout=30)
+
+    assert [resp.status_code for resp in results] == [200]
+    db.session.expire_all()
+    assert [entry.message for entry in LogEntry.query.filter_by(game_id=game_id)] == [
+        'posted from a pool thread']
+
+
+def test_in_process_dispatch_keeps_route_validation(db, ai_game, no_http):
+    game, ai_player = ai_game
+    human = next(p for p in game.players if p.id != ai_player.id)
+
+    resp = ai_worker._ai_post(f'{settings.SERVER_URL}/msg/add_log_entry', ai_player.id, json={
+        'game_id': game.id,
+        'player_id': human.id,
+        'round_number': 1,
+        'turn_number': 1,
+        'message': 'spoofed',
+        'author': 'AI',
+        'type': 'draw',
+    })
+
+    assert resp.status_code == 403
+    assert resp.json()['success'] is False
+
+
+def test_http_mode_keeps_loopback_post(monkeypatch, ai_game):
+    _, ai_player = ai_game
+    calls = []
+    monkeypatch.setattr(settings, 'AI_ACTION_DISPATCH', 'http')
+    monkeypatch.setattr(ai_worker.http_requests, 'post',
+                        lambda url, **kwargs: calls.append(url) or 'sent')
+
+    result = ai_worker._ai_post(f'{settings.SERVER_URL}/games/start_turn', ai_player.id, json={})
+
+    assert result == 'sent'
+    assert calls == [f'{settings.SERVER_URL}/games/start_turn']
@@ -2,7 +2,7 @@
 # See LICENSE file in the project root for full license information.
 """Action-enum and phase-detection tests for AI workflow."""
 
-from ai.action_enum import detect_phase, enumerate_actions, _all_battle_rounds_done
+from ai.action_enum import detect_phase, enumerate_actions, phase_state, _all_battle_rounds_done
 
 
 def _base_game_dict(ai_id=1, opp_id=2):
@@ -173,6 +173,38 @@ def test_tactics_hand_conquer_rounds_done_counts_conquer_tactics():
     assert detect_phase(game_dict, 2) == 'finish_battle'
 
 
+def test_phase_state_matches_full_serialization_across_phases(app, db):
+    from models import BattleMove
+
+    game, ai_player, human_player, _spell = _create_pending_spell(db)
+
+    def assert_same_phase():
+        db.session.expire_all()
+        for player in (ai_player, human_player):
+            assert detect_phase(phase_state(game), player.id) == \
+                detect_phase(game.serialize(), player.id)
+
+    assert_same_phase()
+    game.waiting_for_counter_player_id = ai_player.id
+    game.pending_spell_id = _spell.id
+    db.session.commit()
+    assert_same_phase()
+
+    game.waiting_for_counter_player_id = None
+    game.pending_spell_id = None
+    game.battle_confirmed = True
+    game.battle_turn_player_id = human_player.id
+    game.battle_moves_confirmed = {str(ai_player.id): True}
+    db.session.add_all([
+        BattleMove(game_id=game.id, player_id=pid, family_name='Dagger', card_id=1,
+                   card_type='main', suit='Hearts', rank='7', value=7, played_round=rnd)
+        for pid in (ai_player.id, human_player.id) for rnd in (0, 1, 2)
+    ])
+    db.session.commit()
+    assert detect_phase(phase_state(game), ai_player.id) == 'finish_battle'
+    assert_same_phase()
+
+
 def test_enumerate_actions_counter_spell_has_real_counter_option_when_cards_exist(app, db):
     _, ai_player, human_player, spell = _create_pending_spell(db, spell_name='Peasant War')
 
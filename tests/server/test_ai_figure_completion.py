@@ -123,6 +123,7 @@ def test_best_figure_targets_forwards_draw_limits_to_estimator(monkeypatch):
         remaining_turns=None,
         max_main_draws_per_turn=2,
         max_side_draws_per_turn=1,
+        index=None,
     ):
         captured['game_id'] = game_dict.get('id')
         captured['ai_player_id'] = ai_player_id
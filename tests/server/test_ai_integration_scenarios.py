@@ -3,19 +3,7 @@
 """Deterministic integration-style scenarios for AI worker game loop."""
 
 from ai import ai_worker
-
-
-class _InlineThread:
-    """Thread shim that runs target immediately when start() is called."""
-
-    def __init__(self, target=None, args=(), kwargs=None, **_ignored):
-        self._target = target
-        self._args = args
-        self._kwargs = kwargs or {}
-
-    def start(self):
-        if self._target:
-            self._target(*self._args, **self._kwargs)
+from ai.scheduler import AIScheduler
 
 
 def _sequence(values):
@@ -70,13 +58,11 @@ def _patch_common_loop_controls(monkeypatch):
     monkeypatch.setattr(ai_worker.settings, 'AI_ENABLED', True)
     monkeypatch.setattr(ai_worker.settings, 'AI_THINK_DELAY', 0)
     monkeypatch.setattr(ai_worker.time, 'sleep', lambda *_args, **_kwargs: None)
-    monkeypatch.setattr(ai_worker.threading, 'Thread', _InlineThread)
+    monkeypatch.setattr(ai_worker, '_ai_scheduler', AIScheduler(0))
 
 
 def _reset_worker_state():
-    with ai_worker._active_games_lock:
-        ai_worker._active_games.clear()
-        ai_worker._pending_retrigger.clear()
+    ai_worker._ai_scheduler.clear()
     with ai_worker._ai_player_user_ids_lock:
         ai_worker._ai_player_user_ids.clear()
     with ai_worker._ai_watchdog_lock:
@@ -122,8 +108,7 @@ def test_trigger_runs_normal_turn_flow_inline(app, db, monkeypatch):
 
     assert len(start_turn_calls) == 1
     assert executed == ['change_cards']
-    with ai_worker._active_games_lock:
-        assert game.id not in ai_worker._active_games
+    assert not ai_worker._ai_scheduler.is_active(game.id)
 
 
 def test_trigger_uses_duel_strategy_when_multiple_actions(app, db, monkeypatch):
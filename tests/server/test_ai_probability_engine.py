@@ -2,13 +2,18 @@
 # See LICENSE file in the project root for full license information.
 """Tests for AI probability utilities."""
 
+import random
 from math import isclose
 
+from ai import probability_engine
 from ai.probability_engine import (
+    clear_probability_caches,
     get_deck_counts,
     probability_at_least,
+    probability_cache_info,
     probability_exact,
     probability_meet_requirements,
+    probability_meet_requirements_exact,
 )
 
 
@@ -65,3 +70,43 @@ def test_probability_meet_requirements_multi_key_detects_impossible_requests():
 
     p = probability_meet_requirements(population, req, draws=3)
     assert p == 0.0
+
+
+def test_cached_engine_matches_exact_enumeration():
+    rng = random.Random(20260418)
+    for _ in range(300):
+        keys = [(rank, suit) for rank in 'AKQJ' for suit in ('Hearts', 'Spades')]
+        population = {key: rng.randint(0, 4) for key in keys}
+        population[('7', 'Clubs')] = rng.randint(0, 40)
+        required = rng.sample(keys, rng.randint(1, 4))
+        requirements = {key: rng.randint(1, 3) for key in required}
+        draws = rng.randint(0, 24)
+
+        expected = probability_meet_requirements_exact(population, requirements, draws)
+        actual = probability_meet_requirements(population, requirements, draws)
+
+        assert isclose(actual, expected, rel_tol=1e-9, abs_tol=1e-12)
+
+
+def test_requirements_sharing_a_signature_hit_the_cache():
+    clear_probability_caches()
+    hearts = {('K', 'Hearts'): 2, ('Q', 'Hearts'): 3, ('2', 'Clubs'): 20}
+    spades = {('K', 'Spades'): 2, ('Q', 'Spades'): 3, ('2', 'Clubs'): 20}
+
+    first = probability_meet_requirements(hearts, {('K', 'Hearts'): 1, ('Q', 'Hearts'): 2}, 6)
+    second = probability_meet_requirements(spades, {('Q', 'Spades'): 2, ('K', 'Spades'): 1}, 6)
+
+    assert first == second
+    info = probability_cache_info()['meet_requirements']
+    assert info['misses'] == 1 and info['hits'] == 1
+
+
+def test_large_populations_fall_back_to_exact_arithmetic(monkeypatch):
+    monkeypatch.setattr(probability_engine, '_FLOAT_POPULATION_LIMIT', 10)
+    clear_probability_caches()
+    population = {('A', 'Hearts'): 4, ('K', 'Spades'): 8}
+
+    p = probability_meet_requirements(population, {('A', 'Hearts'): 2}, draws=5)
+
+    assert isclose(p, probability_at_least(4, 12, 5, 2), rel_tol=1e-12)
+    clear_probability_caches()
@@ -1,21 +1,17 @@
 # Copyright (c) 2026 Marc Stieffenhofer. All rights reserved.
 # See LICENSE file in the project root for full license information.
-"""Route-hook tests for AI trigger behavior and recursion guard header."""
+"""AI wake-ups driven by committed game events, and the recursion guard header."""
 
 import pytest
 
+from models import db, Game, Player
+
 
 @pytest.fixture
-def enable_ai_hooks(monkeypatch):
-    import routes.games as games_routes
-    import routes.battle_shop as battle_shop_routes
-    import routes.spells as spells_routes
-    import routes.figures as figures_routes
+def enable_ai(monkeypatch):
+    import server_settings
 
-    monkeypatch.setattr(games_routes.settings, 'AI_ENABLED', True)
-    monkeypatch.setattr(battle_shop_routes.settings, 'AI_ENABLED', True)
-    monkeypatch.setattr(spells_routes.settings, 'AI_ENABLED', True)
-    monkeypatch.setattr(figures_routes.settings, 'AI_ENABLED', True)
+    monkeypatch.setattr(server_settings, 'AI_ENABLED', True)
 
 
 @pytest.fixture
@@ -31,73 +27,93 @@ def trigger_calls(monkeypatch):
     return calls
 
 
-def test_games_hook_triggers_ai_when_post_has_game_id(client, enable_ai_hooks, trigger_calls):
-    resp = client.post('/games/start_turn', json={'game_id': 101, 'player_id': 1})
-
-    assert resp.status_code in {200, 400, 401, 404}
-    assert trigger_calls == [101]
+@pytest.fixture
+def duel(two_users):
+    u1, u2 = two_users
+    game = Game(state='open', mode='duel')
+    db.session.add(game)
+    db.session.flush()
+    p1 = Player(user_id=u1.id, game_id=game.id, turns_left=3, points=0)
+    p2 = Player(user_id=u2.id, game_id=game.id, turns_left=3, points=0)
+    db.session.add_all([p1, p2])
+    db.session.flush()
+    game.turn_player_id = p1.id
+    db.session.commit()
+    return game, p1, p2
+
+
+def _run_request(app, mutate, headers=None):
+    """Run ``mutate`` inside a POST request, including the app's hooks."""
+    with app.test_request_context('/games/test', method='POST', headers=headers or {}):
+        app.preprocess_request()
+        mutate()
+        app.process_response(app.make_response(('ok', 200)))
+
+
+def test_post_without_game_changes_does_not_wake_ai(
+        client, duel, auth_headers_user1, enable_ai, trigger_calls):
+    game, _, _ = duel
+    # Commits a user setting; naming a game in the body no longer matters.
+    resp = client.post('/auth/set_notifications',
+                       data={'enabled': 'false', 'game_id': game.id},
+                       headers=auth_headers_user1)
+
+    assert resp.status_code == 200
+    assert trigger_calls == []
 
 
-def test_games_hook_skips_trigger_for_internal_ai_header(client, enable_ai_hooks, trigger_calls):
-    resp = client.post(
-        '/games/start_turn',
-        json={'game_id': 102, 'player_id': 1},
-        headers={'X-NepalKings-AI-Internal': '1'},
-    )
+def test_unauthorised_post_naming_a_game_does_not_wake_ai(client, enable_ai, trigger_calls):
+    resp = client.post('/games/start_turn', json={'game_id': 101, 'player_id': 1})
 
-    assert resp.status_code in {200, 400, 401, 404}
+    assert resp.status_code == 401
     assert trigger_calls == []
 
 
-def test_battle_shop_hook_triggers_ai_when_post_has_game_id(client, enable_ai_hooks, trigger_calls):
-    resp = client.post('/battle_shop/buy_battle_move', json={'game_id': 201, 'player_id': 1})
+def test_committed_turn_and_phase_changes_wake_ai_once(app, duel, enable_ai, trigger_calls):
+    game, _, p2 = duel
 
-    assert resp.status_code in {200, 400, 401, 404}
-    assert trigger_calls == [201]
+    def mutate():
+        game.turn_player_id = p2.id
+        db.session.commit()
+        game.battle_confirmed = True
+        db.session.commit()
 
+    _run_request(app, mutate)
 
-def test_battle_shop_hook_skips_trigger_for_internal_ai_header(client, enable_ai_hooks, trigger_calls):
-    resp = client.post(
-        '/battle_shop/buy_battle_move',
-        json={'game_id': 202, 'player_id': 1},
-        headers={'X-NepalKings-AI-Internal': '1'},
-    )
+    assert trigger_calls == [game.id]
 
-    assert resp.status_code in {200, 400, 401, 404}
-    assert trigger_calls == []
 
+def test_internal_ai_header_skips_wake_up(app, duel, enable_ai, trigger_calls):
+    game, _, p2 = duel
 
-def test_spells_hook_triggers_ai_when_post_has_game_id(client, enable_ai_hooks, trigger_calls):
-    resp = client.post('/spells/cast_spell', json={'game_id': 301, 'player_id': 1})
+    def mutate():
+        game.turn_player_id = p2.id
+        db.session.commit()
 
-    assert resp.status_code in {200, 400, 401, 404}
-    assert trigger_calls == [301]
+    _run_request(app, mutate, headers={'X-NepalKings-AI-Internal': '1'})
 
+    assert trigger_calls == []
 
-def test_spells_hook_skips_trigger_for_internal_ai_header(client, enable_ai_hooks, trigger_calls):
-    resp = client.post(
-        '/spells/cast_spell',
-        json={'game_id': 302, 'player_id': 1},
-        headers={'X-NepalKings-AI-Internal': '1'},
-    )
 
-    assert resp.status_code in {200, 400, 401, 404}
-    assert trigger_calls == []
+def test_rolled_back_change_wakes_nothing(app, duel, enable_ai, trigger_calls):
+    game, _, p2 = duel
 
+    def mutate():
+        game.turn_player_id = p2.id
+        db.session.flush()
+        db.session.rollback()
 
-def test_figures_hook_triggers_ai_when_post_has_game_id(client, enable_ai_hooks, trigger_calls):
-    resp = client.post('/figures/create_figure', json={'game_id': 401, 'player_id': 1})
+    _run_request(app, mutate)
+
+    assert trigger_calls == []
 
-    assert resp.status_code in {200, 400, 401, 404}
-    assert trigger_calls == [401]
 
+def test_commits_before_the_request_are_not_dispatched_by_it(
+        app, duel, enable_ai, trigger_calls):
+    game, _, p2 = duel
+    game.turn_player_id = p2.id
+    db.session.commit()
 
-def test_figures_hook_skips_trigger_for_internal_ai_header(client, enable_ai_hooks, trigger_calls):
-    resp = client.post(
-        '/figures/create_figure',
-        json={'game_id': 402, 'player_id': 1},
-        headers={'X-NepalKings-AI-Internal': '1'},
-    )
+    _run_request(app, lambda: None)
 
-    assert resp.status_code in {200, 400, 401, 404}
-    assert trigger_calls == []
\ No newline at end of file
+    assert trigger_calls == []
@@ -0,0 +1,162 @@
+# Copyright (c) 2026 Marc Stieffenhofer. All rights reserved.
+# See LICENSE file in the project root for full license information.
+"""Tests for the bounded AI job scheduler.
+
+Test oracle (desired outcomes):
+- A key is never queued twice; re-submitting keeps the earliest due time.
+- Submitting a running key schedules exactly one follow-up after it ends,
+  unless the running job claims it with ``consume_retrigger``.
+- However many games are submitted, at most ``workers`` threads exist.
+- A deferred job frees its worker: other games run during its delay, and
+  its continuation replaces any follow-up recorded meanwhile.
+"""
+
+import threading
+import time
+
+from ai.scheduler import AIScheduler
+
+
+def test_resubmitting_queued_key_dedupes_and_keeps_earliest_due():
+    now = [100.0]
+    scheduler = AIScheduler(1, clock=lambda: now[0])
+    scheduler._ensure_threads = lambda: None  # keep the job in the queue
+
+    assert scheduler.submit(7, lambda: None, delay=5.0) == AIScheduler.QUEUED
+    assert scheduler.submit(7, lambda: None, delay=1.0) == AIScheduler.DEDUPED
+    assert scheduler.submit(7, lambda: None, delay=9.0) == AIScheduler.DEDUPED
+
+    assert scheduler._queued[7].due == 101.0
+    metrics = scheduler.metrics()
+    assert metrics['queue_depth'] == 1
+    assert metrics['submitted'] == 3 and metrics['deduped'] == 2
+
+
+def test_inline_followup_runs_once_after_current_job():
+    scheduler = AIScheduler(0)
+    runs = []
+
+    def job(tag):
+        runs.append(tag)
+        if tag == 'first':
+            assert scheduler.submit('g', job, args=('second',)) == AIScheduler.RETRIGGER
+            assert scheduler.submit('g', job, args=('third',)) == AIScheduler.RETRIGGER
+
+    scheduler.submit('g', job, args=('first',))
+
+    assert runs == ['first', 'second']
+    assert not scheduler.is_active('g')
+
+
+def test_consumed_retrigger_is_not_rerun():
+    scheduler = AIScheduler(0)
+    runs = []
+
+    def job():
+        runs.append(1)
+        if len(runs) == 1:
+            scheduler.submit('g', job)
+            assert scheduler.consume_retrigger('g') is True
+
+    scheduler.submit('g', job)
+
+    assert runs == [1]
+
+
+def test_pool_thread_count_stays_bounded():
+    scheduler = AIScheduler(2, name='test-ai')
+    done = threading.Event()
+    lock = threading.Lock()
+    finished = []
+
+    def job(game_id):
+        time.sleep(0.01)
+        with lock:
+            finished.append(game_id)
+            if len(finished) == 20:
+                done.set()
+
+    try:
+        for game_id in range(20):
+            scheduler.submit(game_id, job, args=(game_id,))
+        assert done.wait(5)
+        metrics = scheduler.metrics()
+        assert metrics['threads_alive'] <= 2
+        assert metrics['completed'] == 20
+        assert sorted(finished) == list(range(20))
+    finally:
+        scheduler.shutdown(timeout=1)
+
+
+def test_crashing_job_is_counted_and_frees_its_key():
+    scheduler = AIScheduler(0)
+
+    def boom():
+        raise RuntimeError('boom')
+
+    scheduler.submit('g', boom)
+
+    assert scheduler.metrics()['failed'] == 1
+    assert not scheduler.is_active('g')
+
+
+def test_defer_replaces_followup_with_continuation():
+    scheduler = AIScheduler(0)
+    runs = []
+
+    def job(step):
+        runs.append(step)
+        if step == 1:
+            assert scheduler.submit('g', job, args=('trigger',)) == AIScheduler.RETRIGGER
+            scheduler.defer('g', job, args=(2,), delay=30.0)
+
+    scheduler.submit('g', job, args=(1,))
+
+    assert runs == [1, 2]
+    assert not scheduler.is_active('g')
+
+
+def test_deferred_game_does_not_hold_the_worker():
+    scheduler = AIScheduler(1, name='test-ai-defer')
+    order = []
+    done = threading.Event()
+
+    def slow_game(step):
+        order.append(('slow', step))
+        if step == 1:
+            scheduler.defer('slow', slow_game, args=(2,), delay=0.2)
+        else:
+            done.set()
+
+    def quick_game():
+        order.append(('quick', 1))
+
+    try:
+        scheduler.submit('slow', slow_game, args=(1,))
+        scheduler.submit('quick', quick_game, delay=0.05)
+        assert done.wait(5)
+        assert order == [('slow', 1), ('quick', 1), ('slow', 2)]
+    finally:
+        scheduler.shutdown(timeout=1)
+
+
+def test_in_pool_job_is_true_only_on_the_running_pool_thread():
+    scheduler = AIScheduler(1, name='test-ai-pool-job')
+    seen = []
+    done = threading.Event()
+
+    def job():
+        seen.append((scheduler.in_pool_job('g'), scheduler.in_pool_job('other')))
+        done.set()
+
+    try:
+        scheduler.submit('g', job)
+        assert done.wait(5)
+    finally:
+        scheduler.shutdown(timeout=1)
+
+    assert seen == [(True, False)]
+    assert not scheduler.in_pool_job('g')
+    inline = AIScheduler(0)
+    inline.submit('g', lambda: seen.append(inline.in_pool_job('g')))
+    assert seen[-1] is False
@@ -0,0 +1,156 @@
+# Copyright (c) 2026 Marc Stieffenhofer. All rights reserved.
+# See LICENSE file in the project root for full license information.
+"""Tests for the per-decision AI game-state index.
+
+Test oracle (desired outcomes):
+- Lookups match the linear scans they replace (first match wins).
+- Planner and strategy results are identical with and without a shared index.
+- With a shared index the resource-deficit pass runs once per figure list,
+  however many actions are scored.
+"""
+
+import random
+
+import ai.state_index as state_index
+from ai import duel_strategy
+from ai.game_state import compute_support_bonus
+from ai.state_index import GameStateIndex
+from ai.strategy_planner import generate_strategy_plans
+
+
+def _fig(fig_id, name, field, suit, values, produces=None, requires=None):
+    return {
+        'id': fig_id, 'name': name, 'family_name': name, 'field': field,
+        'suit': suit, 'cards': [{'value': v, 'role': 'key'} for v in values],
+        'produces': produces or {}, 'requires': requires or {},
+    }
+
+
+def _game_dict():
+    return {
+        'id': 7,
+        'invader_player_id': 1,
+        'battle_modifier': [],
+        'battle_moves': [],
+        'players': [
+            {
+                'id': 1,
+                'turns_left': 3,
+                'main_hand': [
+                    {'id': 1, 'rank': 'K', 'suit': 'Hearts', 'value': 4},
+                    {'id': 2, 'rank': '9', 'suit': 'Hearts', 'value': 9},
+                    {'id': 3, 'rank': '5', 'suit': 'Spades', 'value': 5, 'part_of_figure': True},
+                ],
+                'side_hand': [],
+                'figures': [
+                    _fig(11, 'Djungle King', 'castle', 'Hearts', [15],
+                         produces={'villager_red': 2}),
+                    _fig(12, 'Farmer', 'village', 'Hearts', [3, 4],
+                         produces={'food_red': 2}, requires={'villager_red': 1}),
+                    _fig(13, 'Gorkha Warriors', 'military', 'Hearts', [8, 9],
+                         requires={'food_red': 4}),
+                ],
+            },
+            {
+                'id': 2,
+                'turns_left': 3,
+                'main_hand': [],
+                'side_hand': [],
+                'figures': [
+                    _fig(21, 'Himalaya Maharaja', 'castle', 'Spades', [15]),
+                    _fig(22, 'Cavalry', 'military', 'Spades', [10, 7]),
+                ],
+            },
+        ],
+        'main_cards': [
+            {'rank': 'A', 'suit': 'Hearts', 'in_deck': True},
+            {'rank': '7', 'suit': 'Hearts', 'in_deck': True},
+            {'rank': '7', 'suit': 'Hearts', 'in_deck': False},
+        ],
+        'side_cards': [{'rank': '2', 'suit': 'Hearts', 'in_deck': True}],
+    }
+
+
+_ACTIONS = [
+    {'id': 1, 'type': 'change_cards', 'description': 'change weak cards', 'params': {}},
+    {'id': 2, 'type': 'advance_figure', 'description': 'advance', 'params': {'figure_id': 13}},
+    {'id': 3, 'type': 'cast_spell', 'description': 'Cast Poison',
+     'params': {'spell_name': 'Poison', 'target_figure_id': 22}},
+    {'id': 4, 'type': 'cast_spell', 'description': 'Cast Health Boost',
+     'params': {'spell_name': 'Health Boost', 'target_figure_id': 13}},
+    {'id': 5, 'type': 'cast_spell', 'description': 'Cast Peasant War',
+     'params': {'spell_name': 'Peasant War'}},
+]
+
+
+def test_index_lookups_match_game_dict():
+    game = _game_dict()
+    index = GameStateIndex(game)
+
+    assert index.player(2) is game['players'][1]
+    assert index.opponent(1) is game['players'][1]
+    assert index.player(99) is None
+    assert index.figure(22)['name'] == 'Cavalry'
+    assert index.figure(None) is None
+    assert [f['id'] for f in index.figures_in_field(1, 'Military')] == [13]
+    assert [c['id'] for c in index.free_hand_cards(1, 'main_hand')] == [1, 2]
+    assert index.free_hand_counts(1, 'main_hand')[('K', 'Hearts')] == 1
+    assert index.deck_counts('main') == {('A', 'Hearts'): 1, ('7', 'Hearts'): 1}
+    assert GameStateIndex.of(game, index) is index
+    assert GameStateIndex.of(_game_dict(), index) is not index
+
+
+def test_support_bonus_shares_one_deficit_pass_per_figure_list(monkeypatch):
+    game = _game_dict()
+    calls = []
+    real = state_index.compute_resource_totals
+
+    def counting(figures):
+        calls.append(id(figures))
+        return real(figures)
+
+    monkeypatch.setattr(state_index, 'compute_resource_totals', counting)
+    index = GameStateIndex(game)
+    own = game['players'][0]['figures']
+
+    bonuses = [index.support_bonus(fig, own) for fig in own for _ in range(3)]
+
+    assert bonuses == [compute_support_bonus(fig, own) for fig in own for _ in range(3)]
+    assert calls == [id(own)]
+
+    # A list the index never saw is computed afresh, not served stale.
+    hypothetical = own[:2]
+    assert index.support_bonus(own[1], hypothetical) == compute_support_bonus(own[1], hypothetical)
+    assert len(calls) == 2
+
+
+def test_planner_with_shared_index_matches_and_runs_deficit_pass_once(monkeypatch):
+    baseline = generate_strategy_plans(_game_dict(), 1, 'normal_turn', _ACTIONS, max_plans=5)
+
+    calls = []
+    real = state_index.compute_resource_totals
+    monkeypatch.setattr(state_index, 'compute_resource_totals',
+                        lambda figures: calls.append(1) or real(figures))
+    game = _game_dict()
+    index = GameStateIndex(game)
+    plans = generate_strategy_plans(game, 1, 'normal_turn', _ACTIONS, max_plans=5, index=index)
+
+    assert plans == baseline
+    # One pass per player's figure list, independent of the action count.
+    assert len(calls) <= 2
+
+
+def test_choose_action_is_unchanged_by_a_shared_index():
+    for phase, actions in (
+        ('normal_turn', _ACTIONS),
+        ('select_defender', [
+            {'id': 1, 'type': 'select_defender', 'description': 'd', 'params': {'figure_id': 21}},
+            {'id': 2, 'type': 'select_defender', 'description': 'd', 'params': {'figure_id': 22}},
+        ]),
+    ):
+        game = _game_dict()
+        without = duel_strategy.choose_action(game, 1, phase, actions, random.Random(3))
+        with_index = duel_strategy.choose_action(
+            game, 1, phase, actions, random.Random(3), index=GameStateIndex(game),
+        )
+        assert with_index == without
@@ -201,6 +201,7 @@ def test_generate_strategy_plans_forwards_draw_limits_to_target_selection(monkey
         max_results=6,
         max_main_draws_per_turn=2,
         max_side_draws_per_turn=1,
+        index=None,
     ):
         captured['remaining_turns'] = remaining_turns
         captured['max_results'] = max_results
@@ -220,7 +221,7 @@ def test_generate_strategy_plans_forwards_draw_limits_to_target_selection(monkey
             }
         ]
 
-    def fake_belief_snapshot(_game_dict, _ai_player_id):
+    def fake_belief_snapshot(_game_dict, _ai_player_id, index=None):
         return {
             'likely_battle_figures': [
                 {'name': 'Opp Military', 'power_estimate': 9, 'probability': 0.6}
@@ -268,7 +269,7 @@ def _stub_planner(monkeypatch, targets, opp_figs=None):
     def fake_targets(_g, _pid, **_kw):
         return targets
 
-    def fake_belief(_g, _pid):
+    def fake_belief(_g, _pid, index=None):
         return {
             'likely_battle_figures': opp_figs or [],
             'active_battle_modifiers': [],
@@ -2,6 +2,8 @@
 # See LICENSE file in the project root for full license information.
 """Worker-level tests for AI orchestration and execution helpers."""
 
+import threading
+
 import pytest
 from types import SimpleNamespace
 
@@ -10,9 +12,7 @@ from ai import ai_worker
 
 @pytest.fixture(autouse=True)
 def reset_ai_worker_state():
-    with ai_worker._active_games_lock:
-        ai_worker._active_games.clear()
-        ai_worker._pending_retrigger.clear()
+    ai_worker._ai_scheduler.clear()
     with ai_worker._ai_player_user_ids_lock:
         ai_worker._ai_player_user_ids.clear()
     with ai_worker._internal_service_tokens_lock:
@@ -25,9 +25,7 @@ def reset_ai_worker_state():
 
     yield
 
-    with ai_worker._active_games_lock:
-        ai_worker._active_games.clear()
-        ai_worker._pending_retrigger.clear()
+    ai_worker._ai_scheduler.clear()
     with ai_worker._ai_player_user_ids_lock:
         ai_worker._ai_player_user_ids.clear()
     with ai_worker._internal_service_tokens_lock:
@@ -527,46 +525,105 @@ def test_conquer_try_finish_battle_if_ready_posts_finish_request(monkeypatch):
     assert calls[0][2]['game_id'] == 73
 
 
-def test_conquer_ai_loop_processes_pending_retrigger_on_exit(app, db, monkeypatch):
+def test_conquer_ai_loop_leaves_pending_retrigger_to_scheduler(app, db, monkeypatch):
+    from ai.scheduler import AIScheduler
+
     game, ai_player = _create_game_with_ai(db)
     game.mode = 'conquer'
     db.session.commit()
 
     monkeypatch.setattr(ai_worker.time, 'sleep', lambda *_args, **_kwargs: None)
     monkeypatch.setattr(ai_worker, 'detect_phase', lambda *_args, **_kwargs: None)
+    scheduler = AIScheduler(0)
+    monkeypatch.setattr(ai_worker, '_ai_scheduler', scheduler)
 
-    trigger_calls = []
-    monkeypatch.setattr(
-        ai_worker,
-        'trigger_ai_if_needed',
-        lambda game_id, app=None: trigger_calls.append(game_id),
-    )
+    runs = []
+
+    def loop_then_retrigger(*args):
+        runs.append(args[1])
+        if len(runs) == 1:
+            assert scheduler.submit(game.id, loop_then_retrigger, args) == AIScheduler.RETRIGGER
+        ai_worker._conquer_ai_loop(*args)
 
-    with ai_worker._active_games_lock:
-        ai_worker._active_games.add(game.id)
-        ai_worker._pending_retrigger.add(game.id)
+    scheduler.submit(game.id, loop_then_retrigger, (app, game.id, ai_player.id))
 
-    ai_worker._conquer_ai_loop(app, game.id, ai_player.id)
+    # The retrigger submitted mid-loop ran exactly once after the loop exited.
+    assert runs == [game.id, game.id]
+    assert not scheduler.is_active(game.id)
+    assert not scheduler.has_retrigger(game.id)
 
-    assert trigger_calls == [game.id]
-    with ai_worker._active_games_lock:
-        assert game.id not in ai_worker._active_games
-        assert game.id not in ai_worker._pending_retrigger
+
+def test_pooled_conquer_ai_loop_defers_instead_of_sleeping(app, db, monkeypatch):
+    from ai.scheduler import AIScheduler
+
+    game, ai_player = _create_game_with_ai(db)
+    game.mode = 'conquer'
+    db.session.commit()
+
+    def no_sleep(*_args, **_kwargs):
+        raise AssertionError('conquer loop slept on a pool worker')
+
+    phases = []
+    monkeypatch.setattr(ai_worker.time, 'sleep', no_sleep)
+    monkeypatch.setattr(ai_worker, 'detect_phase',
+                        lambda *_args, **_kwargs: phases.append(None))
+    scheduler = AIScheduler(1, name='test-conquer-defer')
+    monkeypatch.setattr(ai_worker, '_ai_scheduler', scheduler)
+    game_id = game.id
+
+    try:
+        scheduler.submit(game_id, ai_worker._conquer_ai_loop, (app, game_id, ai_player.id))
+        tick = threading.Event()
+        for _ in range(200):
+            if not scheduler.is_active(game_id):
+                break
+            tick.wait(0.05)
+    finally:
+        scheduler.shutdown(timeout=1)
+
+    # The turn-flip recheck ran as a deferred second step, then the loop ended.
+    assert phases == [None, None]
+    assert not scheduler.is_active(game_id)
+    assert scheduler.metrics()['failed'] == 0
 
 
 def test_trigger_ai_if_needed_marks_pending_retrigger_when_game_already_active(app, db, monkeypatch):
+    from ai.scheduler import AIScheduler
+
     game, ai_player = _create_game_with_ai(db)
 
     monkeypatch.setattr(ai_worker.settings, 'AI_ENABLED', True)
     monkeypatch.setattr(ai_worker, 'detect_phase', lambda *_args, **_kwargs: 'normal_turn')
+    scheduler = AIScheduler(0)
+    monkeypatch.setattr(ai_worker, '_ai_scheduler', scheduler)
+    observed = []
+
+    def running_loop(_app, game_id, _player_id):
+        ai_worker.trigger_ai_if_needed(game_id, app=app)
+        observed.append(scheduler.consume_retrigger(game_id))
+
+    scheduler.submit(game.id, running_loop, (app, game.id, ai_player.id))
+
+    assert observed == [True]
 
-    with ai_worker._active_games_lock:
-        ai_worker._active_games.add(game.id)
+
+def test_trigger_ai_if_needed_does_not_serialize_game(app, db, monkeypatch):
+    from models import Game
+
+    game, _ai_player = _create_game_with_ai(db)
+    submitted = []
+
+    def fail_serialize(_self):
+        raise AssertionError('trigger serialized the game graph')
+
+    monkeypatch.setattr(ai_worker.settings, 'AI_ENABLED', True)
+    monkeypatch.setattr(Game, 'serialize', fail_serialize)
+    monkeypatch.setattr(ai_worker._ai_scheduler, 'submit',
+                        lambda key, fn, args=(), delay=0.0: submitted.append(key) or 'queued')
 
     ai_worker.trigger_ai_if_needed(game.id, app=app)
 
-    with ai_worker._active_games_lock:
-        assert game.id in ai_worker._pending_retrigger
+    assert submitted == [game.id]
 
 
 def test_handle_finish_battle_draw_picks_high_value_card(monkeypatch):
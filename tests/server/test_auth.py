@@ -319,6 +319,46 @@ class TestTokenDecorator:
         assert user.suspended_until is None
 
 
+    def test_accepted_principal_is_cached_until_invalidated(
+        self, client, db, two_users, auth_headers_user1,
+    ):
+        from principal_cache import cache_stats, invalidate_user
+
+        user, _ = two_users
+        assert client.post(
+            '/auth/heartbeat', headers=auth_headers_user1,
+        ).status_code == 200
+        assert client.post(
+            '/auth/heartbeat', headers=auth_headers_user1,
+        ).status_code == 200
+        assert cache_stats() == {'hits': 1, 'misses': 1}
+
+        # A ban committed by another worker is only seen once the entry
+        # expires or this process invalidates it.
+        user.account_status = 'banned'
+        db.session.commit()
+        assert client.post(
+            '/auth/heartbeat', headers=auth_headers_user1,
+        ).status_code == 200
+        invalidate_user(user.id)
+        response = client.post('/auth/heartbeat', headers=auth_headers_user1)
+        assert response.status_code == 403
+        assert response.get_json()['reason'] == 'account_banned'
+
+    def test_zero_ttl_disables_principal_cache(
+        self, client, two_users, auth_headers_user1, monkeypatch,
+    ):
+        import security_settings
+        from principal_cache import cache_stats
+
+        monkeypatch.setattr(security_settings, 'AUTH_PRINCIPAL_CACHE_TTL_SECONDS', 0)
+        for _ in range(2):
+            assert client.post(
+                '/auth/heartbeat', headers=auth_headers_user1,
+            ).status_code == 200
+        assert cache_stats() == {'hits': 0, 'misses': 2}
+
+
 class TestAccountLifecycle:
     def _register(self, client, username='account_user', email=None):
         data = _register_data(username, 'original-pass')
@@ -539,6 +579,48 @@ class TestGameMembership:
         assert payload == {'success': False, 'message': 'Invalid game ID'}
 
 
+    def test_repeat_checks_in_one_request_reuse_the_membership(
+        self, app, db, two_users,
+    ):
+        from flask import g
+        from sqlalchemy import event
+        from models import Game, Player
+        from routes.auth import get_game_membership, verify_player_ownership
+
+        user, _ = two_users
+        game = Game(current_round=1, stake=10)
+        db.session.add(game)
+        db.session.commit()
+        player = Player(user_id=user.id, game_id=game.id, turns_left=1,
+                        points=0)
+        db.session.add(player)
+        db.session.commit()
+        user_id, game_id, player_id = user.id, game.id, player.id
+        db.session.expire_all()
+
+        selects = []
+
+        def record(_conn, _cursor, statement, *_args):
+            if statement.lstrip().upper().startswith('SELECT'):
+                selects.append(statement)
+
+        event.listen(db.engine, 'before_cursor_execute', record)
+        try:
+            with app.test_request_context():
+                g.user_id = user_id
+                first, _response, _status = get_game_membership(game_id)
+                assert len(selects) == 1
+                again, _response, _status = get_game_membership(game_id)
+                assert verify_player_ownership(player_id) is None
+                assert verify_player_ownership(player_id) is None
+                assert db.session.get(Game, game_id).id == game_id
+        finally:
+            event.remove(db.engine, 'before_cursor_execute', record)
+
+        assert first.id == again.id == player_id
+        assert len(selects) == 1
+
+
 class TestGetUsers:
     def test_get_users_returns_others(self, client, two_users):
         u1, u2 = two_users
@@ -0,0 +1,129 @@
+# Copyright (c) 2026 Marc Stieffenhofer. All rights reserved.
+# See LICENSE file in the project root for full license information.
+"""Counted collection stacks maintained beside the per-copy rows."""
+
+from sqlalchemy import case
+
+from collection_inventory import rebuild_collection_stacks
+from collection_snapshot import serialize_collection_snapshot
+from models import CollectionCard, CollectionStack
+
+
+def _stacks(db, user_id):
+    return {
+        (row.suit, row.rank): (row.free_count, row.locked_count)
+        for row in db.session.query(CollectionStack).filter_by(user_id=user_id)
+        .populate_existing()
+    }
+
+
+def _counted(db, user_id):
+    locked = db.func.sum(case((CollectionCard.locked.is_(True), 1), else_=0))
+    rows = (
+        db.session.query(CollectionCard.suit, CollectionCard.rank,
+                         db.func.count(CollectionCard.id), locked)
+        .filter(CollectionCard.user_id == user_id)
+        .group_by(CollectionCard.suit, CollectionCard.rank)
+    )
+    return {(suit, rank): (total - held, held) for suit, rank, total, held in rows}
+
+
+def _add(db, user_id, suit, rank, count=1, locked=False):
+    cards = [CollectionCard(user_id=user_id, suit=suit, rank=rank, value=4, locked=locked)
+             for _ in range(count)]
+    db.session.add_all(cards)
+    return cards
+
+
+def test_commits_keep_stacks_in_step_with_copies(db, two_users):
+    u1, u2 = two_users
+    cards = _add(db, u1.id, 'Hearts', 'K', count=3)
+    _add(db, u2.id, 'Hearts', 'K', count=1)
+    db.session.commit()
+    assert _stacks(db, u1.id) == {('Hearts', 'K'): (3, 0)}
+
+    cards[0].locked = True
+    db.session.delete(cards[1])
+    db.session.commit()
+    assert _stacks(db, u1.id) == {('Hearts', 'K'): (1, 1)}
+    assert _stacks(db, u2.id) == {('Hearts', 'K'): (1, 0)}
+
+    cards[2].suit = 'Spades'
+    db.session.commit()
+    assert _stacks(db, u1.id) == {('Hearts', 'K'): (0, 1), ('Spades', 'K'): (1, 0)}
+    assert _stacks(db, u1.id) == _counted(db, u1.id)
+
+
+def test_bulk_statements_are_counted(db, two_users):
+    u1, _ = two_users
+    _add(db, u1.id, 'Clubs', '7', count=4)
+    db.session.commit()
+
+    ids = [card_id for (card_id,) in db.session.query(CollectionCard.id).limit(2)]
+    CollectionCard.query.filter(CollectionCard.id.in_(ids)).update(
+        {CollectionCard.locked: True}, synchronize_session=False)
+    db.session.commit()
+    assert _stacks(db, u1.id) == {('Clubs', '7'): (2, 2)}
+
+    CollectionCard.query.filter_by(user_id=u1.id).delete(synchronize_session=False)
+    db.session.commit()
+    assert _stacks(db, u1.id) == {}
+
+
+def test_rollback_leaves_stacks_untouched(db, two_users):
+    u1, _ = two_users
+    _add(db, u1.id, 'Diamonds', 'A', count=2)
+    db.session.commit()
+
+    _add(db, u1.id, 'Diamonds', 'A', count=5)
+    db.session.flush()
+    db.session.rollback()
+    db.session.commit()
+
+    assert _stacks(db, u1.id) == {('Diamonds', 'A'): (2, 0)}
+
+
+def test_snapshot_sees_uncommitted_copies(db, two_users):
+    u1, _ = two_users
+    _add(db, u1.id, 'Spades', '9', count=2, locked=True)
+    db.session.flush()
+
+    cards = serialize_collection_snapshot(u1)['cards']
+
+    assert cards == [{'suit': 'Spades', 'rank': '9', 'value': 4,
+                      'total': 2, 'locked': 2, 'free': 0}]
+
+
+def test_rebuild_repairs_drifted_stacks(db, two_users):
+    u1, _ = two_users
+    _add(db, u1.id, 'Hearts', '8', count=3)
+    db.session.commit()
+    db.session.query(CollectionStack).update({CollectionStack.free_count: 99})
+    db.session.commit()
+
+    rebuild_collection_stacks(db.session)
+    db.session.commit()
+
+    assert _stacks(db, u1.id) == {('Hearts', '8'): (3, 0)}
+
+
+def test_booster_open_and_sell_update_stacks(client, db, two_users, auth_headers_user1):
+    u1, _ = two_users
+    u1.booster_packs = 2
+    u1.onboarding_state = dict(u1.onboarding_state or {}, starter_set_granted=True)
+    db.session.commit()
+
+    rv = client.post('/collection/open_booster', headers=auth_headers_user1,
+                     json={'quantity': 2})
+    assert rv.status_code == 200
+    assert _stacks(db, u1.id) == _counted(db, u1.id)
+    assert sum(free for free, _ in _stacks(db, u1.id).values()) == 6
+
+    card = rv.get_json()['cards'][0]
+    before = _stacks(db, u1.id)[(card['suit'], card['rank'])][0]
+    rv = client.post('/collection/sell_card', headers=auth_headers_user1,
+                     json={'suit': card['suit'], 'rank': card['rank'], 'quantity': 1})
+    assert rv.status_code == 200
+    after = _stacks(db, u1.id).get((card['suit'], card['rank']), (0, 0))[0]
+    assert after == before - 1
+    assert _stacks(db, u1.id) == _counted(db, u1.id)
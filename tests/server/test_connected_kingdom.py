@@ -76,6 +76,68 @@ class TestConnectedKingdomComponents:
         assert cooldown == 100
 
 
+class TestScopedKingdomReconcile:
+    """Transfers rebuild only the kingdoms around the moved lands."""
+
+    def _transfer(self, db, land, new_owner_id):
+        land.owner_user_id = new_owner_id
+        land.kingdom_id = None
+        db.session.commit()
+
+    def test_gained_land_joins_adjacent_kingdom_without_touching_others(self, db,
+                                                                        two_users):
+        import kingdom_service
+        from kingdom_service import reconcile_after_land_transfer, reconcile_user_kingdoms
+
+        u1, u2 = two_users
+        a = _add_land(db, 0, 0, owner_id=u1.id)
+        _add_land(db, 1, 0, owner_id=u1.id)
+        far = _add_land(db, 6, 6, owner_id=u1.id)
+        gained = _add_land(db, 2, 0, owner_id=u2.id)
+        reconcile_user_kingdoms(u1.id, commit=True)
+        reconcile_user_kingdoms(u2.id, commit=True)
+        self._transfer(db, gained, u1.id)
+
+        seen = []
+        real = kingdom_service._connected_land_components_for_lands
+
+        def spy(lands):
+            seen.extend(land.id for land in lands)
+            return real(lands)
+
+        with patch.object(kingdom_service, '_connected_land_components_for_lands', spy):
+            reconcile_after_land_transfer(u2.id, u1.id, land_ids=[gained.id], commit=True)
+
+        assert gained.kingdom_id == a.kingdom_id
+        assert far.kingdom_id not in (None, a.kingdom_id)
+        assert far.id not in seen
+
+    def test_lost_land_splits_kingdom_like_full_reconcile(self, db, two_users):
+        from models import Kingdom
+        from kingdom_service import reconcile_after_land_transfer, reconcile_user_kingdoms
+
+        u1, u2 = two_users
+        left = _add_land(db, 0, 0, owner_id=u1.id)
+        middle = _add_land(db, 1, 0, owner_id=u1.id)
+        right = _add_land(db, 2, 0, owner_id=u1.id)
+        reconcile_user_kingdoms(u1.id, commit=True)
+        original = left.kingdom_id
+        self._transfer(db, middle, u2.id)
+
+        reconcile_after_land_transfer(u1.id, u2.id, land_ids=[middle.id], commit=True)
+
+        assert {left.kingdom_id, right.kingdom_id} >= {original}
+        assert left.kingdom_id != right.kingdom_id
+        assert middle.kingdom_id not in (None, left.kingdom_id, right.kingdom_id)
+        assert Kingdom.query.filter_by(owner_user_id=u1.id).count() == 2
+
+        # A full reconcile finds nothing left to fix.
+        before = {land.id: land.kingdom_id for land in (left, middle, right)}
+        reconcile_user_kingdoms(u1.id, commit=True)
+        reconcile_user_kingdoms(u2.id, commit=True)
+        assert {land.id: land.kingdom_id for land in (left, middle, right)} == before
+
+
 class TestConnectedKingdomRoutes:
 
     def test_map_exposes_component_data_and_no_legacy_bonuses(self, client, db, two_users,
@@ -0,0 +1,100 @@
+# Copyright (c) 2026 Marc Stieffenhofer. All rights reserved.
+# See LICENSE file in the project root for full license information.
+"""Tests for the post-commit domain event bus (server/domain_events.py)."""
+
+import pytest
+
+import domain_events
+from domain_events import (BattlePhaseChanged, DispatchContext, GameFinished,
+                           TurnChanged, coalesce, dispatch, take_committed)
+from models import db, BattleMove, Game, Player
+
+
+@pytest.fixture
+def duel(two_users):
+    u1, u2 = two_users
+    game = Game(state='open', mode='duel')
+    db.session.add(game)
+    db.session.flush()
+    p1 = Player(user_id=u1.id, game_id=game.id, turns_left=3, points=0)
+    p2 = Player(user_id=u2.id, game_id=game.id, turns_left=3, points=0)
+    db.session.add_all([p1, p2])
+    db.session.flush()
+    game.turn_player_id = p1.id
+    db.session.commit()
+    take_committed(db.session)
+    return game, p1, p2
+
+
+@pytest.fixture
+def subscribers(monkeypatch):
+    """Run dispatch against an empty subscriber list."""
+    monkeypatch.setattr(domain_events, '_subscribers', [])
+
+
+def test_turn_and_finish_commits_record_typed_events(app, duel):
+    game, p1, p2 = duel
+    game_id, p1_id, p2_id = game.id, p1.id, p2.id
+    assert game.turn_player_id == p1_id
+    game.turn_player_id = p2_id
+    db.session.commit()
+    game.state = 'finished'
+    db.session.flush()
+    game.winner_player_id = p1_id
+    db.session.commit()
+
+    events = coalesce(take_committed(db.session))
+
+    assert TurnChanged(game_id, 'duel', p2_id, p1_id) in events
+    assert GameFinished(game_id, 'duel', p1_id) in events
+    assert take_committed(db.session) == []
+
+
+def test_battle_move_rows_count_as_phase_change(app, duel):
+    game, p1, _ = duel
+    db.session.add(BattleMove(game_id=game.id, player_id=p1.id, family_name='Dagger',
+                              card_id=1, card_type='main', suit='Hearts', rank='8',
+                              value=8))
+    db.session.commit()
+
+    events = take_committed(db.session)
+
+    assert events == [BattlePhaseChanged(game.id, None, ('battle_moves',))]
+
+
+def test_unrelated_commit_records_nothing(app, duel):
+    game, _, _ = duel
+    game.turn_email_log = {'turn:1': 'x'}
+    db.session.commit()
+
+    assert take_committed(db.session) == []
+
+
+def test_coalesce_keeps_first_previous_and_last_target():
+    merged = coalesce([
+        TurnChanged(1, 'duel', 2, 1),
+        BattlePhaseChanged(1, 'duel', ('battle_confirmed',)),
+        TurnChanged(1, 'duel', 1, 2),
+        BattlePhaseChanged(1, None, ('battle_moves',)),
+    ])
+
+    assert merged == [
+        TurnChanged(1, 'duel', 1, 1),
+        BattlePhaseChanged(1, 'duel', ('battle_confirmed', 'battle_moves')),
+    ]
+
+
+def test_dispatch_filters_by_type_and_isolates_failures(subscribers):
+    seen = []
+
+    def broken(events, context):
+        raise RuntimeError('boom')
+
+    domain_events.subscribe(broken, TurnChanged)
+    domain_events.subscribe(lambda events, context: seen.append((events, context)),
+                            GameFinished)
+    context = DispatchContext(requester_user_id=7)
+
+    dispatch([TurnChanged(1, 'duel', 2, 1), GameFinished(1, 'duel', 2)], context)
+
+    assert seen == [([GameFinished(1, 'duel', 2)], context)]
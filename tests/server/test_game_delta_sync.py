@@ -0,0 +1,256 @@
+# Copyright (c) 2026 Marc Stieffenhofer. All rights reserved.
+# See LICENSE file in the project root for full license information.
+"""Tests for per-game state versions and ``get_game`` delta polling.
+
+Test oracle (desired outcomes):
+- Committing a change to any row of a game's graph bumps ``state_version``
+  once and stamps the touched payload sections.
+- Transactions that only read, or only touch the version columns, never bump.
+- Bulk deletes inside ``scoped_game_mutation`` count as changes to that game.
+- ``get_game?since_version=current`` answers ``unchanged``; an older version
+  receives scalar fields plus only the changed list sections.
+- Delta polls read log/chat rows only past the cursor, never the full history.
+- ``unchanged`` and delta bodies carry every player's online presence.
+- An All Seeing Eye starting or ending stamps every section it un-redacts.
+"""
+
+import json
+
+import pytest
+
+
+@pytest.fixture
+def delta_game(db):
+    from models import Game, Player, User
+    from werkzeug.security import generate_password_hash
+
+    u1 = User(username='delta_p1', password_hash=generate_password_hash('p'), gold=120)
+    u2 = User(username='delta_p2', password_hash=generate_password_hash('p'), gold=120)
+    db.session.add_all([u1, u2])
+    db.session.commit()
+
+    game = Game(current_round=1, stake=35)
+    db.session.add(game)
+    db.session.commit()
+
+    p1 = Player(user_id=u1.id, game_id=game.id, turns_left=6, points=0)
+    p2 = Player(user_id=u2.id, game_id=game.id, turns_left=6, points=0)
+    db.session.add_all([p1, p2])
+    db.session.commit()
+    game.turn_player_id = p1.id
+    db.session.commit()
+    return game, p1, p2
+
+
+@pytest.fixture
+def delta_headers(app, delta_game):
+    from routes.auth import generate_token
+
+    _, p1, _ = delta_game
+    return {'Authorization': f'Bearer {generate_token(p1.user_id)}'}
+
+
+def _add_log(db, game, player, message):
+    from models import LogEntry
+
+    entry = LogEntry(game_id=game.id, player_id=player.id, round_number=1,
+                     turn_number=1, message=message, author='system', type='move')
+    db.session.add(entry)
+    db.session.commit()
+    return entry
+
+
+def _add_spell(db, game, player, name):
+    from models import ActiveSpell
+
+    spell = ActiveSpell(game_id=game.id, player_id=player.id, spell_name=name,
+                        spell_type='enchantment', spell_family_name=name,
+                        suit='Hearts', cast_round=1, duration=2)
+    db.session.add(spell)
+    db.session.commit()
+    return spell
+
+
+class TestStateVersion:
+    def test_row_changes_bump_version_and_stamp_sections(self, db, delta_game):
+        game, p1, _ = delta_game
+        start = game.state_version
+
+        _add_log(db, game, p1, 'drew a card')
+
+        assert game.state_version == start + 1
+        assert game.state_section_versions['log_entries'] == start + 1
+
+        p1.points = 4
+        db.session.commit()
+
+        assert game.state_version == start + 2
+        assert game.state_section_versions['players'] == start + 2
+        assert game.state_section_versions['log_entries'] == start + 1
+
+    def test_reads_and_empty_commits_do_not_bump(self, db, delta_game):
+        from models import Game
+
+        game, _, _ = delta_game
+        start = game.state_version
+
+        db.session.get(Game, game.id).serialize()
+        db.session.commit()
+
+        assert game.state_version == start
+
+    def test_scoped_bulk_delete_bumps_game(self, db, delta_game):
+        from game_service.game_state_version import scoped_game_mutation
+        from models import LogEntry
+
+        game, p1, _ = delta_game
+        _add_log(db, game, p1, 'temporary')
+        start = game.state_version
+
+        with scoped_game_mutation(game.id):
+            LogEntry.query.filter_by(game_id=game.id).delete()
+            db.session.commit()
+
+        assert game.state_version == start + 1
+        assert game.state_section_versions['log_entries'] == start + 1
+
+
+    def test_all_seeing_eye_stamps_the_sections_it_reveals(self, db, delta_game):
+        from game_service.game_state_version import REVEAL_SECTIONS, scoped_game_mutation
+        from models import ActiveSpell
+
+        game, p1, _ = delta_game
+        _add_spell(db, game, p1, 'Poison')
+        poison_version = game.state_version
+        assert game.state_section_versions.get('players', 0) < poison_version
+
+        eye = _add_spell(db, game, p1, 'All Seeing Eye')
+        started = game.state_version
+        eye.is_active = False
+        db.session.commit()
+        ended = game.state_version
+        with scoped_game_mutation(game.id):
+            ActiveSpell.query.filter_by(game_id=game.id).delete()
+            db.session.commit()
+
+        assert started == poison_version + 1
+        assert ended == started + 1
+        for section in REVEAL_SECTIONS + ('active_spells',):
+            assert game.state_section_versions[section] == ended + 1
+
+
+class TestGetGameDelta:
+    def _get(self, client, headers, **params):
+        query = '&'.join(f'{key}={value}' for key, value in params.items())
+        response = client.get(f'/games/get_game?{query}', headers=headers)
+        assert response.status_code == 200
+        return response.get_json()
+
+    def test_full_snapshot_reports_state_version(self, client, delta_game, delta_headers):
+        game, _, _ = delta_game
+
+        body = self._get(client, delta_headers, game_id=game.id)
+
+        assert body['game']['state_version'] == game.state_version
+        assert 'delta' not in body
+
+    def test_current_version_is_unchanged(self, client, delta_game, delta_headers):
+        game, _, _ = delta_game
+        version = self._get(client, delta_headers, game_id=game.id)['game']['state_version']
+
+        body = self._get(client, delta_headers, game_id=game.id, since_version=version)
+
+        assert body == {'unchanged': True, 'state_version': version,
+                        'presence': body['presence']}
+
+    def test_unchanged_and_delta_polls_report_presence(self, db, client, delta_game,
+                                                       delta_headers):
+        from datetime import datetime, timedelta, timezone
+        from models import User
+
+        game, p1, p2 = delta_game
+        version = self._get(client, delta_headers, game_id=game.id)['game']['state_version']
+        opponent = db.session.get(User, p2.user_id)
+        opponent.last_active = datetime.now(timezone.utc).replace(tzinfo=None)
+        db.session.commit()
+
+        unchanged = self._get(client, delta_headers, game_id=game.id, since_version=version)
+        assert unchanged['unchanged'] is True
+        assert unchanged['presence'][str(p2.id)] is True
+
+        opponent.last_active -= timedelta(minutes=5)
+        _add_log(db, game, p1, 'moved')
+        delta = self._get(client, delta_headers, game_id=game.id, since_version=version)
+        assert 'players' not in delta['game']
+        assert delta['presence'][str(p2.id)] is False
+
+    def test_all_seeing_eye_resends_the_opponent_hand(self, db, client, delta_game,
+                                                      delta_headers):
+        from models import MainCard
+
+        game, p1, p2 = delta_game
+        db.session.add(MainCard(game_id=game.id, player_id=p2.id, rank='K',
+                                suit='Hearts', value=4, in_deck=False))
+        db.session.commit()
+        version = self._get(client, delta_headers, game_id=game.id)['game']['state_version']
+
+        _add_spell(db, game, p1, 'All Seeing Eye')
+        body = self._get(client, delta_headers, game_id=game.id, since_version=version)
+
+        opponent = next(p for p in body['game']['players'] if p['id'] == p2.id)
+        assert [card['rank'] for card in opponent['main_hand']] == ['K']
+
+    def test_delta_contains_only_changed_sections(self, db, client, delta_game, delta_headers):
+        game, p1, p2 = delta_game
+        first = _add_log(db, game, p1, 'first')
+        version = self._get(client, delta_headers, game_id=game.id)['game']['state_version']
+
+        response = client.post(
+            '/msg/add_chat_message',
+            data=json.dumps({'game_id': game.id, 'sender_id': p1.id,
+                             'receiver_id': p2.id, 'message': 'hello'}),
+            content_type='application/json',
+            headers=delta_headers,
+        )
+        assert response.get_json()['success'] is True
+        second = _add_log(db, game, p1, 'second')
+
+        body = self._get(client, delta_headers, game_id=game.id,
+                         since_version=version, log_after_id=first.id)
+
+        assert body['delta'] is True
+        delta = body['game']
+        assert delta['state_version'] > version
+        assert delta['turn_player_id'] == p1.id
+        assert [entry['id'] for entry in delta['log_entries']] == [second.id]
+        assert [msg['message'] for msg in delta['chat_messages']] == ['hello']
+        assert delta['appended_sections'] == ['log_entries']
+        assert 'players' not in delta
+        assert 'players' in delta['omitted_sections']
+        assert 'chat_messages' not in delta['omitted_sections']
+
+    def test_delta_fetches_history_by_cursor(self, db, client, delta_game, delta_headers):
+        from sqlalchemy import event
+
+        game, p1, _ = delta_game
+        first_id = _add_log(db, game, p1, 'first').id
+        version = self._get(client, delta_headers, game_id=game.id)['game']['state_version']
+        _add_log(db, game, p1, 'second')
+        history_selects = []
+
+        def record(_conn, _cursor, statement, *_args):
+            if 'FROM log_entry' in statement or 'FROM chat_message' in statement:
+                history_selects.append(statement)
+
+        event.listen(db.engine, 'before_cursor_execute', record)
+        try:
+            body = self._get(client, delta_headers, game_id=game.id,
+                             since_version=version, log_after_id=first_id)
+        finally:
+            event.remove(db.engine, 'before_cursor_execute', record)
+
+        assert [entry['message'] for entry in body['game']['log_entries']] == ['second']
+        # Only the changed log section is read, and only past the cursor;
+        # chat was not touched after ``version`` so it is not loaded at all.
+        assert len(history_selects) == 1
+        assert 'log_entry.id >' in history_selects[0]
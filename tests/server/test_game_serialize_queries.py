@@ -0,0 +1,118 @@
+# Copyright (c) 2026 Marc Stieffenhofer. All rights reserved.
+# See LICENSE file in the project root for full license information.
+"""Regression tests for the bulk-loaded ``Game.serialize()`` path."""
+import json
+from contextlib import contextmanager
+
+from sqlalchemy import event
+
+
+def _build_game(db, two_users, *, figures_per_player):
+    from models import (
+        CardRole, CardToFigure, ChatMessage, Figure, Game, LogEntry,
+        MainCard, MainRank, Player, SideCard, SideRank, Suit,
+    )
+
+    u1, u2 = two_users
+    game = Game(current_round=1, stake=35, mode='duel')
+    db.session.add(game)
+    db.session.flush()
+    players = [
+        Player(user_id=u1.id, game_id=game.id, turns_left=2, points=0),
+        Player(user_id=u2.id, game_id=game.id, turns_left=0, points=3),
+    ]
+    db.session.add_all(players)
+    db.session.flush()
+    game.turn_player_id = players[0].id
+
+    for player in players:
+        # Deck cards, hand cards and figure cards for each player.
+        db.session.add(MainCard(suit=Suit.SPADES, rank=MainRank.SEVEN, value=7,
+                                game_id=game.id, in_deck=True, deck_position=1))
+        db.session.add(MainCard(suit=Suit.HEARTS, rank=MainRank.EIGHT, value=8,
+                                game_id=game.id, player_id=player.id, in_deck=False))
+        db.session.add(SideCard(suit=Suit.CLUBS, rank=SideRank.TWO, value=2,
+                                game_id=game.id, player_id=player.id, in_deck=False))
+        for index in range(figures_per_player):
+            figure = Figure(
+                player_id=player.id, game_id=game.id, family_name='Villager',
+                field='village', color='red', name=f'Villager {index}',
+                suit='Hearts', produces={'food': 1},
+            )
+            key = MainCard(suit=Suit.HEARTS, rank=MainRank.KING, value=4,
+                           game_id=game.id, player_id=player.id, in_deck=False,
+                           part_of_figure=True)
+            number = SideCard(suit=Suit.DIAMONDS, rank=SideRank.THREE, value=3,
+                              game_id=game.id, player_id=player.id, in_deck=False,
+                              part_of_figure=True)
+            db.session.add_all([figure, key, number])
+            db.session.flush()
+            db.session.add_all([
+                CardToFigure(figure_id=figure.id, card_id=key.id,
+                             card_type='main', role=CardRole.KEY),
+                CardToFigure(figure_id=figure.id, card_id=number.id,
+                             card_type='side', role=CardRole.NUMBER),
+            ])
+        db.session.add(LogEntry(game_id=game.id, player_id=player.id,
+                                round_number=1, turn_number=1, message='built',
+                                author='system', type='figure'))
+    db.session.add(ChatMessage(game_id=game.id, sender_id=players[0].id,
+                               receiver_id=players[1].id, message='hi'))
+    db.session.commit()
+    return game
+
+
+def _legacy_serialize(game):
+    """Per-row reference output: each player/figure/link loads its own rows."""
+    data = game.serialize()
+    data['players'] = [player.serialize() for player in game.players]
+    return data
+
+
+@contextmanager
+def _count_selects(engine):
+    statements = []
+
+    def record(_conn, _cursor, statement, _params, _context, _executemany):
+        if statement.lstrip().upper().startswith('SELECT'):
+            statements.append(statement)
+
+    event.listen(engine, 'before_cursor_execute', record)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, 'before_cursor_execute', record)
+
+
+def _serialize_fresh(db, game_id):
+    from models import Game
+
+    db.session.expire_all()
+    game = db.session.get(Game, game_id)
+    with _count_selects(db.engine) as statements:
+        data = game.serialize()
+    return data, len(statements)
+
+
+def test_bulk_serialize_matches_per_row_serializers(db, two_users):
+    game = _build_game(db, two_users, figures_per_player=2)
+
+    bulk = game.serialize()
+    db.session.expire_all()
+    legacy = _legacy_serialize(game)
+
+    assert json.dumps(bulk, sort_keys=False) == json.dumps(legacy, sort_keys=False)
+    figure_cards = bulk['players'][0]['figures'][0]['cards']
+    assert [link['rank'] for link in figure_cards] == ['K', '3']
+
+
+def test_serialize_query_count_does_not_grow_with_figures(db, two_users):
+    small = _build_game(db, two_users, figures_per_player=1)
+    large = _build_game(db, two_users, figures_per_player=6)
+
+    _, small_queries = _serialize_fresh(db, small.id)
+    large_data, large_queries = _serialize_fresh(db, large.id)
+
+    assert len(large_data['players'][0]['figures']) == 6
+    assert large_queries == small_queries
+    assert large_queries <= 15
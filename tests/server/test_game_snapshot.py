@@ -0,0 +1,177 @@
+# Copyright (c) 2026 Marc Stieffenhofer. All rights reserved.
+# See LICENSE file in the project root for full license information.
+"""Tests for the combined ``/games/get_game_snapshot`` poll endpoint.
+
+Test oracle (desired outcomes):
+- A full snapshot carries the viewer's game plus logs, chats, active spells
+  and per-player figures, each equal to what the dedicated endpoint returns.
+- With ``since_version`` only changed sections are sent; an unchanged game
+  answers ``unchanged`` exactly like ``get_game``.
+- Logs and chats are sent once, in ``logs``/``chats``: the nested game
+  carries no ``log_entries``/``chat_messages``, full or delta.
+- Non-members are rejected.
+"""
+
+import json
+
+import pytest
+
+
+@pytest.fixture
+def snapshot_game(db):
+    from models import ActiveSpell, ChatMessage, Figure, Game, LogEntry, Player, User
+    from werkzeug.security import generate_password_hash
+
+    u1 = User(username='snap_p1', password_hash=generate_password_hash('p'), gold=120)
+    u2 = User(username='snap_p2', password_hash=generate_password_hash('p'), gold=120)
+    db.session.add_all([u1, u2])
+    db.session.commit()
+
+    game = Game(current_round=1, stake=35)
+    db.session.add(game)
+    db.session.commit()
+
+    p1 = Player(user_id=u1.id, game_id=game.id, turns_left=6, points=0)
+    p2 = Player(user_id=u2.id, game_id=game.id, turns_left=6, points=0)
+    db.session.add_all([p1, p2])
+    db.session.commit()
+    game.turn_player_id = p1.id
+    db.session.add_all([
+        Figure(player_id=p2.id, game_id=game.id, family_name='Villager',
+               field='village', color='red', name='Villager', suit='Hearts',
+               produces={'food': 1}),
+        LogEntry(game_id=game.id, player_id=p1.id, round_number=1,
+                 turn_number=1, message='drew', author='system', type='move'),
+        ChatMessage(game_id=game.id, sender_id=p2.id, receiver_id=p1.id,
+                    message='hi'),
+        ActiveSpell(game_id=game.id, player_id=p2.id, spell_name='Poison',
+                    spell_type='tactics', spell_family_name='Poison', suit='Hearts',
+                    cast_round=1, is_active=True),
+    ])
+    db.session.commit()
+    return game, p1, p2
+
+
+@pytest.fixture
+def snapshot_headers(app, snapshot_game):
+    from routes.auth import generate_token
+
+    _, p1, _ = snapshot_game
+    return {'Authorization': f'Bearer {generate_token(p1.user_id)}'}
+
+
+def _get(client, headers, path, **params):
+    query = '&'.join(f'{key}={value}' for key, value in params.items())
+    response = client.get(f'{path}?{query}', headers=headers)
+    assert response.status_code == 200
+    return response.get_json()
+
+
+def test_full_snapshot_matches_dedicated_endpoints(client, snapshot_game, snapshot_headers):
+    game, p1, p2 = snapshot_game
+
+    body = _get(client, snapshot_headers, '/games/get_game_snapshot', game_id=game.id)
+
+    game_body = _get(client, snapshot_headers, '/games/get_game', game_id=game.id)
+    history = ('log_entries', 'chat_messages')
+    assert not any(section in body['game'] for section in history)
+    assert body['game'] == {key: value for key, value in game_body['game'].items()
+                            if key not in history}
+    assert body['logs'] == _get(client, snapshot_headers, '/msg/get_log_entries',
+                                game_id=game.id)['log_entries']
+    assert body['chats'] == _get(client, snapshot_headers, '/msg/get_chat_messages',
+                                 game_id=game.id)['chat_messages']
+    assert body['active_spells'] == _get(client, snapshot_headers, '/spells/get_active_spells',
+                                         game_id=game.id)['active_spells']
+    for player in (p1, p2):
+        assert body['figures'][str(player.id)] == _get(
+            client, snapshot_headers, '/figures/get_figures', player_id=player.id)['figures']
+    assert len(body['figures'][str(p2.id)]) == 1
+
+
+def test_delta_snapshot_sends_only_changed_sections(db, client, snapshot_game, snapshot_headers):
+    game, p1, p2 = snapshot_game
+    version = _get(client, snapshot_headers, '/games/get_game_snapshot',
+                   game_id=game.id)['game']['state_version']
+
+    unchanged = _get(client, snapshot_headers, '/games/get_game_snapshot',
+                     game_id=game.id, since_version=version)
+    assert unchanged == {'unchanged': True, 'state_version': version,
+                         'presence': {str(p1.id): False, str(p2.id): False}}
+
+    response = client.post(
+        '/msg/add_chat_message',
+        data=json.dumps({'game_id': game.id, 'sender_id': p1.id,
+                         'receiver_id': p2.id, 'message': 'hello'}),
+        content_type='application/json',
+        headers=snapshot_headers,
+    )
+    assert response.get_json()['success'] is True
+
+    body = _get(client, snapshot_headers, '/games/get_game_snapshot',
+                game_id=game.id, since_version=version)
+
+    assert body['delta'] is True
+    assert [msg['message'] for msg in body['chats']] == ['hi', 'hello']
+    for key in ('logs', 'active_spells', 'figures'):
+        assert key not in body
+
+
+def test_snapshot_rejects_non_members(db, client, snapshot_game):
+    from models import User
+    from routes.auth import generate_token
+    from werkzeug.security import generate_password_hash
+
+    game, _, _ = snapshot_game
+    outsider = User(username='snap_outsider', password_hash=generate_password_hash('p'))
+    db.session.add(outsider)
+    db.session.commit()
+
+    response = client.get(
+        f'/games/get_game_snapshot?game_id={game.id}',
+        headers={'Authorization': f'Bearer {generate_token(outsider.id)}'},
+    )
+
+    assert response.status_code == 403
+
+
+def test_snapshot_log_cursor_appends_only_new_entries(db, client, snapshot_game, snapshot_headers):
+    from models import LogEntry
+
+    game, p1, _ = snapshot_game
+    first = _get(client, snapshot_headers, '/games/get_game_snapshot', game_id=game.id)
+    version = first['game']['state_version']
+    last_log_id = first['logs'][-1]['id']
+    db.session.add(LogEntry(game_id=game.id, player_id=p1.id, round_number=1,
+                            turn_number=2, message='played', author='system',
+                            type='move'))
+    db.session.commit()
+
+    body = _get(client, snapshot_headers, '/games/get_game_snapshot',
+                game_id=game.id, since_version=version, logs_after_id=last_log_id)
+
+    assert [entry['message'] for entry in body['logs']] == ['played']
+    assert body['appended'] == ['logs']
+
+
+def test_delta_snapshot_does_not_resend_history(db, client, snapshot_game, snapshot_headers):
+    from models import LogEntry
+
+    game, p1, _ = snapshot_game
+    first = _get(client, snapshot_headers, '/games/get_game_snapshot', game_id=game.id)
+    version = first['game']['state_version']
+    last_log_id = first['logs'][-1]['id']
+    for turn in range(5):
+        db.session.add(LogEntry(game_id=game.id, player_id=p1.id, round_number=1,
+                                turn_number=turn + 2, message=f'move {turn}',
+                                author='system', type='move'))
+    db.session.commit()
+
+    body = _get(client, snapshot_headers, '/games/get_game_snapshot',
+                game_id=game.id, since_version=version, logs_after_id=last_log_id)
+
+    assert body['delta'] is True
+    assert 'log_entries' not in body['game']
+    assert 'chat_messages' not in body['game']
+    assert [entry['message'] for entry in body['logs']] == [
+        f'move {turn}' for turn in range(5)]
@@ -361,3 +361,167 @@ class TestKingdomMap:
         """Endpoint requires authentication."""
         rv = client.get('/kingdom/map')
         assert rv.status_code in (401, 403)
+
+
+# ═══════════════════════════════════════════════════════════════════
+#  GET /kingdom/map/static and /kingdom/map/changes
+# ═══════════════════════════════════════════════════════════════════
+
+class TestKingdomMapDeltas:
+
+    # Tier-2 lands keep the tutorial recommendation (itself always resent)
+    # out of the deltas.
+
+    def _changes(self, client, headers, since=None):
+        url = '/kingdom/map/changes'
+        if since is not None:
+            url += f'?since_version={since}'
+        rv = client.get(url, headers=headers)
+        assert rv.status_code == 200
+        return rv.get_json()
+
+    def test_static_map_revalidates_with_etag(self, client, db,
+                                              auth_headers_user1):
+        """Static fields only; an unchanged map answers If-None-Match with 304."""
+        db.session.query(Land).delete()
+        db.session.commit()
+        _add_land(db, 0, 0, tier=2, gold_rate=4.0, suit='Clubs', bonus=3)
+
+        rv = client.get('/kingdom/map/static', headers=auth_headers_user1)
+        assert rv.status_code == 200
+        etag = rv.headers['ETag']
+        land = rv.get_json()['lands'][0]
+        assert land['tier'] == 2 and land['suit_bonus_suit'] == 'Clubs'
+        assert 'owner' not in land and 'is_mine' not in land
+
+        rv = client.get('/kingdom/map/static', headers={
+            **auth_headers_user1, 'If-None-Match': etag})
+        assert rv.status_code == 304
+
+        _add_land(db, 1, 0)
+        rv = client.get('/kingdom/map/static', headers={
+            **auth_headers_user1, 'If-None-Match': etag})
+        assert rv.status_code == 200
+        assert len(rv.get_json()['lands']) == 2
+
+    def test_changes_only_resend_lands_stamped_since_version(
+            self, client, db, two_users, auth_headers_user1):
+        _u1, u2 = two_users
+        db.session.query(Land).delete()
+        db.session.commit()
+        first = _add_land(db, 0, 0, tier=2)
+        _add_land(db, 5, 5, tier=2)
+
+        full = self._changes(client, auth_headers_user1)
+        assert full['full'] is True
+        assert len(full['lands']) == 2
+        assert 'tier' not in full['lands'][0]
+        since = full['map_version']
+
+        assert self._changes(client, auth_headers_user1, since)['lands'] == []
+
+        first.owner_user_id = u2.id
+        db.session.commit()
+
+        delta = self._changes(client, auth_headers_user1, since)
+        assert delta['full'] is False
+        assert delta['map_version'] > since
+        assert [land['id'] for land in delta['lands']] == [first.id]
+        assert delta['lands'][0]['owner']['user_id'] == u2.id
+
+    def test_kingdom_rename_stamps_all_kingdom_lands(self, client, db,
+                                                     two_users,
+                                                     auth_headers_user1):
+        _u1, u2 = two_users
+        db.session.query(Land).delete()
+        db.session.commit()
+        kingdom = KingdomModel(
+            owner_user_id=u2.id,
+            name='Old Name',
+            badge_key='badge_plain',
+            border_key='border_simple_gold',
+            surface_key='surface_plain',
+        )
+        db.session.add(kingdom)
+        db.session.commit()
+        a = _add_land(db, 0, 0, owner_id=u2.id)
+        b = _add_land(db, 1, 0, owner_id=u2.id)
+        _add_land(db, 8, 8, tier=2)
+        a.kingdom_id = b.kingdom_id = kingdom.id
+        db.session.commit()
+        since = self._changes(client, auth_headers_user1)['map_version']
+
+        kingdom.name = 'New Name'
+        db.session.commit()
+
+        delta = self._changes(client, auth_headers_user1, since)
+        assert sorted(land['id'] for land in delta['lands']) == sorted([a.id, b.id])
+        assert {land['kingdom_name'] for land in delta['lands']} == {'New Name'}
+
+    def test_own_and_cooldown_lands_are_always_resent(self, client, db,
+                                                      two_users,
+                                                      auth_headers_user1):
+        """Viewer/clock dependent fields are re-evaluated on every poll."""
+        u1, _u2 = two_users
+        db.session.query(Land).delete()
+        db.session.commit()
+        mine = _add_land(db, 0, 0, owner_id=u1.id)
+        cooling = _add_land(db, 3, 3, tier=2)
+        _add_land(db, 6, 6, tier=2)
+        cooling.conquer_cooldown_until = datetime.now(timezone.utc).replace(
+            tzinfo=None) + timedelta(hours=1)
+        db.session.commit()
+        since = self._changes(client, auth_headers_user1)['map_version']
+
+        delta = self._changes(client, auth_headers_user1, since)
+
+        assert sorted(land['id'] for land in delta['lands']) == sorted(
+            [mine.id, cooling.id])
+
+    def test_unknown_future_version_falls_back_to_full(self, client, db,
+                                                       auth_headers_user1):
+        data = self._changes(client, auth_headers_user1, since=10 ** 6)
+
+        assert data['full'] is True
+        assert len(data['lands']) == Land.query.count()
+
+    def test_map_reports_current_map_version(self, client, db, two_users,
+                                             auth_headers_user1):
+        from kingdom_map_service import current_map_version
+
+        land = _add_land(db, 0, 0)
+        land.owner_user_id = two_users[1].id
+        db.session.commit()
+
+        rv = client.get('/kingdom/map', headers=auth_headers_user1)
+
+        assert rv.get_json()['map_version'] == current_map_version() > 0
+
+    def test_polls_reuse_map_state_until_version_moves(self, client, db,
+                                                       two_users,
+                                                       auth_headers_user1,
+                                                       monkeypatch):
+        """Only a new map version reloads and rebuilds the land map."""
+        import kingdom_map_service
+
+        _u1, u2 = two_users
+        db.session.query(Land).delete()
+        db.session.commit()
+        first = _add_land(db, 0, 0, tier=2)
+        _add_land(db, 5, 5, tier=2)
+        loads = []
+        load_map_lands = kingdom_map_service.load_map_lands
+        monkeypatch.setattr(kingdom_map_service, 'load_map_lands',
+                            lambda: loads.append(1) or load_map_lands())
+
+        since = self._changes(client, auth_headers_user1)['map_version']
+        self._changes(client, auth_headers_user1, since)
+        client.get('/kingdom/map', headers=auth_headers_user1)
+        assert len(loads) == 1
+
+        first.owner_user_id = u2.id
+        db.session.commit()
+        delta = self._changes(client, auth_headers_user1, since)
+
+        assert len(loads) == 2
+        assert [land['owner']['user_id'] for land in delta['lands']] == [u2.id]
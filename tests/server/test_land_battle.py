@@ -2923,21 +2923,17 @@ class TestConquerAutoPlay:
             db.session.commit()
 
             spawned_targets = []
-            original_thread = __import__('threading').Thread
 
-            def capture_thread(*args, **kwargs):
-                t = original_thread(*args, **kwargs)
-                spawned_targets.append(kwargs.get('target', args[0] if args else None))
-                # Don't actually start the thread
-                t.start = lambda: None
-                return t
+            def capture_submit(_key, fn, args=(), delay=0.0):
+                # Don't actually run the loop
+                spawned_targets.append(fn)
+                return 'queued'
 
             import ai.ai_worker as aw
-            # Clear active games set to avoid blocking
-            with aw._active_games_lock:
-                aw._active_games.clear()
+            # Clear scheduler state to avoid blocking
+            aw._ai_scheduler.clear()
             with patch.object(aw.settings, 'AI_ENABLED', True), \
-                 patch('threading.Thread', side_effect=capture_thread):
+                 patch.object(aw._ai_scheduler, 'submit', side_effect=capture_submit):
                 aw.trigger_ai_if_needed(game.id, app=app)
 
             assert len(spawned_targets) == 1
@@ -2966,22 +2962,17 @@ class TestConquerAutoPlay:
 
             spawned_targets = []
             spawned_args = []
-            original_thread = __import__('threading').Thread
 
-            def capture_thread(*args, **kwargs):
-                t = original_thread(*args, **kwargs)
-                spawned_targets.append(kwargs.get('target', args[0] if args else None))
-                thread_args = kwargs.get('args', args[1] if len(args) > 1 else ())
-                spawned_args.append(thread_args)
-                # Don't actually start the thread
-                t.start = lambda: None
-                return t
+            def capture_submit(_key, fn, args=(), delay=0.0):
+                # Don't actually run the loop
+                spawned_targets.append(fn)
+                spawned_args.append(args)
+                return 'queued'
 
             import ai.ai_worker as aw
-            with aw._active_games_lock:
-                aw._active_games.clear()
+            aw._ai_scheduler.clear()
             with patch.object(aw.settings, 'AI_ENABLED', True), \
-                 patch('threading.Thread', side_effect=capture_thread):
+                 patch.object(aw._ai_scheduler, 'submit', side_effect=capture_submit):
                 aw.trigger_ai_if_needed(game.id, app=app)
 
             assert len(spawned_targets) == 1
@@ -3009,19 +3000,15 @@ class TestConquerAutoPlay:
             db.session.commit()
 
             spawned_targets = []
-            original_thread = __import__('threading').Thread
 
-            def capture_thread(*args, **kwargs):
-                t = original_thread(*args, **kwargs)
-                spawned_targets.append(kwargs.get('target', args[0] if args else None))
-                t.start = lambda: None
-                return t
+            def capture_submit(_key, fn, args=(), delay=0.0):
+                spawned_targets.append(fn)
+                return 'queued'
 
             import ai.ai_worker as aw
-            with aw._active_games_lock:
-                aw._active_games.clear()
+            aw._ai_scheduler.clear()
             with patch.object(aw.settings, 'AI_ENABLED', True), \
-                 patch('threading.Thread', side_effect=capture_thread):
+                 patch.object(aw._ai_scheduler, 'submit', side_effect=capture_submit):
                 aw.trigger_ai_if_needed(game.id, app=app)
 
             assert len(spawned_targets) == 1
@@ -0,0 +1,142 @@
+# Copyright (c) 2026 Marc Stieffenhofer. All rights reserved.
+# See LICENSE file in the project root for full license information.
+"""Tests for the outbound notification mail queue (server/mail_queue.py)."""
+
+import socket
+from datetime import timedelta
+
+import pytest
+
+import mail_queue
+import server_settings
+from mail_queue import deliver_due, enqueue_email, get_mail_queue_metrics, queue_depth
+from models import db, OutboundEmail
+from scripts.smtp_stub import StubSMTPServer
+
+
+@pytest.fixture
+def smtp_stub(app, monkeypatch):
+    server = StubSMTPServer().start()
+    monkeypatch.setattr(server_settings, 'NOTIFY_EMAILS_ENABLED', True)
+    monkeypatch.setattr(server_settings, 'SMTP_HOST', server.host)
+    monkeypatch.setattr(server_settings, 'SMTP_PORT', server.port)
+    monkeypatch.setattr(server_settings, 'SMTP_STARTTLS', False)
+    monkeypatch.setattr(server_settings, 'MAIL_WORKER_IN_PROCESS', False)
+    mail_queue.reset_for_tests()
+    yield server
+    mail_queue.reset_for_tests()
+    server.stop()
+
+
+def _queue(count, prefix='mail'):
+    for index in range(count):
+        assert enqueue_email(f'{prefix}{index}@example.com', f'Subject {index} — NK',
+                             f'Body {index}')
+
+
+def _free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def test_burst_is_sent_in_one_batch_over_one_connection(smtp_stub):
+    _queue(5)
+
+    assert deliver_due() == {'sent': 5, 'retried': 0, 'failed': 0}
+    _queue(2, prefix='later')
+    assert deliver_due()['sent'] == 2
+
+    assert [m['to'] for m in smtp_stub.messages][:2] == [['mail0@example.com'],
+                                                         ['mail1@example.com']]
+    assert smtp_stub.messages[0]['subject'] == 'Subject 0 — NK'
+    assert smtp_stub.messages[0]['body'].strip() == 'Body 0'
+    assert smtp_stub.connections == 1
+    assert queue_depth() == 0
+
+
+def test_one_drain_sends_at_most_one_batch(smtp_stub, monkeypatch):
+    monkeypatch.setattr(server_settings, 'MAIL_BATCH_SIZE', 2)
+    _queue(3)
+
+    assert deliver_due()['sent'] == 2
+    assert queue_depth() == 1
+
+
+def test_failed_message_is_retried_with_backoff(smtp_stub):
+    smtp_stub.fail_next(1)
+    _queue(1)
+    now = mail_queue._utcnow()
+
+    assert deliver_due(now=now) == {'sent': 0, 'retried': 1, 'failed': 0}
+    row = OutboundEmail.query.one()
+    assert row.attempts == 1
+    assert row.claim_token is None
+    assert row.due_at == now + timedelta(seconds=server_settings.MAIL_RETRY_BASE_SECONDS)
+    assert '451' in row.last_error
+
+    assert deliver_due(now=now + timedelta(seconds=1))['sent'] == 0
+    assert deliver_due(now=row.due_at)['sent'] == 1
+    assert len(smtp_stub.messages) == 1
+
+
+def test_backoff_doubles_up_to_the_cap(monkeypatch):
+    monkeypatch.setattr(server_settings, 'MAIL_RETRY_BASE_SECONDS', 30)
+    monkeypatch.setattr(server_settings, 'MAIL_RETRY_MAX_SECONDS', 100)
+
+    assert [mail_queue._retry_delay(n) for n in (1, 2, 3, 4)] == [30, 60, 100, 100]
+
+
+def test_message_is_dropped_after_max_attempts(smtp_stub, monkeypatch):
+    monkeypatch.setattr(server_settings, 'MAIL_MAX_ATTEMPTS', 2)
+    smtp_stub.fail_next(5)
+    _queue(1)
+    now = mail_queue._utcnow()
+
+    assert deliver_due(now=now)['retried'] == 1
+    assert deliver_due(now=now + timedelta(hours=2))['failed'] == 1
+    assert queue_depth() == 0
+    assert get_mail_queue_metrics()['failed'] == 1
+
+
+def test_unreachable_server_keeps_mail_queued(smtp_stub, monkeypatch):
+    monkeypatch.setattr(server_settings, 'SMTP_PORT', _free_port())
+    _queue(2)
+
+    assert deliver_due() == {'sent': 0, 'retried': 2, 'failed': 0}
+    assert queue_depth() == 2
+
+
+def test_queue_is_bounded(smtp_stub, monkeypatch):
+    monkeypatch.setattr(server_settings, 'MAIL_QUEUE_MAX_PENDING', 2)
+    _queue(2)
+
+    assert not enqueue_email('overflow@example.com', 'Too many', 'Body')
+    assert queue_depth() == 2
+    assert get_mail_queue_metrics()['dropped_full'] == 1
+
+
+def test_without_smtp_host_mail_is_only_logged(smtp_stub, monkeypatch):
+    monkeypatch.setattr(server_settings, 'SMTP_HOST', '')
+
+    assert not enqueue_email('dev@example.com', 'Hello', 'Body')
+    assert queue_depth() == 0
+
+
+def test_worker_drains_mail_left_from_a_previous_run(app, smtp_stub):
+    # Rows written before a restart are sent once a worker starts.
+    db.session.add_all([
+        OutboundEmail(to_addr='a@example.com', subject='One', body='1'),
+        OutboundEmail(to_addr='b@example.com', subject='Two', body='2'),
+    ])
+    db.session.commit()
+
+    worker = mail_queue.start_mail_worker(app)
+    assert smtp_stub.wait_for(2)
+    worker.stop(timeout=5)
+
+    metrics = get_mail_queue_metrics()
+    assert metrics['queue_depth'] == 0
+    assert metrics['sent'] == 2
+    assert metrics['connections_opened'] == 1
+    assert metrics['send_latency_max_ms'] >= metrics['send_latency_avg_ms'] >= 0
@@ -296,3 +296,72 @@ class TestLogEntries:
         data = resp.get_json()
         assert resp.status_code == 400
         assert data.get('success') is False
+
+
+class TestCursorPagination:
+    def _add_logs(self, db, game, player, count):
+        from models import LogEntry
+
+        entries = [
+            LogEntry(game_id=game.id, player_id=player.id, round_number=1,
+                     turn_number=index, message=f'entry {index}',
+                     author='system', type='move')
+            for index in range(count)
+        ]
+        db.session.add_all(entries)
+        db.session.commit()
+        return [entry.id for entry in entries]
+
+    def test_log_entries_page_by_after_id_and_limit(
+        self, db, client, msg_game, msg_token_p1,
+    ):
+        game, p1, _ = msg_game
+        ids = self._add_logs(db, game, p1, 5)
+        headers = {'Authorization': f'Bearer {msg_token_p1}'}
+
+        first = client.get(
+            f'/msg/get_log_entries?game_id={game.id}&after_id={ids[0]}&limit=2',
+            headers=headers,
+        ).get_json()
+        assert [entry['id'] for entry in first['log_entries']] == ids[1:3]
+        assert first['has_more'] is True
+        assert first['next_after_id'] == ids[2]
+
+        rest = client.get(
+            f'/msg/get_log_entries?game_id={game.id}'
+            f'&after_id={first["next_after_id"]}&limit=2',
+            headers=headers,
+        ).get_json()
+        assert [entry['id'] for entry in rest['log_entries']] == ids[3:]
+        assert rest['has_more'] is False
+
+        empty = client.get(
+            f'/msg/get_log_entries?game_id={game.id}&after_id={ids[-1]}',
+            headers=headers,
+        ).get_json()
+        assert empty['log_entries'] == []
+        assert empty['next_after_id'] == ids[-1]
+
+    def test_chat_messages_after_id_returns_only_new_messages(
+        self, client, msg_game, msg_token_p1,
+    ):
+        game, p1, p2 = msg_game
+        headers = {'Authorization': f'Bearer {msg_token_p1}'}
+        sent_ids = []
+        for text in ('one', 'two', 'three'):
+            resp = client.post(
+                '/msg/add_chat_message',
+                data=json.dumps({'game_id': game.id, 'sender_id': p1.id,
+                                 'receiver_id': p2.id, 'message': text}),
+                content_type='application/json',
+                headers=headers,
+            )
+            sent_ids.append(resp.get_json()['chat_message']['id'])
+
+        data = client.get(
+            f'/msg/get_chat_messages?game_id={game.id}&after_id={sent_ids[0]}',
+            headers=headers,
+        ).get_json()
+
+        assert [msg['message'] for msg in data['chat_messages']] == ['two', 'three']
+        assert data['next_after_id'] == sent_ids[-1]
@@ -77,9 +77,11 @@ def test_worker_iteration_triggers_candidates_and_sweeper(
     assert [game_id for game_id, _app in triggered] == [11, 22]
     assert all(worker_app is app for _game_id, worker_app in triggered)
     assert result == {
+        'pending_games': 0,
         'candidate_games': 2,
         'ai_jobs_enabled': True,
         'swept_games': 3,
+        'mail_sent': 0,
     }
 
 
@@ -111,12 +113,115 @@ def test_worker_ai_kill_switch_keeps_sweeper_running(app, monkeypatch):
 
     assert trigger is None
     assert result == {
+        'pending_games': 0,
         'candidate_games': 1,
         'ai_jobs_enabled': False,
         'swept_games': 2,
+        'mail_sent': 0,
     }
 
 
+def _ai_duel(ai_user_name='[AI] QueueBot'):
+    from werkzeug.security import generate_password_hash
+
+    from models import User
+
+    ai_user = User(username=ai_user_name, password_hash=generate_password_hash('x'),
+                   is_ai=True)
+    human = User(username=f'{ai_user_name}-human', password_hash=generate_password_hash('x'))
+    db.session.add_all([ai_user, human])
+    db.session.commit()
+    game = Game(current_round=1, stake=35)
+    db.session.add(game)
+    db.session.commit()
+    db.session.add_all([
+        Player(user_id=ai_user.id, game_id=game.id, turns_left=2),
+        Player(user_id=human.id, game_id=game.id, turns_left=2),
+    ])
+    db.session.commit()
+    return game
+
+
+def test_game_commits_queue_ai_checks_and_worker_drains_only_them(
+        app,
+        db,
+        monkeypatch,
+):
+    import ai.ai_worker as ai_worker
+    from models import AIPendingGame
+
+    monkeypatch.setattr(background_worker.settings, 'AI_ENABLED', True)
+    game = _ai_duel()
+    idle = _ai_duel('[AI] IdleBot')
+    AIPendingGame.query.filter_by(game_id=idle.id).delete()
+    db.session.commit()
+    triggered = []
+    monkeypatch.setattr(
+        ai_worker,
+        'trigger_ai_if_needed',
+        lambda game_id, app=None: triggered.append(game_id),
+    )
+
+    game.current_round = 2
+    db.session.commit()
+    assert db.session.get(AIPendingGame, game.id) is not None
+
+    first = background_worker.run_worker_iteration(app)
+    second = background_worker.run_worker_iteration(app)
+
+    assert triggered == [game.id]
+    assert first['pending_games'] == 1 and first['candidate_games'] == 0
+    assert second['pending_games'] == 0
+    assert AIPendingGame.query.count() == 0
+
+
+def test_human_only_game_commits_are_not_queued(app, db, monkeypatch):
+    from werkzeug.security import generate_password_hash
+
+    from models import AIPendingGame, User
+
+    monkeypatch.setattr(background_worker.settings, 'AI_ENABLED', True)
+    humans = [User(username=f'pvp-{n}', password_hash=generate_password_hash('x'))
+              for n in range(2)]
+    db.session.add_all(humans)
+    db.session.commit()
+    game = Game(current_round=1, stake=35)
+    db.session.add(game)
+    db.session.commit()
+    db.session.add_all([Player(user_id=user.id, game_id=game.id, turns_left=2)
+                        for user in humans])
+    db.session.commit()
+
+    game.current_round = 2
+    db.session.commit()
+
+    assert db.session.get(AIPendingGame, game.id) is None
+
+
+def test_worker_requeues_games_at_their_next_timer(app, db, monkeypatch):
+    from datetime import timedelta
+
+    import ai.ai_worker as ai_worker
+    from ai.pending_work import claim_due_games, _utcnow
+    from models import AIPendingGame
+
+    monkeypatch.setattr(background_worker.settings, 'AI_ENABLED', True)
+    monkeypatch.setattr(ai_worker, 'trigger_ai_if_needed',
+                        lambda game_id, app=None: None)
+    game = _ai_duel()
+    deadline = _utcnow() + timedelta(seconds=60)
+    game.mode = 'conquer'
+    game.battle_round_deadline_at = deadline
+    db.session.commit()
+
+    background_worker.run_worker_iteration(app)
+
+    row = db.session.get(AIPendingGame, game.id)
+    assert row is not None and row.due_at == deadline
+    assert claim_due_games() == []
+    assert claim_due_games(now=deadline) == [game.id]
+
+
 def test_worker_leadership_is_singleton(app, tmp_path, monkeypatch):
     """Only one always-on worker can lead an environment at a time."""
     monkeypatch.setenv(
@@ -8,9 +8,10 @@ import pytest
 from werkzeug.security import generate_password_hash
 
 import notification_service
+from domain_events import DispatchContext, GameFinished, TurnChanged
 from models import db, Challenge, ChallengeStatus, Game, Player, User
-from notification_service import (maybe_notify_turn_or_finish,
-                                  notify_challenge_received,
+from notification_service import (notify_challenge_received,
+                                  notify_on_game_events,
                                   unsubscribe_sig, verify_unsubscribe_sig)
 
 
@@ -47,12 +48,24 @@ def _mk_duel(user_a, user_b, turn_user=None, state='open'):
     return game, pa, pb
 
 
+def _turn_changed(game, requester=None):
+    """Dispatch the event a commit moving ``game``'s turn would publish."""
+    notify_on_game_events(
+        [TurnChanged(game.id, game.mode, game.turn_player_id, None)],
+        DispatchContext(requester_user_id=requester.id if requester else None))
+
+
+def _game_finished(game):
+    notify_on_game_events(
+        [GameFinished(game.id, game.mode, game.winner_player_id)], DispatchContext())
+
+
 @pytest.fixture
 def sent(monkeypatch):
     """Capture outgoing notification emails instead of touching SMTP."""
     captured = []
     monkeypatch.setattr(
-        notification_service, '_send_async',
+        notification_service, '_send_email',
         lambda to, subject, body: captured.append(
             {'to': to, 'subject': subject, 'body': body}))
     return captured
@@ -96,7 +109,7 @@ class TestTurnNotification:
         a = _mk_user('turn_a', email='a@example.com')
         b = _mk_user('turn_b', email='b@example.com')
         game, pa, pb = _mk_duel(a, b, turn_user=b)
-        assert maybe_notify_turn_or_finish(game.id, requester_user_id=a.id)
+        _turn_changed(game, requester=a)
         assert len(sent) == 1
         assert sent[0]['to'] == 'b@example.com'
         assert 'your turn' in sent[0]['subject'].lower()
@@ -106,22 +119,22 @@ class TestTurnNotification:
         a = _mk_user('deb_a', email='a2@example.com')
         b = _mk_user('deb_b', email='b2@example.com')
         game, _, _ = _mk_duel(a, b, turn_user=b)
-        assert maybe_notify_turn_or_finish(game.id, requester_user_id=a.id)
-        assert not maybe_notify_turn_or_finish(game.id, requester_user_id=a.id)
+        _turn_changed(game, requester=a)
+        _turn_changed(game, requester=a)
         assert len(sent) == 1
 
     def test_requester_not_emailed_about_own_turn(self, app, sent):
         a = _mk_user('req_a', email='a3@example.com')
         b = _mk_user('req_b', email='b3@example.com')
         game, _, _ = _mk_duel(a, b, turn_user=b)
-        assert not maybe_notify_turn_or_finish(game.id, requester_user_id=b.id)
+        _turn_changed(game, requester=b)
         assert sent == []
 
     def test_online_player_not_emailed(self, app, sent):
         a = _mk_user('on_a', email='a4@example.com')
         b = _mk_user('on_b', email='b4@example.com', last_active_minutes_ago=0)
         game, _, _ = _mk_duel(a, b, turn_user=b)
-        assert not maybe_notify_turn_or_finish(game.id, requester_user_id=a.id)
+        _turn_changed(game, requester=a)
         assert sent == []
 
     def test_opted_out_or_missing_email_not_emailed(self, app, sent):
@@ -130,15 +143,15 @@ class TestTurnNotification:
         c = _mk_user('opt_c')  # no email at all
         game1, _, _ = _mk_duel(a, b, turn_user=b)
         game2, _, _ = _mk_duel(a, c, turn_user=c)
-        assert not maybe_notify_turn_or_finish(game1.id)
-        assert not maybe_notify_turn_or_finish(game2.id)
+        _turn_changed(game1)
+        _turn_changed(game2)
         assert sent == []
 
     def test_ai_user_never_emailed(self, app, sent):
         a = _mk_user('ai_h', email='h@example.com')
         strategos = _mk_user('[AI] T', email='ai@example.com', is_ai=True)
         game, _, _ = _mk_duel(a, strategos, turn_user=strategos)
-        assert not maybe_notify_turn_or_finish(game.id, requester_user_id=a.id)
+        _turn_changed(game, requester=a)
         assert sent == []
 
     def test_conquer_games_skipped(self, app, sent):
@@ -147,7 +160,42 @@ class TestTurnNotification:
         game, _, _ = _mk_duel(a, b, turn_user=b)
         game.mode = 'conquer'
         db.session.commit()
-        assert not maybe_notify_turn_or_finish(game.id)
+        _turn_changed(game)
+        assert sent == []
+
+
+class TestGameEventNotification:
+    def test_turn_change_event_emails_offline_turn_player(self, app, sent):
+        a = _mk_user('evt_a', email='ea@example.com')
+        b = _mk_user('evt_b', email='eb@example.com')
+        game, pa, pb = _mk_duel(a, b, turn_user=b)
+        notify_on_game_events([TurnChanged(game.id, 'duel', pb.id, pa.id)],
+                              DispatchContext(requester_user_id=a.id))
+        assert [m['to'] for m in sent] == ['eb@example.com']
+
+    def test_stale_turn_event_not_emailed(self, app, sent):
+        a = _mk_user('stl_a', email='sa@example.com')
+        b = _mk_user('stl_b', email='sb@example.com')
+        game, pa, pb = _mk_duel(a, b, turn_user=a)
+        notify_on_game_events([TurnChanged(game.id, 'duel', pb.id, pa.id)],
+                              DispatchContext(requester_user_id=a.id))
+        assert sent == []
+
+    def test_finished_game_skips_turn_email(self, app, sent):
+        a = _mk_user('efin_a', email='efa@example.com')
+        b = _mk_user('efin_b', email='efb@example.com')
+        game, pa, pb = _mk_duel(a, b, state='finished')
+        game.winner_player_id = pa.id
+        db.session.commit()
+        notify_on_game_events([TurnChanged(game.id, 'duel', pb.id, pa.id),
+                               GameFinished(game.id, 'duel', pa.id)],
+                              DispatchContext(requester_user_id=a.id))
+        assert len(sent) == 1
+        assert 'lost' in sent[0]['subject'].lower()
+
+    def test_conquer_events_skipped_without_queries(self, app, sent, monkeypatch):
+        monkeypatch.setattr(db.session, 'get', None)  # any lookup would fail
+        notify_on_game_events([TurnChanged(1, 'conquer', 2, 3)], DispatchContext())
         assert sent == []
 
 
@@ -158,14 +206,14 @@ class TestFinishNotification:
         game, pa, pb = _mk_duel(a, b, state='finished')
         game.winner_player_id = pa.id
         db.session.commit()
-        assert maybe_notify_turn_or_finish(game.id)
+        _game_finished(game)
         assert {m['to'] for m in sent} == {'fa@example.com', 'fb@example.com'}
         won = next(m for m in sent if m['to'] == 'fa@example.com')
         lost = next(m for m in sent if m['to'] == 'fb@example.com')
         assert 'won' in won['subject'].lower()
         assert 'lost' in lost['subject'].lower()
         # Second pass: nobody is emailed twice.
-        assert not maybe_notify_turn_or_finish(game.id)
+        _game_finished(game)
         assert len(sent) == 2
 
 
@@ -49,6 +49,7 @@ def test_readyz_reports_database_and_schema(client):
     assert data['status'] == 'ready'
     assert data['database'] == db.engine.dialect.name
     assert data['schema_version'] == CURRENT_SCHEMA_VERSION
+    assert data['mail_queue']['queue_depth'] == 0
     assert data['api_version']
     assert data['release_sha']
 
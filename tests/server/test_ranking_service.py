@@ -0,0 +1,163 @@
+# Copyright (c) 2026 Marc Stieffenhofer. All rights reserved.
+# See LICENSE file in the project root for full license information.
+"""Materialized leaderboard rows (server/ranking_service.py)."""
+
+import pytest
+
+import server_settings
+from models import Game, Land, LandAttackLog, Player, User, UserRanking
+from ranking_service import leaderboard, rank_of, reconcile_rankings
+
+
+def _ranking(db, user_id):
+    return (db.session.query(UserRanking).populate_existing()
+            .filter_by(user_id=user_id).one())
+
+
+def _land(db, owner_id, col, gold_rate=5.0):
+    land = Land(col=col, row=0, tier=1, gold_rate=gold_rate,
+                suit_bonus_suit='Hearts', suit_bonus_value=1, owner_user_id=owner_id)
+    db.session.add(land)
+    db.session.commit()
+    return land
+
+
+def _duel(db, winner, loser, state='active'):
+    game = Game(state=state, mode='duel')
+    db.session.add(game)
+    db.session.flush()
+    players = [Player(user_id=user.id, game_id=game.id) for user in (winner, loser)]
+    db.session.add_all(players)
+    db.session.commit()
+    return game, players
+
+
+@pytest.fixture
+def three_users(db, two_users):
+    u3 = User(username='player3', password_hash='x', gold=100)
+    db.session.add(u3)
+    db.session.commit()
+    return (*two_users, u3)
+
+
+def test_new_users_get_an_empty_row(db, two_users):
+    u1, _ = two_users
+
+    row = _ranking(db, u1.id)
+
+    assert (row.total_games, row.wins, row.lands_owned) == (0, 0, 0)
+
+
+def test_finishing_a_game_updates_both_players(db, two_users):
+    u1, u2 = two_users
+    game, (p1, _p2) = _duel(db, u1, u2)
+    assert _ranking(db, u1.id).total_games == 0
+
+    game.state = 'finished'
+    game.winner_player_id = p1.id
+    db.session.commit()
+
+    assert (_ranking(db, u1.id).total_games, _ranking(db, u1.id).wins) == (1, 1)
+    assert (_ranking(db, u2.id).total_games, _ranking(db, u2.id).wins) == (1, 0)
+
+
+def test_land_transfer_moves_counts_between_owners(db, two_users):
+    u1, u2 = two_users
+    land = _land(db, u1.id, 0, gold_rate=7.5)
+    assert _ranking(db, u1.id).lands_owned == 1
+
+    land.owner_user_id = u2.id
+    db.session.commit()
+
+    assert _ranking(db, u1.id).lands_owned == 0
+    assert _ranking(db, u2.id).lands_owned == 1
+    assert _ranking(db, u2.id).total_gold_rate == 7.5
+
+
+def test_attack_log_updates_attacker_and_defender(db, two_users):
+    u1, u2 = two_users
+    land = _land(db, u2.id, 0)
+    db.session.add_all([
+        LandAttackLog(land_id=land.id, attacker_user_id=u1.id,
+                      defender_user_id=u2.id, result='attacker_won'),
+        LandAttackLog(land_id=land.id, attacker_user_id=u1.id,
+                      defender_user_id=u2.id, result='defender_won'),
+    ])
+    db.session.commit()
+
+    attacker, defender = _ranking(db, u1.id), _ranking(db, u2.id)
+    assert (attacker.conquer_attempts, attacker.conquer_wins) == (2, 1)
+    assert defender.defence_wins == 1
+
+
+def test_bulk_delete_recounts_everyone(db, two_users):
+    u1, _ = two_users
+    _land(db, u1.id, 0)
+
+    Land.query.delete(synchronize_session=False)
+    db.session.commit()
+
+    assert _ranking(db, u1.id).lands_owned == 0
+
+
+def test_rolled_back_changes_leave_rankings_alone(db, two_users):
+    u1, _ = two_users
+    _land(db, u1.id, 0)
+
+    db.session.add(Land(col=1, row=0, tier=1, gold_rate=1.0, suit_bonus_suit='Hearts',
+                        suit_bonus_value=1, owner_user_id=u1.id))
+    db.session.flush()
+    db.session.rollback()
+
+    assert _ranking(db, u1.id).lands_owned == 1
+
+
+def test_reconcile_corrects_drift(db, two_users):
+    u1, _ = two_users
+    _land(db, u1.id, 0)
+    db.session.query(UserRanking).filter_by(user_id=u1.id).update(
+        {UserRanking.lands_owned: 42})
+    db.session.commit()
+
+    assert reconcile_rankings(commit=True) == 1
+    assert _ranking(db, u1.id).lands_owned == 1
+    assert reconcile_rankings(commit=True) == 0
+
+
+def test_pages_and_my_rank_follow_the_same_order(client, db, three_users, monkeypatch):
+    # Kingdom order: lands owned, then gold rate (player3 has the richer pair).
+    u1, u2, u3 = three_users
+    for col, owner in enumerate((u2, u2, u3, u3, u1)):
+        _land(db, owner.id, col, gold_rate=1.0 + col)
+    monkeypatch.setattr(server_settings, 'RANKINGS_PAGE_MAX', 2)
+
+    total, rows = leaderboard('kingdom', limit=1, offset=1)
+
+    assert total == 3
+    assert [(rank, user.username) for rank, _ranking_row, user in rows] == [(2, 'player2')]
+    assert rank_of('kingdom', u3.id)[0] == 1
+    assert rank_of('kingdom', u1.id)[0] == 3
+    assert len(client.get('/kingdom/rankings?limit=10').get_json()['rankings']) == 2
+
+
+def test_get_rankings_pages_and_reports_my_rank(client, db, three_users):
+    u1, u2, _u3 = three_users
+    game, (p1, _p2) = _duel(db, u2, u1, state='finished')
+    game.winner_player_id = p1.id
+    db.session.commit()
+
+    rv = client.get('/auth/get_rankings?limit=1&username=player1')
+
+    data = rv.get_json()
+    assert rv.status_code == 200
+    assert data['total'] == 3
+    assert [(r['rank'], r['username'], r['wins']) for r in data['rankings']] == [
+        (1, 'player2', 1)]
+    assert data['me']['username'] == 'player1'
+    assert data['me']['rank'] == 3
+    assert data['me']['losses'] == 1
+
+
+def test_kingdom_rankings_reject_bad_paging(client):
+    assert client.get('/kingdom/rankings?limit=-1').status_code == 400
+    assert client.get('/auth/get_rankings?offset=x').status_code == 400
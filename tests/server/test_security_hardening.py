@@ -342,7 +342,7 @@ def test_get_rankings_aggregates_finished_games(client, db, two_users):
     assert resp.status_code == 200
     rankings = {r['username']: r for r in resp.get_json()['rankings']}
     assert rankings['player1'] == {
-        'username': 'player1', 'gold': 100, 'total_games': 1,
+        'rank': 1, 'username': 'player1', 'gold': 100, 'total_games': 1,
         'wins': 1, 'losses': 0, 'is_online': False,
     }
     assert rankings['player2']['wins'] == 0
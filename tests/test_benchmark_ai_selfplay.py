@@ -0,0 +1,90 @@
+# Copyright (c) 2026 Marc Stieffenhofer. All rights reserved.
+# See LICENSE file in the project root for full license information.
+"""Headless AI self-play benchmark (scripts/benchmark_ai_selfplay.py)."""
+
+import json
+import random
+
+import pytest
+
+from scripts.benchmark_ai_selfplay import (
+    DecisionStats,
+    SelfPlayGame,
+    _nearest_rank,
+    decision_workload,
+    main,
+    run_decisions,
+    run_selfplay,
+)
+
+
+def test_nearest_rank_percentile() -> None:
+    values = [5.0, 1.0, 4.0, 2.0, 3.0]
+    assert _nearest_rank(values, 0.50) == 3.0
+    assert _nearest_rank(values, 0.99) == 5.0
+    assert _nearest_rank([], 0.99) == 0.0
+
+
+def test_decision_stats_summary_per_phase() -> None:
+    stats = DecisionStats()
+    for ms in (1.0, 2.0, 3.0):
+        stats.add('normal_turn', ms)
+    stats.add('battle_round', 4.0)
+
+    summary = stats.summary()
+
+    assert summary['overall']['decisions'] == 4
+    assert summary['overall']['decisions_per_sec'] == 400.0
+    assert summary['by_phase']['normal_turn']['p50_ms'] == 2.0
+    assert summary['by_phase']['battle_round']['p99_ms'] == 4.0
+
+
+def test_duel_selfplay_finishes_and_is_reproducible() -> None:
+    first = run_selfplay(games=2, seed=7, seat_policies=('strategy', 'random'))
+    second = run_selfplay(games=2, seed=7, seat_policies=('strategy', 'random'))
+
+    assert [r.points for r in first.games] == [r.points for r in second.games]
+    assert all(not r.stalled and r.decisions > 0 for r in first.games)
+    # Seats swap player ids between games.
+    assert first.games[0].seat_by_player[1] == 'A:strategy'
+    assert first.games[1].seat_by_player[1] == 'B:random'
+    phases = first.stats.latencies_ms
+    assert {'normal_turn', 'battle_shop', 'battle_round'} <= set(phases)
+
+
+def test_conquer_battle_covers_three_rounds_per_side() -> None:
+    sim = SelfPlayGame.conquer(random.Random(3))
+    tactics = sim.game['conquer_tactics']
+    assert {t['player_id'] for t in tactics} == {1, 2}
+    assert sim.next_decision() == (sim.game['advancing_player_id'], 'battle_round')
+
+    report = run_selfplay(games=3, modes=('conquer',), seed=3)
+
+    assert all(not r.stalled for r in report.games)
+    assert set(report.stats.latencies_ms) == {'battle_round'}
+    assert sum(r.decisions for r in report.games) >= 3 * 6
+
+
+def test_profile_groups_own_time_by_server_module() -> None:
+    report = run_selfplay(games=1, seed=1, profile=True, profile_top=50)
+
+    modules = {row['module'] for row in report.profile}
+    assert 'ai.action_enum' in modules
+    assert 'ai.duel_strategy' in modules
+
+
+def test_cli_prints_json_report(capsys) -> None:
+    assert main(['--games', '1', '--mode', 'both', '--seats', 'random,random', '--json']) == 0
+
+    report = json.loads(capsys.readouterr().out)
+    assert report['games'] == 2
+    assert set(report['results']) == {'duel', 'conquer'}
+    assert report['latency']['overall']['decisions'] > 0
+
+
+def test_decision_throughput_benchmark(request) -> None:
+    pytest.importorskip('pytest_benchmark')
+    benchmark = request.getfixturevalue('benchmark')
+    workload = decision_workload(seed=2, games=1)
+
+    assert benchmark(run_decisions, workload) == len(workload)
@@ -0,0 +1,115 @@
+# Copyright (c) 2026 Marc Stieffenhofer. All rights reserved.
+# See LICENSE file in the project root for full license information.
+"""Startup benchmark harness (scripts/benchmark_startup.py); timings stay in CI."""
+
+import json
+from pathlib import Path
+
+from scripts import benchmark_startup
+from scripts.benchmark_startup import (
+    check_budget,
+    main,
+    parse_events,
+    parse_importtime,
+    run_metrics,
+)
+
+BUDGET_PATH = Path(__file__).resolve().parents[1] / 'scripts' / 'startup_budget.json'
+
+
+def test_parse_importtime_keeps_cumulative_ms_per_module() -> None:
+    stderr = '\n'.join([
+        'import time: self [us] | cumulative | imported package',
+        'import time:       120 |        120 |   _io',
+        'import time:      2500 |      41000 | pygame',
+        'some unrelated warning',
+    ])
+
+    assert parse_importtime(stderr) == {'_io': 0.12, 'pygame': 41.0}
+
+
+def test_run_metrics_flattens_profiler_events() -> None:
+    stdout = '\n'.join([
+        'pygame 2.6.1 (SDL 2.28.4, Python 3.11.9)',
+        'NK_STARTUP {"event":"screen_built","screen":"login","how":"startup","ms":51.0}',
+        'NK_STARTUP {"event":"boot","ms":602.0}',
+        'NK_STARTUP {"event":"first_interactive","screen":"login","ms":610.5}',
+        'NK_STARTUP {"event":"screen_entered","screen":"login","ms":4.2}',
+        'NK_STARTUP {"event":"server_first_request","ms":8.0,"status":200}',
+    ])
+
+    metrics = run_metrics(parse_events(stdout), {'server': 1750.0})
+
+    assert metrics == {
+        'screen.login_ms': 51.0,
+        'boot_ms': 602.0,
+        'first_interactive_ms': 610.5,
+        'first_frame_ms': 4.2,
+        'first_request_ms': 8.0,
+        'import.server_ms': 1750.0,
+    }
+
+
+def test_budget_reports_slow_and_missing_metrics() -> None:
+    results = {'client': {'boot_ms': 900.0, 'screen.login_ms': 40.0}}
+    budget = {
+        'scale': 2.0,
+        'client': {'boot_ms': 400, 'screen.login_ms': 50, 'screen.game_ms': 10},
+        'server': {'boot_ms': 1},
+    }
+
+    assert check_budget(results, budget) == [
+        'client.boot_ms: 900.0 ms > budget 800 ms',
+        'client.screen.game_ms: not measured (budget 20 ms)',
+    ]
+    assert check_budget(results, {'client': {'boot_ms': 1000}}) == []
+
+
+def _fake_runs(monkeypatch, measured):
+    calls = []
+
+    def run_once(target, timeout):
+        calls.append(target)
+        return dict(measured[target])
+
+    monkeypatch.setattr(benchmark_startup, 'run_once', run_once)
+    return calls
+
+
+def test_main_reports_json_medians_and_passes_within_budget(
+        monkeypatch, tmp_path, capsys) -> None:
+    calls = _fake_runs(monkeypatch, {'server': {'boot_ms': 120.0, 'schema_ms': 9.0}})
+    budget = tmp_path / 'budget.json'
+    budget.write_text(json.dumps({'server': {'boot_ms': 200, 'schema_ms': 10}}))
+
+    assert main(['--target', 'server', '--runs', '2', '--json',
+                 '--budget', str(budget)]) == 0
+
+    output = capsys.readouterr().out
+    assert calls == ['server', 'server']
+    assert json.loads(output[:output.rindex('}') + 1]) == {
+        'server': {'boot_ms': 120.0, 'schema_ms': 9.0}}
+    assert f'All startup metrics within {budget}.' in output
+
+
+def test_main_exits_1_and_names_every_metric_over_budget(
+        monkeypatch, tmp_path, capsys) -> None:
+    _fake_runs(monkeypatch, {'server': {'boot_ms': 120.0, 'schema_ms': 9.0}})
+    budget = tmp_path / 'budget.json'
+    budget.write_text(json.dumps({
+        'scale': 0.5, 'server': {'boot_ms': 200, 'first_request_ms': 5}}))
+
+    assert main(['--target', 'server', '--runs', '1', '--budget', str(budget)]) == 1
+
+    assert capsys.readouterr().err.splitlines() == [
+        'BUDGET server.boot_ms: 120.0 ms > budget 100 ms',
+        'BUDGET server.first_request_ms: not measured (budget 2 ms)',
+    ]
+
+
+def test_shipped_budget_covers_both_targets() -> None:
+    budget = json.loads(BUDGET_PATH.read_text())
+
+    assert float(budget['scale']) >= 1.0
+    assert {'boot_ms', 'first_interactive_ms'} <= set(budget['client'])
+    assert {'boot_ms', 'schema_ms', 'first_request_ms'} <= set(budget['server'])